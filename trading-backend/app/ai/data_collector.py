@@ -7,19 +7,39 @@ Features:
 - Binance Futures 과거 데이터 수집
 - 기술적 지표 자동 계산 (RSI, MACD, Bollinger Bands 등)
 - 데이터 검증 및 정제
-- 캐싱 지원
+- 캐싱 지원 (특징 행렬 증분 계산)
 """
 
 import logging
+import math
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from binance.client import Client
 import ta  # Technical Analysis library
 
+from app.ai.feature_store import FeatureStore, feature_store
+from app.core.rate_budget import request_budget, RequestPriority
+
 logger = logging.getLogger(__name__)
 
+# 특징 세트 버전 (add_technical_indicators 변경 시 증가 → 저장된 행렬 무효화)
+FEATURE_SET_VERSION = 1
+
+# 증분 계산 시 새 캔들 앞에 붙이는 과거 캔들 수 (EMA/RSI 수렴용)
+WARMUP_ROWS = 500
+
+# 특징 행렬 최대 보관 기간
+MAX_CACHE_DAYS = 730
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+def _utc_now() -> datetime:
+    """현재 UTC 시각 (캔들 timestamp와 같은 tz-naive UTC, 서버 로컬 시간대와 무관)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 class MarketDataCollector:
     """
@@ -31,13 +51,62 @@ class MarketDataCollector:
     - 데이터 품질 검증
     """
 
-    def __init__(self, api_key: str = "", api_secret: str = ""):
+    def __init__(
+        self,
+        api_key: str = "",
+        api_secret: str = "",
+        store: Optional[FeatureStore] = None
+    ):
         """
         Args:
             api_key: Binance API 키 (선택 - 공개 데이터만 사용 시 불필요)
             api_secret: Binance API 시크릿
+            store: 특징 행렬 저장소 (None이면 전역 저장소 사용)
         """
         self.client = Client(api_key, api_secret)
+        self.store = store or feature_store
+
+    @staticmethod
+    def _acquire_klines_budget(interval: str, start: datetime, end: datetime):
+        """
+        과거 캔들 수집 전 요청 예산 확보
+
+        futures_historical_klines는 1000개 단위로 여러 번 요청하므로
+        예상 페이지 수만큼 가중치를 확보합니다 (시장 데이터 우선순위).
+        """
+        try:
+            step = pd.Timedelta(interval)
+            pages = max(1, math.ceil((pd.Timestamp(end) - pd.Timestamp(start)) / (step * 1000)))
+        except ValueError:
+            pages = 1
+
+        request_budget.acquire_binance_sync(
+            "GET", "/fapi/v1/klines", {"limit": 1000},
+            priority=RequestPriority.MARKET_DATA,
+            cost_multiplier=pages
+        )
+
+    @staticmethod
+    def _klines_to_dataframe(klines: list) -> pd.DataFrame:
+        """Binance kline 응답을 OHLCV 데이터프레임으로 변환"""
+        df = pd.DataFrame(klines, columns=[
+            'timestamp', 'open', 'high', 'low', 'close', 'volume',
+            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+            'taker_buy_quote', 'ignore'
+        ])
+
+        # 필요한 컬럼만 선택
+        df = df[OHLCV_COLUMNS]
+
+        # 타임스탬프를 datetime으로 변환
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+
+        # 숫자 타입으로 변환
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        # 결측치 제거
+        return df.dropna()
 
     def fetch_historical_data(
         self,
@@ -62,13 +131,14 @@ class MarketDataCollector:
 
         # 종료 날짜 설정
         if end_date is None:
-            end_date = datetime.now()
+            end_date = _utc_now()
 
         # 시작 날짜 계산
         start_date = end_date - timedelta(days=days)
 
         # Binance API 호출
         try:
+            self._acquire_klines_budget(interval, start_date, end_date)
             klines = self.client.futures_historical_klines(
                 symbol=symbol,
                 interval=interval,
@@ -77,24 +147,7 @@ class MarketDataCollector:
             )
 
             # 데이터프레임 변환
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-
-            # 필요한 컬럼만 선택
-            df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-
-            # 타임스탬프를 datetime으로 변환
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-
-            # 숫자 타입으로 변환
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-
-            # 결측치 제거
-            df = df.dropna()
+            df = self._klines_to_dataframe(klines)
 
             logger.info(f"✅ Collected {len(df)} candles from {df['timestamp'].min()} to {df['timestamp'].max()}")
 
@@ -104,6 +157,34 @@ class MarketDataCollector:
             logger.error(f"Failed to fetch historical data: {e}")
             raise
 
+    def fetch_candles_since(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: datetime
+    ) -> pd.DataFrame:
+        """
+        특정 시각 이후의 캔들만 수집 (증분 갱신용)
+
+        Args:
+            symbol: 거래 심볼
+            interval: 캔들 간격
+            start_time: 시작 캔들 시각 (포함)
+
+        Returns:
+            OHLCV 데이터프레임
+        """
+        start_ms = int(pd.Timestamp(start_time).value // 1_000_000)
+
+        self._acquire_klines_budget(interval, start_time, _utc_now())
+        klines = self.client.futures_historical_klines(
+            symbol=symbol,
+            interval=interval,
+            start_str=start_ms
+        )
+
+        return self._klines_to_dataframe(klines)
+
     def add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         기술적 지표 추가
@@ -224,11 +305,81 @@ class MarketDataCollector:
         logger.info("✅ Data validation passed")
         return True
 
+    def update_feature_matrix(
+        self,
+        symbol: str,
+        interval: str,
+        days: int
+    ) -> pd.DataFrame:
+        """
+        저장된 특징 행렬을 새 캔들까지 증분 갱신
+
+        저장된 행렬이 요청 기간을 포함하면 마지막 캔들 이후만 수집하고,
+        WARMUP_ROWS 만큼의 과거 캔들을 앞에 붙여 새 행의 지표만 계산합니다.
+        마지막 저장 캔들은 미완성일 수 있으므로 항상 다시 계산합니다.
+
+        Args:
+            symbol: 거래 심볼
+            interval: 캔들 간격
+            days: 필요한 일수
+
+        Returns:
+            기술적 지표가 포함된 데이터프레임 (timestamp 컬럼 포함)
+        """
+        key = FeatureStore.get_key(symbol, interval, FEATURE_SET_VERSION)
+        requested_start = _utc_now() - timedelta(days=days)
+
+        with self.store.lock(key):
+            cached = self.store.load(key)
+            refetched = False
+
+            if cached is None or cached[1] > requested_start or cached[0].empty:
+                # 전체 수집 (최초 또는 요청 기간이 저장 범위보다 김)
+                # fetch_historical_data는 일 단위로 끝나므로 이후 캔들은 아래에서 증분 수집
+                raw = self.fetch_historical_data(symbol=symbol, interval=interval, days=days)
+                cached = (self.add_technical_indicators(raw), requested_start)
+                refetched = True
+
+            features, coverage_start = cached
+            last_timestamp = features['timestamp'].iloc[-1]
+
+            new_raw = self.fetch_candles_since(symbol, interval, last_timestamp)
+            if new_raw.empty:
+                if refetched:
+                    self.store.save(key, features, coverage_start)
+                return features
+
+            first_new = new_raw['timestamp'].iloc[0]
+            kept = features[features['timestamp'] < first_new]
+
+            # 워밍업 구간 + 새 캔들에 대해서만 지표 계산
+            window = pd.concat(
+                [kept[OHLCV_COLUMNS].tail(WARMUP_ROWS), new_raw],
+                ignore_index=True
+            )
+            tail = self.add_technical_indicators(window)
+            tail = tail[tail['timestamp'] >= first_new]
+
+            features = pd.concat([kept, tail], ignore_index=True)
+
+            # 보관 기간 초과분 제거
+            retention_start = _utc_now() - timedelta(days=MAX_CACHE_DAYS)
+            if coverage_start < retention_start:
+                features = features[features['timestamp'] >= retention_start].reset_index(drop=True)
+                coverage_start = retention_start
+
+            self.store.save(key, features, coverage_start)
+
+            logger.info(f"Feature matrix {key}: +{len(tail)} rows (total {len(features)})")
+
+            return features
+
     def prepare_dataset(
         self,
         symbol: str = "BTCUSDT",
         interval: str = "1h",
-        days: int = 365
+        days: int = 365,
+        use_cache: bool = True
     ) -> pd.DataFrame:
         """
         LSTM 모델용 완전한 데이터셋 준비
@@ -237,19 +388,26 @@ class MarketDataCollector:
             symbol: 거래 심볼
             interval: 캔들 간격
             days: 수집할 일수
+            use_cache: 저장된 특징 행렬 증분 갱신 사용 여부
 
         Returns:
             기술적 지표가 포함된 검증된 데이터셋
         """
-        # 1. 데이터 수집
-        df = self.fetch_historical_data(
-            symbol=symbol,
-            interval=interval,
-            days=days
-        )
+        if use_cache:
+            # 1-2. 저장된 특징 행렬 갱신 후 요청 기간만 선택
+            df = self.update_feature_matrix(symbol=symbol, interval=interval, days=days)
+            requested_start = _utc_now() - timedelta(days=days)
+            df = df[df['timestamp'] >= requested_start]
+        else:
+            # 1. 데이터 수집
+            df = self.fetch_historical_data(
+                symbol=symbol,
+                interval=interval,
+                days=days
+            )
 
-        # 2. 기술적 지표 추가
-        df = self.add_technical_indicators(df)
+            # 2. 기술적 지표 추가
+            df = self.add_technical_indicators(df)
 
         # 3. 데이터 검증
         if not self.validate_data(df):
@@ -111,6 +111,38 @@ class LSTMDataPreprocessor:
 
         return scaled_features, scaled_target
 
+    def transform_features(
+        self,
+        df: pd.DataFrame,
+        tail: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        특징만 기존 스케일러로 변환 (추론 전용)
+
+        tail이 주어지면 마지막 tail 행만 변환하므로 예측 시
+        lookback 구간 외의 행은 건드리지 않습니다.
+
+        Args:
+            df: 기술적 지표가 포함된 데이터프레임
+            tail: 변환할 마지막 행 수 (None이면 전체)
+
+        Returns:
+            float32 정규화 특징 행렬 (rows, features)
+        """
+        feature_cols = self.feature_columns
+        if feature_cols is None:
+            if not hasattr(self.feature_scaler, "n_features_in_"):
+                raise ValueError("Scaler not fitted. Call fit_transform first.")
+            feature_cols = [
+                col for col in df.columns
+                if col not in (self.target_column, 'timestamp')
+            ]
+
+        frame = df if tail is None else df.iloc[-tail:]
+        scaled = self.feature_scaler.transform(frame[feature_cols].values)
+
+        return scaled.astype(np.float32, copy=False)
+
     def inverse_transform_target(self, scaled_target: np.ndarray) -> np.ndarray:
         """
         정규화된 타겟을 원래 스케일로 복원
@@ -269,6 +301,9 @@ class LSTMDataPreprocessor:
         joblib.dump(self.feature_scaler, feature_scaler_path)
         joblib.dump(self.target_scaler, target_scaler_path)
 
+        if self.feature_columns is not None:
+            joblib.dump(self.feature_columns, os.path.join(save_dir, "feature_columns.pkl"))
+
         logger.info(f"✅ Scalers saved to {save_dir}")
 
     def load_scalers(self, save_dir: str = "models/scalers"):
@@ -287,6 +322,10 @@ class LSTMDataPreprocessor:
         self.feature_scaler = joblib.load(feature_scaler_path)
         self.target_scaler = joblib.load(target_scaler_path)
 
+        feature_columns_path = os.path.join(save_dir, "feature_columns.pkl")
+        if os.path.exists(feature_columns_path):
+            self.feature_columns = joblib.load(feature_columns_path)
+
         logger.info(f"✅ Scalers loaded from {save_dir}")
 
     def get_feature_importance(self, feature_names: List[str]) -> pd.DataFrame:
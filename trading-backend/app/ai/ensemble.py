@@ -1,9 +1,14 @@
-from typing import Dict, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, Tuple, Optional, List, Awaitable
+from dataclasses import dataclass, field
+import asyncio
+import time
 import pandas as pd
 import numpy as np
 from app.core.config import settings
+from app.ai.llm_cache import llm_cache, candle_state
 import logging
+import json
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +46,10 @@ class EnsembleDecision:
     take_profit: float
     reasoning: str
 
+    # Per-component latency (ms) and components excluded from the weighting
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    degraded: List[str] = field(default_factory=list)
+
 
 class TripleAIEnsemble:
     """
@@ -53,6 +62,10 @@ class TripleAIEnsemble:
     - Technical Analysis Rules (10%): ATR-based signals
 
     Entry Logic: Probability ≥80% AND Confidence ≥70% AND Agreement ≥70%
+
+    All components run concurrently, each under its own deadline. A component
+    that misses its deadline (or raises) is dropped and the remaining weights
+    are renormalized, so latency is bounded by the slowest deadline.
     """
 
     def __init__(self):
@@ -61,6 +74,14 @@ class TripleAIEnsemble:
         self.llama_weight = settings.LLAMA_WEIGHT
         self.ta_weight = settings.TA_WEIGHT
 
+        # Per-component deadlines (seconds)
+        self.timeouts = {
+            "ml": settings.ML_TIMEOUT,
+            "gpt4": settings.GPT4_TIMEOUT,
+            "llama": settings.LLAMA_TIMEOUT,
+            "ta": settings.TA_TIMEOUT,
+        }
+
         # Thresholds
         self.min_probability = settings.MIN_PROBABILITY
         self.min_confidence = settings.MIN_CONFIDENCE
@@ -88,42 +109,54 @@ class TripleAIEnsemble:
         """
         logger.info(f"Analyzing {symbol} with Triple AI Ensemble...")
 
-        # 1. ML Models Analysis (40%)
-        ml_result = await self._ml_analysis(market_data, current_price)
-
-        # 2. GPT-4 Analysis (25%)
-        gpt4_result = await self._gpt4_analysis(symbol, market_data, current_price)
-
-        # 3. LLaMA 3.1 Analysis (25%)
-        llama_result = await self._llama_analysis(symbol, market_data, current_price)
-
-        # 4. Technical Analysis Rules (10%)
-        ta_result = await self._ta_analysis(market_data, current_price)
-
-        # 5. Calculate weighted ensemble
-        probability_up = (
-            self.ml_weight * ml_result.probability +
-            self.gpt4_weight * gpt4_result.probability +
-            self.llama_weight * llama_result.probability +
-            self.ta_weight * ta_result.probability
+        # 1-4. Run all components concurrently, each under its own deadline
+        results = await asyncio.gather(
+            self._run_component("ml", self._ml_analysis(market_data, current_price)),
+            self._run_component("gpt4", self._gpt4_analysis(symbol, market_data, current_price)),
+            self._run_component("llama", self._llama_analysis(symbol, market_data, current_price)),
+            self._run_component("ta", self._ta_analysis(market_data, current_price)),
         )
 
-        # 6. Calculate overall confidence (average of all confidences)
-        overall_confidence = np.mean([
-            ml_result.confidence,
-            gpt4_result.confidence,
-            llama_result.confidence,
-            ta_result.confidence
-        ])
-
-        # 7. Calculate agreement level
-        directions = [
-            ml_result.direction,
-            gpt4_result.direction,
-            llama_result.direction,
-            ta_result.direction
-        ]
-        agreement = self._calculate_agreement(directions)
+        components = {}
+        latency_ms = {}
+        for name, result, elapsed_ms in results:
+            components[name] = result
+            latency_ms[name] = elapsed_ms
+
+        degraded = [name for name, result in components.items() if result is None]
+        if degraded:
+            logger.warning(f"Ensemble components degraded for {symbol}: {degraded}")
+
+        ml_result = components["ml"] or self._unavailable_result("ML Models")
+        gpt4_result = components["gpt4"] or self._unavailable_result("GPT-4")
+        llama_result = components["llama"] or self._unavailable_result("Claude")
+        ta_result = components["ta"] or self._unavailable_result("TA")
+
+        available = {name: result for name, result in components.items() if result is not None}
+
+        # 5. Calculate weighted ensemble (weights renormalized over available components)
+        weights = {
+            "ml": self.ml_weight,
+            "gpt4": self.gpt4_weight,
+            "llama": self.llama_weight,
+            "ta": self.ta_weight,
+        }
+        total_weight = sum(weights[name] for name in available)
+
+        if available and total_weight > 0:
+            probability_up = sum(
+                weights[name] * result.probability for name, result in available.items()
+            ) / total_weight
+
+            # 6. Calculate overall confidence (average of available confidences)
+            overall_confidence = float(np.mean([result.confidence for result in available.values()]))
+
+            # 7. Calculate agreement level
+            agreement = self._calculate_agreement([result.direction for result in available.values()])
+        else:
+            probability_up = 0.5
+            overall_confidence = 0.0
+            agreement = 0.0
 
         # 8. Determine final direction
         final_direction = "LONG" if probability_up >= 0.5 else "SHORT"
@@ -159,17 +192,54 @@ class TripleAIEnsemble:
             entry_price=entry_price,
             stop_loss=stop_loss,
             take_profit=take_profit,
-            reasoning=reasoning
+            reasoning=reasoning,
+            latency_ms=latency_ms,
+            degraded=degraded
         )
 
         logger.info(f"Ensemble Decision: {decision.direction} | "
                    f"Probability={decision.probability_up:.2%} | "
                    f"Confidence={decision.confidence:.2%} | "
                    f"Agreement={decision.agreement:.2%} | "
-                   f"Enter={decision.should_enter}")
+                   f"Enter={decision.should_enter} | "
+                   f"Latency={latency_ms}")
 
         return decision
 
+    async def _run_component(
+        self,
+        name: str,
+        analysis: Awaitable[SignalResult]
+    ) -> Tuple[str, Optional[SignalResult], float]:
+        """
+        Await one ensemble component under its deadline
+
+        Returns:
+            (component name, result or None if it timed out/failed, latency in ms)
+        """
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(analysis, timeout=self.timeouts[name])
+        except asyncio.TimeoutError:
+            logger.warning(f"Ensemble component '{name}' missed its {self.timeouts[name]}s deadline")
+            result = None
+        except Exception as e:
+            logger.error(f"Ensemble component '{name}' failed: {e}")
+            result = None
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return name, result, elapsed_ms
+
+    @staticmethod
+    def _unavailable_result(label: str) -> SignalResult:
+        """Placeholder for a component excluded from the weighting"""
+        return SignalResult(
+            direction="NEUTRAL",
+            probability=0.50,
+            confidence=0.0,
+            reasoning=f"{label}: unavailable (deadline missed or failed) - excluded from ensemble"
+        )
+
     async def _ml_analysis(self, market_data: pd.DataFrame, current_price: float) -> SignalResult:
         """ML Models (LSTM + Transformer + LightGBM) analysis"""
         # TODO: Implement actual ML models
@@ -201,71 +271,16 @@ class TripleAIEnsemble:
         market_data: pd.DataFrame,
         current_price: float
     ) -> SignalResult:
-        """GPT-4 analysis via OpenAI API"""
+        """GPT-4 analysis via OpenAI API (shared per symbol and candle)"""
         try:
-            from openai import AsyncOpenAI
-            from app.core.config import settings
-
-            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-
-            # Prepare market data summary
-            recent_data = market_data.tail(20)
-            data_summary = {
-                "symbol": symbol,
-                "current_price": current_price,
-                "recent_highs": recent_data['high'].tolist(),
-                "recent_lows": recent_data['low'].tolist(),
-                "recent_closes": recent_data['close'].tolist(),
-                "recent_volumes": recent_data['volume'].tolist(),
-                "sma_20": float(market_data['close'].tail(20).mean()),
-                "sma_50": float(market_data['close'].tail(50).mean()),
-            }
-
-            # Create GPT-4 prompt
-            prompt = f"""You are an expert cryptocurrency trader analyzing {symbol}.
-
-Current Market Data:
-- Current Price: ${current_price:,.2f}
-- 20-period SMA: ${data_summary['sma_20']:,.2f}
-- 50-period SMA: ${data_summary['sma_50']:,.2f}
-- Recent High: ${max(data_summary['recent_highs']):,.2f}
-- Recent Low: ${min(data_summary['recent_lows']):,.2f}
-
-Analyze the market structure and provide:
-1. Direction: LONG, SHORT, or NEUTRAL
-2. Probability (0.0-1.0): How confident are you in the direction?
-3. Confidence (0.0-1.0): Overall confidence in the analysis
-4. Brief reasoning (2-3 sentences)
-
-Respond in JSON format:
-{{
-    "direction": "LONG/SHORT/NEUTRAL",
-    "probability": 0.75,
-    "confidence": 0.80,
-    "reasoning": "Your brief analysis"
-}}"""
-
-            # Call GPT-4
-            response = await client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": "You are an expert cryptocurrency trading analyst. Provide concise, data-driven analysis."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=300,
-                response_format={"type": "json_object"}
-            )
-
-            # Parse response
-            import json
-            result = json.loads(response.choices[0].message.content)
-
-            return SignalResult(
-                direction=result["direction"],
-                probability=float(result["probability"]),
-                confidence=float(result["confidence"]),
-                reasoning=f"GPT-4: {result['reasoning']}"
+            # One analysis per closed bar: the first request in a bar sets it for everyone
+            interval, last_closed, ttl = candle_state(market_data)
+            key = llm_cache.make_key("gpt-4-turbo-preview", symbol, interval, last_closed)
+
+            return await llm_cache.get_or_compute(
+                key,
+                lambda: self._gpt4_request(symbol, market_data, current_price),
+                ttl
             )
 
         except Exception as e:
@@ -291,67 +306,99 @@ Respond in JSON format:
                 reasoning="GPT-4: Fallback analysis - price action relative to moving averages"
             )
 
-    async def _llama_analysis(
+    async def _gpt4_request(
         self,
         symbol: str,
         market_data: pd.DataFrame,
         current_price: float
     ) -> SignalResult:
-        """Claude (Anthropic) analysis as alternative to LLaMA"""
-        try:
-            from anthropic import AsyncAnthropic
-            from app.core.config import settings
+        """Send the GPT-4 prompt (raises on API or parse errors)"""
+        from openai import AsyncOpenAI
 
-            client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL
+        )
 
-            # Prepare market data summary
-            recent_data = market_data.tail(20)
-            volume_trend = "increasing" if recent_data['volume'].tail(5).mean() > recent_data['volume'].tail(10).mean() else "decreasing"
+        # Prepare market data summary
+        recent_data = market_data.tail(20)
+        data_summary = {
+            "symbol": symbol,
+            "current_price": current_price,
+            "recent_highs": recent_data['high'].tolist(),
+            "recent_lows": recent_data['low'].tolist(),
+            "recent_closes": recent_data['close'].tolist(),
+            "recent_volumes": recent_data['volume'].tolist(),
+            "sma_20": float(market_data['close'].tail(20).mean()),
+            "sma_50": float(market_data['close'].tail(50).mean()),
+        }
+
+        # Create GPT-4 prompt
+        prompt = f"""You are an expert cryptocurrency trader analyzing {symbol}.
 
-            # Create Claude prompt
-            prompt = f"""Analyze {symbol} cryptocurrency market:
+Current Market Data:
+- Current Price: ${current_price:,.2f}
+- 20-period SMA: ${data_summary['sma_20']:,.2f}
+- 50-period SMA: ${data_summary['sma_50']:,.2f}
+- Recent High: ${max(data_summary['recent_highs']):,.2f}
+- Recent Low: ${min(data_summary['recent_lows']):,.2f}
 
-Current Price: ${current_price:,.2f}
-Volume Trend: {volume_trend}
-Price Change (24h): {((current_price / market_data['close'].iloc[-24] - 1) * 100):.2f}%
+Analyze the market structure and provide:
+1. Direction: LONG, SHORT, or NEUTRAL
+2. Probability (0.0-1.0): How confident are you in the direction?
+3. Confidence (0.0-1.0): Overall confidence in the analysis
+4. Brief reasoning (2-3 sentences)
 
-Provide trading analysis in JSON:
+Respond in JSON format:
 {{
     "direction": "LONG/SHORT/NEUTRAL",
     "probability": 0.75,
     "confidence": 0.80,
-    "reasoning": "Brief volume and momentum analysis"
+    "reasoning": "Your brief analysis"
 }}"""
 
-            # Call Claude
-            message = await client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=300,
-                temperature=0.3,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        # Call GPT-4
+        response = await client.chat.completions.create(
+            model="gpt-4-turbo-preview",
+            messages=[
+                {"role": "system", "content": "You are an expert cryptocurrency trading analyst. Provide concise, data-driven analysis."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=300,
+            response_format={"type": "json_object"}
+        )
+
+        # Parse response
+        result = json.loads(response.choices[0].message.content)
 
-            # Parse response
-            import json
-            import re
+        return SignalResult(
+            direction=result["direction"],
+            probability=float(result["probability"]),
+            confidence=float(result["confidence"]),
+            reasoning=f"GPT-4: {result['reasoning']}"
+        )
 
-            # Extract JSON from response
-            content = message.content[0].text
-            json_match = re.search(r'\{[^}]+\}', content, re.DOTALL)
+    async def _llama_analysis(
+        self,
+        symbol: str,
+        market_data: pd.DataFrame,
+        current_price: float
+    ) -> SignalResult:
+        """Claude (Anthropic) analysis as alternative to LLaMA (shared per symbol and candle)"""
+        try:
+            interval, last_closed, ttl = candle_state(market_data)
+            recent_data = market_data.tail(20)
+            volume_trend = "increasing" if recent_data['volume'].tail(5).mean() > recent_data['volume'].tail(10).mean() else "decreasing"
+            change_24h = (current_price / market_data['close'].iloc[-24] - 1) * 100
 
-            if json_match:
-                result = json.loads(json_match.group())
+            key = llm_cache.make_key("claude-3-5-sonnet-20241022", symbol, interval, last_closed)
 
-                return SignalResult(
-                    direction=result["direction"],
-                    probability=float(result["probability"]),
-                    confidence=float(result["confidence"]),
-                    reasoning=f"Claude: {result['reasoning']}"
-                )
-            else:
-                raise ValueError("Could not parse JSON from Claude response")
+            return await llm_cache.get_or_compute(
+                key,
+                lambda: self._llama_request(symbol, current_price, volume_trend, change_24h),
+                ttl
+            )
 
         except Exception as e:
             logger.error(f"Claude analysis error: {e}")
@@ -373,6 +420,62 @@ Provide trading analysis in JSON:
                 reasoning="Claude: Fallback analysis - volume profile and price momentum"
             )
 
+    async def _llama_request(
+        self,
+        symbol: str,
+        current_price: float,
+        volume_trend: str,
+        change_24h: float
+    ) -> SignalResult:
+        """Send the Claude prompt (raises on API or parse errors)"""
+        from anthropic import AsyncAnthropic
+
+        client = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL
+        )
+
+        # Create Claude prompt
+        prompt = f"""Analyze {symbol} cryptocurrency market:
+
+Current Price: ${current_price:,.2f}
+Volume Trend: {volume_trend}
+Price Change (24h): {change_24h:.2f}%
+
+Provide trading analysis in JSON:
+{{
+    "direction": "LONG/SHORT/NEUTRAL",
+    "probability": 0.75,
+    "confidence": 0.80,
+    "reasoning": "Brief volume and momentum analysis"
+}}"""
+
+        # Call Claude
+        message = await client.messages.create(
+            model="claude-3-5-sonnet-20241022",
+            max_tokens=300,
+            temperature=0.3,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+        # Extract JSON from response
+        content = message.content[0].text
+        json_match = re.search(r'\{[^}]+\}', content, re.DOTALL)
+
+        if not json_match:
+            raise ValueError("Could not parse JSON from Claude response")
+
+        result = json.loads(json_match.group())
+
+        return SignalResult(
+            direction=result["direction"],
+            probability=float(result["probability"]),
+            confidence=float(result["confidence"]),
+            reasoning=f"Claude: {result['reasoning']}"
+        )
+
     async def _ta_analysis(self, market_data: pd.DataFrame, current_price: float) -> SignalResult:
         """
         Technical Analysis using TradingView's Top-Rated Strategies
@@ -386,7 +489,13 @@ Provide trading analysis in JSON:
         6. Multi-Indicator Consensus
 
         Returns weighted ensemble of all strategy signals.
+        Strategies are CPU-bound, so they run in a worker thread to keep the
+        event loop (and the concurrent LLM calls) responsive.
         """
+        return await asyncio.to_thread(self._ta_analysis_sync, market_data, current_price)
+
+    def _ta_analysis_sync(self, market_data: pd.DataFrame, current_price: float) -> SignalResult:
+        """Synchronous body of _ta_analysis"""
         from app.strategies.strategies import (
             SuperTrendStrategy,
             RSIEMAStrategy,
@@ -0,0 +1,118 @@
+"""
+특징 행렬 저장소
+
+심볼/캔들 간격/특징 세트 버전별로 OHLCV + 기술적 지표 행렬을 보관합니다.
+MarketDataCollector가 새 캔들에 대해서만 지표를 증분 계산할 수 있도록
+마지막으로 계산된 행렬을 메모리와 디스크에 유지합니다.
+
+Features:
+- 메모리 캐시 + 디스크 영속화 (joblib)
+- 특징 세트 버전 불일치 시 자동 무효화
+- 키별 잠금으로 동시 갱신 방지
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIR = "models/features"
+
+
+class FeatureStore:
+    """
+    특징 행렬 저장소
+
+    각 항목은 (특징 데이터프레임, 커버리지 시작 시각) 으로 구성됩니다.
+    커버리지 시작 시각은 원본 캔들 수집을 시작한 시점이며, 요청된 기간이
+    이 시점보다 앞서면 전체 재수집이 필요합니다.
+    """
+
+    def __init__(self, cache_dir: str = FEATURE_DIR):
+        """
+        Args:
+            cache_dir: 특징 행렬 저장 디렉토리
+        """
+        self.cache_dir = cache_dir
+        self._memory: Dict[str, Tuple[pd.DataFrame, datetime]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def get_key(symbol: str, interval: str, version: int) -> str:
+        """저장소 키 생성"""
+        return f"{symbol}_{interval}_v{version}"
+
+    def lock(self, key: str) -> threading.Lock:
+        """키별 갱신 잠금 반환"""
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def load(self, key: str) -> Optional[Tuple[pd.DataFrame, datetime]]:
+        """
+        특징 행렬 로드 (메모리 → 디스크 순)
+
+        Returns:
+            (특징 데이터프레임, 커버리지 시작 시각) 또는 None
+        """
+        if key in self._memory:
+            return self._memory[key]
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            payload = joblib.load(path)
+            entry = (payload["features"], payload["coverage_start"])
+        except Exception as e:
+            logger.warning(f"Failed to load feature matrix {key}: {e}")
+            return None
+
+        self._memory[key] = entry
+        return entry
+
+    def save(self, key: str, features: pd.DataFrame, coverage_start: datetime):
+        """
+        특징 행렬 저장 (메모리 + 디스크)
+
+        Args:
+            key: 저장소 키
+            features: 특징 데이터프레임 (timestamp 컬럼 포함)
+            coverage_start: 원본 캔들 수집 시작 시각
+        """
+        self._memory[key] = (features, coverage_start)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            joblib.dump(
+                {"features": features, "coverage_start": coverage_start},
+                tmp_path
+            )
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            # 디스크 저장 실패는 치명적이지 않음 (메모리 캐시는 유지)
+            logger.warning(f"Failed to persist feature matrix {key}: {e}")
+
+    def invalidate(self, key: str):
+        """특징 행렬 삭제"""
+        self._memory.pop(key, None)
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# 전역 특징 저장소
+feature_store = FeatureStore()
@@ -0,0 +1,209 @@
+"""
+LLM 분석 응답 캐시
+
+동일한 캔들에 대한 LLM 분석을 심볼/캔들 단위로 공유합니다.
+여러 사용자가 같은 심볼을 거래해도 캔들당 한 번만 LLM을 호출합니다.
+
+Features:
+- 키: (모델, 심볼, 캔들 간격, 마지막 마감 캔들, 선택적 입력 상태)
+- TTL: 현재 캔들 마감 시각까지
+- Single-flight: 동일 키의 동시 요청은 하나의 호출을 공유
+- 실패/폴백 응답은 캐시하지 않음
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 캔들 정보를 알 수 없을 때의 기본 TTL
+DEFAULT_TTL_SECONDS = 60.0
+
+# 캔들 마감 직전에도 최소한 유지할 TTL
+MIN_TTL_SECONDS = 5.0
+
+
+def candle_state(market_data: pd.DataFrame) -> Tuple[str, str, float]:
+    """
+    OHLCV 데이터에서 캔들 간격, 마지막 마감 캔들, TTL 추출
+
+    마지막 행은 진행 중인 캔들로 간주합니다. TTL은 그 캔들이
+    마감되는 시각까지이므로 새 캔들이 열리면 캐시가 자연히 만료됩니다.
+
+    Returns:
+        (캔들 간격 라벨, 마지막 마감 캔들 시각, TTL 초)
+    """
+    if 'timestamp' in market_data.columns:
+        timestamps = pd.to_datetime(market_data['timestamp'])
+    elif isinstance(market_data.index, pd.DatetimeIndex):
+        timestamps = market_data.index.to_series()
+    else:
+        return "na", "na", DEFAULT_TTL_SECONDS
+
+    if len(timestamps) < 2:
+        return "na", "na", DEFAULT_TTL_SECONDS
+
+    current_open = timestamps.iloc[-1]
+    last_closed = timestamps.iloc[-2]
+    step = (current_open - last_closed).total_seconds()
+    if step <= 0:
+        return "na", "na", DEFAULT_TTL_SECONDS
+
+    # 거래소 캔들 시각은 UTC 기준 (tz-naive)
+    current_open = pd.Timestamp(current_open)
+    if current_open.tzinfo is None:
+        current_open = current_open.tz_localize("UTC")
+    next_close = current_open.timestamp() + step
+
+    ttl = min(max(next_close - time.time(), MIN_TTL_SECONDS), step)
+
+    return f"{int(step)}s", pd.Timestamp(last_closed).isoformat(), ttl
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시 (TTL + LRU + single-flight)
+
+    호출은 호출자와 독립된 태스크에서 실행되므로, 한 호출자가
+    타임아웃으로 취소되어도 다른 대기자와 캐시는 결과를 받습니다.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0
+        }
+
+    @staticmethod
+    def make_key(
+        model: str,
+        symbol: str,
+        interval: str,
+        last_closed_candle: str,
+        state: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            model: LLM 모델 이름
+            symbol: 거래 심볼 (또는 분석 대상 식별자)
+            interval: 캔들 간격
+            last_closed_candle: 마지막 마감 캔들 시각
+            state: 캔들 외 입력 상태 (예: 분석 대상 코드 해시)
+        """
+        state_str = json.dumps(state or {}, sort_keys=True, default=str)
+        state_hash = hashlib.sha256(state_str.encode()).hexdigest()[:16]
+        return f"llm:{model}:{symbol}:{interval}:{last_closed_candle}:{state_hash}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """유효한 캐시 값 조회 (없으면 None)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if time.time() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        """캐시 값 저장"""
+        self._entries[key] = (value, time.time() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        should_cache: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        캐시 조회 후 없으면 계산 (동일 키 동시 요청은 하나로 병합)
+
+        Args:
+            key: 캐시 키
+            compute: LLM 호출 코루틴 팩토리
+            ttl: 캐시 유지 시간 (초)
+            should_cache: 결과 캐시 여부 판단 함수 (None이면 항상 캐시)
+
+        Returns:
+            LLM 분석 결과 (compute의 예외는 모든 대기자에게 전파)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(
+                functools.partial(self._on_done, key, ttl, should_cache)
+            )
+        else:
+            self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _on_done(
+        self,
+        key: str,
+        ttl: float,
+        should_cache: Optional[Callable[[Any], bool]],
+        task: asyncio.Future
+    ):
+        self._inflight.pop(key, None)
+
+        if task.cancelled():
+            return
+
+        error = task.exception()  # 대기자가 없어도 예외를 회수
+        if error is not None:
+            logger.warning(f"LLM request for {key} failed: {error}")
+            return
+
+        value = task.result()
+        if should_cache is None or should_cache(value):
+            self.set(key, value, ttl)
+
+    def clear(self):
+        """캐시 비우기"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_rate": round((self.stats["hits"] + self.stats["coalesced"]) / total * 100, 2) if total else 0
+        }
+
+
+# 전역 LLM 응답 캐시
+llm_cache = LLMResponseCache()
@@ -448,11 +448,8 @@ class SignalGenerator:
             preprocessor = LSTMDataPreprocessor()
             preprocessor.load_scalers(scaler_path)
 
-            # 데이터 변환
-            scaled_features, _ = preprocessor.transform(df)
-
-            # 시퀀스 생성
-            X_recent = scaled_features[-lookback_hours:]
+            # 데이터 변환 (최근 lookback_hours 행만)
+            X_recent = preprocessor.transform_features(df, tail=lookback_hours)
             X_recent = np.expand_dims(X_recent, axis=0)
 
             # 모델 로드 및 예측
@@ -466,7 +463,7 @@ class SignalGenerator:
             trainer.load_model(model_path)
 
             model.eval()
-            X_tensor = torch.FloatTensor(X_recent).to(device)
+            X_tensor = torch.from_numpy(X_recent).to(device)
 
             with torch.no_grad():
                 prediction_scaled = model(X_tensor).cpu().numpy()
@@ -557,27 +554,19 @@ class SignalGenerator:
         """Llama 3.1 전략 분석"""
         try:
             # ensemble.py의 get_ai_analysis 활용
-            strategy_name = "AI Signal Generator"
-            params = {
-                "symbol": symbol,
-                "lstm_prediction": lstm_result,
-                "technical_analysis": technical_result
-            }
-
-            # Historical data for context
-            recent_data = df.tail(24).to_dict('records')
+            # (LLM 응답은 llm_cache를 통해 캔들/시장 상태 단위로 공유됨)
+            current_price = float(df['close'].iloc[-1])
 
-            # AI 분석 요청
-            analysis = await get_ai_analysis(
-                strategy_name=strategy_name,
-                params=params,
-                historical_data=recent_data
+            decision = await get_ai_analysis(
+                symbol=symbol,
+                market_data=df,
+                current_price=current_price
             )
 
             return {
-                "analysis": analysis.get('analysis', ''),
-                "recommendation": analysis.get('recommendations', []),
-                "confidence": analysis.get('confidence', 0)
+                "analysis": decision.reasoning,
+                "recommendation": [decision.direction] if decision.should_enter else [],
+                "confidence": decision.confidence * 100
             }
 
         except Exception as e:
@@ -160,7 +160,7 @@ async def get_account_status(
         exchange_enum = Exchange(exchange.lower())
 
         # 계정 상태 조회
-        status = order_executor.get_account_status(
+        status = await order_executor.get_account_status(
             account_id=account_id,
             exchange=exchange_enum
         )
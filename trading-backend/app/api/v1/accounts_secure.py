@@ -26,6 +26,8 @@ from app.models.api_key import ApiKey
 from app.services.order_executor import order_executor, Exchange
 from app.services.binance_client import BinanceClient
 from app.services.okx_client import OKXClient
+from app.services.account_state import account_state
+from app.services.client_cache import client_cache
 
 logger = logging.getLogger(__name__)
 
@@ -131,7 +133,7 @@ async def register_exchange_account(
                     api_secret=account.api_secret,
                     testnet=account.testnet
                 )
-                validation_result = client.validate_credentials()
+                validation_result = await client.validate_credentials_async()
 
             elif exchange_lower == "okx":
                 # OKX API 키 검증
@@ -141,7 +143,7 @@ async def register_exchange_account(
                     passphrase=account.passphrase,
                     testnet=account.testnet
                 )
-                validation_result = client.validate_credentials()
+                validation_result = await client.validate_credentials_async()
 
             # 검증 실패 시
             if not validation_result.get("valid", False):
@@ -339,7 +341,7 @@ async def update_exchange_account(
                     api_secret=account.api_secret,
                     testnet=account.testnet
                 )
-                validation_result = client.validate_credentials()
+                validation_result = await client.validate_credentials_async()
 
             elif exchange_lower == "okx":
                 client = OKXClient(
@@ -348,7 +350,7 @@ async def update_exchange_account(
                     passphrase=account.passphrase,
                     testnet=account.testnet
                 )
-                validation_result = client.validate_credentials()
+                validation_result = await client.validate_credentials_async()
 
             if not validation_result.get("valid", False):
                 error_message = validation_result.get("message", "Invalid API credentials")
@@ -385,6 +387,9 @@ async def update_exchange_account(
         await db.commit()
         await db.refresh(api_key_record)
 
+        # 이전 자격증명으로 만든 클라이언트 폐기
+        client_cache.invalidate(account_id)
+
         # OrderExecutor 업데이트
         executor_account_id = f"{current_user.id}_{account_id}"
 
@@ -472,6 +477,7 @@ async def delete_exchange_account(
         # 데이터베이스에서 삭제
         await db.delete(api_key_record)
         await db.commit()
+        client_cache.invalidate(account_id)
 
         logger.info(f"Account deleted: {account_id}")
 
@@ -521,6 +527,7 @@ async def toggle_account_status(
         api_key_record.is_active = not api_key_record.is_active
         await db.commit()
         await db.refresh(api_key_record)
+        client_cache.invalidate(account_id)
 
         logger.info(f"Account {account_id} toggled to: {api_key_record.is_active}")
 
@@ -570,32 +577,14 @@ async def get_account_balance(
         if not api_key_record:
             raise HTTPException(status_code=404, detail="Account not found")
 
-        # API 키 복호화
-        decrypted = crypto_service.decrypt_api_credentials({
-            "api_key": api_key_record.api_key,
-            "api_secret": api_key_record.api_secret,
-            "passphrase": api_key_record.passphrase
-        })
-
-        # 거래소 클라이언트 생성 및 잔액 조회
-        if api_key_record.exchange == "binance":
-            client = BinanceClient(
-                api_key=decrypted["api_key"],
-                api_secret=decrypted["api_secret"],
-                testnet=api_key_record.testnet
-            )
-        elif api_key_record.exchange == "okx":
-            client = OKXClient(
-                api_key=decrypted["api_key"],
-                api_secret=decrypted["api_secret"],
-                passphrase=decrypted["passphrase"],
-                testnet=api_key_record.testnet
-            )
-        else:
+        # 거래소 클라이언트 (복호화된 자격증명 캐시)
+        try:
+            client = client_cache.get(api_key_record)
+        except ValueError:
             raise HTTPException(status_code=400, detail="Unsupported exchange")
 
         # 잔액 조회
-        balance = client.get_account_balance()
+        balance = await account_state.get_balance(client)
 
         return {
             "account_id": account_id,
@@ -645,32 +634,14 @@ async def get_account_positions(
         if not api_key_record:
             raise HTTPException(status_code=404, detail="Account not found")
 
-        # API 키 복호화
-        decrypted = crypto_service.decrypt_api_credentials({
-            "api_key": api_key_record.api_key,
-            "api_secret": api_key_record.api_secret,
-            "passphrase": api_key_record.passphrase
-        })
-
-        # 거래소 클라이언트 생성 및 포지션 조회
-        if api_key_record.exchange == "binance":
-            client = BinanceClient(
-                api_key=decrypted["api_key"],
-                api_secret=decrypted["api_secret"],
-                testnet=api_key_record.testnet
-            )
-        elif api_key_record.exchange == "okx":
-            client = OKXClient(
-                api_key=decrypted["api_key"],
-                api_secret=decrypted["api_secret"],
-                passphrase=decrypted["passphrase"],
-                testnet=api_key_record.testnet
-            )
-        else:
+        # 거래소 클라이언트 (복호화된 자격증명 캐시)
+        try:
+            client = client_cache.get(api_key_record)
+        except ValueError:
             raise HTTPException(status_code=400, detail="Unsupported exchange")
 
         # 포지션 조회
-        positions = client.get_positions(symbol=symbol)
+        positions = await account_state.get_positions(client, symbol=symbol)
 
         return {
             "account_id": account_id,
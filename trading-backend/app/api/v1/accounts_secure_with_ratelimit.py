@@ -243,7 +243,7 @@ async def get_account_balance(
             api_secret=decrypted["api_secret"],
             testnet=account.testnet
         )
-        return await client.get_account_balance()
+        return await client.get_account_balance_async()
 
     elif account.exchange == "okx":
         from app.services.okx_client import OKXClient
@@ -253,7 +253,7 @@ async def get_account_balance(
             passphrase=decrypted["passphrase"],
             testnet=account.testnet
         )
-        return await client.get_account_balance()
+        return await client.get_account_balance_async()
 
 
 @router.get("/{account_id}/positions")
@@ -295,7 +295,7 @@ async def get_account_positions(
             api_secret=decrypted["api_secret"],
             testnet=account.testnet
         )
-        return await client.get_positions()
+        return await client.get_positions_async()
 
     elif account.exchange == "okx":
         from app.services.okx_client import OKXClient
@@ -305,4 +305,4 @@ async def get_account_positions(
             passphrase=decrypted["passphrase"],
             testnet=account.testnet
         )
-        return await client.get_positions()
+        return await client.get_positions_async()
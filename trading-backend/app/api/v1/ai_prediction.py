@@ -375,11 +375,8 @@ async def predict_price(request: PredictionRequest):
         # 2. 전처리기 로드
         preprocessor = await load_preprocessor(request.symbol, request.interval)
 
-        # 3. 데이터 변환
-        scaled_features, scaled_target = preprocessor.transform(df)
-
-        # 최근 lookback_window 시간의 데이터
-        X_recent = scaled_features[-request.lookback_hours:]
+        # 3. 데이터 변환 (최근 lookback_hours 행만)
+        X_recent = preprocessor.transform_features(df, tail=request.lookback_hours)
         X_recent = np.expand_dims(X_recent, axis=0)  # (1, lookback, features)
 
         # 4. 모델 로드
@@ -393,7 +390,7 @@ async def predict_price(request: PredictionRequest):
         # 5. 예측
         model.eval()
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        X_tensor = torch.FloatTensor(X_recent).to(device)
+        X_tensor = torch.from_numpy(X_recent).to(device)
 
         with torch.no_grad():
             prediction_scaled = model(X_tensor).cpu().numpy()
@@ -356,6 +356,8 @@ async def get_websocket_stats():
         from app.services.websocket_pool import websocket_pool
         from app.services.websocket_reconnect import websocket_reconnector
         from app.services.websocket_manager import websocket_manager
+        from app.services.account_state import account_state
+        from app.services.position_stream import position_stream
 
         # 연결 풀 통계
         pool_stats = websocket_pool.get_pool_stats()
@@ -375,7 +377,10 @@ async def get_websocket_stats():
             "coordinator": coordinator_stats,
             "active_frontend_connections": len(websocket_manager.active_connections),
             "active_streams": len(websocket_manager.active_streams),
-            "subscribed_symbols": len(websocket_manager.subscribed_symbols)
+            "subscribed_symbols": len(websocket_manager.subscribed_symbols),
+            "fanout": websocket_manager.get_fanout_stats(),
+            "account_streams": account_state.get_stats(),
+            "position_stream": position_stream.get_stats()
         }
 
     except Exception as e:
@@ -5,7 +5,8 @@ Features:
 - 4개 코인 실시간 가격 조회
 - 24시간 통계 조회
 - 멀티 거래소 지원 (Binance, OKX)
-- Redis 캐싱으로 성능 최적화
+- WebSocket 기반 가격 장부에서 조회 (오래된 경우에만 REST 폴백)
+- 응답 캐시 만료 후에도 잠시 이전 값을 주면서 1회만 갱신 (stale-while-revalidate)
 """
 
 from fastapi import APIRouter, HTTPException, Depends
@@ -13,120 +14,72 @@ from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import logging
 
+from app.core.cache import cached
+from app.core.config import settings
 from app.core.symbols import symbol_config, SupportedSymbol
-from app.services.binance_client import BinanceClient
-from app.services.okx_client import OKXClient
-from app.core.redis_client import cached
+from app.services.price_book import price_book
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/market", tags=["market"])
 
 
-# 캐싱 헬퍼 함수들
-@cached(ttl=5, key_prefix="market:prices")
-async def _fetch_prices_cached(exchange: str, symbols_str: str):
-    """가격 조회 캐싱 (5초 TTL)"""
-    symbol_list = [s.strip().upper() for s in symbols_str.split(",")]
-    target_symbols = [SupportedSymbol(s) for s in symbol_list]
+def _exchange_symbol(exchange: str, symbol: SupportedSymbol) -> str:
+    if exchange == "binance":
+        return symbol_config.get_binance_symbol(symbol)
+    return symbol_config.get_okx_symbol(symbol)
 
-    prices = []
-    import time
-    current_timestamp = int(time.time() * 1000)
 
-    if exchange == "binance":
-        client = BinanceClient(api_key="", api_secret="", testnet=False)
-        for symbol in target_symbols:
-            try:
-                exchange_symbol = symbol_config.get_binance_symbol(symbol)
-                price = client.get_current_price(exchange_symbol)
-                prices.append({
-                    "symbol": symbol.value,
-                    "exchange": "binance",
-                    "price": price,
-                    "timestamp": current_timestamp
-                })
-            except Exception as e:
-                logger.error(f"Failed to get price for {symbol.value}: {str(e)}")
-                continue
-
-    elif exchange == "okx":
-        client = OKXClient(api_key="", api_secret="", passphrase="", testnet=False)
-        for symbol in target_symbols:
-            try:
-                exchange_symbol = symbol_config.get_okx_symbol(symbol)
-                price = client.get_current_price(exchange_symbol)
-                prices.append({
-                    "symbol": symbol.value,
-                    "exchange": "okx",
-                    "price": price,
-                    "timestamp": current_timestamp
-                })
-            except Exception as e:
-                logger.error(f"Failed to get price for {symbol.value}: {str(e)}")
-                continue
-
-    return prices
-
-
-@cached(ttl=60, key_prefix="market:24h_stats")
-async def _fetch_24h_stats_cached(exchange: str, symbols_str: str):
-    """24시간 통계 조회 캐싱 (60초 TTL)"""
+# 가격 장부 조회 헬퍼 함수들
+@cached(cache_type="market_data", ttl_seconds=settings.MARKET_CACHE_TTL, stale_ttl_seconds=settings.MARKET_CACHE_STALE_TTL)
+async def _fetch_tickers(exchange: str, symbols_str: str) -> List[Dict[str, Any]]:
+    """가격 장부에서 티커 조회 (오래된 경우 전체 티커 REST 1회로 갱신)"""
     symbol_list = [s.strip().upper() for s in symbols_str.split(",")]
     target_symbols = [SupportedSymbol(s) for s in symbol_list]
+    exchange_symbols = {symbol: _exchange_symbol(exchange, symbol) for symbol in target_symbols}
 
-    tickers = []
+    ticker_map = await price_book.get_tickers(exchange, list(exchange_symbols.values()))
 
-    if exchange == "binance":
-        client = BinanceClient(api_key="", api_secret="", testnet=False)
-        for symbol in target_symbols:
-            try:
-                exchange_symbol = symbol_config.get_binance_symbol(symbol)
-                ticker_data = client.get_24h_ticker(exchange_symbol)
-                tickers.append({
-                    "symbol": symbol.value,
-                    "exchange": "binance",
-                    **ticker_data
-                })
-            except Exception as e:
-                logger.error(f"Failed to get 24h ticker for {symbol.value}: {str(e)}")
-                continue
-
-    elif exchange == "okx":
-        client = OKXClient(api_key="", api_secret="", passphrase="", testnet=False)
-        for symbol in target_symbols:
-            try:
-                exchange_symbol = symbol_config.get_okx_symbol(symbol)
-                ticker_data = client.get_24h_ticker(exchange_symbol)
-                tickers.append({
-                    "symbol": symbol.value,
-                    "exchange": "okx",
-                    **ticker_data
-                })
-            except Exception as e:
-                logger.error(f"Failed to get 24h ticker for {symbol.value}: {str(e)}")
-                continue
+    tickers = []
+    for symbol, exchange_symbol in exchange_symbols.items():
+        ticker_data = ticker_map.get(exchange_symbol)
+        if ticker_data is None:
+            logger.error(f"Failed to get ticker for {symbol.value}: {exchange_symbol} not available")
+            continue
+
+        tickers.append({
+            **ticker_data,
+            "symbol": symbol.value,
+            "exchange": exchange
+        })
 
     return tickers
 
 
-@cached(ttl=3, key_prefix="market:price")
-async def _fetch_single_price_cached(symbol: str, exchange: str):
-    """단일 심볼 가격 조회 캐싱 (3초 TTL)"""
+async def _fetch_prices(exchange: str, symbols_str: str):
+    """가격 조회"""
     import time
     current_timestamp = int(time.time() * 1000)
 
-    std_symbol = SupportedSymbol(symbol)
+    return [
+        {
+            "symbol": ticker["symbol"],
+            "exchange": exchange,
+            "price": ticker["last_price"],
+            "timestamp": current_timestamp
+        }
+        for ticker in await _fetch_tickers(exchange, symbols_str)
+    ]
 
-    if exchange == "binance":
-        client = BinanceClient(api_key="", api_secret="", testnet=False)
-        exchange_symbol = symbol_config.get_binance_symbol(std_symbol)
-        price = client.get_current_price(exchange_symbol)
 
-    elif exchange == "okx":
-        client = OKXClient(api_key="", api_secret="", passphrase="", testnet=False)
-        exchange_symbol = symbol_config.get_okx_symbol(std_symbol)
-        price = client.get_current_price(exchange_symbol)
+@cached(cache_type="market_data", ttl_seconds=settings.MARKET_CACHE_TTL, stale_ttl_seconds=settings.MARKET_CACHE_STALE_TTL)
+async def _fetch_single_price(symbol: str, exchange: str):
+    """단일 심볼 가격 조회"""
+    import time
+    current_timestamp = int(time.time() * 1000)
+
+    std_symbol = SupportedSymbol(symbol)
+    price = await price_book.get_price_async(exchange, _exchange_symbol(exchange, std_symbol))
 
     return {
         "symbol": symbol,
@@ -178,7 +131,7 @@ async def get_multi_symbol_prices(
     symbols: Optional[str] = None
 ):
     """
-    4개 코인 실시간 가격 조회 (Redis 캐싱: 5초 TTL)
+    4개 코인 실시간 가격 조회 (가격 장부)
 
     **파라미터**:
     - exchange: 거래소 (binance, okx)
@@ -192,7 +145,7 @@ async def get_multi_symbol_prices(
     - GET /api/v1/market/prices?exchange=binance
     - GET /api/v1/market/prices?exchange=okx&symbols=BTC,ETH
 
-    **성능**: 캐싱으로 5초 내 동일 요청은 즉시 응답 (< 1ms)
+    **성능**: WebSocket으로 갱신되는 메모리 장부에서 응답 (거래소 호출 없음)
     """
     try:
         exchange_lower = exchange.lower()
@@ -218,8 +171,8 @@ async def get_multi_symbol_prices(
             # 전체 지원 심볼
             symbols_str = ",".join([s.value for s in symbol_config.SUPPORTED_SYMBOLS])
 
-        # 캐싱된 헬퍼 함수 호출
-        prices_data = await _fetch_prices_cached(exchange_lower, symbols_str)
+        # 가격 장부 조회
+        prices_data = await _fetch_prices(exchange_lower, symbols_str)
 
         # Pydantic 모델로 변환
         prices = [PriceData(**p) for p in prices_data]
@@ -245,7 +198,7 @@ async def get_24h_stats(
     symbols: Optional[str] = None
 ):
     """
-    4개 코인 24시간 통계 조회 (Redis 캐싱: 60초 TTL)
+    4개 코인 24시간 통계 조회 (가격 장부)
 
     **파라미터**:
     - exchange: 거래소 (binance, okx)
@@ -259,7 +212,7 @@ async def get_24h_stats(
     - GET /api/v1/market/24h-stats?exchange=binance
     - GET /api/v1/market/24h-stats?exchange=okx&symbols=BTC,ETH,SOL
 
-    **성능**: 캐싱으로 60초 내 동일 요청은 즉시 응답 (< 1ms)
+    **성능**: WebSocket으로 갱신되는 메모리 장부에서 응답 (거래소 호출 없음)
     """
     try:
         exchange_lower = exchange.lower()
@@ -285,8 +238,8 @@ async def get_24h_stats(
             # 전체 지원 심볼
             symbols_str = ",".join([s.value for s in symbol_config.SUPPORTED_SYMBOLS])
 
-        # 캐싱된 헬퍼 함수 호출
-        tickers_data = await _fetch_24h_stats_cached(exchange_lower, symbols_str)
+        # 가격 장부 조회
+        tickers_data = await _fetch_tickers(exchange_lower, symbols_str)
 
         # Pydantic 모델로 변환
         tickers = [TickerData(**t) for t in tickers_data]
@@ -312,7 +265,7 @@ async def get_single_price(
     exchange: str = "binance"
 ):
     """
-    단일 심볼 가격 조회 (Redis 캐싱: 3초 TTL)
+    단일 심볼 가격 조회 (가격 장부)
 
     **파라미터**:
     - symbol: 심볼 (BTC, ETH, SOL, ADA)
@@ -327,7 +280,7 @@ async def get_single_price(
     **예시**:
     - GET /api/v1/market/price/BTC?exchange=binance
 
-    **성능**: 캐싱으로 3초 내 동일 요청은 즉시 응답 (< 1ms)
+    **성능**: WebSocket으로 갱신되는 메모리 장부에서 응답 (거래소 호출 없음)
     """
     try:
         symbol_upper = symbol.upper()
@@ -349,8 +302,8 @@ async def get_single_price(
                 detail=f"Unsupported exchange: {exchange}"
             )
 
-        # 캐싱된 헬퍼 함수 호출
-        result = await _fetch_single_price_cached(symbol_upper, exchange_lower)
+        # 가격 장부 조회
+        result = await _fetch_single_price(symbol_upper, exchange_lower)
 
         return result
 
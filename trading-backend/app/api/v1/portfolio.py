@@ -9,6 +9,7 @@ Portfolio Management API
 - 청산 가격
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 from fastapi import APIRouter, HTTPException, Query, Depends
@@ -17,9 +18,7 @@ from sqlalchemy.orm import Session
 
 from app.database.session import get_db
 from app.models.api_key import ApiKey
-from app.core.crypto import crypto_service
-from app.services.binance_client import BinanceClient
-from app.services.okx_client import OKXClient
+from app.services.client_cache import client_cache
 from app.services.portfolio_analyzer import portfolio_analyzer
 
 logger = logging.getLogger(__name__)
@@ -126,32 +125,11 @@ async def get_all_positions(
             continue
 
         try:
-            # API 키 복호화
-            decrypted_creds = crypto_service.decrypt_api_credentials({
-                "api_key": account.api_key,
-                "api_secret": account.api_secret,
-                "passphrase": account.passphrase
-            })
-
-            # 거래소별 클라이언트 생성
-            if account.exchange.lower() == "binance":
-                client = BinanceClient(
-                    api_key=decrypted_creds["api_key"],
-                    api_secret=decrypted_creds["api_secret"],
-                    testnet=account.testnet
-                )
-            elif account.exchange.lower() == "okx":
-                client = OKXClient(
-                    api_key=decrypted_creds["api_key"],
-                    api_secret=decrypted_creds["api_secret"],
-                    passphrase=decrypted_creds["passphrase"],
-                    testnet=account.testnet
-                )
-            else:
-                continue
+            # 거래소 클라이언트 (복호화된 자격증명 캐시)
+            client = client_cache.get(account)
 
             # 포지션 조회
-            positions = client.get_positions()
+            positions = await client.get_positions_async()
 
             for pos in positions:
                 pos["account_id"] = account_id
@@ -227,8 +205,9 @@ async def get_risk_metrics(
         if not positions:
             raise HTTPException(status_code=404, detail="No positions found")
 
-        # VaR 계산
-        var_result = portfolio_analyzer.calculate_portfolio_var(
+        # VaR 계산 (수익률 캔들 수집이 필요할 수 있으므로 스레드에서 실행)
+        var_result = await asyncio.to_thread(
+            portfolio_analyzer.calculate_portfolio_var,
             positions,
             confidence_level=confidence_level
         )
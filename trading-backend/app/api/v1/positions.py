@@ -5,24 +5,28 @@ Features:
 - 멀티 심볼 포지션 조회
 - 포트폴리오 요약
 - 전체 포지션 일괄 청산
+- 계정/심볼 단위 동시 조회·청산 (요청당 동시성 제한, 도착 순서대로 집계)
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, TypeVar
 from pydantic import BaseModel
+import asyncio
 import logging
 
+from app.core.config import settings
 from app.core.symbols import symbol_config, SupportedSymbol
 from app.services.order_executor import order_executor, Exchange
-from app.services.binance_client import BinanceClient
-from app.services.okx_client import OKXClient
-from app.core.crypto import crypto_service
+from app.services.account_state import account_state
+from app.services.client_cache import client_cache
 from app.database.session import get_db
 from sqlalchemy.orm import Session
 from app.models.api_key import ApiKey
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 router = APIRouter(prefix="/positions", tags=["positions"])
 
 
@@ -63,6 +67,79 @@ class CloseAllResponse(BaseModel):
     results: List[Dict[str, Any]]
 
 
+class _FanOut:
+    """
+    요청 하나의 거래소 호출 동시성 제한
+
+    전체 동시 호출 수와 계정별 동시 호출 수를 함께 제한합니다.
+    (거래소 가중치 한도는 request_budget이 계정별 버킷으로 따로 관리)
+    """
+
+    def __init__(
+        self,
+        limit: int = settings.POSITIONS_FANOUT_CONCURRENCY,
+        per_account: int = settings.POSITIONS_ACCOUNT_CONCURRENCY
+    ):
+        self._total = asyncio.Semaphore(limit)
+        self._per_account_limit = per_account
+        self._accounts: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(self, account_id: str, factory: Callable[[], Awaitable[T]]) -> T:
+        account_limit = self._accounts.get(account_id)
+        if account_limit is None:
+            account_limit = self._accounts[account_id] = asyncio.Semaphore(self._per_account_limit)
+
+        async with account_limit, self._total:
+            return await factory()
+
+
+def _parse_symbols(symbols: Optional[str]) -> List[SupportedSymbol]:
+    """심볼 목록 결정 (미지정시 전체)"""
+    if not symbols:
+        return symbol_config.SUPPORTED_SYMBOLS
+
+    symbol_list = [s.strip().upper() for s in symbols.split(",")]
+    return [SupportedSymbol(s) for s in symbol_list if s in [sym.value for sym in symbol_config.SUPPORTED_SYMBOLS]]
+
+
+def _exchange_symbols(exchange: str, target_symbols: List[SupportedSymbol]) -> Dict[str, SupportedSymbol]:
+    """거래소 형식 심볼 → 표준 심볼"""
+    if exchange == "binance":
+        return {symbol_config.get_binance_symbol(symbol): symbol for symbol in target_symbols}
+    return {symbol_config.get_okx_symbol(symbol): symbol for symbol in target_symbols}
+
+
+def _load_accounts(db: Session, account_ids: Optional[str]) -> Tuple[List[Tuple[ApiKey, Any]], List[str]]:
+    """
+    대상 활성 계정 조회 (단일 쿼리) 및 거래소 클라이언트 준비
+
+    Returns:
+        ([(계정, 클라이언트)], 클라이언트 준비에 실패한 계정 ID 목록)
+    """
+    query = db.query(ApiKey).filter(ApiKey.is_active == True)
+    if account_ids:
+        target_account_ids = [aid.strip() for aid in account_ids.split(",")]
+        records = {acc.id: acc for acc in query.filter(ApiKey.id.in_(target_account_ids)).all()}
+        for account_id in target_account_ids:
+            if account_id not in records:
+                logger.warning(f"Account {account_id} not found or inactive")
+        accounts = [records[aid] for aid in target_account_ids if aid in records]
+    else:
+        accounts = query.all()
+
+    loaded = []
+    failed = []
+    for account in accounts:
+        # 거래소 클라이언트 (복호화된 자격증명 캐시)
+        try:
+            loaded.append((account, client_cache.get(account)))
+        except Exception as e:
+            logger.error(f"Failed to load client for {account.id}: {str(e)}")
+            failed.append(account.id)
+
+    return loaded, failed
+
+
 @router.get("/multi-symbol", response_model=MultiSymbolPositionsResponse)
 async def get_multi_symbol_positions(
     account_ids: Optional[str] = None,
@@ -72,6 +149,8 @@ async def get_multi_symbol_positions(
     """
     멀티 심볼 포지션 조회
 
+    계정별 포지션을 동시에 조회하고 도착하는 순서대로 집계합니다.
+
     **파라미터**:
     - account_ids: 계정 ID 목록 (쉼표 구분, 미지정시 전체)
     - symbols: 심볼 목록 (쉼표 구분, 미지정시 전체)
@@ -86,113 +165,54 @@ async def get_multi_symbol_positions(
     - GET /api/v1/positions/multi-symbol?symbols=BTC,ETH
     """
     try:
-        # 계정 ID 목록 결정
-        if account_ids:
-            target_account_ids = [aid.strip() for aid in account_ids.split(",")]
-        else:
-            # DB에서 모든 활성 계정 조회
-            all_accounts = db.query(ApiKey).filter(ApiKey.is_active == True).all()
-            target_account_ids = [acc.id for acc in all_accounts]
-
-        # 심볼 목록 결정
-        if symbols:
-            symbol_list = [s.strip().upper() for s in symbols.split(",")]
-            target_symbols = [SupportedSymbol(s) for s in symbol_list if s in [sym.value for sym in symbol_config.SUPPORTED_SYMBOLS]]
-        else:
-            target_symbols = symbol_config.SUPPORTED_SYMBOLS
+        accounts, _ = _load_accounts(db, account_ids)
+        target_symbols = _parse_symbols(symbols)
 
         all_positions = []
         total_unrealized_pnl = 0.0
         positions_by_symbol = {}
         positions_by_exchange = {}
 
-        # 각 계정별 포지션 조회
-        for account_id in target_account_ids:
-            # 계정 정보 조회
-            account = db.query(ApiKey).filter(ApiKey.id == account_id).first()
-            if not account or not account.is_active:
-                logger.warning(f"Account {account_id} not found or inactive")
-                continue
+        fan_out = _FanOut()
 
-            # API 키 복호화
+        async def fetch(account: ApiKey, client) -> Tuple[ApiKey, Optional[List[Dict[str, Any]]]]:
             try:
-                decrypted_creds = crypto_service.decrypt_api_credentials({
-                    "api_key": account.api_key,
-                    "api_secret": account.api_secret,
-                    "passphrase": account.passphrase
-                })
+                # 계정 전체 포지션 1회 조회 후 심볼 필터
+                positions = await fan_out.run(account.id, lambda: account_state.get_positions(client))
+                return account, positions
             except Exception as e:
-                logger.error(f"Failed to decrypt credentials for {account_id}: {str(e)}")
+                logger.error(f"Failed to get positions for {account.id}: {str(e)}")
+                return account, None
+
+        for completed in asyncio.as_completed([fetch(account, client) for account, client in accounts]):
+            account, positions = await completed
+            if positions is None:
                 continue
 
-            # 거래소별 클라이언트 생성
             exchange_lower = account.exchange.lower()
-
-            try:
-                if exchange_lower == "binance":
-                    client = BinanceClient(
-                        api_key=decrypted_creds["api_key"],
-                        api_secret=decrypted_creds["api_secret"],
-                        testnet=account.testnet
-                    )
-
-                    # 각 심볼별 포지션 조회
-                    for symbol in target_symbols:
-                        exchange_symbol = symbol_config.get_binance_symbol(symbol)
-                        positions = client.get_positions(exchange_symbol)
-
-                        for pos in positions:
-                            all_positions.append(PositionData(
-                                symbol=symbol.value,
-                                exchange="binance",
-                                account_id=account_id,
-                                position_amt=pos["position_amt"],
-                                entry_price=pos["entry_price"],
-                                unrealized_pnl=pos["unrealized_pnl"],
-                                leverage=pos["leverage"],
-                                side=pos["side"]
-                            ))
-
-                            total_unrealized_pnl += pos["unrealized_pnl"]
-
-                            # 집계
-                            positions_by_symbol[symbol.value] = positions_by_symbol.get(symbol.value, 0) + 1
-                            positions_by_exchange["binance"] = positions_by_exchange.get("binance", 0) + 1
-
-                elif exchange_lower == "okx":
-                    client = OKXClient(
-                        api_key=decrypted_creds["api_key"],
-                        api_secret=decrypted_creds["api_secret"],
-                        passphrase=decrypted_creds["passphrase"],
-                        testnet=account.testnet
-                    )
-
-                    # 각 심볼별 포지션 조회
-                    for symbol in target_symbols:
-                        exchange_symbol = symbol_config.get_okx_symbol(symbol)
-                        positions = client.get_positions(exchange_symbol)
-
-                        for pos in positions:
-                            all_positions.append(PositionData(
-                                symbol=symbol.value,
-                                exchange="okx",
-                                account_id=account_id,
-                                position_amt=pos["position_amt"],
-                                entry_price=pos["entry_price"],
-                                unrealized_pnl=pos["unrealized_pnl"],
-                                leverage=pos["leverage"],
-                                side=pos["side"]
-                            ))
-
-                            total_unrealized_pnl += pos["unrealized_pnl"]
-
-                            # 집계
-                            positions_by_symbol[symbol.value] = positions_by_symbol.get(symbol.value, 0) + 1
-                            positions_by_exchange["okx"] = positions_by_exchange.get("okx", 0) + 1
-
-            except Exception as e:
-                logger.error(f"Failed to get positions for {account_id}: {str(e)}")
-                continue
+            symbol_map = _exchange_symbols(exchange_lower, target_symbols)
+
+            for pos in positions:
+                symbol = symbol_map.get(pos["symbol"])
+                if symbol is None:
+                    continue
+
+                all_positions.append(PositionData(
+                    symbol=symbol.value,
+                    exchange=exchange_lower,
+                    account_id=account.id,
+                    position_amt=pos["position_amt"],
+                    entry_price=pos["entry_price"],
+                    unrealized_pnl=pos["unrealized_pnl"],
+                    leverage=pos["leverage"],
+                    side=pos["side"]
+                ))
+
+                total_unrealized_pnl += pos["unrealized_pnl"]
+
+                # 집계
+                positions_by_symbol[symbol.value] = positions_by_symbol.get(symbol.value, 0) + 1
+                positions_by_exchange[exchange_lower] = positions_by_exchange.get(exchange_lower, 0) + 1
 
         return MultiSymbolPositionsResponse(
             positions=all_positions,
@@ -220,6 +240,8 @@ async def get_portfolio_summary(
     """
     포트폴리오 요약 조회
 
+    계정별 잔액/포지션을 동시에 조회하고 도착하는 순서대로 집계합니다.
+
     **파라미터**:
     - account_ids: 계정 ID 목록 (쉼표 구분, 미지정시 전체)
 
@@ -235,13 +257,7 @@ async def get_portfolio_summary(
     - GET /api/v1/positions/summary
     """
     try:
-        # 계정 ID 목록 결정
-        if account_ids:
-            target_account_ids = [aid.strip() for aid in account_ids.split(",")]
-        else:
-            # DB에서 모든 활성 계정 조회
-            all_accounts = db.query(ApiKey).filter(ApiKey.is_active == True).all()
-            target_account_ids = [acc.id for acc in all_accounts]
+        accounts, _ = _load_accounts(db, account_ids)
 
         total_balance = 0.0
         total_unrealized_pnl = 0.0
@@ -250,107 +266,51 @@ async def get_portfolio_summary(
         positions_by_exchange = {}
         account_details = []
 
-        # 각 계정별 정보 수집
-        for account_id in target_account_ids:
-            # 계정 정보 조회
-            account = db.query(ApiKey).filter(ApiKey.id == account_id).first()
-            if not account or not account.is_active:
-                continue
+        fan_out = _FanOut()
 
-            # API 키 복호화
+        async def fetch(account: ApiKey, client):
             try:
-                decrypted_creds = crypto_service.decrypt_api_credentials({
-                    "api_key": account.api_key,
-                    "api_secret": account.api_secret,
-                    "passphrase": account.passphrase
-                })
+                # 잔액 / 포지션 동시 조회
+                balance_info, positions = await asyncio.gather(
+                    fan_out.run(account.id, lambda: account_state.get_balance(client)),
+                    fan_out.run(account.id, lambda: account_state.get_positions(client))
+                )
+                return account, balance_info, positions
             except Exception as e:
-                logger.error(f"Failed to decrypt credentials for {account_id}: {str(e)}")
+                logger.error(f"Failed to get summary for {account.id}: {str(e)}")
+                return account, None, None
+
+        for completed in asyncio.as_completed([fetch(account, client) for account, client in accounts]):
+            account, balance_info, positions = await completed
+            if positions is None:
                 continue
 
             exchange_lower = account.exchange.lower()
-
-            try:
-                if exchange_lower == "binance":
-                    client = BinanceClient(
-                        api_key=decrypted_creds["api_key"],
-                        api_secret=decrypted_creds["api_secret"],
-                        testnet=account.testnet
-                    )
-
-                    # 잔액 조회
-                    balance_info = client.get_account_balance()
-                    account_balance = balance_info["total_balance"]
-
-                    # 포지션 조회
-                    positions = client.get_positions()
-                    account_positions = len(positions)
-                    account_pnl = sum([pos["unrealized_pnl"] for pos in positions])
-
-                    # 집계
-                    total_balance += account_balance
-                    total_unrealized_pnl += account_pnl
-                    total_positions += account_positions
-
-                    for pos in positions:
-                        # 심볼 파싱
-                        std_symbol = symbol_config.parse_symbol(pos["symbol"], "binance")
-                        if std_symbol:
-                            positions_by_symbol[std_symbol.value] = positions_by_symbol.get(std_symbol.value, 0) + 1
-
-                    positions_by_exchange["binance"] = positions_by_exchange.get("binance", 0) + account_positions
-
-                    account_details.append({
-                        "account_id": account_id,
-                        "exchange": "binance",
-                        "balance": account_balance,
-                        "unrealized_pnl": account_pnl,
-                        "positions": account_positions,
-                        "testnet": account.testnet
-                    })
-
-                elif exchange_lower == "okx":
-                    client = OKXClient(
-                        api_key=decrypted_creds["api_key"],
-                        api_secret=decrypted_creds["api_secret"],
-                        passphrase=decrypted_creds["passphrase"],
-                        testnet=account.testnet
-                    )
-
-                    # 잔액 조회
-                    balance_info = client.get_account_balance()
-                    account_balance = balance_info["total_balance"]
-
-                    # 포지션 조회
-                    positions = client.get_positions()
-                    account_positions = len(positions)
-                    account_pnl = sum([pos["unrealized_pnl"] for pos in positions])
-
-                    # 집계
-                    total_balance += account_balance
-                    total_unrealized_pnl += account_pnl
-                    total_positions += account_positions
-
-                    for pos in positions:
-                        # 심볼 파싱
-                        std_symbol = symbol_config.parse_symbol(pos["symbol"], "okx")
-                        if std_symbol:
-                            positions_by_symbol[std_symbol.value] = positions_by_symbol.get(std_symbol.value, 0) + 1
-
-                    positions_by_exchange["okx"] = positions_by_exchange.get("okx", 0) + account_positions
-
-                    account_details.append({
-                        "account_id": account_id,
-                        "exchange": "okx",
-                        "balance": account_balance,
-                        "unrealized_pnl": account_pnl,
-                        "positions": account_positions,
-                        "testnet": account.testnet
-                    })
-
-            except Exception as e:
-                logger.error(f"Failed to get summary for {account_id}: {str(e)}")
-                continue
+            account_balance = balance_info["total_balance"]
+            account_positions = len(positions)
+            account_pnl = sum([pos["unrealized_pnl"] for pos in positions])
+
+            # 집계
+            total_balance += account_balance
+            total_unrealized_pnl += account_pnl
+            total_positions += account_positions
+
+            for pos in positions:
+                # 심볼 파싱
+                std_symbol = symbol_config.parse_symbol(pos["symbol"], exchange_lower)
+                if std_symbol:
+                    positions_by_symbol[std_symbol.value] = positions_by_symbol.get(std_symbol.value, 0) + 1
+
+            positions_by_exchange[exchange_lower] = positions_by_exchange.get(exchange_lower, 0) + account_positions
+
+            account_details.append({
+                "account_id": account.id,
+                "exchange": exchange_lower,
+                "balance": account_balance,
+                "unrealized_pnl": account_pnl,
+                "positions": account_positions,
+                "testnet": account.testnet
+            })
 
         return PortfolioSummary(
             total_balance=round(total_balance, 2),
@@ -380,6 +340,10 @@ async def close_all_symbols(
 
     **⚠️ 주의**: 이 작업은 되돌릴 수 없습니다!
 
+    계정 상태 캐시에서 열린 포지션을 확인한 뒤 모든 청산 주문을 동시에 전송합니다.
+    (포지션 재조회 없이 주문만 보내므로 전체가 주문 1회 왕복 시간에 끝남)
+    일부 실패해도 나머지 결과를 그대로 반환합니다.
+
     **파라미터**:
     - account_ids: 계정 ID 목록 (쉼표 구분, 미지정시 전체)
     - symbols: 심볼 목록 (쉼표 구분, 미지정시 전체)
@@ -395,142 +359,92 @@ async def close_all_symbols(
     - POST /api/v1/positions/close-all-symbols?symbols=BTC,ETH
     """
     try:
-        # 계정 ID 목록 결정
-        if account_ids:
-            target_account_ids = [aid.strip() for aid in account_ids.split(",")]
-        else:
-            # DB에서 모든 활성 계정 조회
-            all_accounts = db.query(ApiKey).filter(ApiKey.is_active == True).all()
-            target_account_ids = [acc.id for acc in all_accounts]
-
-        # 심볼 목록 결정
-        if symbols:
-            symbol_list = [s.strip().upper() for s in symbols.split(",")]
-            target_symbols = [SupportedSymbol(s) for s in symbol_list if s in [sym.value for sym in symbol_config.SUPPORTED_SYMBOLS]]
-        else:
-            target_symbols = symbol_config.SUPPORTED_SYMBOLS
+        accounts, failed_accounts = _load_accounts(db, account_ids)
+        target_symbols = _parse_symbols(symbols)
 
         closed_count = 0
-        failed_count = 0
-        results = []
+        failed_count = len(failed_accounts)
+        results = [
+            {
+                "account_id": account_id,
+                "success": False,
+                "error": "Decryption failed"
+            }
+            for account_id in failed_accounts
+        ]
 
-        # 각 계정별 포지션 청산
-        for account_id in target_account_ids:
-            # 계정 정보 조회
-            account = db.query(ApiKey).filter(ApiKey.id == account_id).first()
-            if not account or not account.is_active:
-                continue
+        fan_out = _FanOut()
 
-            # API 키 복호화
+        # 1. 계정별 열린 포지션 확인 (캐시, 콜드 계정만 REST 스냅샷)
+        async def fetch(account: ApiKey, client):
             try:
-                decrypted_creds = crypto_service.decrypt_api_credentials({
-                    "api_key": account.api_key,
-                    "api_secret": account.api_secret,
-                    "passphrase": account.passphrase
-                })
+                positions = await fan_out.run(account.id, lambda: account_state.get_positions(client))
+                return account, client, positions, None
+            except Exception as e:
+                logger.error(f"Failed to close positions for {account.id}: {str(e)}")
+                return account, client, None, str(e)
+
+        snapshots = await asyncio.gather(*(fetch(account, client) for account, client in accounts))
+
+        # 2. 청산 주문 동시 전송
+        async def close(account: ApiKey, client, symbol: SupportedSymbol, position: Dict[str, Any]) -> Dict[str, Any]:
+            exchange_lower = account.exchange.lower()
+            result = {
+                "account_id": account.id,
+                "exchange": exchange_lower,
+                "symbol": symbol.value
+            }
+            try:
+                if exchange_lower == "okx":
+                    order = await fan_out.run(account.id, lambda: client.close_position_async(
+                        position["symbol"], position_side=position["side"], position=position
+                    ))
+                else:
+                    order = await fan_out.run(account.id, lambda: client.close_position_async(
+                        position["symbol"], position=position
+                    ))
+                result["success"] = order["success"]
+                if not order["success"]:
+                    result["message"] = order["message"]
             except Exception as e:
-                logger.error(f"Failed to decrypt credentials for {account_id}: {str(e)}")
+                result["success"] = False
+                result["error"] = str(e)
+            return result
+
+        close_jobs = []
+        for account, client, positions, error in snapshots:
+            if positions is None:
                 failed_count += 1
                 results.append({
-                    "account_id": account_id,
+                    "account_id": account.id,
                     "success": False,
-                    "error": "Decryption failed"
+                    "error": error
                 })
                 continue
 
             exchange_lower = account.exchange.lower()
+            for exchange_symbol, symbol in _exchange_symbols(exchange_lower, target_symbols).items():
+                open_positions = [pos for pos in positions if pos["symbol"] == exchange_symbol]
+                if not open_positions:
+                    results.append({
+                        "account_id": account.id,
+                        "exchange": exchange_lower,
+                        "symbol": symbol.value,
+                        "success": False,
+                        "message": f"No open position for {exchange_symbol}"
+                    })
+                    continue
 
-            try:
-                if exchange_lower == "binance":
-                    client = BinanceClient(
-                        api_key=decrypted_creds["api_key"],
-                        api_secret=decrypted_creds["api_secret"],
-                        testnet=account.testnet
-                    )
-
-                    # 각 심볼별 포지션 청산
-                    for symbol in target_symbols:
-                        exchange_symbol = symbol_config.get_binance_symbol(symbol)
-
-                        try:
-                            result = client.close_position(exchange_symbol)
-
-                            if result["success"]:
-                                closed_count += 1
-                                results.append({
-                                    "account_id": account_id,
-                                    "exchange": "binance",
-                                    "symbol": symbol.value,
-                                    "success": True
-                                })
-                            else:
-                                results.append({
-                                    "account_id": account_id,
-                                    "exchange": "binance",
-                                    "symbol": symbol.value,
-                                    "success": False,
-                                    "message": result["message"]
-                                })
-                        except Exception as e:
-                            failed_count += 1
-                            results.append({
-                                "account_id": account_id,
-                                "exchange": "binance",
-                                "symbol": symbol.value,
-                                "success": False,
-                                "error": str(e)
-                            })
-
-                elif exchange_lower == "okx":
-                    client = OKXClient(
-                        api_key=decrypted_creds["api_key"],
-                        api_secret=decrypted_creds["api_secret"],
-                        passphrase=decrypted_creds["passphrase"],
-                        testnet=account.testnet
-                    )
-
-                    # 각 심볼별 포지션 청산
-                    for symbol in target_symbols:
-                        exchange_symbol = symbol_config.get_okx_symbol(symbol)
-
-                        try:
-                            result = client.close_position(exchange_symbol)
-
-                            if result["success"]:
-                                closed_count += 1
-                                results.append({
-                                    "account_id": account_id,
-                                    "exchange": "okx",
-                                    "symbol": symbol.value,
-                                    "success": True
-                                })
-                            else:
-                                results.append({
-                                    "account_id": account_id,
-                                    "exchange": "okx",
-                                    "symbol": symbol.value,
-                                    "success": False,
-                                    "message": result["message"]
-                                })
-                        except Exception as e:
-                            failed_count += 1
-                            results.append({
-                                "account_id": account_id,
-                                "exchange": "okx",
-                                "symbol": symbol.value,
-                                "success": False,
-                                "error": str(e)
-                            })
+                for position in open_positions:
+                    close_jobs.append(close(account, client, symbol, position))
 
-            except Exception as e:
-                logger.error(f"Failed to close positions for {account_id}: {str(e)}")
+        for completed in asyncio.as_completed(close_jobs):
+            result = await completed
+            if result["success"]:
+                closed_count += 1
+            elif "error" in result:
                 failed_count += 1
-                results.append({
-                    "account_id": account_id,
-                    "success": False,
-                    "error": str(e)
-                })
-                continue
+            results.append(result)
 
         return CloseAllResponse(
             success=(failed_count == 0),
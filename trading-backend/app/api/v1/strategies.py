@@ -13,10 +13,13 @@ from pydantic import BaseModel, Field
 from app.database.session import get_db
 from app.models.user import User
 from app.models.strategy import Strategy, StrategyConfig
-from app.workers.auto_trader import auto_trader_manager
+from app.workers.trader_shards import get_auto_trader_manager
 
 router = APIRouter(prefix="/strategies", tags=["strategies"])
 
+# In-process or sharded (multi-process) auto-trader manager
+auto_trader_manager = get_auto_trader_manager()
+
 
 # ===== Pydantic Models =====
 
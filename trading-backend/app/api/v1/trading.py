@@ -66,7 +66,9 @@ async def analyze_market(request: AnalyzeRequest):
                 "entry_price": decision.entry_price,
                 "stop_loss": decision.stop_loss,
                 "take_profit": decision.take_profit,
-                "reasoning": decision.reasoning
+                "reasoning": decision.reasoning,
+                "latency_ms": decision.latency_ms,
+                "degraded": decision.degraded
             },
             "ai_results": {
                 "ml": {
@@ -3,7 +3,7 @@ TradingView Webhook API
 
 Features:
 - TradingView 알림 수신
-- 시그널 검증 및 실행
+- 시그널 검증 및 실행 (중복 제거 + 계정/심볼 순서 보장 수집 큐)
 - 보안 검증 (Secret Key)
 - 실시간 주문 전송
 """
@@ -15,6 +15,7 @@ import logging
 import hmac
 import hashlib
 import re
+import time
 from datetime import datetime, timedelta
 
 from app.services.order_executor import order_executor, Exchange
@@ -22,8 +23,12 @@ from app.core.config import settings
 from app.services.telegram_service import telegram_service
 from app.api.v1.telegram import get_telegram_chat_id
 from app.core.symbols import symbol_config
+from app.core.background_queue import background_queue
+from app.core.metrics import webhook_tick_to_order_seconds, webhook_alert_to_order_seconds
+from app.services.webhook_queue import webhook_queue
 
 logger = logging.getLogger(__name__)
+audit_logger = logging.getLogger("audit.webhook")
 
 router = APIRouter(prefix="/webhook", tags=["webhook"])
 
@@ -113,13 +118,93 @@ def verify_webhook_secret(payload_secret: str, expected_secret: str) -> bool:
     return hmac.compare_digest(payload_secret, expected_secret)
 
 
+def _notify(account_id: str, method: str, **kwargs):
+    """텔레그램 알림 (백그라운드 큐에서 실행: 채팅 ID 조회 + 전송)"""
+    telegram_chat_id = get_telegram_chat_id(account_id)
+    if telegram_chat_id:
+        getattr(telegram_service, method)(chat_id=telegram_chat_id, **kwargs)
+
+
+def _audit(event: str, **fields):
+    """웹훅 감사 로그 (백그라운드 큐에서 실행)"""
+    audit_logger.info(f"{event}: {fields}")
+
+
+async def execute_webhook_signal(message: Dict[str, Any]):
+    """
+    큐에 들어온 웹훅 시그널 실행 (webhook_queue 파티션 태스크에서 호출)
+
+    주문을 먼저 보내고, 텔레그램 알림과 감사 로그는 백그라운드 큐로 넘깁니다.
+    """
+    account_id = message["account_id"]
+    signal = message["signal"]
+    context = {
+        "exchange": message["exchange"],
+        "action": signal["action"],
+        "symbol": signal["symbol"]
+    }
+
+    try:
+        result = await order_executor.execute_signal_async(
+            account_id=account_id,
+            exchange=Exchange(message["exchange"]),
+            signal=signal
+        )
+    except Exception as e:
+        logger.error(f"Webhook execution failed: {str(e)}", exc_info=True)
+        webhook_tick_to_order_seconds.labels(message["exchange"], signal["action"], "failed").observe(
+            time.time() - message["received_at"]
+        )
+
+        # 텔레그램 알림: 주문 실행 실패
+        background_queue.submit(
+            _notify, account_id, "send_error_notification",
+            error_type="주문 실행 실패",
+            error_message=str(e),
+            context=context
+        )
+        background_queue.submit(
+            _audit, "Order execution failed",
+            account_id=account_id, signal_id=message["signal_id"], error=str(e), **context
+        )
+        raise
+
+    # 수신 시각 기준 (큐 대기 포함)
+    latency = time.time() - message["received_at"]
+    webhook_tick_to_order_seconds.labels(message["exchange"], signal["action"], "success").observe(latency)
+    if message.get("alert_timestamp"):
+        webhook_alert_to_order_seconds.labels(message["exchange"], signal["action"]).observe(
+            max(0.0, time.time() - message["alert_timestamp"])
+        )
+
+    # 텔레그램 알림: Webhook 수신 + 주문 실행 성공, 감사 로그
+    background_queue.submit(
+        _notify, account_id, "send_webhook_received_notification",
+        success=True, **context
+    )
+    background_queue.submit(
+        _notify, account_id, "send_order_notification",
+        price=signal.get("price") or result.get("price"),
+        quantity=signal.get("quantity") or result.get("quantity"),
+        leverage=signal.get("leverage"),
+        order_id=result.get("orderId") or result.get("order_id"),
+        **context
+    )
+    background_queue.submit(
+        _audit, "Order executed successfully",
+        account_id=account_id, signal_id=message["signal_id"],
+        latency_ms=round(latency * 1000, 1), result=result
+    )
+    return result
+
+
 @router.post("/tradingview", response_model=WebhookResponse)
 async def receive_tradingview_webhook(
     webhook: TradingViewWebhook,
     request: Request
 ):
     """
-    TradingView 웹훅 수신 및 주문 실행
+    TradingView 웹훅 수신 및 주문 등록
 
     TradingView에서 알림 발생 시 이 엔드포인트로 POST 요청이 전송됩니다.
 
@@ -141,124 +226,89 @@ async def receive_tradingview_webhook(
     **자동 기능:**
     - 수량 미지정 시 계좌의 10% 자동 사용
     - Stop Loss/Take Profit 자동 설정
-    """
-    # 텔레그램 채팅 ID 조회
-    telegram_chat_id = get_telegram_chat_id(webhook.account_id)
 
-    try:
-        logger.info(
-            f"Webhook received: account={webhook.account_id}, "
-            f"exchange={webhook.exchange}, action={webhook.action}, symbol={webhook.symbol}"
-        )
+    **처리 방식:**
+    검증 후 수집 큐에 등록하고 바로 응답합니다 (order_details.signal_id).
+    같은 알림이 윈도우 내에 다시 오면 무시되고, 같은 계정/심볼의 시그널은 도착 순서대로 실행됩니다.
+    주문 결과는 텔레그램 알림과 감사 로그로 전달됩니다.
+    """
+    logger.info(
+        f"Webhook received: account={webhook.account_id}, "
+        f"exchange={webhook.exchange}, action={webhook.action}, symbol={webhook.symbol}"
+    )
 
-        # 텔레그램 알림: Webhook 수신
-        if telegram_chat_id:
-            telegram_service.send_webhook_received_notification(
-                chat_id=telegram_chat_id,
-                exchange=webhook.exchange,
-                action=webhook.action,
-                symbol=webhook.symbol,
-                success=True
-            )
+    # 1. Secret 검증 (환경변수에서 읽어옴)
+    if not verify_webhook_secret(webhook.secret, settings.WEBHOOK_SECRET):
+        logger.warning(f"Invalid webhook secret from {request.client.host}")
 
-        # 1. Secret 검증 (환경변수에서 읽어옴)
-        if not verify_webhook_secret(webhook.secret, settings.WEBHOOK_SECRET):
-            logger.warning(f"Invalid webhook secret from {request.client.host}")
-
-            # 텔레그램 알림: Secret 검증 실패
-            if telegram_chat_id:
-                telegram_service.send_error_notification(
-                    chat_id=telegram_chat_id,
-                    error_type="Webhook Secret 검증 실패",
-                    error_message="Invalid webhook secret",
-                    context={"ip": request.client.host}
-                )
-
-            raise HTTPException(status_code=401, detail="Invalid webhook secret")
-
-        # 2. Exchange 검증
-        try:
-            exchange = Exchange(webhook.exchange.lower())
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid exchange: {webhook.exchange}. Must be 'binance' or 'okx'"
-            )
-
-        # 3. 시그널 구성
-        signal = {
-            "action": webhook.action.lower(),
-            "symbol": webhook.symbol.upper(),
-            "price": webhook.price,
-            "quantity": webhook.quantity,
-            "leverage": webhook.leverage,
-            "stop_loss": webhook.stop_loss,
-            "take_profit": webhook.take_profit
-        }
-
-        # 4. 주문 실행
-        result = order_executor.execute_signal(
-            account_id=webhook.account_id,
-            exchange=exchange,
-            signal=signal
+        # 텔레그램 알림: Secret 검증 실패
+        background_queue.submit(
+            _notify, webhook.account_id, "send_error_notification",
+            error_type="Webhook Secret 검증 실패",
+            error_message="Invalid webhook secret",
+            context={"ip": request.client.host}
         )
 
-        logger.info(f"Order executed successfully: {result}")
-
-        # 텔레그램 알림: 주문 실행 성공
-        if telegram_chat_id:
-            telegram_service.send_order_notification(
-                chat_id=telegram_chat_id,
-                exchange=webhook.exchange,
-                action=webhook.action,
-                symbol=webhook.symbol,
-                price=webhook.price or result.get("price"),
-                quantity=webhook.quantity or result.get("quantity"),
-                leverage=webhook.leverage,
-                order_id=result.get("orderId") or result.get("order_id")
-            )
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
 
-        return WebhookResponse(
-            success=True,
-            message=f"{webhook.action.upper()} order executed on {webhook.exchange}",
-            order_details=result
+    # 2. Exchange / 계정 검증
+    try:
+        exchange = Exchange(webhook.exchange.lower())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid exchange: {webhook.exchange}. Must be 'binance' or 'okx'"
         )
 
-    except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+    # 시그널은 파티션을 소유한 워커에서 실행되므로 DB 계정(자격증명 조회 가능) 여부를 확인
+    clients = order_executor.binance_clients if exchange == Exchange.BINANCE else order_executor.okx_clients
+    stored_account = await order_executor.load_account(webhook.account_id, exchange)
+    if stored_account is None and webhook.account_id not in clients:
+        logger.error(f"Validation error: {exchange.value} account not found: {webhook.account_id}")
 
         # 텔레그램 알림: 검증 에러
-        if telegram_chat_id:
-            telegram_service.send_error_notification(
-                chat_id=telegram_chat_id,
-                error_type="입력 검증 실패",
-                error_message=str(e),
-                context={
-                    "exchange": webhook.exchange,
-                    "action": webhook.action,
-                    "symbol": webhook.symbol
-                }
-            )
+        background_queue.submit(
+            _notify, webhook.account_id, "send_error_notification",
+            error_type="입력 검증 실패",
+            error_message=f"{exchange.value} account not found",
+            context={"exchange": webhook.exchange, "action": webhook.action, "symbol": webhook.symbol}
+        )
 
-        raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=400, detail=f"{exchange.value} account not found: {webhook.account_id}")
+
+    # 3. 시그널 구성
+    signal = {
+        "action": webhook.action.lower(),
+        "symbol": webhook.symbol.upper(),
+        "price": webhook.price,
+        "quantity": webhook.quantity,
+        "leverage": webhook.leverage,
+        "stop_loss": webhook.stop_loss,
+        "take_profit": webhook.take_profit
+    }
 
-    except Exception as e:
-        logger.error(f"Webhook execution failed: {str(e)}", exc_info=True)
+    # 4. 수집 큐 등록 (중복 제거 + 계정/심볼 순서 보장)
+    signal_id, accepted = await webhook_queue.submit(
+        account_id=webhook.account_id,
+        exchange=exchange.value,
+        signal=signal,
+        alert_timestamp=webhook.timestamp,
+        # 이 프로세스 메모리에만 등록된 계정은 다른 워커가 실행할 수 없으므로 여기서 실행
+        local=stored_account is None
+    )
 
-        # 텔레그램 알림: 주문 실행 실패
-        if telegram_chat_id:
-            telegram_service.send_error_notification(
-                chat_id=telegram_chat_id,
-                error_type="주문 실행 실패",
-                error_message=str(e),
-                context={
-                    "exchange": webhook.exchange,
-                    "action": webhook.action,
-                    "symbol": webhook.symbol
-                }
-            )
+    if not accepted:
+        return WebhookResponse(
+            success=True,
+            message=f"Duplicate {webhook.action.upper()} alert ignored",
+            order_details={"signal_id": signal_id, "status": "duplicate"}
+        )
 
-        raise HTTPException(status_code=500, detail=f"Order execution failed: {str(e)}")
+    return WebhookResponse(
+        success=True,
+        message=f"{webhook.action.upper()} order queued on {webhook.exchange}",
+        order_details={"signal_id": signal_id, "status": "queued"}
+    )
 
 
 @router.get("/health")
@@ -270,5 +320,7 @@ async def webhook_health():
         "registered_accounts": {
             "binance": len(order_executor.binance_clients),
             "okx": len(order_executor.okx_clients)
-        }
+        },
+        "ingestion_queue": webhook_queue.get_stats(),
+        "background_queue": background_queue.get_stats()
     }
@@ -1,6 +1,15 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from typing import Any, List, Optional, Tuple
+from app.core.auth import get_current_user, get_user_by_token_sync
+from app.database.base import AsyncSessionLocal, SessionLocal, is_sqlite
+from app.models.api_key import ApiKey
+from app.services.client_cache import client_cache
+from app.services.position_stream import position_stream
 from app.services.websocket_manager import websocket_manager
-from app.core.config import settings
+from app.services.websocket_fanout import DeliverySpec
+import asyncio
 import logging
 import json
 
@@ -10,29 +19,32 @@ router = APIRouter()
 
 
 @router.websocket("/market")
-async def websocket_market_endpoint(websocket: WebSocket):
+async def websocket_market_endpoint(
+    websocket: WebSocket,
+    policy: Optional[str] = None,
+    encoding: Optional[str] = None
+):
     """
     WebSocket endpoint for real-time market data
 
+    Only streams the client subscribed to are delivered.
+
     Client can send commands:
     - {"action": "subscribe_ticker", "symbol": "BTCUSDT"}
     - {"action": "subscribe_kline", "symbol": "BTCUSDT", "interval": "1m"}
     - {"action": "subscribe_trades", "symbol": "BTCUSDT"}
     - {"action": "unsubscribe", "stream": "ticker_BTCUSDT"}
-    """
-    await websocket_manager.connect(websocket)
 
-    # Initialize Binance client if not already done
-    if not websocket_manager.binance_client:
-        try:
-            await websocket_manager.initialize_binance_client(
-                api_key=settings.BINANCE_API_KEY,
-                api_secret=settings.BINANCE_API_SECRET
-            )
-        except Exception as e:
-            logger.error(f"Failed to initialize Binance client: {e}")
-            await websocket.close(code=1011, reason="Failed to connect to Binance")
-            return
+    Subscribe actions accept an optional delivery mode:
+    - {"mode": "every"} (default): every exchange update
+    - {"mode": "conflate", "rate": 4}: latest value at most N times per second
+    - {"mode": "batch", "interval_ms": 250}: {"type": "batch", "stream", "data": [...]} per interval
+
+    Query parameters:
+    - policy: slow-consumer policy (drop, conflate, disconnect)
+    - encoding: json (text frames, default) or msgpack (binary frames)
+    """
+    await websocket_manager.connect(websocket, policy=policy, encoding=encoding)
 
     try:
         while True:
@@ -43,46 +55,59 @@ async def websocket_market_endpoint(websocket: WebSocket):
             action = message.get("action")
             symbol = message.get("symbol")
 
+            if action in ("subscribe_ticker", "subscribe_kline", "subscribe_trades"):
+                try:
+                    delivery = DeliverySpec.from_request(message)
+                except ValueError as e:
+                    await websocket_manager.send(websocket, {"error": str(e)})
+                    continue
+
             if action == "subscribe_ticker" and symbol:
                 await websocket_manager.subscribe_ticker(symbol)
-                await websocket.send_json({
+                await websocket_manager.subscribe_client(websocket, f"ticker_{symbol}", delivery)
+                await websocket_manager.send(websocket, {
                     "status": "subscribed",
                     "type": "ticker",
-                    "symbol": symbol
+                    "symbol": symbol,
+                    "delivery": delivery.describe()
                 })
 
             elif action == "subscribe_kline" and symbol:
                 interval = message.get("interval", "1m")
                 await websocket_manager.subscribe_kline(symbol, interval)
-                await websocket.send_json({
+                await websocket_manager.subscribe_client(websocket, f"kline_{symbol}_{interval}", delivery)
+                await websocket_manager.send(websocket, {
                     "status": "subscribed",
                     "type": "kline",
                     "symbol": symbol,
-                    "interval": interval
+                    "interval": interval,
+                    "delivery": delivery.describe()
                 })
 
             elif action == "subscribe_trades" and symbol:
                 await websocket_manager.subscribe_trades(symbol)
-                await websocket.send_json({
+                await websocket_manager.subscribe_client(websocket, f"trades_{symbol}", delivery)
+                await websocket_manager.send(websocket, {
                     "status": "subscribed",
                     "type": "trades",
-                    "symbol": symbol
+                    "symbol": symbol,
+                    "delivery": delivery.describe()
                 })
 
             elif action == "unsubscribe":
                 stream_key = message.get("stream")
                 if stream_key:
-                    await websocket_manager.unsubscribe(stream_key)
-                    await websocket.send_json({
+                    await websocket_manager.unsubscribe_client(websocket, stream_key)
+                    await websocket_manager.send(websocket, {
                         "status": "unsubscribed",
                         "stream": stream_key
                     })
 
             elif action == "ping":
-                await websocket.send_json({"type": "pong"})
+                await websocket_manager.send(websocket, {"type": "pong"})
 
             else:
-                await websocket.send_json({
+                await websocket_manager.send(websocket, {
                     "error": "Invalid action or missing parameters"
                 })
 
@@ -95,32 +120,151 @@ async def websocket_market_endpoint(websocket: WebSocket):
         websocket_manager.disconnect(websocket)
 
 
+async def _load_position_accounts(token: Optional[str]) -> Optional[Tuple[str, List[Tuple[str, Any]]]]:
+    """
+    Authenticate a position stream client and load its active exchange accounts
+
+    SQLite sessions are synchronous, so they run in a thread to keep the event loop free.
+
+    Returns:
+        (user_id, [(account_id, exchange client)]) or None if authentication fails
+
+    Raises:
+        Exception: database errors (the caller closes the socket with 1011)
+    """
+    if not token:
+        return None
+
+    def accounts_query(user_id: str):
+        return select(ApiKey).where(ApiKey.user_id == user_id, ApiKey.is_active == True)
+
+    if is_sqlite:
+        def query():
+            db = SessionLocal()
+            try:
+                user = get_user_by_token_sync(db, token)
+                if user is None:
+                    return None, []
+                return user.id, db.execute(accounts_query(user.id)).scalars().all()
+            finally:
+                db.close()
+
+        user_id, records = await asyncio.to_thread(query)
+        if user_id is None:
+            return None
+    else:
+        async with AsyncSessionLocal() as db:
+            try:
+                user = await get_current_user(
+                    HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+                    db
+                )
+            except HTTPException:
+                return None
+
+            user_id = user.id
+            result = await db.execute(accounts_query(user_id))
+            records = result.scalars().all()
+
+    accounts = []
+    for record in records:
+        try:
+            accounts.append((record.id, client_cache.get(record)))
+        except Exception as e:
+            logger.warning(f"Position stream skipped account {record.id}: {e}")
+
+    return user_id, accounts
+
+
 @router.websocket("/positions")
-async def websocket_positions_endpoint(websocket: WebSocket):
+async def websocket_positions_endpoint(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    policy: Optional[str] = None,
+    encoding: Optional[str] = None
+):
     """
     WebSocket endpoint for real-time position updates
 
-    Streams:
-    - Position P&L changes
-    - Liquidation price updates
-    - Margin updates
+    Position metrics are computed server-side from the price stream and the
+    accounts' private streams; only positions whose symbol ticked or whose
+    account changed are recomputed and pushed.
+
+    Messages:
+    - {"type": "positions_snapshot", "positions": [...]} on connect and on request
+    - {"type": "positions_delta", "updates": [...], "removed": [ids], "open": [ids]}
+
+    Each position carries unrealized_pnl, roe, margin, margin_ratio,
+    liquidation_price and liquidation_distance.
+
+    Client can send commands:
+    - {"action": "snapshot"}: resend the full snapshot
+    - {"action": "subscribe", "mode": "conflate", "rate": 2}: change delivery mode
+    - {"action": "ping"}
+
+    Query parameters:
+    - token: JWT or session token (same as the Authorization header)
+    - policy: slow-consumer policy (drop, conflate, disconnect)
+    - encoding: json (text frames, default) or msgpack (binary frames)
     """
-    await websocket.accept()
+    try:
+        loaded = await _load_position_accounts(token)
+    except Exception as e:
+        logger.error(f"Position WebSocket account lookup failed: {e}")
+        await websocket.close(code=1011)
+        return
+
+    if loaded is None:
+        await websocket.close(code=1008)
+        return
+
+    user_id, accounts = loaded
+    topic = position_stream.topic(user_id)
+    await websocket_manager.connect(websocket, policy=policy, encoding=encoding)
 
     try:
-        # TODO: Implement position monitoring
-        # For now, send a placeholder message
-        await websocket.send_json({
-            "type": "positions",
-            "message": "Position monitoring will be implemented"
-        })
+        await websocket_manager.subscribe_client(websocket, topic)
+        await position_stream.watch(user_id, accounts)
+        await websocket_manager.send(websocket, position_stream.snapshot(user_id))
 
         while True:
             data = await websocket.receive_text()
-            # Handle position-related commands
+            message = json.loads(data)
+            action = message.get("action")
+
+            if action == "snapshot":
+                await websocket_manager.send(websocket, position_stream.snapshot(user_id))
+
+            elif action == "subscribe":
+                try:
+                    delivery = DeliverySpec.from_request(message)
+                except ValueError as e:
+                    await websocket_manager.send(websocket, {"error": str(e)})
+                    continue
+
+                await websocket_manager.subscribe_client(websocket, topic, delivery)
+                await websocket_manager.send(websocket, {
+                    "status": "subscribed",
+                    "type": "positions",
+                    "delivery": delivery.describe()
+                })
+
+            elif action == "ping":
+                await websocket_manager.send(websocket, {"type": "pong"})
+
+            else:
+                await websocket_manager.send(websocket, {
+                    "error": "Invalid action or missing parameters"
+                })
 
     except WebSocketDisconnect:
+        websocket_manager.disconnect(websocket)
         logger.info("Position WebSocket client disconnected")
 
     except Exception as e:
         logger.error(f"Position WebSocket error: {e}")
+        websocket_manager.disconnect(websocket)
+
+    finally:
+        # Release symbol / account indexes now instead of waiting for a later flush
+        position_stream.unwatch(user_id)
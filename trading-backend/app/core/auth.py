@@ -186,3 +186,31 @@ async def get_optional_user(
         return None
     except Exception:
         return None
+
+
+def get_user_by_token_sync(db, token: str) -> Optional[User]:
+    """
+    동기 세션용 토큰 인증 (SQLite 동기 세션을 스레드에서 사용할 때)
+
+    get_current_user와 같은 순서로 JWT → NextAuth 세션 토큰을 확인합니다.
+
+    Args:
+        db: 동기 데이터베이스 세션
+        token: JWT 또는 세션 토큰
+
+    Returns:
+        User 객체 또는 None (인증 실패)
+    """
+    try:
+        user_id = verify_jwt_token(token).get("sub")
+    except HTTPException:
+        session = db.execute(
+            select(UserSession).where(UserSession.session_token == token)
+        ).scalar_one_or_none()
+        if not session or session.expires < datetime.utcnow():
+            return None
+        user_id = session.user_id
+
+    if not user_id:
+        return None
+    return db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
@@ -0,0 +1,140 @@
+"""
+백그라운드 작업 큐
+
+응답 경로에서 기다릴 필요가 없는 부수 작업(텔레그램 알림, 감사 로그 등)을
+제한된 크기의 asyncio 큐에 넣고 워커가 나중에 처리합니다.
+
+Usage:
+    background_queue.submit(telegram_service.send_order_notification, chat_id=..., ...)
+
+Features:
+- submit()은 블로킹하지 않음 (큐가 가득 차면 버리고 로그)
+- 동기 함수는 스레드에서 실행 (requests, 동기 DB 세션이 이벤트 루프를 막지 않음)
+- 코루틴 함수는 워커 루프에서 직접 await
+- 종료 시 남은 작업 드레인 (제한 시간 내)
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundQueue:
+    """제한 크기 백그라운드 작업 큐"""
+
+    def __init__(self, name: str, maxsize: int = 1000, workers: int = 2):
+        self.name = name
+        self.maxsize = maxsize
+        self.num_workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """워커 시작"""
+        if self.running:
+            return
+
+        self._spawn_workers()
+        logger.info(f"Background queue '{self.name}' started ({self.num_workers} workers)")
+
+    def _spawn_workers(self):
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """남은 작업을 제한 시간 내 처리한 뒤 워커 종료"""
+        if not self.running:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Background queue '{self.name}' stopped with {self._queue.qsize()} pending jobs"
+            )
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        작업 등록 (블로킹하지 않음)
+
+        워커가 아직 시작되지 않았다면 현재 루프에서 시작합니다.
+
+        Returns:
+            등록 여부 (큐가 가득 찼거나 실행 중인 루프가 없으면 False)
+        """
+        if not self.running:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                logger.warning(f"Background queue '{self.name}' has no running loop, dropping {func.__name__}")
+                self.stats["dropped"] += 1
+                return False
+            self._spawn_workers()
+
+        job: Tuple[Callable[..., Any], tuple, dict] = (func, args, kwargs)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"Background queue '{self.name}' full, dropping {func.__name__}")
+            return False
+
+        self.stats["submitted"] += 1
+        return True
+
+    async def _worker(self):
+        queue = self._queue
+        while True:
+            func, args, kwargs = await queue.get()
+            try:
+                if asyncio.iscoroutinefunction(func):
+                    await func(*args, **kwargs)
+                else:
+                    await asyncio.to_thread(func, *args, **kwargs)
+                self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Background job {func.__name__} failed: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐 통계"""
+        return {
+            **self.stats,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers)
+        }
+
+
+# 전역 백그라운드 큐 (알림, 감사 로그)
+background_queue = BackgroundQueue(
+    "notifications",
+    maxsize=settings.BACKGROUND_QUEUE_SIZE,
+    workers=settings.BACKGROUND_QUEUE_WORKERS
+)
@@ -7,6 +7,7 @@ Features:
 - LRU cache with size limits
 - Cache invalidation strategies
 - Performance metrics tracking
+- Single-flight misses and stale-while-revalidate
 """
 
 import time
@@ -17,15 +18,19 @@ from functools import wraps
 from collections import OrderedDict
 from datetime import datetime, timedelta
 import asyncio
+import threading
+
+from app.core.single_flight import single_flight
 
 
 class CacheEntry:
     """Cache entry with metadata"""
 
-    def __init__(self, value: Any, ttl_seconds: int = 300):
+    def __init__(self, value: Any, ttl_seconds: int = 300, stale_seconds: int = 0):
         self.value = value
         self.created_at = time.time()
         self.expires_at = time.time() + ttl_seconds
+        self.stale_until = self.expires_at + stale_seconds
         self.hit_count = 0
         self.last_accessed = time.time()
 
@@ -33,6 +38,10 @@ class CacheEntry:
         """Check if cache entry is expired"""
         return time.time() > self.expires_at
 
+    def is_servable(self) -> bool:
+        """Check if cache entry can still be served (fresh or within stale window)"""
+        return time.time() <= self.stale_until
+
     def is_valid(self) -> bool:
         """Check if cache entry is still valid"""
         return not self.is_expired()
@@ -53,6 +62,7 @@ class LRUCache:
         self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self.stats = {
             "hits": 0,
+            "stale_hits": 0,
             "misses": 0,
             "evictions": 0,
             "size": 0
@@ -78,7 +88,28 @@ class LRUCache:
 
         return entry.access()
 
-    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get entry that is fresh or still within its stale window
+
+        Callers check entry.is_expired() to decide whether to revalidate.
+        """
+        entry = self.cache.get(key)
+
+        if entry is None or not entry.is_servable():
+            if entry is not None:
+                self.cache.pop(key)
+                self.stats["size"] = len(self.cache)
+            self.stats["misses"] += 1
+            return None
+
+        self.cache.move_to_end(key)
+        self.stats["hits"] += 1
+        if entry.is_expired():
+            self.stats["stale_hits"] += 1
+
+        return entry
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None, stale_seconds: int = 0):
         """Set value in cache"""
         ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl
 
@@ -87,7 +118,7 @@ class LRUCache:
             self.cache.pop(key)
 
         # Add new entry
-        self.cache[key] = CacheEntry(value, ttl)
+        self.cache[key] = CacheEntry(value, ttl, stale_seconds)
 
         # Evict oldest if over max size
         if len(self.cache) > self.max_size:
@@ -117,7 +148,7 @@ class LRUCache:
 
     def cleanup_expired(self):
         """Remove all expired entries"""
-        expired_keys = [k for k, v in self.cache.items() if v.is_expired()]
+        expired_keys = [k for k, v in self.cache.items() if not v.is_servable()]
         for key in expired_keys:
             self.cache.pop(key)
         self.stats["size"] = len(self.cache)
@@ -272,12 +303,25 @@ class CacheManager:
 cache_manager = CacheManager()
 
 
-def cached(cache_type: str = "backtest", ttl_seconds: Optional[int] = None):
+# Striped locks for sync cached functions (single-flight across threads, bounded memory)
+_sync_locks: List[threading.Lock] = [threading.Lock() for _ in range(64)]
+
+
+def _sync_lock_for(key: str) -> threading.Lock:
+    return _sync_locks[hash(key) % len(_sync_locks)]
+
+
+def cached(cache_type: str = "backtest", ttl_seconds: Optional[int] = None, stale_ttl_seconds: int = 0):
     """Decorator for caching function results
 
+    Concurrent misses for the same key run the function once and share the result.
+    With stale_ttl_seconds, an expired entry is still served for that long while a
+    single background call refreshes it (stale-while-revalidate).
+
     Args:
         cache_type: Type of cache to use (backtest, market_data, strategy, preset, pine_script)
         ttl_seconds: Time to live in seconds (overrides cache default)
+        stale_ttl_seconds: How long an expired entry may be served while revalidating (async only)
 
     Example:
         @cached(cache_type="backtest", ttl_seconds=1800)
@@ -290,26 +334,33 @@ def cached(cache_type: str = "backtest", ttl_seconds: Optional[int] = None):
         async def async_wrapper(*args, **kwargs):
             # Generate cache key
             cache_key = cache_manager.generate_cache_key(func.__name__, *args, **kwargs)
+            flight_key = ("cache", cache_type, cache_key)
 
             # Get appropriate cache
             cache = cache_manager.get_cache(cache_type)
 
+            async def refresh():
+                result = await func(*args, **kwargs)
+                cache.set(cache_key, result, ttl_seconds, stale_seconds=stale_ttl_seconds)
+                return result
+
             # Try to get from cache
             start_time = time.time()
-            cached_result = cache.get(cache_key)
+            entry = cache.get_entry(cache_key)
+
+            if entry is not None:
+                # Stale entry - serve it and revalidate once in the background
+                if entry.is_expired():
+                    single_flight.refresh_in_background(flight_key, refresh)
 
-            if cached_result is not None:
                 duration_ms = (time.time() - start_time) * 1000
                 cache_manager.record_performance(func.__name__, duration_ms, cache_hit=True)
-                return cached_result
+                return entry.access()
 
-            # Cache miss - execute function
-            result = await func(*args, **kwargs)
+            # Cache miss - execute function once for all concurrent callers
+            result = await single_flight.do(flight_key, refresh)
             duration_ms = (time.time() - start_time) * 1000
 
-            # Store in cache
-            cache.set(cache_key, result, ttl_seconds)
-
             cache_manager.record_performance(func.__name__, duration_ms, cache_hit=False)
 
             return result
@@ -331,12 +382,20 @@ def cached(cache_type: str = "backtest", ttl_seconds: Optional[int] = None):
                 cache_manager.record_performance(func.__name__, duration_ms, cache_hit=True)
                 return cached_result
 
-            # Cache miss - execute function
-            result = func(*args, **kwargs)
-            duration_ms = (time.time() - start_time) * 1000
+            with _sync_lock_for(cache_key):
+                # Another thread may have filled the cache while we waited
+                cached_result = cache.get(cache_key)
+                if cached_result is not None:
+                    duration_ms = (time.time() - start_time) * 1000
+                    cache_manager.record_performance(func.__name__, duration_ms, cache_hit=True)
+                    return cached_result
+
+                # Cache miss - execute function
+                result = func(*args, **kwargs)
+                duration_ms = (time.time() - start_time) * 1000
 
-            # Store in cache
-            cache.set(cache_key, result, ttl_seconds)
+                # Store in cache
+                cache.set(cache_key, result, ttl_seconds)
 
             cache_manager.record_performance(func.__name__, duration_ms, cache_hit=False)
 
@@ -44,9 +44,87 @@ class Settings(BaseSettings):
     OKX_PASSPHRASE: str = ""
     OKX_TESTNET: bool = True
 
+    # Exchange HTTP Pool
+    EXCHANGE_HTTP_MAX_CONNECTIONS: int = 100
+    EXCHANGE_HTTP_MAX_KEEPALIVE: int = 20
+    EXCHANGE_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    EXCHANGE_HTTP_TIMEOUT: float = 10.0  # seconds
+    EXCHANGE_HTTP2: bool = True  # Used only when the h2 package is installed
+
+    # Exchange Request Budget (shared across workers via Redis)
+    EXCHANGE_BUDGET_ENABLED: bool = True
+    EXCHANGE_BUDGET_SAFETY_MARGIN: float = 0.9  # Fraction of published limits to use
+    EXCHANGE_BUDGET_MAX_WAIT: float = 30.0  # seconds before raising RateLimitError
+
+    # Price Book (websocket-fed last price / 24h stats)
+    PRICE_BOOK_ENABLED: bool = True
+    PRICE_BOOK_MAX_AGE: float = 5.0  # seconds before falling back to REST
+    PRICE_BOOK_TESTNET_MARKS: bool = True  # also stream testnet mark prices for testnet accounts
+    MARKET_CACHE_TTL: int = 1  # seconds a /market response is reused
+    MARKET_CACHE_STALE_TTL: int = 10  # seconds an expired response is served while one call refreshes it
+
+    # Order Book Mirror (L2 depth for slippage estimates)
+    ORDER_BOOK_ENABLED: bool = True
+    ORDER_BOOK_DEPTH_LIMIT: int = 1000  # levels in the REST snapshot
+    ORDER_BOOK_MAX_SLIPPAGE_BPS: float = 20.0  # cap auto-sized orders to this slippage
+
+    # Frontend WebSocket Fan-out
+    WS_CLIENT_QUEUE_SIZE: int = 256  # pending messages per client before the slow-consumer policy applies
+    WS_SLOW_CONSUMER_POLICY: str = "conflate"  # drop | conflate | disconnect
+    WS_SEND_TIMEOUT: float = 5.0  # seconds for a single send before the client is dropped
+    WS_DEFAULT_CONFLATE_HZ: float = 4.0  # "conflate" subscriptions without an explicit rate
+    WS_DEFAULT_BATCH_MS: float = 250.0  # "batch" subscriptions without an explicit interval
+    WS_MIN_DELIVERY_INTERVAL: float = 0.05  # upper bound of 20 frames/s per subscription
+
+    # Exchange WebSocket Pool (combined-stream multiplexing)
+    WS_POOL_MAX_CONNECTIONS: int = 5  # per exchange
+    WS_POOL_BINANCE_MAX_STREAMS: int = 200  # Binance allows up to 1024 streams per connection
+    WS_POOL_OKX_MAX_STREAMS: int = 100
+    WS_POOL_RECYCLE_AFTER: int = 23 * 3600  # seconds; Binance drops connections at 24h
+
+    # Background Queue (notifications / audit off the order path)
+    BACKGROUND_QUEUE_SIZE: int = 1000  # pending jobs before new ones are dropped
+    BACKGROUND_QUEUE_WORKERS: int = 4  # concurrent jobs (sync jobs run in threads)
+
+    # Webhook Ingestion Queue (dedup + per-account/symbol ordering)
+    WEBHOOK_QUEUE_BACKEND: str = "redis"  # redis | memory
+    WEBHOOK_QUEUE_PARTITIONS: int = 64  # max signals executing in parallel
+    WEBHOOK_DEDUP_WINDOW: int = 60  # seconds; identical alerts inside the window are dropped
+
+    # Account State Cache (private-stream fed balance / positions)
+    ACCOUNT_STATE_MAX_AGE: float = 5.0  # seconds to trust memory while the private stream is down
+    ACCOUNT_STATE_RECONCILE_INTERVAL: float = 300.0  # seconds between REST reconciliations
+    ACCOUNT_STATE_IDLE_TIMEOUT: float = 900.0  # close streams of accounts not read for this long
+
+    # Exchange Client Cache (decrypted credentials, in-process memory only)
+    CLIENT_CACHE_TTL: float = 900.0  # seconds before credentials are decrypted again
+    CLIENT_CACHE_MAX_SIZE: int = 1000  # accounts kept per process
+
+    # Position Stream (/ws/positions PnL deltas)
+    POSITION_STREAM_INTERVAL: float = 0.25  # seconds between delta flushes
+
+    # Position Endpoints Fan-out (multi-account queries / close-all)
+    POSITIONS_FANOUT_CONCURRENCY: int = 32  # concurrent exchange calls per request
+    POSITIONS_ACCOUNT_CONCURRENCY: int = 8  # per account; weight limits are enforced by the request budget
+
+    # Risk Monitor (periodic scan + tick-driven liquidation alerts)
+    RISK_MONITOR_CONCURRENCY: int = 50  # accounts scanned in parallel
+    RISK_MONITOR_EXCHANGE_CONCURRENCY: int = 20  # per exchange; weight limits are enforced by the request budget
+    RISK_MONITOR_EVENT_DRIVEN: bool = True  # re-check liquidation distance on every price tick
+
+    # Portfolio VaR Engine (returns from the candle / feature store)
+    VAR_RETURNS_INTERVAL: str = "1d"  # candle interval; one interval = one horizon unit
+    VAR_LOOKBACK_DAYS: int = 365  # rolling returns window
+    VAR_RETURNS_TTL: float = 3600.0  # seconds before per-symbol returns are refreshed
+    VAR_MIN_OVERLAP: float = 0.8  # symbols with less history than this share of the longest are left uncovered
+    VAR_MONTE_CARLO_SIMULATIONS: int = 10000  # scenarios shared by every account in a batch
+    VAR_DEFAULT_METHOD: str = "historical"  # historical | parametric | monte_carlo
+
     # AI APIs
     OPENAI_API_KEY: str
     ANTHROPIC_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None  # Override for proxies / local stub servers
+    ANTHROPIC_BASE_URL: Optional[str] = None
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
@@ -70,11 +148,21 @@ class Settings(BaseSettings):
     LLAMA_WEIGHT: float = 0.25
     TA_WEIGHT: float = 0.10
 
+    # AI Ensemble Per-Component Deadlines (seconds)
+    ML_TIMEOUT: float = 5.0
+    GPT4_TIMEOUT: float = 10.0
+    LLAMA_TIMEOUT: float = 10.0
+    TA_TIMEOUT: float = 5.0
+
     # Entry/Exit Thresholds
     MIN_PROBABILITY: float = 0.80
     MIN_CONFIDENCE: float = 0.70
     MIN_AGREEMENT: float = 0.70
 
+    # Auto-Trading Workers
+    AUTO_TRADER_SHARDING: bool = False  # Host auto-traders in shard worker processes
+    AUTO_TRADER_WORKERS: int = 0  # Worker processes spawned by the API (0 = external workers only)
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
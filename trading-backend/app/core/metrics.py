@@ -0,0 +1,36 @@
+"""
+애플리케이션 Prometheus 메트릭
+
+main.py를 임포트하지 않고 서비스/라우터에서 직접 기록할 수 있도록 정의합니다.
+핫 리로드로 모듈이 다시 로드되면 이미 등록된 컬렉터를 재사용합니다.
+"""
+
+from prometheus_client import Histogram, REGISTRY
+
+# 주문 경로 지연은 수십 ms ~ 수 초 구간을 세밀하게 봅니다
+ORDER_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0)
+
+
+def _histogram(name: str, documentation: str, labelnames, buckets) -> Histogram:
+    """Histogram 생성 (이미 등록돼 있으면 기존 컬렉터 반환)"""
+    try:
+        return Histogram(name, documentation, labelnames, buckets=buckets)
+    except ValueError:
+        return REGISTRY._names_to_collectors[name]
+
+
+# 웹훅 수신 → 거래소 주문 응답
+webhook_tick_to_order_seconds = _histogram(
+    "webhook_tick_to_order_seconds",
+    "Time from TradingView webhook receipt to exchange order acknowledgement",
+    ["exchange", "action", "status"],
+    ORDER_LATENCY_BUCKETS
+)
+
+# 알림 타임스탬프(페이로드) → 거래소 주문 응답 (초 단위 타임스탬프라 해상도 1초)
+webhook_alert_to_order_seconds = _histogram(
+    "webhook_alert_to_order_seconds",
+    "Time from the alert timestamp in the webhook payload to exchange order acknowledgement",
+    ["exchange", "action"],
+    ORDER_LATENCY_BUCKETS
+)
@@ -0,0 +1,621 @@
+"""
+거래소 요청 가중치 예산 관리 (Request-Weight Budgeter)
+
+Binance/OKX의 IP·계정별 요청 한도를 모든 클라이언트와 워커 프로세스가 공유하는
+토큰 버킷으로 관리합니다. 429를 받은 뒤 대응하는 대신 요청 전에 예산을 확보합니다.
+
+Features:
+- 엔드포인트 클래스별 토큰 버킷 (Redis Lua 스크립트로 프로세스 간 원자적 공유)
+- Binance X-MBX-USED-WEIGHT-1M 헤더로 버킷 보정
+- 429/418 응답 시 Retry-After 동안 버킷 차단
+- 우선순위: 주문 > 계좌 조회 > 시장 데이터
+  (낮은 우선순위는 버킷 일부를 예비분으로 남겨야 하므로 주문이 항상 선점)
+- Redis 장애 시 프로세스 로컬 버킷으로 폴백
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.api_wrapper import RateLimitError
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """요청 우선순위 (값이 작을수록 우선)"""
+    ORDER = 0  # 주문 생성/취소, 레버리지 변경
+    ACCOUNT = 1  # 잔고/포지션 조회
+    MARKET_DATA = 2  # 시세, 캔들, 호가 스냅샷
+
+
+# 우선순위별 예비분 비율: 요청 후에도 버킷에 남아 있어야 하는 토큰 비율
+PRIORITY_RESERVE = {
+    RequestPriority.ORDER: 0.0,
+    RequestPriority.ACCOUNT: 0.10,
+    RequestPriority.MARKET_DATA: 0.25,
+}
+
+
+@dataclass(frozen=True)
+class BucketSpec:
+    """토큰 버킷 사양 (window 초 동안 capacity 토큰)"""
+    capacity: int
+    window: float
+    per_account: bool = False
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.window
+
+
+# 거래소 공개 한도
+# - Binance USDS-M: IP당 REQUEST_WEIGHT 2400/분, 계정당 주문 300/10초
+# - OKX: 엔드포인트별 한도 (공개 API는 IP, 비공개 API는 계정 기준)
+BUCKETS: Dict[Tuple[str, str], BucketSpec] = {
+    ("binance", "weight"): BucketSpec(capacity=2400, window=60),
+    ("binance", "orders"): BucketSpec(capacity=300, window=10, per_account=True),
+    ("okx", "/api/v5/trade/order"): BucketSpec(capacity=60, window=2, per_account=True),
+    ("okx", "/api/v5/trade/cancel-order"): BucketSpec(capacity=60, window=2, per_account=True),
+    ("okx", "/api/v5/trade/close-position"): BucketSpec(capacity=20, window=2, per_account=True),
+    ("okx", "/api/v5/account/set-leverage"): BucketSpec(capacity=20, window=2, per_account=True),
+    ("okx", "/api/v5/account/balance"): BucketSpec(capacity=10, window=2, per_account=True),
+    ("okx", "/api/v5/account/positions"): BucketSpec(capacity=10, window=2, per_account=True),
+    ("okx", "/api/v5/market/ticker"): BucketSpec(capacity=20, window=2),
+    ("okx", "/api/v5/market/tickers"): BucketSpec(capacity=20, window=2),
+    ("okx", "default"): BucketSpec(capacity=10, window=2, per_account=True),
+}
+
+BINANCE_ORDER_PATHS = {"/fapi/v1/order", "/fapi/v1/batchOrders", "/fapi/v1/allOpenOrders", "/fapi/v1/leverage"}
+
+# python-binance Client 메서드 → (HTTP 메서드, 경로)
+BINANCE_CLIENT_ENDPOINTS = {
+    "futures_account": ("GET", "/fapi/v2/account"),
+    "futures_klines": ("GET", "/fapi/v1/klines"),
+    "futures_historical_klines": ("GET", "/fapi/v1/klines"),
+    "futures_symbol_ticker": ("GET", "/fapi/v1/ticker/price"),
+    "futures_position_information": ("GET", "/fapi/v2/positionRisk"),
+    "futures_get_open_orders": ("GET", "/fapi/v1/openOrders"),
+    "futures_create_order": ("POST", "/fapi/v1/order"),
+    "futures_change_leverage": ("POST", "/fapi/v1/leverage"),
+}
+
+# KEYS[1]=버킷 키 / ARGV: capacity, rate(토큰/초), cost, reserve
+# 반환: 0 이면 획득, 양수면 재시도까지 대기 ms
+_ACQUIRE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local blocked = tonumber(state[3]) or 0
+if blocked > now then
+  return blocked - now
+end
+tokens = math.min(capacity, tokens + (now - ts) / 1000 * rate)
+local wait = 0
+if tokens - cost >= reserve then
+  tokens = tokens - cost
+else
+  wait = math.ceil((cost + reserve - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 60000)
+return wait
+"""
+
+# KEYS[1]=버킷 키 / ARGV: capacity, rate, remaining(거래소 기준 남은 토큰), block_ms
+_SYNC_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local remaining = tonumber(ARGV[3])
+local block_ms = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) / 1000 * rate)
+if remaining >= 0 then
+  tokens = math.min(tokens, remaining)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+if block_ms > 0 then
+  redis.call('HSET', KEYS[1], 'blocked_until', now + block_ms)
+end
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 60000)
+return 0
+"""
+
+
+def binance_request_weight(method: str, path: str, params: Optional[Mapping[str, Any]] = None) -> int:
+    """Binance USDS-M 엔드포인트 요청 가중치"""
+    params = params or {}
+    has_symbol = "symbol" in params
+
+    if path == "/fapi/v1/depth":
+        limit = int(params.get("limit", 500))
+        return 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+    if path == "/fapi/v1/klines":
+        limit = int(params.get("limit", 500))
+        return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    if path == "/fapi/v1/ticker/24hr":
+        return 1 if has_symbol else 40
+    if path == "/fapi/v1/ticker/price":
+        return 1 if has_symbol else 2
+    if path == "/fapi/v1/openOrders":
+        return 1 if has_symbol else 40
+    if path in ("/fapi/v2/balance", "/fapi/v2/account", "/fapi/v2/positionRisk"):
+        return 5
+    return 1
+
+
+def account_key(api_key: Optional[str]) -> str:
+    """계정 식별자 (API 키 원문은 Redis에 저장하지 않음)"""
+    if not api_key:
+        return "public"
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class _LocalBucket:
+    """Redis 장애 시 사용하는 프로세스 로컬 토큰 버킷"""
+
+    def __init__(self, spec: BucketSpec):
+        self.spec = spec
+        self.tokens = float(spec.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.spec.capacity, self.tokens + (now - self.updated) * self.spec.rate)
+        self.updated = now
+
+    def try_acquire(self, cost: float, reserve: float) -> float:
+        """획득 시 0, 실패 시 대기 초"""
+        with self._lock:
+            now = time.monotonic()
+            if self.blocked_until > now:
+                return self.blocked_until - now
+
+            self._refill(now)
+            if self.tokens - cost >= reserve:
+                self.tokens -= cost
+                return 0.0
+            return (cost + reserve - self.tokens) / self.spec.rate
+
+    def sync(self, remaining: Optional[float], block: float):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+            if block > 0:
+                self.blocked_until = now + block
+
+
+class RequestBudget:
+    """
+    거래소 요청 예산 관리자
+
+    모든 거래소 호출은 요청 전에 acquire*()로 예산을 확보하고,
+    응답 후 observe*()로 거래소가 알려준 사용량을 반영합니다.
+    """
+
+    def __init__(self, key_prefix: str = "exchange_budget", safety_margin: float = 0.9):
+        """
+        Args:
+            key_prefix: Redis 키 접두사
+            safety_margin: 공개 한도 중 실제 사용할 비율
+        """
+        self.key_prefix = key_prefix
+        self.safety_margin = safety_margin
+        self.enabled = True
+
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._async_scripts: Dict[asyncio.AbstractEventLoop, Tuple[Any, Any]] = {}
+        self._sync_client = None
+        self._sync_scripts: Optional[Tuple[Any, Any]] = None
+        self._redis_failed_at = 0.0
+        self._local: Dict[str, _LocalBucket] = {}
+
+        # 프로세스 내 우선순위 대기열: {버킷 키: {우선순위: 대기 수}}
+        self._waiting: Dict[str, Dict[int, int]] = {}
+
+        self.stats = {
+            "acquired": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "rate_limited": 0,
+            "redis_fallbacks": 0
+        }
+
+    # ===== 버킷 =====
+
+    def _spec(self, exchange: str, bucket: str) -> BucketSpec:
+        spec = BUCKETS.get((exchange, bucket)) or BUCKETS.get((exchange, "default"))
+        if spec is None:
+            raise ValueError(f"Unknown budget bucket: {exchange}/{bucket}")
+        return BucketSpec(
+            capacity=max(1, int(spec.capacity * self.safety_margin)),
+            window=spec.window,
+            per_account=spec.per_account
+        )
+
+    def _key(self, exchange: str, bucket: str, spec: BucketSpec, account: Optional[str]) -> str:
+        key = f"{self.key_prefix}:{exchange}:{bucket}"
+        if spec.per_account:
+            key += f":{account_key(account)}"
+        return key
+
+    @staticmethod
+    def _cost_and_reserve(spec: BucketSpec, cost: float, priority: RequestPriority) -> Tuple[float, float]:
+        cost = min(float(cost), float(spec.capacity))
+        reserve = min(spec.capacity * PRIORITY_RESERVE[priority], spec.capacity - cost)
+        return cost, reserve
+
+    def _local_bucket(self, key: str, spec: BucketSpec) -> _LocalBucket:
+        if key not in self._local:
+            self._local[key] = _LocalBucket(spec)
+        return self._local[key]
+
+    def _redis_available(self) -> bool:
+        # 장애 후 30초 동안은 로컬 버킷 사용
+        return time.monotonic() - self._redis_failed_at > 30
+
+    def _on_redis_error(self, e: Exception):
+        if self._redis_available():
+            logger.warning(f"Request budget falling back to local buckets: {e}")
+        self._redis_failed_at = time.monotonic()
+        self.stats["redis_fallbacks"] += 1
+
+    async def _get_async_scripts(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_scripts:
+            client = aioredis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=2)
+            self._async_clients[loop] = client
+            self._async_scripts[loop] = (
+                client.register_script(_ACQUIRE_SCRIPT),
+                client.register_script(_SYNC_SCRIPT)
+            )
+        return self._async_scripts[loop]
+
+    def _get_sync_scripts(self):
+        if self._sync_scripts is None:
+            self._sync_client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=2)
+            self._sync_scripts = (
+                self._sync_client.register_script(_ACQUIRE_SCRIPT),
+                self._sync_client.register_script(_SYNC_SCRIPT)
+            )
+        return self._sync_scripts
+
+    # ===== 획득 =====
+
+    async def _try_acquire(self, key: str, spec: BucketSpec, cost: float, reserve: float) -> float:
+        if self._redis_available():
+            try:
+                acquire_script, _ = await self._get_async_scripts()
+                wait_ms = await acquire_script(keys=[key], args=[spec.capacity, spec.rate, cost, reserve])
+                return int(wait_ms) / 1000
+            except Exception as e:
+                self._on_redis_error(e)
+        return self._local_bucket(key, spec).try_acquire(cost, reserve)
+
+    def _try_acquire_sync(self, key: str, spec: BucketSpec, cost: float, reserve: float) -> float:
+        if self._redis_available():
+            try:
+                acquire_script, _ = self._get_sync_scripts()
+                wait_ms = acquire_script(keys=[key], args=[spec.capacity, spec.rate, cost, reserve])
+                return int(wait_ms) / 1000
+            except Exception as e:
+                self._on_redis_error(e)
+        return self._local_bucket(key, spec).try_acquire(cost, reserve)
+
+    def _has_priority_waiters(self, key: str, priority: RequestPriority) -> bool:
+        waiting = self._waiting.get(key, {})
+        return any(count > 0 for p, count in waiting.items() if p < priority)
+
+    def _enter(self, key: str, priority: RequestPriority):
+        self._waiting.setdefault(key, {}).setdefault(priority, 0)
+        self._waiting[key][priority] += 1
+
+    def _leave(self, key: str, priority: RequestPriority):
+        self._waiting[key][priority] -= 1
+
+    async def acquire(
+        self,
+        exchange: str,
+        bucket: str,
+        cost: float = 1,
+        priority: RequestPriority = RequestPriority.MARKET_DATA,
+        account: Optional[str] = None,
+        max_wait: Optional[float] = None
+    ):
+        """
+        버킷에서 cost만큼 예산 확보 (부족하면 대기)
+
+        Raises:
+            RateLimitError: max_wait 안에 예산을 확보하지 못함
+        """
+        if not self.enabled:
+            return
+
+        spec = self._spec(exchange, bucket)
+        key = self._key(exchange, bucket, spec, account)
+        cost, reserve = self._cost_and_reserve(spec, cost, priority)
+        max_wait = settings.EXCHANGE_BUDGET_MAX_WAIT if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        waited = 0.0
+
+        self._enter(key, priority)
+        try:
+            while True:
+                # 같은 프로세스의 더 높은 우선순위 대기자에게 양보
+                wait = 0.05 if self._has_priority_waiters(key, priority) else \
+                    await self._try_acquire(key, spec, cost, reserve)
+                if wait <= 0:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RateLimitError(
+                        f"{exchange} request budget exhausted for {bucket} (waited {waited:.1f}s)"
+                    )
+
+                sleep_for = min(wait, remaining)
+                waited += sleep_for
+                await asyncio.sleep(sleep_for)
+        finally:
+            self._leave(key, priority)
+
+        self._record(waited)
+
+    def acquire_sync(
+        self,
+        exchange: str,
+        bucket: str,
+        cost: float = 1,
+        priority: RequestPriority = RequestPriority.MARKET_DATA,
+        account: Optional[str] = None,
+        max_wait: Optional[float] = None
+    ):
+        """acquire()의 동기 버전 (동기 거래소 클라이언트용)"""
+        if not self.enabled:
+            return
+
+        spec = self._spec(exchange, bucket)
+        key = self._key(exchange, bucket, spec, account)
+        cost, reserve = self._cost_and_reserve(spec, cost, priority)
+        max_wait = settings.EXCHANGE_BUDGET_MAX_WAIT if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        waited = 0.0
+
+        while True:
+            wait = self._try_acquire_sync(key, spec, cost, reserve)
+            if wait <= 0:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RateLimitError(
+                    f"{exchange} request budget exhausted for {bucket} (waited {waited:.1f}s)"
+                )
+
+            sleep_for = min(wait, remaining)
+            waited += sleep_for
+            time.sleep(sleep_for)
+
+        self._record(waited)
+
+    def _record(self, waited: float):
+        self.stats["acquired"] += 1
+        if waited > 0:
+            self.stats["waits"] += 1
+            self.stats["wait_seconds"] += waited
+
+    # ===== 거래소별 요청 분류 =====
+
+    @staticmethod
+    def binance_plan(
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]] = None,
+        priority: Optional[RequestPriority] = None
+    ) -> Tuple[List[Tuple[str, int]], RequestPriority]:
+        """Binance 요청이 소비할 (버킷, 비용) 목록과 우선순위"""
+        buckets = [("weight", binance_request_weight(method, path, params))]
+        is_order = path in BINANCE_ORDER_PATHS and method != "GET"
+
+        if is_order:
+            buckets.append(("orders", 1))
+
+        if priority is None:
+            if is_order:
+                priority = RequestPriority.ORDER
+            elif path.startswith(("/fapi/v1/ticker", "/fapi/v1/depth", "/fapi/v1/klines")):
+                priority = RequestPriority.MARKET_DATA
+            else:
+                priority = RequestPriority.ACCOUNT
+
+        return buckets, priority
+
+    @staticmethod
+    def okx_bucket(path: str) -> str:
+        """OKX 요청 경로의 버킷 이름"""
+        return path if ("okx", path) in BUCKETS else "default"
+
+    @staticmethod
+    def okx_priority(path: str) -> RequestPriority:
+        if path.startswith("/api/v5/trade") or path == "/api/v5/account/set-leverage":
+            return RequestPriority.ORDER
+        if path.startswith("/api/v5/account"):
+            return RequestPriority.ACCOUNT
+        return RequestPriority.MARKET_DATA
+
+    async def acquire_binance(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]] = None,
+        account: Optional[str] = None,
+        priority: Optional[RequestPriority] = None
+    ):
+        """Binance 요청 예산 확보 (IP 가중치 + 주문 수)"""
+        buckets, priority = self.binance_plan(method, path, params, priority)
+        for bucket, cost in buckets:
+            await self.acquire("binance", bucket, cost, priority, account)
+
+    def acquire_binance_sync(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]] = None,
+        account: Optional[str] = None,
+        priority: Optional[RequestPriority] = None,
+        cost_multiplier: int = 1
+    ):
+        """acquire_binance()의 동기 버전 (cost_multiplier: 페이지 수 등)"""
+        buckets, priority = self.binance_plan(method, path, params, priority)
+        for bucket, cost in buckets:
+            self.acquire_sync("binance", bucket, cost * cost_multiplier, priority, account)
+
+    async def acquire_okx(
+        self,
+        path: str,
+        account: Optional[str] = None,
+        priority: Optional[RequestPriority] = None
+    ):
+        """OKX 요청 예산 확보 (엔드포인트별 버킷)"""
+        await self.acquire("okx", self.okx_bucket(path), 1, priority or self.okx_priority(path), account)
+
+    # ===== 거래소 응답 반영 =====
+
+    async def observe_binance_headers(self, headers: Mapping[str, str]):
+        """Binance 응답 헤더(X-MBX-USED-WEIGHT-1M)로 IP 가중치 버킷 보정"""
+        used = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("x-mbx-used-weight-1m")
+        if used is None:
+            return
+        await self._sync_bucket("binance", "weight", None, remaining_from_used=int(used))
+
+    def observe_binance_headers_sync(self, headers: Mapping[str, str]):
+        """observe_binance_headers()의 동기 버전"""
+        used = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("x-mbx-used-weight-1m")
+        if used is None:
+            return
+        self._sync_bucket_sync("binance", "weight", None, remaining_from_used=int(used))
+
+    async def observe_rate_limited(
+        self,
+        exchange: str,
+        bucket: str,
+        retry_after: Optional[float] = None,
+        account: Optional[str] = None
+    ):
+        """429/418 응답 → Retry-After 동안 버킷 차단"""
+        self.stats["rate_limited"] += 1
+        block = float(retry_after) if retry_after else 60.0
+        logger.warning(f"{exchange} rate limited on {bucket}; blocking for {block:.1f}s")
+        await self._sync_bucket(exchange, bucket, account, block=block, empty=True)
+
+    def observe_rate_limited_sync(
+        self,
+        exchange: str,
+        bucket: str,
+        retry_after: Optional[float] = None,
+        account: Optional[str] = None
+    ):
+        """observe_rate_limited()의 동기 버전"""
+        self.stats["rate_limited"] += 1
+        block = float(retry_after) if retry_after else 60.0
+        logger.warning(f"{exchange} rate limited on {bucket}; blocking for {block:.1f}s")
+        self._sync_bucket_sync(exchange, bucket, account, block=block, empty=True)
+
+    def _sync_args(
+        self,
+        spec: BucketSpec,
+        remaining_from_used: Optional[int],
+        block: float,
+        empty: bool
+    ) -> Tuple[Optional[float], float]:
+        if empty:
+            return 0.0, block
+        if remaining_from_used is not None:
+            return max(0.0, spec.capacity - remaining_from_used), block
+        return None, block
+
+    async def _sync_bucket(
+        self,
+        exchange: str,
+        bucket: str,
+        account: Optional[str],
+        remaining_from_used: Optional[int] = None,
+        block: float = 0.0,
+        empty: bool = False
+    ):
+        spec = self._spec(exchange, bucket)
+        key = self._key(exchange, bucket, spec, account)
+        remaining, block = self._sync_args(spec, remaining_from_used, block, empty)
+
+        if self._redis_available():
+            try:
+                _, sync_script = await self._get_async_scripts()
+                await sync_script(
+                    keys=[key],
+                    args=[spec.capacity, spec.rate, -1 if remaining is None else remaining, int(block * 1000)]
+                )
+                return
+            except Exception as e:
+                self._on_redis_error(e)
+        self._local_bucket(key, spec).sync(remaining, block)
+
+    def _sync_bucket_sync(
+        self,
+        exchange: str,
+        bucket: str,
+        account: Optional[str],
+        remaining_from_used: Optional[int] = None,
+        block: float = 0.0,
+        empty: bool = False
+    ):
+        spec = self._spec(exchange, bucket)
+        key = self._key(exchange, bucket, spec, account)
+        remaining, block = self._sync_args(spec, remaining_from_used, block, empty)
+
+        if self._redis_available():
+            try:
+                _, sync_script = self._get_sync_scripts()
+                sync_script(
+                    keys=[key],
+                    args=[spec.capacity, spec.rate, -1 if remaining is None else remaining, int(block * 1000)]
+                )
+                return
+            except Exception as e:
+                self._on_redis_error(e)
+        self._local_bucket(key, spec).sync(remaining, block)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """예산 통계"""
+        return {
+            **self.stats,
+            "wait_seconds": round(self.stats["wait_seconds"], 3),
+            "enabled": self.enabled,
+            "redis": self._redis_available()
+        }
+
+
+# 전역 요청 예산 관리자
+request_budget = RequestBudget(safety_margin=settings.EXCHANGE_BUDGET_SAFETY_MARGIN)
+request_budget.enabled = settings.EXCHANGE_BUDGET_ENABLED
@@ -6,11 +6,13 @@ Features:
 - 캐싱 데코레이터
 - TTL 관리
 - 자동 직렬화/역직렬화
+- 동시 캐시 미스 병합 (single-flight) 및 stale-while-revalidate
 """
 
 import json
 import pickle
 import logging
+import time
 from typing import Any, Optional, Callable, Union
 from functools import wraps
 import redis.asyncio as aioredis
@@ -18,6 +20,7 @@ from redis.asyncio import Redis
 from datetime import timedelta
 
 from app.core.config import settings
+from app.core.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -337,11 +340,15 @@ redis_cache = RedisCache()
 def cached(
     ttl: int = 300,
     key_prefix: str = "",
-    use_json: bool = True
+    use_json: bool = True,
+    stale_ttl: int = 0
 ):
     """
     함수 결과 캐싱 데코레이터
 
+    동시에 발생한 같은 키의 캐시 미스는 함수를 한 번만 실행합니다 (프로세스 내 single-flight).
+    stale_ttl > 0 이면 만료 후 stale_ttl 동안 이전 값을 반환하면서 백그라운드에서 1회 갱신합니다.
+
     Usage:
         @cached(ttl=60, key_prefix="market")
         async def get_market_data(symbol: str):
@@ -352,6 +359,7 @@ def cached(
         ttl: 캐시 TTL (초)
         key_prefix: 캐시 키 접두사
         use_json: JSON 직렬화 사용 여부
+        stale_ttl: 만료 후 이전 값을 제공할 시간 (초, 0이면 비활성)
     """
     def decorator(func: Callable):
         @wraps(func)
@@ -369,27 +377,59 @@ def cached(
                 cache_key_parts.extend(f"{k}={v}" for k, v in sorted_kwargs)
 
             cache_key = ":".join(cache_key_parts)
+            flight_key = ("redis-cache", cache_key)
+
+            async def refresh():
+                result = await func(*args, **kwargs)
+                await _store(cache_key, result, ttl, stale_ttl, use_json)
+                return result
 
             # 캐시 조회
             cached_value = await redis_cache.get(cache_key, use_json=use_json)
 
-            if cached_value is not None:
-                logger.debug(f"Cache HIT: {cache_key}")
-                return cached_value
+            # stale_ttl 도입 이전 형식의 값은 미스로 처리
+            if stale_ttl and not (isinstance(cached_value, dict) and "fresh_until" in cached_value):
+                cached_value = None
 
-            # 캐시 미스 - 함수 실행
+            if cached_value is not None:
+                if not stale_ttl:
+                    logger.debug(f"Cache HIT: {cache_key}")
+                    return cached_value
+
+                # stale 구간이면 이전 값 반환 + 백그라운드 갱신 1회
+                if time.time() > cached_value["fresh_until"]:
+                    logger.debug(f"Cache STALE: {cache_key}")
+                    single_flight.refresh_in_background(flight_key, refresh)
+                else:
+                    logger.debug(f"Cache HIT: {cache_key}")
+                return cached_value["value"]
+
+            # 캐시 미스 - 동시 호출자는 하나의 실행 결과를 공유
             logger.debug(f"Cache MISS: {cache_key}")
-            result = await func(*args, **kwargs)
-
-            # 결과 캐싱
-            await redis_cache.set(cache_key, result, ttl=ttl, use_json=use_json)
-
-            return result
+            return await single_flight.do(flight_key, refresh)
 
         return wrapper
     return decorator
 
 
+async def _store(key: str, value: Any, ttl: int, stale_ttl: int, use_json: bool):
+    """
+    캐시 저장 (stale_ttl 사용 시 신선도 정보를 함께 저장)
+
+    Redis 만료는 ttl + stale_ttl 이며, 신선 여부는 fresh_until로 판단합니다.
+    """
+    if not stale_ttl:
+        await redis_cache.set(key, value, ttl=ttl, use_json=use_json)
+        return
+
+    await redis_cache.set(
+        key,
+        {"value": value, "fresh_until": time.time() + ttl},
+        ttl=ttl + stale_ttl,
+        use_json=use_json
+    )
+
+
 async def invalidate_cache(pattern: str):
     """
     캐시 무효화
@@ -426,10 +466,14 @@ async def get_or_set_cache(
     if value is not None:
         return value
 
-    # 캐시 미스 - 값 생성
-    value = await factory() if callable(factory) else factory
+    if not callable(factory):
+        await redis_cache.set(key, factory, ttl=ttl, use_json=use_json)
+        return factory
 
-    # 캐싱
-    await redis_cache.set(key, value, ttl=ttl, use_json=use_json)
+    # 캐시 미스 - 값 생성 (동시 호출자는 하나의 생성 결과를 공유)
+    async def load():
+        result = await factory()
+        await redis_cache.set(key, result, ttl=ttl, use_json=use_json)
+        return result
 
-    return value
+    return await single_flight.do(("redis-cache", key), load)
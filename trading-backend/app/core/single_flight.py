@@ -0,0 +1,100 @@
+"""
+Single-flight 요청 병합
+
+동일한 키로 동시에 들어온 요청을 하나의 실행으로 합칩니다.
+첫 호출자(leader)만 실제 작업을 수행하고, 나머지 호출자는 같은 Future를 기다립니다.
+
+Usage:
+    result = await single_flight.do(("binance", "/fapi/v2/balance", api_key), fetch_balance)
+
+Features:
+- 키별 in-flight 작업 공유 (thundering herd 방지)
+- 대기자 취소가 공유 작업을 취소하지 않음 (asyncio.shield)
+- 이벤트 루프별 분리 (동기 래퍼용 백그라운드 루프와 공존)
+- 백그라운드 갱신 (stale-while-revalidate 용)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """키 단위 in-flight 요청 병합기"""
+
+    def __init__(self):
+        # (이벤트 루프, 키) → 공유 작업
+        # Task는 생성된 루프에서만 await 가능하므로 루프별로 분리합니다.
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.stats = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "background_refreshes": 0
+        }
+
+    def _start(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> Tuple[asyncio.Task, bool]:
+        """공유 작업 반환 (없으면 생성). (작업, 새로 생성 여부)"""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            return task, False
+
+        task = asyncio.ensure_future(factory())
+        self._inflight[flight_key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        self.stats["executions"] += 1
+        return task, True
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        키별로 한 번만 실행하고 결과 공유
+
+        Args:
+            key: 병합 키 (해시 가능)
+            factory: 코루틴을 반환하는 호출 가능 객체 (leader만 호출)
+
+        Returns:
+            공유 작업 결과 (예외도 모든 대기자에게 전파)
+        """
+        self.stats["calls"] += 1
+        task, created = self._start(key, factory)
+        if not created:
+            self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def refresh_in_background(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        결과를 기다리지 않는 백그라운드 갱신 (이미 진행 중이면 재사용)
+
+        실패는 로그만 남깁니다 (호출자는 이미 이전 값을 반환한 상태).
+        """
+        task, created = self._start(key, factory)
+        if created:
+            self.stats["background_refreshes"] += 1
+            task.add_done_callback(self._log_failure)
+        return task
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh failed: {task.exception()}")
+
+    def in_flight(self) -> int:
+        """진행 중인 작업 수"""
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """병합 통계"""
+        return {**self.stats, "in_flight": self.in_flight()}
+
+
+# 전역 single-flight 인스턴스
+single_flight = SingleFlight()
@@ -0,0 +1,569 @@
+"""
+계정 상태 캐시 (잔고, 포지션, 레버리지, 미체결 주문)
+
+거래소 Private 스트림(Binance User Data Stream, OKX private WebSocket)으로
+계정 상태를 메모리에 유지하고, 조회는 메모리에서 바로 응답합니다.
+
+Usage:
+    balance = await account_state.get_balance(client)
+    positions = await account_state.get_positions(client, symbol="BTCUSDT")
+
+Features:
+- 최초 조회 시 REST 스냅샷 + 스트림 구독 시작 (이후 조회는 REST 없음)
+- Binance: ACCOUNT_UPDATE / ORDER_TRADE_UPDATE / ACCOUNT_CONFIG_UPDATE 반영
+- OKX: account / positions / orders 채널 반영
+- Binance 미실현 손익은 가격 장부 최신가로 재계산 (스트림은 잔고 변동 시에만 전송)
+- Binance 수량 변경 시 해당 심볼 청산가만 REST 재조회 (디바운스)
+- 주기적 REST 대사 (스트림 누락 보정), 스트림 재연결 시 즉시 대사
+- 일정 시간 조회되지 않은 계정은 스트림 종료
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import websockets
+
+from app.core.config import settings
+from app.core.single_flight import single_flight
+from app.services.binance_client import BinanceClient
+from app.services.okx_client import OKXClient
+from app.services.price_book import mark_venue, price_book
+
+logger = logging.getLogger(__name__)
+
+ExchangeClient = Union[BinanceClient, OKXClient]
+
+# Binance 종료 상태 주문은 미체결 목록에서 제거
+BINANCE_CLOSED_ORDER_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH"}
+OKX_OPEN_ORDER_STATES = {"live", "partially_filled"}
+
+LISTEN_KEY_KEEPALIVE = 30 * 60  # seconds
+OKX_PING_INTERVAL = 20  # OKX는 30초 무응답 시 연결 종료
+
+
+def _exchange_of(client: ExchangeClient) -> str:
+    return "binance" if isinstance(client, BinanceClient) else "okx"
+
+
+def account_key(client: ExchangeClient) -> Tuple[str, str, bool]:
+    """계정 식별 키 (거래소, API 키, 테스트넷)"""
+    return (_exchange_of(client), client.api_key, client.testnet)
+
+
+@dataclass
+class AccountState:
+    """계정 하나의 메모리 상태"""
+    exchange: str
+    client: ExchangeClient
+    balance: Optional[Dict[str, Any]] = None
+    # 키: Binance (심볼, positionSide) / OKX (instId, posSide)
+    positions: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    leverage: Dict[str, int] = field(default_factory=dict)
+    open_orders: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    stream_connected: bool = False
+    reconciled_at: float = 0.0
+    updated_at: float = 0.0
+    last_read: float = field(default_factory=time.monotonic)
+    stream_task: Optional[asyncio.Task] = None
+    balance_refresh: Optional[asyncio.Task] = None
+    # 심볼 → 청산가 REST 갱신 태스크
+    position_refresh: Dict[str, asyncio.Task] = field(default_factory=dict)
+
+    def is_fresh(self, max_age: float) -> bool:
+        """메모리 상태로 응답 가능한지 (스트림 연결 중이거나 최근 대사)"""
+        if not self.reconciled_at:
+            return False
+        if self.stream_connected:
+            return True
+        return time.monotonic() - max(self.reconciled_at, self.updated_at) < max_age
+
+
+class AccountStateManager:
+    """계정 상태 캐시 관리자"""
+
+    def __init__(
+        self,
+        max_age: float = 5.0,
+        reconcile_interval: float = 300.0,
+        idle_timeout: float = 900.0,
+        max_backoff: float = 60.0
+    ):
+        """
+        Args:
+            max_age: 스트림이 끊긴 동안 메모리 상태를 신뢰하는 시간 (초)
+            reconcile_interval: REST 대사 주기 (초)
+            idle_timeout: 이 시간 동안 조회가 없으면 스트림 종료 (초)
+            max_backoff: 스트림 재연결 최대 대기 (초)
+        """
+        self.max_age = max_age
+        self.reconcile_interval = reconcile_interval
+        self.idle_timeout = idle_timeout
+        self.max_backoff = max_backoff
+
+        self._states: Dict[Tuple[str, str, bool], AccountState] = {}
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[Tuple[str, str, bool]], None]] = []
+        self.stats = {
+            "hits": 0,
+            "rest_snapshots": 0,
+            "stream_events": 0,
+            "balance_refreshes": 0,
+            "position_refreshes": 0
+        }
+
+    # ===== 생명주기 =====
+
+    async def start(self):
+        """주기적 대사 / 유휴 계정 정리 시작"""
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+            logger.info("Account state cache started")
+
+    async def stop(self):
+        """모든 스트림 종료"""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+
+        for key in list(self._states):
+            await self._drop(key)
+        logger.info("Account state cache stopped")
+
+    # ===== 조회 =====
+
+    async def get_balance(self, client: ExchangeClient) -> Dict[str, Any]:
+        """USDT 잔고 (get_account_balance_async와 같은 형식)"""
+        state = await self._ensure(client)
+        return dict(state.balance)
+
+    async def get_positions(self, client: ExchangeClient, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """활성 포지션 (get_positions_async와 같은 형식)"""
+        state = await self._ensure(client)
+        positions = [
+            self._with_live_pnl(state, position)
+            for position in state.positions.values()
+            if symbol is None or position["symbol"] == symbol
+        ]
+        return positions
+
+    async def get_open_orders(self, client: ExchangeClient, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """미체결 주문"""
+        state = await self._ensure(client)
+        return [
+            dict(order) for order in state.open_orders.values()
+            if symbol is None or order["symbol"] == symbol
+        ]
+
+    def get_leverage(self, client: ExchangeClient, symbol: str) -> Optional[int]:
+        """알려진 레버리지 (메모리만, 모르면 None)"""
+        state = self._states.get(account_key(client))
+        return state.leverage.get(symbol) if state else None
+
+    def record_leverage(self, client: ExchangeClient, symbol: str, leverage: Optional[int]):
+        """레버리지 설정 결과 반영 (None이면 제거)"""
+        state = self._states.get(account_key(client))
+        if state is None:
+            state = self._states[account_key(client)] = AccountState(_exchange_of(client), client)
+        if leverage is None:
+            state.leverage.pop(symbol, None)
+        else:
+            state.leverage[symbol] = leverage
+
+    def invalidate(self, client: ExchangeClient):
+        """다음 조회 시 REST 스냅샷을 다시 받도록 표시 (주문 직후 등)"""
+        state = self._states.get(account_key(client))
+        if state is not None and not state.stream_connected:
+            state.reconciled_at = 0.0
+
+    def peek(self, key: Tuple[str, str, bool]) -> Optional[AccountState]:
+        """메모리 상태 조회 (REST 대사 / 스트림 시작 없음, 조회 시각 갱신)"""
+        state = self._states.get(key)
+        if state is not None:
+            state.last_read = time.monotonic()
+        return state
+
+    def add_listener(self, callback: Callable[[Tuple[str, str, bool]], None]):
+        """상태 변경 알림 등록 (계정 키 전달, 이벤트 루프에서 동기 호출)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Tuple[str, str, bool]], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, state: AccountState):
+        key = account_key(state.client)
+        for callback in self._listeners:
+            try:
+                callback(key)
+            except Exception as e:
+                logger.error(f"Account state listener failed: {e}")
+
+    def forget(self, client: ExchangeClient):
+        """계정 상태 제거 및 스트림 종료 예약 (자격증명 변경 / 계정 비활성화)"""
+        key = account_key(client)
+        if key in self._states:
+            asyncio.create_task(self._drop(key))
+
+    async def _ensure(self, client: ExchangeClient) -> AccountState:
+        key = account_key(client)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = AccountState(_exchange_of(client), client)
+
+        state.last_read = time.monotonic()
+        if state.stream_task is None or state.stream_task.done():
+            state.client = client
+            state.stream_task = asyncio.create_task(self._run_stream(key))
+
+        if state.is_fresh(self.max_age):
+            self.stats["hits"] += 1
+        else:
+            await single_flight.do(("account_state", key), lambda: self._reconcile(state))
+        return state
+
+    def _with_live_pnl(self, state: AccountState, position: Dict[str, Any]) -> Dict[str, Any]:
+        position = dict(position)
+        # Binance 스트림은 잔고 변동 시에만 미실현 손익을 보내므로 마크 가격으로 재계산
+        # (마크 가격이 없으면, OKX는 수량이 계약 단위라 거래소 값을 그대로 사용)
+        if state.exchange == "binance":
+            venue = mark_venue("binance", state.client.testnet)
+            price = price_book.get_mark_price(venue, position["symbol"])
+            if price is not None:
+                position["unrealized_pnl"] = position["position_amt"] * (price - position["entry_price"])
+        return position
+
+    # ===== REST 대사 =====
+
+    async def _reconcile(self, state: AccountState):
+        """REST 스냅샷으로 상태 교체"""
+        client = state.client
+        if state.exchange == "binance":
+            balance, positions, orders = await asyncio.gather(
+                client.get_account_balance_async(),
+                client.get_positions_async(),
+                client.get_open_orders_async()
+            )
+            state.open_orders = {str(order["order_id"]): order for order in orders}
+        else:
+            balance, positions = await asyncio.gather(
+                client.get_account_balance_async(),
+                client.get_positions_async()
+            )
+
+        state.balance = balance
+        state.positions = {
+            (position["symbol"], str(position.get("position_side") or position["side"])): position
+            for position in positions
+        }
+        for position in positions:
+            state.leverage[position["symbol"]] = position["leverage"]
+
+        state.reconciled_at = time.monotonic()
+        self.stats["rest_snapshots"] += 1
+        self._notify(state)
+
+    async def _refresh_balance(self, state: AccountState, delay: float = 0.5):
+        """
+        잔고만 REST 갱신 (디바운스)
+
+        Binance ACCOUNT_UPDATE에는 지갑 잔고만 있고 가용 잔고가 없으므로
+        연속된 업데이트를 묶어 한 번만 조회합니다.
+        """
+        await asyncio.sleep(delay)
+        try:
+            state.balance = await state.client.get_account_balance_async()
+            state.updated_at = time.monotonic()
+            self.stats["balance_refreshes"] += 1
+        except Exception as e:
+            logger.warning(f"Account balance refresh failed ({state.exchange}): {e}")
+
+    def _schedule_balance_refresh(self, state: AccountState):
+        if state.balance_refresh is None or state.balance_refresh.done():
+            state.balance_refresh = asyncio.create_task(self._refresh_balance(state))
+
+    async def _refresh_liquidation_prices(self, state: AccountState, symbol: str, delay: float = 0.5):
+        """
+        심볼 포지션의 청산가만 REST 갱신 (디바운스)
+
+        Binance ACCOUNT_UPDATE에는 청산가가 없으므로 수량이 바뀐 포지션은
+        positionRisk를 다시 조회해 채웁니다. 그 사이 수량이 또 바뀐 포지션은
+        다음 이벤트의 갱신에 맡깁니다.
+        """
+        await asyncio.sleep(delay)
+        # 조회 중 도착한 변경은 새 갱신을 예약하도록 먼저 해제
+        state.position_refresh.pop(symbol, None)
+        try:
+            positions = await state.client.get_positions_async(symbol)
+        except Exception as e:
+            logger.warning(f"Liquidation price refresh failed ({state.exchange} {symbol}): {e}")
+            return
+
+        for position in positions:
+            current = state.positions.get((symbol, str(position.get("position_side") or position["side"])))
+            if current is not None and current["position_amt"] == position["position_amt"]:
+                current["liquidation_price"] = position["liquidation_price"]
+
+        state.updated_at = time.monotonic()
+        self.stats["position_refreshes"] += 1
+        self._notify(state)
+
+    def _schedule_liquidation_refresh(self, state: AccountState, symbol: str):
+        if symbol not in state.position_refresh:
+            state.position_refresh[symbol] = asyncio.create_task(self._refresh_liquidation_prices(state, symbol))
+
+    async def _maintenance_loop(self):
+        """주기적 REST 대사 + 유휴 계정 스트림 종료"""
+        while True:
+            try:
+                await asyncio.sleep(self.reconcile_interval)
+                now = time.monotonic()
+
+                for key, state in list(self._states.items()):
+                    if now - state.last_read > self.idle_timeout:
+                        await self._drop(key)
+                        continue
+                    try:
+                        await self._reconcile(state)
+                    except Exception as e:
+                        logger.warning(f"Account state reconcile failed ({state.exchange}): {e}")
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Account state maintenance error: {e}")
+
+    async def _drop(self, key: Tuple[str, str, bool]):
+        state = self._states.pop(key, None)
+        if state is None:
+            return
+        self._notify(state)
+        for task in (state.stream_task, state.balance_refresh, *state.position_refresh.values()):
+            if task:
+                task.cancel()
+        if state.stream_task:
+            await asyncio.gather(state.stream_task, return_exceptions=True)
+
+    # ===== 스트림 =====
+
+    async def _run_stream(self, key: Tuple[str, str, bool]):
+        """재연결 루프 (Exponential Backoff)"""
+        backoff = 1.0
+
+        while key in self._states:
+            state = self._states[key]
+            try:
+                if state.exchange == "binance":
+                    await self._stream_binance(state)
+                else:
+                    await self._stream_okx(state)
+                backoff = 1.0
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception as e:
+                logger.warning(
+                    f"Account stream {state.exchange} disconnected: {e}. Reconnecting in {backoff:.0f}s"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+            finally:
+                state.stream_connected = False
+
+    async def _on_connected(self, state: AccountState):
+        """스트림 연결 직후 REST 스냅샷으로 연결 전 누락분 보정"""
+        await self._reconcile(state)
+        state.stream_connected = True
+
+    async def _stream_binance(self, state: AccountState):
+        client: BinanceClient = state.client
+        listen_key = await client.create_listen_key_async()
+
+        async with websockets.connect(f"{client.user_stream_url}/{listen_key}") as ws:
+            await self._on_connected(state)
+            logger.info("Account stream connected: binance")
+            keepalive_at = time.monotonic() + LISTEN_KEY_KEEPALIVE
+
+            while True:
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=60)
+                except asyncio.TimeoutError:
+                    raw = None
+
+                if time.monotonic() >= keepalive_at:
+                    await client.keepalive_listen_key_async()
+                    keepalive_at = time.monotonic() + LISTEN_KEY_KEEPALIVE
+
+                if raw is None:
+                    continue
+
+                event = json.loads(raw)
+                if event.get("e") == "listenKeyExpired":
+                    raise ConnectionError("listenKey expired")
+                self.apply_binance_event(state, event)
+
+    def apply_binance_event(self, state: AccountState, event: Dict[str, Any]):
+        """Binance User Data Stream 이벤트 반영"""
+        event_type = event.get("e")
+        self.stats["stream_events"] += 1
+
+        if event_type == "ACCOUNT_UPDATE":
+            update = event["a"]
+            for item in update.get("B", []):
+                if item["a"] == "USDT" and state.balance is not None:
+                    state.balance["total_balance"] = float(item["wb"])
+                    self._schedule_balance_refresh(state)
+
+            for item in update.get("P", []):
+                position_key = (item["s"], item.get("ps", "BOTH"))
+                amount = float(item["pa"])
+                previous = state.positions.pop(position_key, None)
+                if amount == 0:
+                    continue
+                amount_changed = not previous or previous["position_amt"] != amount
+                state.positions[position_key] = {
+                    "symbol": item["s"],
+                    "position_amt": amount,
+                    "entry_price": float(item["ep"]),
+                    "unrealized_pnl": float(item["up"]),
+                    "leverage": state.leverage.get(item["s"], 1),
+                    "side": "LONG" if amount > 0 else "SHORT",
+                    "position_side": position_key[1],
+                    # 이벤트에 청산가가 없어 수량이 그대로일 때만 유지 (바뀌면 REST로 다시 조회)
+                    "liquidation_price": None if amount_changed else previous.get("liquidation_price")
+                }
+                if amount_changed:
+                    self._schedule_liquidation_refresh(state, item["s"])
+
+        elif event_type == "ORDER_TRADE_UPDATE":
+            order = event["o"]
+            order_id = str(order["i"])
+            if order["X"] in BINANCE_CLOSED_ORDER_STATUSES:
+                state.open_orders.pop(order_id, None)
+            else:
+                state.open_orders[order_id] = {
+                    "order_id": order["i"],
+                    "symbol": order["s"],
+                    "side": order["S"],
+                    "type": order["o"],
+                    "price": float(order["p"]) or None,
+                    "quantity": float(order["q"]),
+                    "status": order["X"],
+                    "timestamp": order["T"]
+                }
+
+        elif event_type == "ACCOUNT_CONFIG_UPDATE" and "ac" in event:
+            symbol, leverage = event["ac"]["s"], int(event["ac"]["l"])
+            state.leverage[symbol] = leverage
+            for (position_symbol, _), position in state.positions.items():
+                if position_symbol == symbol:
+                    position["leverage"] = leverage
+
+        else:
+            return
+
+        state.updated_at = time.monotonic()
+        self._notify(state)
+
+    async def _stream_okx(self, state: AccountState):
+        client: OKXClient = state.client
+
+        async with websockets.connect(client.private_ws_url) as ws:
+            await ws.send(json.dumps(client.ws_login_message()))
+            login = json.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+            if login.get("event") != "login" or login.get("code") != "0":
+                raise ConnectionError(f"OKX login failed: {login.get('msg')}")
+
+            await ws.send(json.dumps({
+                "op": "subscribe",
+                "args": [
+                    {"channel": "account", "ccy": "USDT"},
+                    {"channel": "positions", "instType": "SWAP"},
+                    {"channel": "orders", "instType": "SWAP"}
+                ]
+            }))
+            await self._on_connected(state)
+            logger.info("Account stream connected: okx")
+
+            while True:
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=OKX_PING_INTERVAL)
+                except asyncio.TimeoutError:
+                    await ws.send("ping")
+                    continue
+
+                if raw == "pong":
+                    continue
+                self.apply_okx_message(state, json.loads(raw))
+
+    def apply_okx_message(self, state: AccountState, message: Dict[str, Any]):
+        """OKX private 채널 메시지 반영"""
+        channel = message.get("arg", {}).get("channel")
+        data = message.get("data")
+        if not data:
+            return
+        self.stats["stream_events"] += 1
+
+        if channel == "account":
+            details = data[0].get("details", [])
+            usdt = next((item for item in details if item["ccy"] == "USDT"), None)
+            if usdt is not None:
+                state.balance = {
+                    "asset": "USDT",
+                    "available_balance": float(usdt["availBal"]),
+                    "total_balance": float(usdt["eq"])
+                }
+
+        elif channel == "positions":
+            for item in data:
+                position_key = (item["instId"], item["posSide"])
+                if not item.get("pos") or float(item["pos"]) == 0:
+                    state.positions.pop(position_key, None)
+                    continue
+                position = OKXClient._parse_position(item)
+                state.leverage[item["instId"]] = position["leverage"]
+                state.positions[position_key] = position
+
+        elif channel == "orders":
+            for item in data:
+                if item["state"] in OKX_OPEN_ORDER_STATES:
+                    state.open_orders[item["ordId"]] = {
+                        "order_id": item["ordId"],
+                        "symbol": item["instId"],
+                        "side": item["side"],
+                        "type": item["ordType"],
+                        "price": float(item["px"]) if item.get("px") else None,
+                        "quantity": float(item["sz"]),
+                        "status": item["state"],
+                        "timestamp": int(item["uTime"])
+                    }
+                else:
+                    state.open_orders.pop(item["ordId"], None)
+
+        else:
+            return
+
+        state.updated_at = time.monotonic()
+        self._notify(state)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {
+            **self.stats,
+            "accounts": len(self._states),
+            "streaming": sum(1 for state in self._states.values() if state.stream_connected)
+        }
+
+
+# 전역 계정 상태 캐시
+account_state = AccountStateManager(
+    max_age=settings.ACCOUNT_STATE_MAX_AGE,
+    reconcile_interval=settings.ACCOUNT_STATE_RECONCILE_INTERVAL,
+    idle_timeout=settings.ACCOUNT_STATE_IDLE_TIMEOUT
+)
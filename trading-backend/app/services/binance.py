@@ -4,6 +4,9 @@ from typing import Dict, List, Optional
 import pandas as pd
 from app.core.config import settings
 from app.services.margin_calculator import MarginCalculator
+from app.services.order_book import order_book_manager
+from app.core.rate_budget import request_budget, BINANCE_CLIENT_ENDPOINTS
+from app.core.single_flight import single_flight
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,6 +43,42 @@ class BinanceFuturesClient:
 
         logger.info(f"Binance Futures client initialized (testnet={self.testnet})")
 
+    async def _call(self, name: str, **params):
+        """
+        Call a python-binance futures endpoint within the shared request budget
+
+        Identical read-only calls already in flight share one exchange request.
+
+        Args:
+            name: Client method name (e.g. 'futures_account')
+            **params: Method parameters
+        """
+        method, _ = BINANCE_CLIENT_ENDPOINTS[name]
+        if method != "GET":
+            return await self._send(name, **params)
+
+        key = ("binance-futures", self.testnet, self.api_key, name, tuple(sorted(params.items())))
+        return await single_flight.do(key, lambda: self._send(name, **params))
+
+    async def _send(self, name: str, **params):
+        """Send a python-binance call after acquiring its request budget"""
+        method, path = BINANCE_CLIENT_ENDPOINTS[name]
+        await request_budget.acquire_binance(method, path, params, account=self.api_key)
+
+        try:
+            result = getattr(self.client, name)(**params)
+        except BinanceAPIException as e:
+            if e.status_code in (418, 429):
+                await request_budget.observe_rate_limited(
+                    "binance", "weight", e.response.headers.get("Retry-After")
+                )
+            raise
+
+        if self.client.response is not None:
+            await request_budget.observe_binance_headers(self.client.response.headers)
+
+        return result
+
     async def get_account_balance(self) -> Dict:
         """
         Get futures account balance
@@ -48,7 +87,7 @@ class BinanceFuturesClient:
             Account balance information including USDT balance
         """
         try:
-            account = self.client.futures_account()
+            account = await self._call("futures_account")
 
             # Extract USDT balance
             usdt_balance = next(
@@ -85,7 +124,8 @@ class BinanceFuturesClient:
             DataFrame with columns: timestamp, open, high, low, close, volume
         """
         try:
-            klines = self.client.futures_klines(
+            klines = await self._call(
+                "futures_klines",
                 symbol=symbol,
                 interval=interval,
                 limit=limit
@@ -121,7 +161,7 @@ class BinanceFuturesClient:
             Current price as float
         """
         try:
-            ticker = self.client.futures_symbol_ticker(symbol=symbol)
+            ticker = await self._call("futures_symbol_ticker", symbol=symbol)
             return float(ticker['price'])
         except BinanceAPIException as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
@@ -135,7 +175,7 @@ class BinanceFuturesClient:
             List of open positions with details
         """
         try:
-            positions = self.client.futures_position_information()
+            positions = await self._call("futures_position_information")
 
             # Filter only positions with non-zero size
             open_positions = []
@@ -158,6 +198,34 @@ class BinanceFuturesClient:
             logger.error(f"Error fetching open positions: {e}")
             raise
 
+    async def get_protective_orders(self) -> List[Dict]:
+        """
+        Get open stop-loss / take-profit orders
+
+        Returns:
+            List of reduce-only STOP_MARKET / TAKE_PROFIT_MARKET orders
+        """
+        try:
+            orders = await self._call("futures_get_open_orders")
+
+            protective_orders = []
+            for order in orders:
+                if order['type'] not in ('STOP_MARKET', 'TAKE_PROFIT_MARKET'):
+                    continue
+                protective_orders.append({
+                    'orderId': order['orderId'],
+                    'symbol': order['symbol'],
+                    'type': order['type'],
+                    'side': order['side'],
+                    'positionSide': order.get('positionSide', 'BOTH'),
+                    'stopPrice': float(order['stopPrice']),
+                })
+
+            return protective_orders
+        except BinanceAPIException as e:
+            logger.error(f"Error fetching protective orders: {e}")
+            raise
+
     async def place_market_order(
         self,
         symbol: str,
@@ -178,7 +246,8 @@ class BinanceFuturesClient:
             Order information
         """
         try:
-            order = self.client.futures_create_order(
+            order = await self._call(
+                "futures_create_order",
                 symbol=symbol,
                 side=side,
                 type='MARKET',
@@ -214,7 +283,8 @@ class BinanceFuturesClient:
             Order information
         """
         try:
-            order = self.client.futures_create_order(
+            order = await self._call(
+                "futures_create_order",
                 symbol=symbol,
                 side=side,
                 type='LIMIT',
@@ -241,7 +311,8 @@ class BinanceFuturesClient:
             Leverage change confirmation
         """
         try:
-            result = self.client.futures_change_leverage(
+            result = await self._call(
+                "futures_change_leverage",
                 symbol=symbol,
                 leverage=leverage
             )
@@ -271,7 +342,8 @@ class BinanceFuturesClient:
             Stop order information
         """
         try:
-            order = self.client.futures_create_order(
+            order = await self._call(
+                "futures_create_order",
                 symbol=symbol,
                 side=side,
                 type='STOP_MARKET',
@@ -306,7 +378,8 @@ class BinanceFuturesClient:
             Take-profit order information
         """
         try:
-            order = self.client.futures_create_order(
+            order = await self._call(
+                "futures_create_order",
                 symbol=symbol,
                 side=side,
                 type='TAKE_PROFIT_MARKET',
@@ -472,15 +545,20 @@ class BinanceFuturesClient:
         self,
         symbol: str,
         leverage: int = None,
-        max_risk_pct: float = None
+        max_risk_pct: float = None,
+        side: str = "BUY"
     ) -> Dict:
         """
         Calculate maximum safe position size based on available balance
 
+        Capped to order book liquidity within ORDER_BOOK_MAX_SLIPPAGE_BPS
+        when a synced order book mirror is available.
+
         Args:
             symbol: Trading pair
             leverage: Desired leverage (uses DEFAULT_LEVERAGE if None)
             max_risk_pct: Max % of balance to risk (uses MAX_POSITION_SIZE_PCT if None)
+            side: Intended order side ('BUY' or 'SELL')
 
         Returns:
             Safe position size and related metrics
@@ -496,8 +574,12 @@ class BinanceFuturesClient:
             max_risk_pct = max_risk_pct or settings.MAX_POSITION_SIZE_PCT
 
             # Calculate max safe position size
+            order_book = order_book_manager.get(symbol)
             max_position_size = MarginCalculator.calculate_max_position_size(
-                available_balance, current_price, leverage, max_risk_pct
+                available_balance, current_price, leverage, max_risk_pct,
+                order_book=order_book,
+                side=side,
+                max_slippage_bps=settings.ORDER_BOOK_MAX_SLIPPAGE_BPS
             )
 
             # Calculate margins for this position
@@ -519,7 +601,8 @@ class BinanceFuturesClient:
                 'max_risk_pct': max_risk_pct,
                 'initial_margin': initial_margin,
                 'maintenance_margin': maintenance_margin,
-                'maintenance_margin_rate': mmr
+                'maintenance_margin_rate': mmr,
+                'slippage_estimate': order_book.estimate_slippage(side, max_position_size) if order_book else None
             }
 
         except Exception as e:
@@ -5,19 +5,24 @@ Features:
 - 시장가/지정가 주문
 - 포지션 관리
 - 레버리지 설정
-- Stop Loss / Take Profit
+- Stop Loss / Take Profit (batchOrders로 동시 주문)
+- 비동기 연결 풀 (keep-alive, HTTP/2) + 동기 래퍼
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import hmac
 import hashlib
+import json
 import time
-import requests
+import httpx
 from datetime import datetime
 import logging
 
 from app.core.config import settings
-from app.core.stability import with_retry, RetryStrategy
+from app.core.stability import with_async_retry, RetryStrategy
+from app.core.rate_budget import request_budget
+from app.core.single_flight import single_flight
+from app.services.http_transport import get_client, run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +30,9 @@ logger = logging.getLogger(__name__)
 class BinanceClient:
     """Binance Futures API 클라이언트"""
 
+    # base_url → {심볼: (stepSize, minQty)}
+    _lot_sizes: Dict[str, Dict[str, Tuple[float, float]]] = {}
+
     def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
         self.api_key = api_key
         self.api_secret = api_secret
@@ -50,19 +58,48 @@ class BinanceClient:
         ).hexdigest()
         return signature
 
-    @with_retry(max_attempts=3, strategy=RetryStrategy.EXPONENTIAL)
-    def _request(
+    async def _arequest(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        signed: bool = False
+    ) -> Dict[str, Any]:
+        """
+        API 요청
+
+        동일한 조회(GET) 요청이 동시에 진행 중이면 하나의 거래소 호출 결과를 공유합니다.
+        주문 등 상태 변경 요청은 병합하지 않습니다.
+        """
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+
+        if method != "GET":
+            return await self._send(method, endpoint, params=params, signed=signed)
+
+        key = (
+            "binance", self.base_url, self.api_key, endpoint,
+            tuple(sorted((params or {}).items()))
+        )
+        return await single_flight.do(
+            key, lambda: self._send(method, endpoint, params=params, signed=signed)
+        )
+
+    @with_async_retry(max_attempts=3, strategy=RetryStrategy.EXPONENTIAL)
+    async def _send(
         self,
         method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         signed: bool = False
     ) -> Dict[str, Any]:
-        """API 요청"""
-        url = f"{self.base_url}{endpoint}"
+        """API 요청 전송 (공유 연결 풀 사용)"""
+
+        # 재시도 시 이전 서명이 섞이지 않도록 복사본에 서명
+        params = dict(params or {})
 
-        if params is None:
-            params = {}
+        # 요청 가중치 예산 확보 (주문 요청이 데이터 조회보다 우선)
+        await request_budget.acquire_binance(method, endpoint, params, account=self.api_key)
 
         # 서명 필요 시
         if signed:
@@ -70,25 +107,35 @@ class BinanceClient:
             params["signature"] = self._generate_signature(params)
 
         try:
-            if method == "GET":
-                response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, params=params, headers=self.headers, timeout=10)
-            elif method == "DELETE":
-                response = requests.delete(url, params=params, headers=self.headers, timeout=10)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            client = get_client(self.base_url)
+            response = await client.request(method, endpoint, params=params, headers=self.headers)
+
+            await request_budget.observe_binance_headers(response.headers)
+            if response.status_code in (418, 429):
+                await request_budget.observe_rate_limited(
+                    "binance", "weight", response.headers.get("Retry-After")
+                )
 
             response.raise_for_status()
             return response.json()
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Binance API request failed: {str(e)}")
             raise
 
-    def get_account_balance(self) -> Dict[str, Any]:
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        signed: bool = False
+    ) -> Dict[str, Any]:
+        """API 요청 (동기 래퍼)"""
+        return run_sync(self._arequest(method, endpoint, params=params, signed=signed))
+
+    async def get_account_balance_async(self) -> Dict[str, Any]:
         """계좌 잔액 조회"""
-        result = self._request("GET", "/fapi/v2/balance", signed=True)
+        result = await self._arequest("GET", "/fapi/v2/balance", signed=True)
 
         # USDT 잔액만 추출
         usdt_balance = next(
@@ -102,13 +149,13 @@ class BinanceClient:
             "total_balance": float(usdt_balance["balance"])
         }
 
-    def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_positions_async(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """포지션 조회"""
         params = {}
         if symbol:
             params["symbol"] = symbol
 
-        result = self._request("GET", "/fapi/v2/positionRisk", params=params, signed=True)
+        result = await self._arequest("GET", "/fapi/v2/positionRisk", params=params, signed=True)
 
         # 활성 포지션만 필터링
         active_positions = [
@@ -118,7 +165,9 @@ class BinanceClient:
                 "entry_price": float(pos["entryPrice"]),
                 "unrealized_pnl": float(pos["unRealizedProfit"]),
                 "leverage": int(pos["leverage"]),
-                "side": "LONG" if float(pos["positionAmt"]) > 0 else "SHORT" if float(pos["positionAmt"]) < 0 else "NONE"
+                "side": "LONG" if float(pos["positionAmt"]) > 0 else "SHORT" if float(pos["positionAmt"]) < 0 else "NONE",
+                "position_side": pos.get("positionSide", "BOTH"),
+                "liquidation_price": float(pos.get("liquidationPrice") or 0) or None
             }
             for pos in result
             if float(pos["positionAmt"]) != 0
@@ -126,14 +175,14 @@ class BinanceClient:
 
         return active_positions
 
-    def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
+    async def set_leverage_async(self, symbol: str, leverage: int) -> Dict[str, Any]:
         """레버리지 설정"""
         params = {
             "symbol": symbol,
             "leverage": leverage
         }
 
-        result = self._request("POST", "/fapi/v1/leverage", params=params, signed=True)
+        result = await self._arequest("POST", "/fapi/v1/leverage", params=params, signed=True)
 
         logger.info(f"Leverage set: {symbol} = {leverage}x")
 
@@ -143,7 +192,7 @@ class BinanceClient:
             "max_notional_value": result.get("maxNotionalValue", "N/A")
         }
 
-    def create_market_order(
+    async def create_market_order_async(
         self,
         symbol: str,
         side: str,  # BUY or SELL
@@ -161,7 +210,7 @@ class BinanceClient:
         if reduce_only:
             params["reduceOnly"] = "true"
 
-        result = self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        result = await self._arequest("POST", "/fapi/v1/order", params=params, signed=True)
 
         logger.info(
             f"Market order created: {symbol} {side} {quantity} "
@@ -178,7 +227,7 @@ class BinanceClient:
             "timestamp": result["updateTime"]
         }
 
-    def create_limit_order(
+    async def create_limit_order_async(
         self,
         symbol: str,
         side: str,  # BUY or SELL
@@ -196,7 +245,7 @@ class BinanceClient:
             "timeInForce": time_in_force
         }
 
-        result = self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        result = await self._arequest("POST", "/fapi/v1/order", params=params, signed=True)
 
         logger.info(
             f"Limit order created: {symbol} {side} {quantity} @ {price} "
@@ -214,7 +263,7 @@ class BinanceClient:
             "timestamp": result["updateTime"]
         }
 
-    def create_stop_loss(
+    async def create_stop_loss_async(
         self,
         symbol: str,
         side: str,  # BUY or SELL (포지션 반대)
@@ -231,7 +280,7 @@ class BinanceClient:
             "closePosition": "false"
         }
 
-        result = self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        result = await self._arequest("POST", "/fapi/v1/order", params=params, signed=True)
 
         logger.info(
             f"Stop Loss created: {symbol} {side} {quantity} @ {stop_price} "
@@ -247,7 +296,7 @@ class BinanceClient:
             "status": result["status"]
         }
 
-    def create_take_profit(
+    async def create_take_profit_async(
         self,
         symbol: str,
         side: str,  # BUY or SELL (포지션 반대)
@@ -264,7 +313,7 @@ class BinanceClient:
             "closePosition": "false"
         }
 
-        result = self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        result = await self._arequest("POST", "/fapi/v1/order", params=params, signed=True)
 
         logger.info(
             f"Take Profit created: {symbol} {side} {quantity} @ {take_profit_price} "
@@ -280,10 +329,77 @@ class BinanceClient:
             "status": result["status"]
         }
 
-    def close_position(self, symbol: str) -> Dict[str, Any]:
-        """포지션 전체 청산"""
+    async def create_bracket_orders_async(
+        self,
+        symbol: str,
+        side: str,  # BUY or SELL (포지션 반대)
+        quantity: float,
+        stop_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Stop Loss / Take Profit 동시 주문 (batchOrders, 1회 왕복)
+
+        보호 주문은 reduceOnly로 걸어 포지션이 사라진 뒤 남더라도 새 포지션을 열지 않습니다.
+        배치 내 주문은 개별적으로 성공/실패하므로 실패한 항목은 {"error": ...}로 반환됩니다.
+
+        Returns:
+            {"stop_loss": {...}, "take_profit": {...}} (요청한 항목만)
+        """
+        legs = []
+        if stop_price:
+            legs.append(("stop_loss", "STOP_MARKET", stop_price))
+        if take_profit_price:
+            legs.append(("take_profit", "TAKE_PROFIT_MARKET", take_profit_price))
+        if not legs:
+            return {}
+
+        batch = [
+            {
+                "symbol": symbol,
+                "side": side,
+                "type": order_type,
+                "stopPrice": str(price),
+                "quantity": str(quantity),
+                "reduceOnly": "true"
+            }
+            for _, order_type, price in legs
+        ]
+
+        result = await self._arequest(
+            "POST", "/fapi/v1/batchOrders",
+            params={"batchOrders": json.dumps(batch)}, signed=True
+        )
+
+        orders = {}
+        for (name, _, price), item in zip(legs, result):
+            if "orderId" not in item:
+                orders[name] = {"error": item.get("msg", "Unknown error"), "code": item.get("code")}
+                logger.error(f"{name} order rejected: {symbol} {side} {quantity} @ {price} ({item.get('msg')})")
+                continue
+
+            orders[name] = {
+                "order_id": item["orderId"],
+                "symbol": item["symbol"],
+                "side": item["side"],
+                "type": item["type"],
+                "stop_price": float(item["stopPrice"]),
+                "status": item["status"]
+            }
+            logger.info(f"{name} created: {symbol} {side} {quantity} @ {price} (orderId: {item['orderId']})")
+
+        return orders
+
+    async def close_position_async(self, symbol: str, position: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        포지션 전체 청산
+
+        Args:
+            symbol: 심볼
+            position: 이미 알고 있는 포지션 (get_positions_async 형식, 지정 시 조회 생략)
+        """
         # 현재 포지션 조회
-        positions = self.get_positions(symbol=symbol)
+        positions = [position] if position else await self.get_positions_async(symbol=symbol)
 
         if not positions:
             return {
@@ -303,7 +419,7 @@ class BinanceClient:
             side = "BUY"
             position_amt = abs(position_amt)
 
-        result = self.create_market_order(
+        result = await self.create_market_order_async(
             symbol=symbol,
             side=side,
             quantity=position_amt,
@@ -318,14 +434,14 @@ class BinanceClient:
             "order": result
         }
 
-    def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+    async def cancel_order_async(self, symbol: str, order_id: int) -> Dict[str, Any]:
         """주문 취소"""
         params = {
             "symbol": symbol,
             "orderId": order_id
         }
 
-        result = self._request("DELETE", "/fapi/v1/order", params=params, signed=True)
+        result = await self._arequest("DELETE", "/fapi/v1/order", params=params, signed=True)
 
         logger.info(f"Order cancelled: {symbol} orderId={order_id}")
 
@@ -335,13 +451,13 @@ class BinanceClient:
             "status": result["status"]
         }
 
-    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_open_orders_async(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """미체결 주문 조회"""
         params = {}
         if symbol:
             params["symbol"] = symbol
 
-        result = self._request("GET", "/fapi/v1/openOrders", params=params, signed=True)
+        result = await self._arequest("GET", "/fapi/v1/openOrders", params=params, signed=True)
 
         return [
             {
@@ -357,15 +473,98 @@ class BinanceClient:
             for order in result
         ]
 
-    def get_current_price(self, symbol: str) -> float:
+    async def create_listen_key_async(self) -> str:
+        """User Data Stream listenKey 발급 (60분 유효, 이미 있으면 같은 키 반환)"""
+        result = await self._arequest("POST", "/fapi/v1/listenKey")
+        return result["listenKey"]
+
+    async def keepalive_listen_key_async(self):
+        """listenKey 유효기간 연장 (30분마다 호출 권장)"""
+        await self._arequest("PUT", "/fapi/v1/listenKey")
+
+    @property
+    def user_stream_url(self) -> str:
+        """User Data Stream WebSocket 기본 URL"""
+        if self.testnet:
+            return "wss://stream.binancefuture.com/ws"
+        return "wss://fstream.binance.com/ws"
+
+    async def get_lot_size_async(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """
+        LOT_SIZE 필터 조회
+
+        거래 규칙은 거의 바뀌지 않으므로 거래소(메인넷/테스트넷)별로 프로세스에 보관하고,
+        모르는 심볼일 때만 exchangeInfo를 다시 조회합니다.
+
+        Returns:
+            (stepSize, minQty) 또는 None (심볼 없음)
+        """
+        lot_sizes = BinanceClient._lot_sizes.get(self.base_url)
+        if lot_sizes is None or symbol not in lot_sizes:
+            result = await self._arequest("GET", "/fapi/v1/exchangeInfo")
+            lot_sizes = {
+                info["symbol"]: (float(f["stepSize"]), float(f["minQty"]))
+                for info in result["symbols"]
+                for f in info["filters"]
+                if f["filterType"] == "LOT_SIZE"
+            }
+            BinanceClient._lot_sizes[self.base_url] = lot_sizes
+        return lot_sizes.get(symbol)
+
+    async def get_current_price_async(self, symbol: str) -> float:
         """현재 시장가 조회"""
-        result = self._request("GET", f"/fapi/v1/ticker/price", params={"symbol": symbol})
+        result = await self._arequest("GET", f"/fapi/v1/ticker/price", params={"symbol": symbol})
         return float(result["price"])
 
-    def get_24h_ticker(self, symbol: str) -> Dict[str, Any]:
+    async def get_klines_async(self, symbol: str, interval: str = "1h", limit: int = 500) -> List[List[Any]]:
+        """
+        캔들 조회 (공개 데이터, 서명 불필요)
+
+        Returns:
+            [[open_time, open, high, low, close, volume, close_time, ...], ...]
+        """
+        return await self._arequest(
+            "GET", "/fapi/v1/klines",
+            params={"symbol": symbol, "interval": interval, "limit": limit}
+        )
+
+    async def get_24h_ticker_async(self, symbol: str) -> Dict[str, Any]:
         """24시간 통계 조회"""
-        result = self._request("GET", "/fapi/v1/ticker/24hr", params={"symbol": symbol})
+        result = await self._arequest("GET", "/fapi/v1/ticker/24hr", params={"symbol": symbol})
+        return self._parse_24h_ticker(result)
 
+    async def get_all_prices_async(self) -> Dict[str, float]:
+        """
+        전체 심볼 현재가 조회 (단일 요청)
+
+        Returns:
+            {거래소 심볼: 현재가}
+        """
+        result = await self._arequest("GET", "/fapi/v1/ticker/price")
+        return {item["symbol"]: float(item["price"]) for item in result}
+
+    async def get_all_24h_tickers_async(self) -> Dict[str, Dict[str, Any]]:
+        """
+        전체 심볼 24시간 통계 조회 (단일 요청)
+
+        Returns:
+            {거래소 심볼: 24시간 통계}
+        """
+        result = await self._arequest("GET", "/fapi/v1/ticker/24hr")
+        return {item["symbol"]: self._parse_24h_ticker(item) for item in result}
+
+    async def get_order_book_async(self, symbol: str, limit: int = 1000) -> Dict[str, Any]:
+        """
+        호가창 스냅샷 조회
+
+        Returns:
+            {"lastUpdateId": int, "bids": [[price, qty], ...], "asks": [[price, qty], ...]}
+        """
+        return await self._arequest("GET", "/fapi/v1/depth", params={"symbol": symbol, "limit": limit})
+
+    @staticmethod
+    def _parse_24h_ticker(result: Dict[str, Any]) -> Dict[str, Any]:
+        """24시간 통계 응답 파싱"""
         return {
             "symbol": result["symbol"],
             "price_change": float(result["priceChange"]),
@@ -380,7 +579,7 @@ class BinanceClient:
             "count": result["count"]  # 거래 횟수
         }
 
-    def validate_credentials(self) -> Dict[str, Any]:
+    async def validate_credentials_async(self) -> Dict[str, Any]:
         """
         API 키 유효성 검증
 
@@ -395,7 +594,7 @@ class BinanceClient:
         """
         try:
             # 계정 잔액 조회를 통해 API 키 유효성 검증
-            account_info = self.get_account_balance()
+            account_info = await self.get_account_balance_async()
 
             return {
                 "valid": True,
@@ -407,7 +606,7 @@ class BinanceClient:
                 }
             }
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             # HTTP 에러 처리
             if e.response.status_code == 401:
                 return {
@@ -434,3 +633,105 @@ class BinanceClient:
                 "valid": False,
                 "message": f"Validation error: {str(e)}"
             }
+
+    # ===== 동기 API (기존 호출자 호환용 래퍼) =====
+
+    def get_account_balance(self) -> Dict[str, Any]:
+        """계좌 잔액 조회"""
+        return run_sync(self.get_account_balance_async())
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """포지션 조회"""
+        return run_sync(self.get_positions_async(symbol))
+
+    def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
+        """레버리지 설정"""
+        return run_sync(self.set_leverage_async(symbol, leverage))
+
+    def create_market_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        reduce_only: bool = False
+    ) -> Dict[str, Any]:
+        """시장가 주문"""
+        return run_sync(self.create_market_order_async(symbol, side, quantity, reduce_only))
+
+    def create_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        time_in_force: str = "GTC"
+    ) -> Dict[str, Any]:
+        """지정가 주문"""
+        return run_sync(self.create_limit_order_async(symbol, side, quantity, price, time_in_force))
+
+    def create_stop_loss(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        stop_price: float
+    ) -> Dict[str, Any]:
+        """Stop Loss 주문"""
+        return run_sync(self.create_stop_loss_async(symbol, side, quantity, stop_price))
+
+    def create_take_profit(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        take_profit_price: float
+    ) -> Dict[str, Any]:
+        """Take Profit 주문"""
+        return run_sync(self.create_take_profit_async(symbol, side, quantity, take_profit_price))
+
+    def create_bracket_orders(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        stop_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Stop Loss / Take Profit 동시 주문"""
+        return run_sync(self.create_bracket_orders_async(symbol, side, quantity, stop_price, take_profit_price))
+
+    def close_position(self, symbol: str) -> Dict[str, Any]:
+        """포지션 전체 청산"""
+        return run_sync(self.close_position_async(symbol))
+
+    def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """주문 취소"""
+        return run_sync(self.cancel_order_async(symbol, order_id))
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """미체결 주문 조회"""
+        return run_sync(self.get_open_orders_async(symbol))
+
+    def get_current_price(self, symbol: str) -> float:
+        """현재 시장가 조회"""
+        return run_sync(self.get_current_price_async(symbol))
+
+    def get_24h_ticker(self, symbol: str) -> Dict[str, Any]:
+        """24시간 통계 조회"""
+        return run_sync(self.get_24h_ticker_async(symbol))
+
+    def get_all_prices(self) -> Dict[str, float]:
+        """전체 심볼 현재가 조회"""
+        return run_sync(self.get_all_prices_async())
+
+    def get_all_24h_tickers(self) -> Dict[str, Dict[str, Any]]:
+        """전체 심볼 24시간 통계 조회"""
+        return run_sync(self.get_all_24h_tickers_async())
+
+    def get_order_book(self, symbol: str, limit: int = 1000) -> Dict[str, Any]:
+        """호가창 스냅샷 조회"""
+        return run_sync(self.get_order_book_async(symbol, limit))
+
+    def validate_credentials(self) -> Dict[str, Any]:
+        """API 키 유효성 검증"""
+        return run_sync(self.validate_credentials_async())
@@ -0,0 +1,174 @@
+"""
+거래소 클라이언트 캐시
+
+계정(ApiKey.id)별로 복호화된 자격증명으로 만든 BinanceClient/OKXClient 인스턴스를
+메모리에 보관합니다. 같은 계정을 반복 조회할 때 Fernet 복호화와 클라이언트 생성을
+건너뜁니다 (HTTP 커넥션 풀은 http_transport가 base_url별로 이미 공유).
+
+Usage:
+    client = client_cache.get(api_key_record)
+    balance = await account_state.get_balance(client)
+
+    # 자격증명 수정 / 삭제 / 활성화 토글 후
+    client_cache.invalidate(api_key_record.id)
+
+Features:
+- 평문 자격증명은 프로세스 메모리에만 존재 (Redis/디스크에 기록하지 않음)
+- TTL 만료 후 다시 복호화
+- 암호문 지문 비교 → 다른 워커가 자격증명을 바꿔도 다음 조회에서 재생성
+- LRU 상한 (max_size)
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
+
+from app.core.config import settings
+from app.core.crypto import crypto_service
+from app.models.api_key import ApiKey
+from app.services.account_state import account_state
+from app.services.binance_client import BinanceClient
+from app.services.okx_client import OKXClient
+
+logger = logging.getLogger(__name__)
+
+ExchangeClient = Union[BinanceClient, OKXClient]
+
+
+def _fingerprint(account: ApiKey) -> str:
+    """암호문 기반 지문 (평문은 사용하지 않음)"""
+    parts = (
+        account.exchange.lower(),
+        str(bool(account.testnet)),
+        account.api_key or "",
+        account.api_secret or "",
+        account.passphrase or ""
+    )
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+
+
+class ExchangeClientCache:
+    """계정별 거래소 클라이언트 캐시"""
+
+    def __init__(self, ttl: float = 900.0, max_size: int = 1000):
+        """
+        Args:
+            ttl: 클라이언트 보관 시간 (초)
+            max_size: 최대 보관 계정 수
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[str, ExchangeClient, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+
+    def get(self, account: ApiKey) -> ExchangeClient:
+        """
+        계정의 거래소 클라이언트 조회 (없으면 복호화 후 생성)
+
+        Raises:
+            ValueError: 지원하지 않는 거래소
+            Exception: 복호화 실패
+        """
+        key = str(account.id)
+        fingerprint = _fingerprint(account)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached_fingerprint, client, expires_at = entry
+                if cached_fingerprint == fingerprint and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return client
+                self._entries.pop(key)
+
+        stale_client = entry[1] if entry is not None and entry[0] != fingerprint else None
+        if stale_client is not None:
+            self._forget(stale_client)
+
+        client = self._build(account)
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self._entries[key] = (fingerprint, client, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+        return client
+
+    def invalidate(self, account_id: Any):
+        """계정 캐시 제거 (자격증명 수정 / 삭제 / 활성화 토글 후 호출)"""
+        with self._lock:
+            entry = self._entries.pop(str(account_id), None)
+            if entry is not None:
+                self.stats["invalidations"] += 1
+
+        if entry is not None:
+            self._forget(entry[1])
+
+    def clear(self):
+        """전체 캐시 제거"""
+        with self._lock:
+            self._entries.clear()
+
+    def _build(self, account: ApiKey) -> ExchangeClient:
+        exchange = account.exchange.lower()
+        encrypted = {
+            "api_key": account.api_key,
+            "api_secret": account.api_secret
+        }
+        if account.passphrase:
+            encrypted["passphrase"] = account.passphrase
+        decrypted = crypto_service.decrypt_api_credentials(encrypted)
+
+        if exchange == "binance":
+            return BinanceClient(
+                api_key=decrypted["api_key"],
+                api_secret=decrypted["api_secret"],
+                testnet=account.testnet
+            )
+        if exchange == "okx":
+            return OKXClient(
+                api_key=decrypted["api_key"],
+                api_secret=decrypted["api_secret"],
+                passphrase=decrypted.get("passphrase", ""),
+                testnet=account.testnet
+            )
+        raise ValueError(f"Unsupported exchange: {account.exchange}")
+
+    def _forget(self, client: ExchangeClient):
+        """이전 자격증명으로 열린 프라이빗 스트림 종료"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        account_state.forget(client)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 (자격증명은 포함하지 않음)"""
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "hit_rate": f"{(self.stats['hits'] / total * 100) if total else 0:.2f}%"
+        }
+
+
+# 전역 클라이언트 캐시
+client_cache = ExchangeClientCache(
+    ttl=settings.CLIENT_CACHE_TTL,
+    max_size=settings.CLIENT_CACHE_MAX_SIZE
+)
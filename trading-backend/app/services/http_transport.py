@@ -0,0 +1,141 @@
+"""
+거래소 HTTP 전송 계층
+
+BinanceClient / OKXClient가 공유하는 비동기 HTTP 연결 풀입니다.
+요청마다 새 TLS 연결을 맺지 않고 base URL별 keep-alive 연결을 재사용합니다.
+
+Features:
+- httpx.AsyncClient 연결 풀 (base URL + 이벤트 루프 단위로 공유)
+- HTTP/2 지원 (h2 패키지가 설치된 경우)
+- 설정 가능한 풀 크기/keep-alive/타임아웃
+- 동기 API용 백그라운드 이벤트 루프 (run_sync)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# (이벤트 루프, base URL) → 공유 클라이언트
+# httpx.AsyncClient는 생성된 루프에 묶이므로 루프별로 분리합니다.
+_clients: Dict[Tuple[asyncio.AbstractEventLoop, str], httpx.AsyncClient] = {}
+
+# 동기 래퍼용 백그라운드 루프
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_thread: Optional[threading.Thread] = None
+_sync_lock = threading.Lock()
+
+
+def _build_client(base_url: str) -> httpx.AsyncClient:
+    """연결 풀 설정이 적용된 AsyncClient 생성"""
+    limits = httpx.Limits(
+        max_connections=settings.EXCHANGE_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.EXCHANGE_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.EXCHANGE_HTTP_KEEPALIVE_EXPIRY
+    )
+
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=settings.EXCHANGE_HTTP2 and HTTP2_AVAILABLE,
+        limits=limits,
+        timeout=settings.EXCHANGE_HTTP_TIMEOUT
+    )
+
+
+def get_client(base_url: str) -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프에서 base URL에 대한 공유 클라이언트 반환
+
+    실행 중인 이벤트 루프 안에서 호출해야 합니다.
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, base_url)
+
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        # 종료된 루프의 클라이언트 정리
+        for stale in [k for k in _clients if k[0].is_closed()]:
+            _clients.pop(stale, None)
+
+        client = _build_client(base_url)
+        _clients[key] = client
+        logger.info(
+            f"Exchange HTTP pool created for {base_url} "
+            f"(http2={settings.EXCHANGE_HTTP2 and HTTP2_AVAILABLE})"
+        )
+
+    return client
+
+
+def _ensure_sync_loop() -> asyncio.AbstractEventLoop:
+    """동기 래퍼용 백그라운드 이벤트 루프 시작 (최초 1회)"""
+    global _sync_loop, _sync_thread
+
+    with _sync_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            _sync_loop = asyncio.new_event_loop()
+            _sync_thread = threading.Thread(
+                target=_sync_loop.run_forever,
+                name="exchange-http",
+                daemon=True
+            )
+            _sync_thread.start()
+
+    return _sync_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    코루틴을 백그라운드 루프에서 실행하고 결과를 반환 (동기 API용)
+
+    호출 스레드만 블로킹되며, 연결 풀은 백그라운드 루프에서 재사용됩니다.
+    """
+    loop = _ensure_sync_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def _close_loop_clients():
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _clients if k[0] is loop]:
+        client = _clients.pop(key)
+        await client.aclose()
+
+
+async def close_all():
+    """
+    모든 연결 풀 종료 (애플리케이션 종료 시)
+
+    현재 루프의 클라이언트와 백그라운드 루프를 함께 정리합니다.
+    """
+    global _sync_loop, _sync_thread
+
+    await _close_loop_clients()
+
+    with _sync_lock:
+        loop, thread = _sync_loop, _sync_thread
+        _sync_loop, _sync_thread = None, None
+
+    if loop is not None and loop.is_running():
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(_close_loop_clients(), loop)
+        )
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            await asyncio.to_thread(thread.join, 5)
+        loop.close()
+
+    logger.info("Exchange HTTP pools closed")
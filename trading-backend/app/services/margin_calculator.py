@@ -211,16 +211,25 @@ class MarginCalculator:
         available_balance: float,
         mark_price: float,
         leverage: int,
-        max_position_pct: float = 0.10
+        max_position_pct: float = 0.10,
+        order_book=None,
+        side: str = "BUY",
+        max_slippage_bps: Optional[float] = None
     ) -> float:
         """
         Calculate maximum safe position size based on available balance
 
+        If a synced order book is given, the size is also capped to the
+        liquidity available within max_slippage_bps of the mid price.
+
         Args:
             available_balance: Available wallet balance in USDT
             mark_price: Current mark price
             leverage: Desired leverage
             max_position_pct: Maximum % of balance to risk (default 10%)
+            order_book: Optional LocalOrderBook for liquidity capping
+            side: Order side for liquidity capping ('BUY'/'LONG' or 'SELL'/'SHORT')
+            max_slippage_bps: Slippage budget in basis points (required with order_book)
 
         Returns:
             Maximum position size in base currency
@@ -235,6 +244,15 @@ class MarginCalculator:
         # Convert to base currency quantity
         max_position_size = max_position_value / mark_price
 
+        # Cap to book liquidity within the slippage budget
+        if order_book is not None and max_slippage_bps is not None:
+            liquidity = order_book.max_quantity_within_slippage(side, max_slippage_bps)
+            if liquidity < max_position_size:
+                logger.info(f"Max Position Size capped by liquidity: {max_position_size:.4f} -> {liquidity:.4f} "
+                           f"({side} within {max_slippage_bps:.1f} bps)")
+                max_position_size = liquidity
+                max_position_value = max_position_size * mark_price
+
         logger.info(f"Max Position Size: {max_position_size:.4f} "
                    f"(Value: ${max_position_value:.2f}, Balance: ${available_balance:.2f}, "
                    f"Leverage: {leverage}x, Risk: {max_position_pct:.1%})")
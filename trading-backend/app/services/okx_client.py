@@ -6,18 +6,24 @@ Features:
 - 포지션 관리
 - 레버리지 설정
 - Stop Loss / Take Profit
+- 비동기 연결 풀 (keep-alive, HTTP/2) + 동기 래퍼
 """
 
 from typing import Dict, Any, Optional, List
 import hmac
 import hashlib
 import base64
+import json
 import time
-import requests
+import httpx
 from datetime import datetime
+from urllib.parse import urlencode
 import logging
 
-from app.core.stability import with_retry, RetryStrategy
+from app.core.stability import with_async_retry, RetryStrategy
+from app.core.rate_budget import request_budget
+from app.core.single_flight import single_flight
+from app.services.http_transport import get_client, run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -61,33 +67,93 @@ class OKXClient:
             "Content-Type": "application/json"
         }
 
-    @with_retry(max_attempts=3, strategy=RetryStrategy.EXPONENTIAL)
-    def _request(
+    def ws_login_message(self) -> Dict[str, Any]:
+        """Private WebSocket 로그인 메시지 (서명 경로: GET /users/self/verify)"""
+        timestamp = str(int(time.time()))
+        return {
+            "op": "login",
+            "args": [{
+                "apiKey": self.api_key,
+                "passphrase": self.passphrase,
+                "timestamp": timestamp,
+                "sign": self._generate_signature(timestamp, "GET", "/users/self/verify")
+            }]
+        }
+
+    @property
+    def private_ws_url(self) -> str:
+        """Private WebSocket URL (모의투자는 별도 호스트)"""
+        if self.testnet:
+            return "wss://wspap.okx.com:8443/ws/v5/private?brokerId=9999"
+        return "wss://ws.okx.com:8443/ws/v5/private"
+
+    async def _arequest(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        API 요청
+
+        동일한 조회(GET) 요청이 동시에 진행 중이면 하나의 거래소 호출 결과를 공유합니다.
+        주문 등 상태 변경 요청은 병합하지 않습니다.
+        """
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported method: {method}")
+
+        if method != "GET":
+            return await self._send(method, endpoint, params=params, body=body)
+
+        key = (
+            "okx", self.base_url, self.api_key, endpoint,
+            tuple(sorted((params or {}).items()))
+        )
+        return await single_flight.do(
+            key, lambda: self._send(method, endpoint, params=params, body=body)
+        )
+
+    @with_async_retry(max_attempts=3, strategy=RetryStrategy.EXPONENTIAL)
+    async def _send(
         self,
         method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         body: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """API 요청"""
-        url = f"{self.base_url}{endpoint}"
+        """API 요청 전송 (공유 연결 풀 사용)"""
+
+        # OKX 서명은 쿼리스트링을 포함한 경로 기준
+        request_path = endpoint
+        if params:
+            request_path = f"{endpoint}?{urlencode(params)}"
 
         # Body JSON 문자열
-        body_str = ""
-        if body:
-            import json
-            body_str = json.dumps(body)
+        body_str = json.dumps(body) if body else ""
+
+        # 엔드포인트별 요청 예산 확보 (서명 타임스탬프 이전)
+        await request_budget.acquire_okx(endpoint, account=self.api_key)
 
         # 헤더 생성
-        headers = self._get_headers(method, endpoint, body_str)
+        headers = self._get_headers(method, request_path, body_str)
 
         try:
-            if method == "GET":
-                response = requests.get(url, params=params, headers=headers, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, data=body_str, headers=headers, timeout=10)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            client = get_client(self.base_url)
+            response = await client.request(
+                method,
+                request_path,
+                content=body_str if method == "POST" else None,
+                headers=headers
+            )
+
+            if response.status_code == 429:
+                await request_budget.observe_rate_limited(
+                    "okx",
+                    request_budget.okx_bucket(endpoint),
+                    response.headers.get("Retry-After"),
+                    account=self.api_key
+                )
 
             response.raise_for_status()
             result = response.json()
@@ -98,13 +164,23 @@ class OKXClient:
 
             return result.get("data", [])
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"OKX API request failed: {str(e)}")
             raise
 
-    def get_account_balance(self) -> Dict[str, Any]:
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """API 요청 (동기 래퍼)"""
+        return run_sync(self._arequest(method, endpoint, params=params, body=body))
+
+    async def get_account_balance_async(self) -> Dict[str, Any]:
         """계좌 잔액 조회"""
-        result = self._request("GET", "/api/v5/account/balance")
+        result = await self._arequest("GET", "/api/v5/account/balance")
 
         if not result:
             return {
@@ -126,31 +202,24 @@ class OKXClient:
             "total_balance": float(usdt_detail["eq"])
         }
 
-    def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_positions_async(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """포지션 조회"""
         params = {}
         if symbol:
             # OKX 형식: BTC-USDT-SWAP
             params["instId"] = symbol
 
-        result = self._request("GET", "/api/v5/account/positions", params=params)
+        result = await self._arequest("GET", "/api/v5/account/positions", params=params)
 
         active_positions = [
-            {
-                "symbol": pos["instId"],
-                "position_amt": float(pos["pos"]),
-                "entry_price": float(pos["avgPx"]),
-                "unrealized_pnl": float(pos["upl"]),
-                "leverage": int(float(pos["lever"])),
-                "side": pos["posSide"]  # long or short
-            }
+            self._parse_position(pos)
             for pos in result
             if float(pos["pos"]) != 0
         ]
 
         return active_positions
 
-    def set_leverage(self, symbol: str, leverage: int, margin_mode: str = "cross") -> Dict[str, Any]:
+    async def set_leverage_async(self, symbol: str, leverage: int, margin_mode: str = "cross") -> Dict[str, Any]:
         """레버리지 설정"""
         body = {
             "instId": symbol,
@@ -158,7 +227,7 @@ class OKXClient:
             "mgnMode": margin_mode  # cross or isolated
         }
 
-        result = self._request("POST", "/api/v5/account/set-leverage", body=body)
+        result = await self._arequest("POST", "/api/v5/account/set-leverage", body=body)
 
         logger.info(f"Leverage set: {symbol} = {leverage}x ({margin_mode})")
 
@@ -168,14 +237,21 @@ class OKXClient:
             "margin_mode": margin_mode
         }
 
-    def create_market_order(
+    async def create_market_order_async(
         self,
         symbol: str,
         side: str,  # buy or sell
         quantity: float,
-        position_side: str = "net"  # net, long, short
+        position_side: str = "net",  # net, long, short
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None
     ) -> Dict[str, Any]:
-        """시장가 주문"""
+        """
+        시장가 주문
+
+        stop_loss / take_profit 지정 시 attachAlgoOrds로 진입 주문에 함께 첨부합니다.
+        OKX는 첨부 주문이 유효하지 않으면 진입 주문 전체를 거부하므로 부분 체결 상태가 남지 않습니다.
+        """
         body = {
             "instId": symbol,
             "tdMode": "cross",  # cross margin
@@ -185,7 +261,17 @@ class OKXClient:
             "posSide": position_side
         }
 
-        result = self._request("POST", "/api/v5/trade/order", body=body)
+        if stop_loss or take_profit:
+            algo = {}
+            if stop_loss:
+                algo["slTriggerPx"] = str(stop_loss)
+                algo["slOrdPx"] = "-1"  # 트리거 시 시장가
+            if take_profit:
+                algo["tpTriggerPx"] = str(take_profit)
+                algo["tpOrdPx"] = "-1"
+            body["attachAlgoOrds"] = [algo]
+
+        result = await self._arequest("POST", "/api/v5/trade/order", body=body)
 
         if not result:
             raise Exception("Order creation failed")
@@ -206,7 +292,7 @@ class OKXClient:
             "status": order_data["sCode"]  # Success code
         }
 
-    def create_limit_order(
+    async def create_limit_order_async(
         self,
         symbol: str,
         side: str,  # buy or sell
@@ -225,7 +311,7 @@ class OKXClient:
             "posSide": position_side
         }
 
-        result = self._request("POST", "/api/v5/trade/order", body=body)
+        result = await self._arequest("POST", "/api/v5/trade/order", body=body)
 
         if not result:
             raise Exception("Order creation failed")
@@ -247,10 +333,22 @@ class OKXClient:
             "status": order_data["sCode"]
         }
 
-    def close_position(self, symbol: str, position_side: str = "net") -> Dict[str, Any]:
-        """포지션 전체 청산"""
+    async def close_position_async(
+        self,
+        symbol: str,
+        position_side: str = "net",
+        position: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        포지션 전체 청산
+
+        Args:
+            symbol: 심볼
+            position_side: 포지션 방향 (net, long, short)
+            position: 이미 알고 있는 포지션 (get_positions_async 형식, 지정 시 조회 생략)
+        """
         # 현재 포지션 조회
-        positions = self.get_positions(symbol=symbol)
+        positions = [position] if position else await self.get_positions_async(symbol=symbol)
 
         if not positions:
             return {
@@ -274,7 +372,7 @@ class OKXClient:
             "cxlOnClosePos": "true"  # 포지션 청산 시 미체결 주문 자동 취소
         }
 
-        result = self._request("POST", "/api/v5/trade/close-position", body=body)
+        result = await self._arequest("POST", "/api/v5/trade/close-position", body=body)
 
         logger.info(f"Position closed: {symbol}")
 
@@ -284,14 +382,14 @@ class OKXClient:
             "result": result
         }
 
-    def cancel_order(self, symbol: str, order_id: str) -> Dict[str, Any]:
+    async def cancel_order_async(self, symbol: str, order_id: str) -> Dict[str, Any]:
         """주문 취소"""
         body = {
             "instId": symbol,
             "ordId": order_id
         }
 
-        result = self._request("POST", "/api/v5/trade/cancel-order", body=body)
+        result = await self._arequest("POST", "/api/v5/trade/cancel-order", body=body)
 
         logger.info(f"Order cancelled: {symbol} orderId={order_id}")
 
@@ -301,24 +399,69 @@ class OKXClient:
             "status": "cancelled"
         }
 
-    def get_current_price(self, symbol: str) -> float:
+    async def get_current_price_async(self, symbol: str) -> float:
         """현재 시장가 조회"""
-        result = self._request("GET", f"/api/v5/market/ticker", params={"instId": symbol})
+        result = await self._arequest("GET", f"/api/v5/market/ticker", params={"instId": symbol})
 
         if not result:
             raise Exception(f"Failed to get price for {symbol}")
 
         return float(result[0]["last"])
 
-    def get_24h_ticker(self, symbol: str) -> Dict[str, Any]:
+    async def get_24h_ticker_async(self, symbol: str) -> Dict[str, Any]:
         """24시간 통계 조회"""
-        result = self._request("GET", "/api/v5/market/ticker", params={"instId": symbol})
+        result = await self._arequest("GET", "/api/v5/market/ticker", params={"instId": symbol})
 
         if not result:
             raise Exception(f"Failed to get 24h ticker for {symbol}")
 
-        ticker = result[0]
+        return self._parse_24h_ticker(result[0])
+
+    async def get_all_24h_tickers_async(self, inst_type: str = "SWAP") -> Dict[str, Dict[str, Any]]:
+        """
+        전체 심볼 24시간 통계 조회 (단일 요청)
+
+        Args:
+            inst_type: 상품 유형 (SWAP, FUTURES, SPOT)
+
+        Returns:
+            {거래소 심볼: 24시간 통계}
+        """
+        result = await self._arequest("GET", "/api/v5/market/tickers", params={"instType": inst_type})
+        return {ticker["instId"]: self._parse_24h_ticker(ticker) for ticker in result}
+
+    async def get_all_prices_async(self, inst_type: str = "SWAP") -> Dict[str, float]:
+        """
+        전체 심볼 현재가 조회 (단일 요청)
+
+        Returns:
+            {거래소 심볼: 현재가}
+        """
+        result = await self._arequest("GET", "/api/v5/market/tickers", params={"instType": inst_type})
+        return {ticker["instId"]: float(ticker["last"]) for ticker in result}
+
+    @staticmethod
+    def _parse_position(pos: Dict[str, Any]) -> Dict[str, Any]:
+        """포지션 응답 / positions 채널 항목을 공통 형식으로 변환"""
+        amount = float(pos["pos"])
+        mark_price = float(pos.get("markPx") or 0)
+        notional = float(pos.get("notionalUsd") or 0)
 
+        return {
+            "symbol": pos["instId"],
+            "position_amt": amount,
+            "entry_price": float(pos["avgPx"]),
+            "unrealized_pnl": float(pos["upl"]),
+            "leverage": int(float(pos["lever"])),
+            "side": pos["posSide"],  # long, short or net
+            "liquidation_price": float(pos.get("liqPx") or 0) or None,
+            # 계약당 기초자산 수량 (수량이 계약 단위라 손익 재계산에 필요)
+            "contract_value": notional / (abs(amount) * mark_price) if amount and mark_price and notional else None
+        }
+
+    @staticmethod
+    def _parse_24h_ticker(ticker: Dict[str, Any]) -> Dict[str, Any]:
+        """티커 응답을 24시간 통계 형식으로 변환"""
         return {
             "symbol": ticker["instId"],
             "price_change": float(ticker["last"]) - float(ticker["open24h"]),
@@ -333,7 +476,7 @@ class OKXClient:
             "count": 0  # OKX는 거래 횟수 제공 안함
         }
 
-    def validate_credentials(self) -> Dict[str, Any]:
+    async def validate_credentials_async(self) -> Dict[str, Any]:
         """
         API 키 유효성 검증
 
@@ -348,7 +491,7 @@ class OKXClient:
         """
         try:
             # 계정 잔액 조회를 통해 API 키 유효성 검증
-            account_info = self.get_account_balance()
+            account_info = await self.get_account_balance_async()
 
             return {
                 "valid": True,
@@ -360,7 +503,7 @@ class OKXClient:
                 }
             }
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             # HTTP 에러 처리
             if e.response.status_code == 401:
                 return {
@@ -405,3 +548,68 @@ class OKXClient:
                     "valid": False,
                     "message": f"Validation error: {error_message}"
                 }
+
+    # ===== 동기 API (기존 호출자 호환용 래퍼) =====
+
+    def get_account_balance(self) -> Dict[str, Any]:
+        """계좌 잔액 조회"""
+        return run_sync(self.get_account_balance_async())
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """포지션 조회"""
+        return run_sync(self.get_positions_async(symbol))
+
+    def set_leverage(self, symbol: str, leverage: int, margin_mode: str = "cross") -> Dict[str, Any]:
+        """레버리지 설정"""
+        return run_sync(self.set_leverage_async(symbol, leverage, margin_mode))
+
+    def create_market_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        position_side: str = "net",
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """시장가 주문"""
+        return run_sync(self.create_market_order_async(symbol, side, quantity, position_side, stop_loss, take_profit))
+
+    def create_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        position_side: str = "net"
+    ) -> Dict[str, Any]:
+        """지정가 주문"""
+        return run_sync(self.create_limit_order_async(symbol, side, quantity, price, position_side))
+
+    def close_position(self, symbol: str, position_side: str = "net") -> Dict[str, Any]:
+        """포지션 전체 청산"""
+        return run_sync(self.close_position_async(symbol, position_side))
+
+    def cancel_order(self, symbol: str, order_id: str) -> Dict[str, Any]:
+        """주문 취소"""
+        return run_sync(self.cancel_order_async(symbol, order_id))
+
+    def get_current_price(self, symbol: str) -> float:
+        """현재 시장가 조회"""
+        return run_sync(self.get_current_price_async(symbol))
+
+    def get_24h_ticker(self, symbol: str) -> Dict[str, Any]:
+        """24시간 통계 조회"""
+        return run_sync(self.get_24h_ticker_async(symbol))
+
+    def get_all_prices(self, inst_type: str = "SWAP") -> Dict[str, float]:
+        """전체 심볼 현재가 조회"""
+        return run_sync(self.get_all_prices_async(inst_type))
+
+    def get_all_24h_tickers(self, inst_type: str = "SWAP") -> Dict[str, Dict[str, Any]]:
+        """전체 심볼 24시간 통계 조회"""
+        return run_sync(self.get_all_24h_tickers_async(inst_type))
+
+    def validate_credentials(self) -> Dict[str, Any]:
+        """API 키 유효성 검증"""
+        return run_sync(self.validate_credentials_async())
@@ -0,0 +1,524 @@
+"""
+로컬 호가창 미러 (L2 Order Book)
+
+Binance Futures 호가 스냅샷 + diff 스트림으로 심볼별 L2 호가창을 유지합니다.
+주문 전 슬리피지 추정과 유동성 기반 수량 산정에 사용됩니다.
+
+Features:
+- 정렬 배열 기반 호가 (bisect) → 상위 N호가/VWAP 조회가 빠름
+- 시퀀스 갭 감지 (pu != 이전 u) 시 스냅샷 재동기화
+- 스냅샷/이벤트 소스 주입 가능 → 로컬 리플레이 피드로 검증 가능
+- diff 스트림은 공용 WebSocket 연결 풀(binance_futures)에 멀티플렉싱
+- 자동 재연결 (Exponential Backoff, 풀 재연결 뒤 끊긴 구간은 시퀀스 갭으로 재동기화)
+
+동기화 규칙 (Binance USDS-M Futures):
+1. 스트림을 먼저 열고 이벤트를 버퍼링
+2. REST 스냅샷 조회 (lastUpdateId)
+3. u < lastUpdateId 인 이벤트는 폐기
+4. 첫 이벤트는 U <= lastUpdateId <= u 를 만족해야 함
+5. 이후 이벤트의 pu는 직전 이벤트의 u와 같아야 함 (아니면 재동기화)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.binance_client import BinanceClient
+from app.services.websocket_pool import websocket_pool
+
+logger = logging.getLogger(__name__)
+
+# 연결 풀의 Binance USDS-M 선물 combined stream
+DEPTH_POOL_EXCHANGE = "binance_futures"
+
+SnapshotFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+EventSource = Callable[[], AsyncIterator[Dict[str, Any]]]
+
+
+class OrderBookGapError(Exception):
+    """diff 이벤트 시퀀스 갭 (재동기화 필요)"""
+    pass
+
+
+def _is_buy(side: str) -> bool:
+    """매수 방향 여부 (BUY/LONG → 매도 호가 소진)"""
+    return side.upper() in ("BUY", "LONG")
+
+
+class BookSide:
+    """
+    한쪽 호가 (정렬 배열)
+
+    키를 오름차순으로 유지하고, 매수 호가는 가격에 -1을 곱해 저장하므로
+    양쪽 모두 인덱스 0이 최우선 호가입니다.
+    """
+
+    def __init__(self, descending: bool):
+        self._sign = -1.0 if descending else 1.0
+        self._keys: List[float] = []
+        self._quantities: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys.clear()
+        self._quantities.clear()
+
+    def update(self, price: float, quantity: float):
+        """호가 갱신 (수량 0이면 삭제)"""
+        key = self._sign * price
+        i = bisect_left(self._keys, key)
+        found = i < len(self._keys) and self._keys[i] == key
+
+        if quantity == 0:
+            if found:
+                del self._keys[i]
+                del self._quantities[i]
+        elif found:
+            self._quantities[i] = quantity
+        else:
+            self._keys.insert(i, key)
+            self._quantities.insert(i, quantity)
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        """최우선 호가 (가격, 수량)"""
+        if not self._keys:
+            return None
+        return self._sign * self._keys[0], self._quantities[0]
+
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        """상위 N호가 [(가격, 수량), ...]"""
+        return [
+            (self._sign * key, quantity)
+            for key, quantity in zip(self._keys[:n], self._quantities[:n])
+        ]
+
+    def walk(self, quantity: float) -> Tuple[float, float]:
+        """
+        시장가로 quantity만큼 체결 시 소진되는 호가 계산
+
+        Returns:
+            (체결 수량, 체결 금액)
+        """
+        filled = 0.0
+        notional = 0.0
+
+        for key, level_qty in zip(self._keys, self._quantities):
+            take = min(level_qty, quantity - filled)
+            filled += take
+            notional += take * self._sign * key
+            if filled >= quantity:
+                break
+
+        return filled, notional
+
+    def quantity_within(self, limit_price: float) -> Tuple[float, float]:
+        """
+        limit_price 이내(같거나 유리한) 호가의 누적 수량/금액
+
+        Returns:
+            (누적 수량, 누적 금액)
+        """
+        end = bisect_right(self._keys, self._sign * limit_price)
+        quantity = sum(self._quantities[:end], 0.0)
+        notional = sum(
+            self._sign * key * qty
+            for key, qty in zip(self._keys[:end], self._quantities[:end])
+        )
+        return quantity, notional
+
+
+class LocalOrderBook:
+    """심볼별 L2 호가창"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id: Optional[int] = None
+        self.last_update_time: Optional[float] = None
+        self.synced = False
+        self._awaiting_first_event = False
+
+    # ===== 동기화 =====
+
+    def load_snapshot(self, snapshot: Dict[str, Any]):
+        """REST 스냅샷으로 호가창 초기화"""
+        self.bids.clear()
+        self.asks.clear()
+
+        for price, quantity in snapshot["bids"]:
+            self.bids.update(float(price), float(quantity))
+        for price, quantity in snapshot["asks"]:
+            self.asks.update(float(price), float(quantity))
+
+        self.last_update_id = int(snapshot["lastUpdateId"])
+        self.last_update_time = time.monotonic()
+        self._awaiting_first_event = True
+        self.synced = True
+
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """
+        depthUpdate 이벤트 적용
+
+        Returns:
+            적용 여부 (스냅샷 이전 이벤트는 False)
+
+        Raises:
+            OrderBookGapError: 시퀀스 갭 감지
+        """
+        if self.last_update_id is None:
+            raise OrderBookGapError(f"{self.symbol}: no snapshot loaded")
+
+        first_id, final_id = int(event["U"]), int(event["u"])
+
+        # 스냅샷 이전 이벤트 폐기
+        if final_id < self.last_update_id:
+            return False
+
+        if self._awaiting_first_event:
+            if first_id > self.last_update_id:
+                self.synced = False
+                raise OrderBookGapError(
+                    f"{self.symbol}: first event U={first_id} after snapshot {self.last_update_id}"
+                )
+            self._awaiting_first_event = False
+
+        elif int(event["pu"]) != self.last_update_id:
+            self.synced = False
+            raise OrderBookGapError(
+                f"{self.symbol}: pu={event['pu']} != last u={self.last_update_id}"
+            )
+
+        for price, quantity in event["b"]:
+            self.bids.update(float(price), float(quantity))
+        for price, quantity in event["a"]:
+            self.asks.update(float(price), float(quantity))
+
+        self.last_update_id = final_id
+        self.last_update_time = time.monotonic()
+        return True
+
+    # ===== 조회 =====
+
+    @property
+    def age(self) -> float:
+        """마지막 갱신 이후 경과 시간 (초)"""
+        if self.last_update_time is None:
+            return float("inf")
+        return time.monotonic() - self.last_update_time
+
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def mid_price(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread_bps(self) -> Optional[float]:
+        bid, ask, mid = self.best_bid(), self.best_ask(), self.mid_price()
+        if not mid:
+            return None
+        return (ask - bid) / mid * 10000
+
+    def top(self, n: int = 10) -> Dict[str, List[Tuple[float, float]]]:
+        """상위 N호가"""
+        return {"bids": self.bids.top(n), "asks": self.asks.top(n)}
+
+    def vwap(self, side: str, quantity: float) -> Optional[float]:
+        """
+        시장가 주문 예상 평균 체결가
+
+        Args:
+            side: BUY/LONG (매도 호가 소진) 또는 SELL/SHORT (매수 호가 소진)
+            quantity: 주문 수량
+
+        Returns:
+            VWAP (호가 잔량 부족 시 None)
+        """
+        book_side = self.asks if _is_buy(side) else self.bids
+        filled, notional = book_side.walk(quantity)
+        if quantity <= 0 or filled < quantity:
+            return None
+        return notional / filled
+
+    def estimate_slippage(self, side: str, quantity: float) -> Dict[str, Any]:
+        """
+        주문 전 슬리피지 추정
+
+        Returns:
+            {mid_price, vwap, slippage_bps, filled_quantity, fully_filled}
+        """
+        book_side = self.asks if _is_buy(side) else self.bids
+        filled, notional = book_side.walk(quantity)
+        mid = self.mid_price()
+        vwap = notional / filled if filled > 0 else None
+
+        slippage_bps = None
+        if vwap is not None and mid:
+            slippage_bps = (vwap - mid) / mid * 10000
+            if not _is_buy(side):
+                slippage_bps = -slippage_bps
+
+        return {
+            "symbol": self.symbol,
+            "side": side.upper(),
+            "quantity": quantity,
+            "mid_price": mid,
+            "vwap": vwap,
+            "slippage_bps": slippage_bps,
+            "filled_quantity": filled,
+            "fully_filled": filled >= quantity
+        }
+
+    def max_quantity_within_slippage(self, side: str, max_slippage_bps: float) -> float:
+        """
+        중간가 대비 max_slippage_bps 이내에서 체결 가능한 최대 수량
+
+        한도 가격 이내 호가만 소진하므로 평균 슬리피지도 한도를 넘지 않습니다.
+        """
+        mid = self.mid_price()
+        if not mid:
+            return 0.0
+
+        if _is_buy(side):
+            quantity, _ = self.asks.quantity_within(mid * (1 + max_slippage_bps / 10000))
+        else:
+            quantity, _ = self.bids.quantity_within(mid * (1 - max_slippage_bps / 10000))
+        return quantity
+
+
+def binance_snapshot_fetcher(symbol: str, limit: int = 1000) -> SnapshotFetcher:
+    """Binance Futures REST 스냅샷 조회 함수 생성"""
+    client = BinanceClient(api_key="", api_secret="", testnet=False)
+
+    async def fetch() -> Dict[str, Any]:
+        return await client.get_order_book_async(symbol, limit)
+
+    return fetch
+
+
+def binance_depth_source(symbol: str) -> EventSource:
+    """
+    Binance Futures diff depth 스트림 이벤트 소스 생성
+
+    심볼마다 소켓을 열지 않고 연결 풀에 스트림을 구독합니다.
+    """
+    stream = f"{symbol.lower()}@depth@100ms"
+
+    async def events() -> AsyncIterator[Dict[str, Any]]:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def handler(event: Dict[str, Any]):
+            queue.put_nowait(event)
+
+        if await websocket_pool.subscribe(DEPTH_POOL_EXCHANGE, stream, handler) is None:
+            raise ConnectionError(f"No websocket pool capacity for {stream}")
+
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            await websocket_pool.unsubscribe(DEPTH_POOL_EXCHANGE, stream)
+
+    return events
+
+
+def replay_source(path: str, delay: float = 0.0) -> EventSource:
+    """
+    로컬 리플레이 피드 (녹화된 depthUpdate JSONL 파일)
+
+    Args:
+        path: 한 줄에 이벤트 하나씩 저장된 JSONL 파일
+        delay: 이벤트 간 지연 (초)
+    """
+    async def events() -> AsyncIterator[Dict[str, Any]]:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+                    await asyncio.sleep(delay)
+
+    return events
+
+
+class OrderBookSync:
+    """
+    스냅샷 + diff 스트림으로 LocalOrderBook 유지
+
+    스냅샷/이벤트 소스를 주입할 수 있어 리플레이 피드로 검증할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        book: LocalOrderBook,
+        fetch_snapshot: SnapshotFetcher,
+        events: EventSource
+    ):
+        self.book = book
+        self.fetch_snapshot = fetch_snapshot
+        self.events = events
+        self.resyncs = 0
+
+    async def run(self):
+        """
+        스트림 종료 시까지 호가창 동기화
+
+        Raises:
+            ConnectionError: 이벤트 스트림 종료
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read(queue))
+
+        try:
+            while True:
+                # 스트림을 먼저 열어 버퍼링한 뒤 스냅샷 적용
+                self.book.load_snapshot(await self.fetch_snapshot())
+                logger.info(f"Order book snapshot loaded: {self.book.symbol} (lastUpdateId={self.book.last_update_id})")
+
+                try:
+                    while True:
+                        event = await queue.get()
+                        if event is None:
+                            raise ConnectionError(f"Depth stream closed for {self.book.symbol}")
+                        self.book.apply_diff(event)
+
+                except OrderBookGapError as e:
+                    self.resyncs += 1
+                    logger.warning(f"Order book gap detected, resyncing: {e}")
+
+        finally:
+            self.book.synced = False
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+    async def _read(self, queue: asyncio.Queue):
+        try:
+            async for event in self.events():
+                await queue.put(event)
+        finally:
+            await queue.put(None)
+
+
+class OrderBookManager:
+    """심볼별 호가창 미러 관리"""
+
+    def __init__(self, depth_limit: int = 1000, max_age: float = 5.0, max_backoff: float = 60.0):
+        """
+        Args:
+            depth_limit: 스냅샷 호가 수
+            max_age: 이 시간(초) 이상 갱신이 없으면 조회 대상에서 제외
+            max_backoff: 재연결 최대 대기 (초)
+        """
+        self.depth_limit = depth_limit
+        self.max_age = max_age
+        self.max_backoff = max_backoff
+        self.books: Dict[str, LocalOrderBook] = {}
+        self.syncs: Dict[str, OrderBookSync] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def subscribe(
+        self,
+        symbol: str,
+        fetch_snapshot: Optional[SnapshotFetcher] = None,
+        events: Optional[EventSource] = None
+    ) -> LocalOrderBook:
+        """
+        심볼 호가창 미러 시작
+
+        Args:
+            symbol: Binance 형식 심볼 (예: BTCUSDT)
+            fetch_snapshot: 스냅샷 조회 함수 (기본: Binance REST)
+            events: diff 이벤트 소스 (기본: Binance WebSocket)
+        """
+        if symbol in self.tasks:
+            return self.books[symbol]
+
+        book = LocalOrderBook(symbol)
+        sync = OrderBookSync(
+            book,
+            fetch_snapshot or binance_snapshot_fetcher(symbol, self.depth_limit),
+            events or binance_depth_source(symbol)
+        )
+
+        self.books[symbol] = book
+        self.syncs[symbol] = sync
+        self.tasks[symbol] = asyncio.create_task(self._run(sync))
+        logger.info(f"Order book mirror started for {symbol}")
+
+        return book
+
+    async def unsubscribe(self, symbol: str):
+        """심볼 호가창 미러 중지"""
+        task = self.tasks.pop(symbol, None)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.books.pop(symbol, None)
+        self.syncs.pop(symbol, None)
+
+    async def stop(self):
+        """모든 미러 중지"""
+        for symbol in list(self.tasks):
+            await self.unsubscribe(symbol)
+
+    async def _run(self, sync: OrderBookSync):
+        """재연결 루프 (Exponential Backoff)"""
+        backoff = 1.0
+
+        while True:
+            try:
+                await sync.run()
+                backoff = 1.0
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception as e:
+                logger.warning(
+                    f"Order book mirror {sync.book.symbol} interrupted: {e}. "
+                    f"Reconnecting in {backoff:.0f}s"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def get(self, symbol: str) -> Optional[LocalOrderBook]:
+        """동기화된 최신 호가창 (없거나 오래되면 None)"""
+        book = self.books.get(symbol)
+        if book is None or not book.synced or book.age > self.max_age:
+            return None
+        return book
+
+    def estimate_slippage(self, symbol: str, side: str, quantity: float) -> Optional[Dict[str, Any]]:
+        """슬리피지 추정 (호가창 없으면 None)"""
+        book = self.get(symbol)
+        return book.estimate_slippage(side, quantity) if book else None
+
+    def get_status(self) -> Dict[str, Any]:
+        """미러 상태"""
+        return {
+            symbol: {
+                "synced": book.synced,
+                "lastUpdateId": book.last_update_id,
+                "age": round(book.age, 3) if book.last_update_time else None,
+                "levels": {"bids": len(book.bids), "asks": len(book.asks)},
+                "resyncs": self.syncs[symbol].resyncs if symbol in self.syncs else 0
+            }
+            for symbol, book in self.books.items()
+        }
+
+
+# 전역 호가창 미러 관리자
+order_book_manager = OrderBookManager(depth_limit=settings.ORDER_BOOK_DEPTH_LIMIT)
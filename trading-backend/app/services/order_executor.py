@@ -6,15 +6,28 @@ Features:
 - Binance/OKX 자동 주문 실행
 - 리스크 관리 (포지션 크기, 레버리지)
 - 에러 처리 및 재시도
+- 진입 전 조회 병렬화, 보호 주문 일괄 전송 + 부분 실패 롤백
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from enum import Enum
+from decimal import Decimal
+import asyncio
 import logging
 
+from sqlalchemy import select
+
 from app.services.binance_client import BinanceClient
 from app.services.okx_client import OKXClient
-from app.core.stability import with_retry, RetryStrategy
+from app.services.price_book import price_book
+from app.services.order_book import order_book_manager
+from app.services.account_state import account_state
+from app.services.client_cache import client_cache
+from app.models.api_key import ApiKey
+from app.database.base import AsyncSessionLocal, SessionLocal, is_sqlite
+from app.core.config import settings
+from app.core.exceptions import OrderExecutionError
+from app.services.http_transport import run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -73,16 +86,79 @@ class OrderExecutor:
         )
         logger.info(f"OKX account registered: {account_id} (testnet={testnet})")
 
-    @with_retry(max_attempts=3, strategy=RetryStrategy.EXPONENTIAL)
+    async def load_account(self, account_id: str, exchange: Exchange) -> Optional[ApiKey]:
+        """
+        DB에 저장된 활성 계정 조회
+
+        실행 계정 ID는 "{user_id}_{ApiKey.id}" (accounts_secure 등록) 또는 ApiKey.id 입니다.
+        accounts.py로 메모리에만 등록한 계정은 DB에 없으므로 None을 반환합니다.
+        """
+        user_id, _, key_id = account_id.rpartition("_")
+        stmt = select(ApiKey).where(ApiKey.id == key_id, ApiKey.is_active == True)
+        if user_id:
+            stmt = stmt.where(ApiKey.user_id == user_id)
+
+        if is_sqlite:
+            def query() -> Optional[ApiKey]:
+                db = SessionLocal()
+                try:
+                    return db.execute(stmt).scalars().first()
+                finally:
+                    db.close()
+
+            account = await asyncio.to_thread(query)
+        else:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(stmt)
+                account = result.scalars().first()
+
+        if account is None or account.exchange.lower() != exchange.value:
+            return None
+        return account
+
+    async def get_client(self, account_id: str, exchange: Exchange) -> Union[BinanceClient, OKXClient]:
+        """
+        실행 클라이언트 조회 (프로세스 등록 → DB 계정 순)
+
+        웹훅 시그널은 파티션을 소유한 워커에서 실행되므로, 이 프로세스에 등록되지 않은
+        계정은 DB 자격증명으로 만든 클라이언트(client_cache)를 사용합니다.
+
+        Raises:
+            ValueError: 어느 쪽에서도 계정을 찾지 못함
+        """
+        registry = self.binance_clients if exchange == Exchange.BINANCE else self.okx_clients
+        client = registry.get(account_id)
+        if client is not None:
+            return client
+
+        account = await self.load_account(account_id, exchange)
+        if account is None:
+            name = "Binance" if exchange == Exchange.BINANCE else "OKX"
+            raise ValueError(f"{name} account not found: {account_id}")
+        return client_cache.get(account)
+
     def execute_signal(
         self,
         account_id: str,
         exchange: Exchange,
         signal: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """TradingView 시그널 실행 (동기 래퍼, 호출 스레드 블로킹)"""
+        return run_sync(self.execute_signal_async(account_id, exchange, signal))
+
+    async def execute_signal_async(
+        self,
+        account_id: str,
+        exchange: Exchange,
+        signal: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         TradingView 시그널 실행
 
+        이벤트 루프를 블로킹하지 않으므로 웹훅 핸들러에서 직접 await 합니다.
+        개별 요청 재시도는 클라이언트가 담당합니다. 시그널 전체를 재시도하면
+        롤백된 진입 주문이 다시 나가므로 여기서는 재시도하지 않습니다.
+
         Args:
             account_id: 계정 ID
             exchange: 거래소 (binance or okx)
@@ -108,9 +184,9 @@ class OrderExecutor:
 
             # 거래소별 실행
             if exchange == Exchange.BINANCE:
-                return self._execute_binance_signal(account_id, signal)
+                return await self._execute_binance_signal(account_id, signal)
             elif exchange == Exchange.OKX:
-                return self._execute_okx_signal(account_id, signal)
+                return await self._execute_okx_signal(account_id, signal)
             else:
                 raise ValueError(f"Unsupported exchange: {exchange}")
 
@@ -118,15 +194,19 @@ class OrderExecutor:
             logger.error(f"Signal execution failed: {str(e)}", exc_info=True)
             raise
 
-    def _execute_binance_signal(
+    async def _execute_binance_signal(
         self,
         account_id: str,
         signal: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Binance 시그널 실행"""
-        client = self.binance_clients.get(account_id)
-        if not client:
-            raise ValueError(f"Binance account not found: {account_id}")
+        """
+        Binance 시그널 실행
+
+        1) 레버리지 설정 / 잔고 / 현재가를 동시에 조회 (캐시·가격 장부로 생략 가능)
+        2) 시장가 진입
+        3) Stop Loss / Take Profit을 batchOrders 한 번으로 동시 주문 (실패 시 롤백)
+        """
+        client = await self.get_client(account_id, Exchange.BINANCE)
 
         action = SignalType(signal["action"])
         symbol = signal["symbol"]
@@ -137,85 +217,44 @@ class OrderExecutor:
 
         results = {}
 
-        # 레버리지 설정
-        if leverage:
-            results["leverage"] = client.set_leverage(symbol, leverage)
-
         # 액션별 실행
-        if action == SignalType.LONG:
-            # 롱 진입
-            if not quantity:
-                # 수량 미지정 시 계좌의 10% 사용
-                balance = client.get_account_balance()
-                available = balance["available_balance"]
-                quantity = self._calculate_quantity(
-                    available * 0.1,
-                    signal.get("price", client.get_current_price(symbol)),
-                    leverage or 1
-                )
-
-            results["entry"] = client.create_market_order(
-                symbol=symbol,
-                side="BUY",
-                quantity=quantity
-            )
+        if action in [SignalType.LONG, SignalType.SHORT]:
+            # 롱: BUY 진입 / SELL 보호 주문, 숏: 반대
+            side, exit_side = ("BUY", "SELL") if action == SignalType.LONG else ("SELL", "BUY")
 
-            # Stop Loss 설정
-            if stop_loss:
-                results["stop_loss"] = client.create_stop_loss(
-                    symbol=symbol,
-                    side="SELL",
-                    quantity=quantity,
-                    stop_price=stop_loss
-                )
-
-            # Take Profit 설정
-            if take_profit:
-                results["take_profit"] = client.create_take_profit(
-                    symbol=symbol,
-                    side="SELL",
-                    quantity=quantity,
-                    take_profit_price=take_profit
-                )
-
-        elif action == SignalType.SHORT:
-            # 숏 진입
+            quantity = await self._prefetch_and_size("binance", client, symbol, side, signal, results)
             if not quantity:
-                balance = client.get_account_balance()
-                available = balance["available_balance"]
-                quantity = self._calculate_quantity(
-                    available * 0.1,
-                    signal.get("price", client.get_current_price(symbol)),
-                    leverage or 1
-                )
+                # 호가 잔량이 최소 주문 수량에 못 미침 (사유는 _cap_to_liquidity 로그)
+                return {
+                    "success": False,
+                    "skipped": "insufficient_liquidity",
+                    "exchange": "binance",
+                    "account_id": account_id,
+                    "action": action.value,
+                    "symbol": symbol,
+                    "results": results
+                }
 
-            results["entry"] = client.create_market_order(
+            # 주문 전 슬리피지 추정 (호가창 미러가 있을 때)
+            results["slippage_estimate"] = order_book_manager.estimate_slippage(symbol, side, quantity)
+
+            results["entry"] = await client.create_market_order_async(
                 symbol=symbol,
-                side="SELL",
+                side=side,
                 quantity=quantity
             )
 
-            # Stop Loss 설정
-            if stop_loss:
-                results["stop_loss"] = client.create_stop_loss(
-                    symbol=symbol,
-                    side="BUY",
-                    quantity=quantity,
-                    stop_price=stop_loss
-                )
-
-            # Take Profit 설정
-            if take_profit:
-                results["take_profit"] = client.create_take_profit(
-                    symbol=symbol,
-                    side="BUY",
-                    quantity=quantity,
-                    take_profit_price=take_profit
-                )
+            # Stop Loss / Take Profit 동시 설정
+            if stop_loss or take_profit:
+                results.update(await self._place_binance_brackets(
+                    client, symbol, exit_side, results["entry"]["quantity"], stop_loss, take_profit
+                ))
 
         elif action in [SignalType.CLOSE_LONG, SignalType.CLOSE_SHORT, SignalType.CLOSE_ALL]:
             # 포지션 청산
-            results["close"] = client.close_position(symbol)
+            if leverage:
+                results["leverage"] = await self._ensure_leverage(client, symbol, leverage)
+            results["close"] = await client.close_position_async(symbol)
 
         logger.info(f"Binance signal executed successfully: {action.value}")
 
@@ -228,68 +267,112 @@ class OrderExecutor:
             "results": results
         }
 
-    def _execute_okx_signal(
+    async def _place_binance_brackets(
+        self,
+        client: BinanceClient,
+        symbol: str,
+        exit_side: str,
+        quantity: float,
+        stop_loss: Optional[float],
+        take_profit: Optional[float]
+    ) -> Dict[str, Any]:
+        """
+        보호 주문 일괄 전송
+
+        하나라도 실패하면 성공한 보호 주문을 취소하고 진입 수량을 reduce-only로 청산한 뒤
+        OrderExecutionError를 발생시킵니다 (보호 주문 없는 포지션을 남기지 않음).
+        """
+        try:
+            brackets = await client.create_bracket_orders_async(
+                symbol=symbol,
+                side=exit_side,
+                quantity=quantity,
+                stop_price=stop_loss,
+                take_profit_price=take_profit
+            )
+            failed = {name: order["error"] for name, order in brackets.items() if "error" in order}
+        except Exception as e:
+            # 요청 자체가 실패: reduceOnly 보호 주문이므로 청산 후 남아도 포지션을 열지 않음
+            brackets, failed = {}, {"batch": str(e)}
+
+        if not failed:
+            return brackets
+
+        rollback = await self._rollback_binance_entry(client, symbol, exit_side, quantity, brackets)
+        raise OrderExecutionError(
+            f"Protective orders failed, entry rolled back: {failed}",
+            order_type="bracket",
+            symbol=symbol,
+            details={"failed": failed, "rollback": rollback}
+        )
+
+    async def _rollback_binance_entry(
+        self,
+        client: BinanceClient,
+        symbol: str,
+        exit_side: str,
+        quantity: float,
+        brackets: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """성공한 보호 주문 취소 + 진입 수량 청산 (동시 실행)"""
+        names = [name for name, order in brackets.items() if "order_id" in order]
+        outcomes = await asyncio.gather(
+            client.create_market_order_async(symbol=symbol, side=exit_side, quantity=quantity, reduce_only=True),
+            *[client.cancel_order_async(symbol, brackets[name]["order_id"]) for name in names],
+            return_exceptions=True
+        )
+
+        rollback = {}
+        for name, outcome in zip(["close"] + [f"cancel_{name}" for name in names], outcomes):
+            if isinstance(outcome, Exception):
+                logger.critical(f"Rollback step failed: {symbol} {name}: {outcome}")
+                rollback[name] = {"error": str(outcome)}
+            else:
+                rollback[name] = outcome
+
+        logger.warning(f"Binance entry rolled back: {symbol} {exit_side} {quantity}")
+        return rollback
+
+    async def _execute_okx_signal(
         self,
         account_id: str,
         signal: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """OKX 시그널 실행"""
-        client = self.okx_clients.get(account_id)
-        if not client:
-            raise ValueError(f"OKX account not found: {account_id}")
+        """
+        OKX 시그널 실행
+
+        레버리지 / 잔고 / 현재가를 동시에 조회한 뒤, Stop Loss / Take Profit을
+        진입 주문에 첨부(attachAlgoOrds)해 한 번에 전송합니다.
+        """
+        client = await self.get_client(account_id, Exchange.OKX)
 
         action = SignalType(signal["action"])
         symbol = signal["symbol"]  # OKX 형식: BTC-USDT-SWAP
-        quantity = signal.get("quantity")
         leverage = signal.get("leverage")
 
         results = {}
 
-        # 레버리지 설정
-        if leverage:
-            results["leverage"] = client.set_leverage(symbol, leverage)
-
         # 액션별 실행
-        if action == SignalType.LONG:
-            # 롱 진입
-            if not quantity:
-                balance = client.get_account_balance()
-                available = balance["available_balance"]
-                quantity = self._calculate_quantity(
-                    available * 0.1,
-                    signal.get("price", client.get_current_price(symbol)),
-                    leverage or 1
-                )
+        if action in [SignalType.LONG, SignalType.SHORT]:
+            side, position_side = ("buy", "long") if action == SignalType.LONG else ("sell", "short")
 
-            results["entry"] = client.create_market_order(
-                symbol=symbol,
-                side="buy",
-                quantity=quantity,
-                position_side="long"
-            )
-
-        elif action == SignalType.SHORT:
-            # 숏 진입
-            if not quantity:
-                balance = client.get_account_balance()
-                available = balance["available_balance"]
-                quantity = self._calculate_quantity(
-                    available * 0.1,
-                    signal.get("price", client.get_current_price(symbol)),
-                    leverage or 1
-                )
+            quantity = await self._prefetch_and_size("okx", client, symbol, None, signal, results)
 
-            results["entry"] = client.create_market_order(
+            results["entry"] = await client.create_market_order_async(
                 symbol=symbol,
-                side="sell",
+                side=side,
                 quantity=quantity,
-                position_side="short"
+                position_side=position_side,
+                stop_loss=signal.get("stop_loss"),
+                take_profit=signal.get("take_profit")
             )
 
         elif action in [SignalType.CLOSE_LONG, SignalType.CLOSE_SHORT, SignalType.CLOSE_ALL]:
             # 포지션 청산
+            if leverage:
+                results["leverage"] = await self._ensure_leverage(client, symbol, leverage)
             position_side = "long" if action == SignalType.CLOSE_LONG else "short" if action == SignalType.CLOSE_SHORT else "net"
-            results["close"] = client.close_position(symbol, position_side=position_side)
+            results["close"] = await client.close_position_async(symbol, position_side=position_side)
 
         logger.info(f"OKX signal executed successfully: {action.value}")
 
@@ -302,6 +385,118 @@ class OrderExecutor:
             "results": results
         }
 
+    async def _prefetch_and_size(
+        self,
+        exchange: str,
+        client,
+        symbol: str,
+        side: Optional[str],
+        signal: Dict[str, Any],
+        results: Dict[str, Any]
+    ) -> float:
+        """
+        진입 전 조회를 동시에 실행하고 주문 수량 결정
+
+        레버리지 설정, 잔고 조회, 현재가 조회를 한 번의 왕복 시간에 끝냅니다.
+        수량이 지정돼 있으면 잔고/가격 조회를, 같은 레버리지가 이미 적용돼 있으면 설정을 생략합니다.
+        잔고는 계정 상태 캐시에서 읽으므로 스트림이 연결돼 있으면 REST 호출이 없습니다.
+
+        Args:
+            side: 유동성 제한에 쓸 주문 방향 (None이면 제한하지 않음)
+        """
+        quantity = signal.get("quantity")
+        leverage = signal.get("leverage")
+
+        leverage_task = self._ensure_leverage(client, symbol, leverage) if leverage else None
+
+        if quantity:
+            if leverage_task is not None:
+                results["leverage"] = await leverage_task
+            return quantity
+
+        # 수량 미지정 시 계좌의 10% 사용
+        price_task = self._get_price(exchange, client, symbol) if not signal.get("price") else None
+        outcomes = await asyncio.gather(
+            account_state.get_balance(client),
+            *(task for task in (price_task, leverage_task) if task is not None)
+        )
+        balance, rest = outcomes[0], list(outcomes[1:])
+        price = rest.pop(0) if price_task is not None else signal["price"]
+        if leverage_task is not None:
+            results["leverage"] = rest.pop(0)
+
+        quantity = self._calculate_quantity(
+            balance["available_balance"] * 0.1,
+            price,
+            leverage or 1
+        )
+        if side is not None:
+            quantity = await self._cap_to_liquidity(client, symbol, side, quantity)
+        return quantity
+
+    async def _ensure_leverage(
+        self,
+        client,
+        symbol: str,
+        leverage: int
+    ) -> Dict[str, Any]:
+        """
+        레버리지 설정 (계정 상태 캐시의 현재 값과 같으면 거래소 호출 생략)
+
+        계정 상태는 레버리지 변경 스트림 이벤트로 갱신되므로 거래소 UI에서 바꾼 값도 반영됩니다.
+        """
+        if account_state.get_leverage(client, symbol) == leverage:
+            return {"symbol": symbol, "leverage": leverage, "cached": True}
+
+        try:
+            result = await client.set_leverage_async(symbol, leverage)
+        except Exception:
+            account_state.record_leverage(client, symbol, None)
+            raise
+
+        account_state.record_leverage(client, symbol, leverage)
+        return result
+
+    async def _get_price(self, exchange: str, client, symbol: str) -> float:
+        """현재가 조회 (가격 장부 우선, 오래된 경우 REST)"""
+        price = price_book.get_price(exchange, symbol)
+        if price is None:
+            price = await client.get_current_price_async(symbol)
+        return price
+
+    async def _cap_to_liquidity(self, client: BinanceClient, symbol: str, side: str, quantity: float) -> float:
+        """
+        자동 산정 수량을 허용 슬리피지 이내 호가 잔량으로 제한
+
+        제한한 수량은 LOT_SIZE stepSize 단위로 내림합니다.
+        최소 수량(minQty)에 못 미치면 0을 반환하고 호출자는 시그널을 건너뜁니다.
+        """
+        book = order_book_manager.get(symbol)
+        if book is None:
+            return quantity
+
+        liquidity = book.max_quantity_within_slippage(side, settings.ORDER_BOOK_MAX_SLIPPAGE_BPS)
+        if liquidity >= quantity:
+            return quantity
+
+        # 거래 규칙을 못 찾으면 기존 소수점 3자리 기준
+        step_size, min_qty = await client.get_lot_size_async(symbol) or (0.001, 0.001)
+        step = Decimal(str(step_size))
+        capped = float((Decimal(str(liquidity)) // step) * step)
+
+        if capped < min_qty:
+            logger.warning(
+                f"Signal skipped: {symbol} {side} liquidity within {settings.ORDER_BOOK_MAX_SLIPPAGE_BPS} bps "
+                f"is {liquidity} (rounded to {capped}), below minQty {min_qty}"
+            )
+            return 0.0
+
+        logger.info(
+            f"Quantity capped by liquidity: {symbol} {side} {quantity} -> {capped} "
+            f"(within {settings.ORDER_BOOK_MAX_SLIPPAGE_BPS} bps, step {step_size})"
+        )
+        return capped
+
     def _calculate_quantity(
         self,
         capital: float,
@@ -313,21 +508,23 @@ class OrderExecutor:
         quantity = (capital * leverage) / price
         return round(quantity, 3)  # 소수점 3자리
 
-    def get_account_status(
+    async def get_account_status(
         self,
         account_id: str,
         exchange: Exchange
     ) -> Dict[str, Any]:
-        """계정 상태 조회"""
+        """계정 상태 조회 (계정 상태 캐시)"""
         try:
             if exchange == Exchange.BINANCE:
                 client = self.binance_clients.get(account_id)
                 if not client:
                     raise ValueError(f"Binance account not found: {account_id}")
 
-                balance = client.get_account_balance()
-                positions = client.get_positions()
-                open_orders = client.get_open_orders()
+                balance, positions, open_orders = await asyncio.gather(
+                    account_state.get_balance(client),
+                    account_state.get_positions(client),
+                    account_state.get_open_orders(client)
+                )
 
                 return {
                     "exchange": "binance",
@@ -342,8 +539,10 @@ class OrderExecutor:
                 if not client:
                     raise ValueError(f"OKX account not found: {account_id}")
 
-                balance = client.get_account_balance()
-                positions = client.get_positions()
+                balance, positions = await asyncio.gather(
+                    account_state.get_balance(client),
+                    account_state.get_positions(client)
+                )
 
                 return {
                     "exchange": "okx",
@@ -9,6 +9,7 @@ Features:
 """
 
 import re
+import hashlib
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
@@ -17,9 +18,13 @@ import openai
 from anthropic import Anthropic
 
 from app.core.config import settings
+from app.ai.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# 동일 코드에 대한 AI 분석 캐시 유지 시간 (코드가 같으면 결과도 같음)
+PINE_ANALYSIS_TTL_SECONDS = 24 * 3600
+
 
 @dataclass
 class StrategyMetrics:
@@ -52,8 +57,14 @@ class PineScriptAnalyzer:
     """Pine Script 분석기"""
 
     def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.anthropic_client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.openai_client = openai.OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL
+        )
+        self.anthropic_client = Anthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL
+        )
 
     def parse_pine_script(self, code: str) -> StrategyInfo:
         """
@@ -224,11 +235,32 @@ class PineScriptAnalyzer:
         """
         logger.info("Analyzing strategy with AI ensemble...")
 
+        # 같은 코드/전략 정보는 캐시된 분석을 재사용 (실패 응답은 캐시하지 않음)
+        state = {
+            "code": hashlib.sha256(code.encode()).hexdigest(),
+            "name": strategy_info.name,
+            "indicators": strategy_info.indicators,
+            "parameters": strategy_info.parameters,
+        }
+
+        def is_success(result: Dict[str, Any]) -> bool:
+            return "error" not in result
+
         # GPT-4 분석
-        gpt4_analysis = await self._analyze_with_gpt4(code, strategy_info)
+        gpt4_analysis = await llm_cache.get_or_compute(
+            llm_cache.make_key("gpt-4", "pine_script", "static", "na", state),
+            lambda: self._analyze_with_gpt4(code, strategy_info),
+            PINE_ANALYSIS_TTL_SECONDS,
+            should_cache=is_success
+        )
 
         # Claude 분석
-        claude_analysis = await self._analyze_with_claude(code, strategy_info)
+        claude_analysis = await llm_cache.get_or_compute(
+            llm_cache.make_key("claude-3-5-sonnet-20241022", "pine_script", "static", "na", state),
+            lambda: self._analyze_with_claude(code, strategy_info),
+            PINE_ANALYSIS_TTL_SECONDS,
+            should_cache=is_success
+        )
 
         # 결과 통합
         combined_analysis = {
@@ -15,6 +15,8 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 
+from app.services.var_engine import var_engine
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,83 +71,32 @@ class PortfolioAnalyzer:
         positions: List[Dict[str, Any]],
         confidence_level: float = 0.95,
         time_horizon_days: int = 1
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Any]:
         """
-        포트폴리오 VaR (Value at Risk) 계산
-        Historical Simulation 방법 사용
+        포트폴리오 VaR (Value at Risk) / CVaR 계산
+
+        심볼별 과거 수익률 행렬과 포지션 노출 벡터로 Historical Simulation,
+        Parametric(공분산), Monte Carlo 방법을 함께 계산합니다 (상관관계 반영).
+        캔들 수집이 필요할 수 있으므로 이벤트 루프에서는 스레드로 호출하세요.
 
         Args:
-            positions: 포지션 리스트 [{symbol, size, entry_price, current_price}]
+            positions: 포지션 리스트 [{symbol, size, side, current_price}]
             confidence_level: 신뢰 수준 (default: 0.95 = 95%)
             time_horizon_days: 시간 범위 (default: 1 = 1일)
 
         Returns:
-            VaR 계산 결과 {var_amount, var_percentage, confidence_level}
+            VaR 계산 결과 {var_amount, var_percentage, cvar_amount, confidence_level, methods, ...}
         """
         try:
-            if not positions:
-                return {
-                    "var_amount": 0.0,
-                    "var_percentage": 0.0,
-                    "confidence_level": confidence_level,
-                    "time_horizon_days": time_horizon_days
-                }
-
-            # 포트폴리오 총 가치 계산
-            total_value = sum(
-                abs(pos.get("size", 0)) * pos.get("current_price", 0)
-                for pos in positions
+            result = var_engine.portfolio_var(
+                positions,
+                confidence_level=confidence_level,
+                time_horizon_days=time_horizon_days
             )
 
-            if total_value == 0:
-                return {
-                    "var_amount": 0.0,
-                    "var_percentage": 0.0,
-                    "confidence_level": confidence_level,
-                    "time_horizon_days": time_horizon_days
-                }
-
-            # 각 포지션의 손익률 계산
-            position_returns = []
-            for pos in positions:
-                entry_price = pos.get("entry_price", 0)
-                current_price = pos.get("current_price", 0)
-
-                if entry_price > 0:
-                    pnl_pct = ((current_price - entry_price) / entry_price) * 100
-
-                    # 숏 포지션은 반대
-                    if pos.get("side") == "SHORT":
-                        pnl_pct = -pnl_pct
-
-                    position_returns.append(pnl_pct)
-
-            if not position_returns:
-                return {
-                    "var_amount": 0.0,
-                    "var_percentage": 0.0,
-                    "confidence_level": confidence_level,
-                    "time_horizon_days": time_horizon_days
-                }
-
-            # VaR 계산 (percentile 방법)
-            var_percentile = (1 - confidence_level) * 100
-            var_percentage = np.percentile(position_returns, var_percentile)
-            var_amount = (abs(var_percentage) / 100) * total_value
-
-            # 시간 범위 조정 (Square Root of Time)
-            var_amount_adjusted = var_amount * np.sqrt(time_horizon_days)
-            var_percentage_adjusted = var_percentage * np.sqrt(time_horizon_days)
-
-            result = {
-                "var_amount": round(var_amount_adjusted, 2),
-                "var_percentage": round(abs(var_percentage_adjusted), 2),
-                "confidence_level": confidence_level,
-                "time_horizon_days": time_horizon_days,
-                "portfolio_value": round(total_value, 2)
-            }
-
-            self.logger.info(f"VaR calculated: ${result['var_amount']} ({result['var_percentage']}%)")
+            self.logger.info(
+                f"VaR calculated ({result['method']}): ${result['var_amount']} ({result['var_percentage']}%)"
+            )
             return result
 
         except Exception as e:
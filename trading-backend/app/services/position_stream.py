@@ -0,0 +1,425 @@
+"""
+실시간 포지션 스트림 (/ws/positions)
+
+가격 장부(마크 가격 스트림)와 계정 상태 캐시(Private 스트림)를 서버에서 결합해
+사용자별 포지션 지표(미실현 손익, 증거금 비율, 청산가 거리)를 계산하고
+변경된 포지션만 프론트엔드에 푸시합니다.
+
+Usage:
+    topic = await position_stream.watch(user_id, [(account_id, client), ...])
+    await websocket_manager.subscribe_client(websocket, topic)
+    await websocket.send_json(position_stream.snapshot(user_id))
+
+Features:
+- 마크 가격 틱은 해당 심볼 포지션을 가진 사용자만 표시 (장부 키, 심볼 → 사용자 인덱스)
+- 테스트넷 계정은 테스트넷 마크 가격으로 계산 (메인넷과 시세가 다름)
+- 계정 이벤트(체결, 레버리지 변경, 대사)는 해당 계정 포지션만 재계산
+- 플러시 주기마다 값이 바뀐 포지션만 전송 (REST 호출 없음)
+- 델타마다 열린 포지션 ID 목록 포함 (conflate로 델타가 합쳐져도 종료 포지션 정리 가능)
+- 구독자가 없어진 사용자는 다음 플러시에서 정리
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.account_state import AccountState, ExchangeClient, account_key, account_state
+from app.services.price_book import mark_venue, price_book
+from app.services.websocket_manager import websocket_manager
+
+logger = logging.getLogger(__name__)
+
+AccountKey = Tuple[str, str, bool]
+
+
+def _direction(position: Dict[str, Any]) -> int:
+    """포지션 방향 (+1 롱 / -1 숏)"""
+    side = str(position.get("side", "")).lower()
+    if side == "long":
+        return 1
+    if side == "short":
+        return -1
+    return 1 if position["position_amt"] >= 0 else -1
+
+
+def position_metrics(exchange: str, position: Dict[str, Any], mark_price: Optional[float]) -> Dict[str, Any]:
+    """
+    포지션 하나의 실시간 지표 (증거금 비율 제외)
+
+    OKX 수량은 계약 단위이므로 contract_value(계약당 기초자산 수량)를 곱합니다.
+    마크 가격이 없으면 거래소가 보낸 미실현 손익을 그대로 사용합니다.
+    """
+    amount = abs(position["position_amt"])
+    contract_value = position.get("contract_value") or 1.0
+    entry_price = position["entry_price"]
+    leverage = position.get("leverage") or 1
+
+    if mark_price is not None and (exchange == "binance" or position.get("contract_value")):
+        unrealized_pnl = _direction(position) * amount * contract_value * (mark_price - entry_price)
+    else:
+        unrealized_pnl = position["unrealized_pnl"]
+
+    price = mark_price if mark_price is not None else entry_price
+    notional = amount * contract_value * price
+    margin = notional / leverage
+    liquidation_price = position.get("liquidation_price")
+
+    return {
+        "symbol": position["symbol"],
+        "exchange": exchange,
+        "side": position["side"],
+        "position_amt": position["position_amt"],
+        "entry_price": entry_price,
+        "mark_price": mark_price,
+        "leverage": leverage,
+        "unrealized_pnl": round(unrealized_pnl, 4),
+        "notional": round(notional, 4),
+        "margin": round(margin, 4),
+        "roe": round(unrealized_pnl / margin, 6) if margin else None,
+        "liquidation_price": liquidation_price,
+        "liquidation_distance": (
+            round(abs(price - liquidation_price) / price, 6)
+            if liquidation_price and price else None
+        )
+    }
+
+
+@dataclass
+class _WatchedAccount:
+    exchange: str
+    client: ExchangeClient
+    key: AccountKey
+    # 마크 가격 장부 키 (binance / binance-testnet / okx / okx-testnet)
+    venue: str
+
+
+@dataclass
+class _Watch:
+    """사용자 한 명의 구독 상태"""
+    user_id: str
+    accounts: Dict[str, _WatchedAccount] = field(default_factory=dict)
+    # 포지션 ID → 마지막 전송 지표
+    sent: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    symbols: Set[Tuple[str, str]] = field(default_factory=set)
+
+
+class PositionStream:
+    """사용자별 포지션 지표 델타 스트림"""
+
+    def __init__(self, interval: float = 0.25):
+        """
+        Args:
+            interval: 델타 플러시 주기 (초)
+        """
+        self.interval = interval
+
+        self._watches: Dict[str, _Watch] = {}
+        # (마크 가격 장부 키, 심볼) → 사용자 / 계정 키 → 사용자
+        self._symbol_users: Dict[Tuple[str, str], Set[str]] = {}
+        self._account_users: Dict[AccountKey, Set[str]] = {}
+
+        self._dirty_symbols: Set[Tuple[str, str]] = set()
+        self._dirty_accounts: Set[AccountKey] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "flushes": 0,
+            "recomputed": 0,
+            "deltas_sent": 0
+        }
+
+    @staticmethod
+    def topic(user_id: str) -> str:
+        return f"positions_{user_id}"
+
+    # ===== 생명주기 =====
+
+    async def start(self):
+        """가격 / 계정 상태 알림 구독 및 플러시 루프 시작"""
+        if self._task is not None and not self._task.done():
+            return
+
+        price_book.add_mark_listener(self._on_mark)
+        account_state.add_listener(self._on_account)
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info("Position stream started")
+
+    async def stop(self):
+        """플러시 루프 종료"""
+        price_book.remove_mark_listener(self._on_mark)
+        account_state.remove_listener(self._on_account)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        self._watches.clear()
+        self._symbol_users.clear()
+        self._account_users.clear()
+        logger.info("Position stream stopped")
+
+    # ===== 구독 =====
+
+    async def watch(self, user_id: str, accounts: List[Tuple[str, ExchangeClient]]) -> str:
+        """
+        사용자 계정 감시 시작 (이미 감시 중이면 계정 목록 갱신)
+
+        계정 상태 캐시를 채우고(필요 시 REST 스냅샷 + Private 스트림 시작)
+        현재 포지션 지표를 계산해 둡니다.
+
+        Args:
+            user_id: 사용자 ID
+            accounts: [(계정 ID, 거래소 클라이언트)]
+
+        Returns:
+            websocket_manager 구독 토픽
+        """
+        results = await asyncio.gather(
+            *(account_state.get_positions(client) for _, client in accounts),
+            return_exceptions=True
+        )
+
+        watch = self._watches.get(user_id)
+        if watch is None:
+            watch = self._watches[user_id] = _Watch(user_id)
+
+        for account_id in list(watch.accounts):
+            self._unwatch_account(watch, account_id)
+
+        for (account_id, client), result in zip(accounts, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Position stream skipped account {account_id}: {result}")
+                continue
+            key = account_key(client)
+            watch.accounts[account_id] = _WatchedAccount(key[0], client, key, mark_venue(key[0], key[2]))
+            self._account_users.setdefault(key, set()).add(user_id)
+
+        for pid in list(watch.sent):
+            if pid.split(":", 1)[0] not in watch.accounts:
+                del watch.sent[pid]
+
+        message = self._recompute(watch, {entry.key for entry in watch.accounts.values()}, set())
+        self._index_symbols(watch, self._watched_symbols(watch))
+        if message:
+            await websocket_manager.broadcast(message, self.topic(user_id))
+        return self.topic(user_id)
+
+    def snapshot(self, user_id: str) -> Dict[str, Any]:
+        """현재 포지션 지표 전체"""
+        watch = self._watches.get(user_id)
+        return {
+            "type": "positions_snapshot",
+            "positions": list(watch.sent.values()) if watch else [],
+            "timestamp": int(time.time() * 1000)
+        }
+
+    def unwatch(self, user_id: str):
+        """
+        사용자 감시 종료 (연결 종료 시 호출)
+
+        같은 사용자의 다른 연결이 아직 토픽을 구독 중이면 유지합니다.
+        """
+        if websocket_manager.topic_channels.get(self.topic(user_id)):
+            return
+
+        watch = self._watches.pop(user_id, None)
+        if watch is None:
+            return
+        for account_id in list(watch.accounts):
+            self._unwatch_account(watch, account_id)
+        self._index_symbols(watch, set())
+
+    def _unwatch_account(self, watch: _Watch, account_id: str):
+        entry = watch.accounts.pop(account_id)
+        users = self._account_users.get(entry.key)
+        if users is not None:
+            users.discard(watch.user_id)
+            if not users:
+                del self._account_users[entry.key]
+
+    @staticmethod
+    def _watched_symbols(watch: _Watch) -> Set[Tuple[str, str]]:
+        """전송 중인 포지션의 (마크 가격 장부 키, 심볼)"""
+        return {
+            (watch.accounts[metrics["account_id"]].venue, metrics["symbol"])
+            for metrics in watch.sent.values()
+            if metrics["account_id"] in watch.accounts
+        }
+
+    def _index_symbols(self, watch: _Watch, symbols: Set[Tuple[str, str]]):
+        for symbol in watch.symbols - symbols:
+            users = self._symbol_users.get(symbol)
+            if users is not None:
+                users.discard(watch.user_id)
+                if not users:
+                    del self._symbol_users[symbol]
+        for symbol in symbols - watch.symbols:
+            self._symbol_users.setdefault(symbol, set()).add(watch.user_id)
+        watch.symbols = symbols
+
+    # ===== 알림 (동기, 표시만) =====
+
+    def _on_mark(self, venue: str, symbol: str):
+        if (venue, symbol) in self._symbol_users:
+            self._dirty_symbols.add((venue, symbol))
+
+    def _on_account(self, key: AccountKey):
+        if key in self._account_users:
+            self._dirty_accounts.add(key)
+
+    # ===== 재계산 =====
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._flush()
+            except Exception as e:
+                logger.error(f"Position stream flush error: {e}", exc_info=True)
+
+    async def _flush(self):
+        if not self._dirty_symbols and not self._dirty_accounts:
+            return
+
+        dirty_symbols, self._dirty_symbols = self._dirty_symbols, set()
+        dirty_accounts, self._dirty_accounts = self._dirty_accounts, set()
+        self.stats["flushes"] += 1
+
+        users: Set[str] = set()
+        for symbol in dirty_symbols:
+            users |= self._symbol_users.get(symbol, set())
+        for key in dirty_accounts:
+            users |= self._account_users.get(key, set())
+
+        for user_id in users:
+            topic = self.topic(user_id)
+            if not websocket_manager.topic_channels.get(topic):
+                self.unwatch(user_id)
+                continue
+
+            message = self._recompute(self._watches[user_id], dirty_accounts, dirty_symbols)
+            if message:
+                await websocket_manager.broadcast(message, topic)
+                self.stats["deltas_sent"] += 1
+
+    def _recompute(
+        self,
+        watch: _Watch,
+        dirty_accounts: Set[AccountKey],
+        dirty_symbols: Set[Tuple[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        변경 대상 포지션만 재계산해 델타 메시지 생성 (변경 없으면 None)
+
+        계정 이벤트가 있으면 그 계정 포지션 전체를, 가격 틱만 있으면
+        해당 심볼 포지션만 다시 계산합니다.
+        """
+        updates: List[Dict[str, Any]] = []
+        removed: List[str] = []
+
+        for account_id, entry in list(watch.accounts.items()):
+            full = entry.key in dirty_accounts
+            state = account_state.peek(entry.key) if full or dirty_symbols else None
+
+            if full and state is None:
+                # 계정 상태가 제거됨 (자격증명 변경 / 비활성화 / 삭제)
+                removed.extend(pid for pid in watch.sent if pid.startswith(f"{account_id}:"))
+                self._unwatch_account(watch, account_id)
+                continue
+            if state is None:
+                continue
+
+            current: Dict[str, Dict[str, Any]] = {}
+            for (symbol, side), position in state.positions.items():
+                if full or (entry.venue, symbol) in dirty_symbols:
+                    metrics = position_metrics(
+                        entry.exchange,
+                        position,
+                        price_book.get_mark_price(entry.venue, symbol)
+                    )
+                    metrics["id"] = f"{account_id}:{symbol}:{side}"
+                    metrics["account_id"] = account_id
+                    current[metrics["id"]] = metrics
+
+            if not current and not full:
+                continue
+            self.stats["recomputed"] += len(current)
+
+            if full:
+                stale = [
+                    pid for pid in watch.sent
+                    if pid.startswith(f"{account_id}:") and pid not in current
+                ]
+                removed.extend(stale)
+
+            self._apply_margin_ratio(watch, account_id, state, current, set(removed))
+
+            for pid, metrics in current.items():
+                if watch.sent.get(pid) != metrics:
+                    updates.append(metrics)
+
+        for pid in removed:
+            watch.sent.pop(pid, None)
+        for metrics in updates:
+            watch.sent[metrics["id"]] = metrics
+
+        if dirty_accounts & {entry.key for entry in watch.accounts.values()} or removed:
+            self._index_symbols(watch, self._watched_symbols(watch))
+
+        if not updates and not removed:
+            return None
+
+        return {
+            "type": "positions_delta",
+            "updates": updates,
+            "removed": removed,
+            "open": list(watch.sent),
+            "timestamp": int(time.time() * 1000)
+        }
+
+    def _apply_margin_ratio(
+        self,
+        watch: _Watch,
+        account_id: str,
+        state: AccountState,
+        current: Dict[str, Dict[str, Any]],
+        removed: Set[str]
+    ):
+        """
+        포지션 증거금 / 계정 순자산
+
+        Binance 잔고는 지갑 잔고라 미실현 손익 합계를 더하고,
+        OKX eq는 이미 미실현 손익을 포함합니다.
+        """
+        if not state.balance:
+            for metrics in current.values():
+                metrics["margin_ratio"] = None
+            return
+
+        equity = state.balance["total_balance"]
+        if state.exchange == "binance":
+            prefix = f"{account_id}:"
+            pnl = {
+                pid: metrics["unrealized_pnl"] for pid, metrics in watch.sent.items()
+                if pid.startswith(prefix) and pid not in removed
+            }
+            pnl.update({pid: metrics["unrealized_pnl"] for pid, metrics in current.items()})
+            equity += sum(pnl.values())
+
+        for metrics in current.values():
+            metrics["margin_ratio"] = round(metrics["margin"] / equity, 6) if equity > 0 else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스트림 통계"""
+        return {
+            **self.stats,
+            "users": len(self._watches),
+            "accounts": len(self._account_users),
+            "symbols": len(self._symbol_users)
+        }
+
+
+# 전역 포지션 스트림
+position_stream = PositionStream(interval=settings.POSITION_STREAM_INTERVAL)
@@ -0,0 +1,387 @@
+"""
+실시간 가격 장부 (Price Book)
+
+거래소 WebSocket 티커 스트림으로 갱신되는 프로세스 전역 최신가/24시간 통계 저장소입니다.
+시장 API, 리스크 체크, 주문 수량 계산은 여기서 가격을 읽고,
+데이터가 오래된 경우에만 REST 전체 티커 1회 요청으로 장부를 갱신합니다.
+
+Features:
+- 메모리 조회 (요청당 거래소 호출 없음)
+- Binance Futures 전체 티커 스트림 (!ticker@arr)
+- OKX tickers 채널 (지원 심볼)
+- 마크 가격 (Binance !markPrice@arr@1s, OKX mark-price) - 메인넷 / 테스트넷 별도 장부
+- 신선도(max_age) 기준 REST 폴백 (거래소별 single-flight)
+- 자동 재연결 (Exponential Backoff)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import websockets
+
+from app.core.config import settings
+from app.core.symbols import symbol_config
+from app.services.binance_client import BinanceClient
+from app.services.okx_client import OKXClient
+
+logger = logging.getLogger(__name__)
+
+BINANCE_TICKER_STREAM_URL = "wss://fstream.binance.com/ws/!ticker@arr"
+BINANCE_MARK_STREAM_URL = "wss://fstream.binance.com/ws/!markPrice@arr@1s"
+BINANCE_TESTNET_MARK_STREAM_URL = "wss://stream.binancefuture.com/ws/!markPrice@arr@1s"
+OKX_PUBLIC_WS_URL = "wss://ws.okx.com:8443/ws/v5/public"
+OKX_DEMO_PUBLIC_WS_URL = "wss://wspap.okx.com:8443/ws/v5/public?brokerId=9999"
+
+
+def mark_venue(exchange: str, testnet: bool) -> str:
+    """마크 가격 장부 키 (테스트넷 시세는 메인넷과 다르므로 분리)"""
+    return f"{exchange}-testnet" if testnet else exchange
+
+
+@dataclass
+class TickerEntry:
+    """장부 항목 (24시간 통계 + 갱신 시각)"""
+    ticker: Dict[str, Any]
+    updated_at: float  # time.monotonic()
+    source: str  # "ws" or "rest"
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.updated_at
+
+
+def parse_binance_ws_ticker(msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Binance 24hrTicker 이벤트를 REST 24시간 통계 형식으로 변환"""
+    return {
+        "symbol": msg["s"],
+        "price_change": float(msg["p"]),
+        "price_change_percent": float(msg["P"]),
+        "last_price": float(msg["c"]),
+        "high_price": float(msg["h"]),
+        "low_price": float(msg["l"]),
+        "volume": float(msg["v"]),
+        "quote_volume": float(msg["q"]),
+        "open_time": msg["O"],
+        "close_time": msg["C"],
+        "count": msg["n"]
+    }
+
+
+class PriceBook:
+    """
+    거래소별 최신 티커 장부
+
+    키는 (거래소, 거래소 심볼) 입니다. 예: ("binance", "BTCUSDT"), ("okx", "BTC-USDT-SWAP")
+    """
+
+    def __init__(self, max_age: float = 5.0):
+        """
+        Args:
+            max_age: 이 시간(초)보다 오래된 항목은 REST로 갱신
+        """
+        self.max_age = max_age
+        self._entries: Dict[str, Dict[str, TickerEntry]] = {"binance": {}, "okx": {}}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._public_clients: Dict[str, Any] = {}
+        self._listeners: List[Callable[[str, str], None]] = []
+        # 마크 가격: 장부 키(mark_venue) → {심볼: (마크 가격, 갱신 시각)}
+        self._marks: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self._mark_listeners: List[Callable[[str, str], None]] = []
+        self.stats = {
+            "ws_updates": 0,
+            "mark_updates": 0,
+            "rest_refreshes": 0,
+            "hits": 0,
+            "stale": 0
+        }
+
+    # ===== 쓰기 =====
+
+    def update(self, exchange: str, symbol: str, ticker: Dict[str, Any], source: str = "ws"):
+        """티커 갱신"""
+        self._entries.setdefault(exchange, {})[symbol] = TickerEntry(
+            ticker=ticker,
+            updated_at=time.monotonic(),
+            source=source
+        )
+        if source == "ws":
+            self.stats["ws_updates"] += 1
+
+        for callback in self._listeners:
+            try:
+                callback(exchange, symbol)
+            except Exception as e:
+                logger.error(f"Price book listener failed: {e}")
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """가격 갱신 알림 등록 (거래소, 심볼 전달, 이벤트 루프에서 동기 호출 - 가볍게 유지)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def update_mark(self, venue: str, symbol: str, mark_price: float):
+        """마크 가격 갱신"""
+        self._marks.setdefault(venue, {})[symbol] = (mark_price, time.monotonic())
+        self.stats["mark_updates"] += 1
+
+        for callback in self._mark_listeners:
+            try:
+                callback(venue, symbol)
+            except Exception as e:
+                logger.error(f"Price book mark listener failed: {e}")
+
+    def add_mark_listener(self, callback: Callable[[str, str], None]):
+        """마크 가격 갱신 알림 등록 (장부 키, 심볼 전달, 이벤트 루프에서 동기 호출 - 가볍게 유지)"""
+        if callback not in self._mark_listeners:
+            self._mark_listeners.append(callback)
+
+    def remove_mark_listener(self, callback: Callable[[str, str], None]):
+        if callback in self._mark_listeners:
+            self._mark_listeners.remove(callback)
+
+    # ===== 동기 조회 (메모리만) =====
+
+    def get(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        신선한 티커 조회 (없거나 오래되면 None)
+
+        Args:
+            exchange: 거래소 (binance, okx)
+            symbol: 거래소 형식 심볼
+            max_age: 허용 최대 경과 시간 (None이면 기본값)
+        """
+        entry = self._entries.get(exchange, {}).get(symbol)
+        limit = self.max_age if max_age is None else max_age
+
+        if entry is None or entry.age > limit:
+            self.stats["stale"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return entry.ticker
+
+    def get_price(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """신선한 최신가 조회 (없거나 오래되면 None)"""
+        ticker = self.get(exchange, symbol, max_age)
+        return ticker["last_price"] if ticker else None
+
+    def get_mark_price(self, venue: str, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        신선한 마크 가격 조회 (청산 / 미실현 손익 기준 가격)
+
+        메인넷은 마크 스트림이 끊긴 동안 최신가로 대신합니다.
+        테스트넷은 메인넷 최신가와 시세가 달라 대신하지 않고 None을 반환합니다.
+
+        Args:
+            venue: mark_venue(거래소, 테스트넷 여부)
+            symbol: 거래소 형식 심볼
+            max_age: 허용 최대 경과 시간 (None이면 기본값)
+        """
+        mark = self._marks.get(venue, {}).get(symbol)
+        limit = self.max_age if max_age is None else max_age
+        if mark is not None and time.monotonic() - mark[1] <= limit:
+            return mark[0]
+
+        if venue in self._entries:
+            return self.get_price(venue, symbol, max_age)
+        return None
+
+    # ===== 비동기 조회 (REST 폴백) =====
+
+    async def get_tickers(
+        self,
+        exchange: str,
+        symbols: List[str],
+        max_age: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 심볼 티커 조회
+
+        하나라도 오래된 심볼이 있으면 전체 티커 REST 요청 1회로 장부를 갱신합니다.
+
+        Returns:
+            {거래소 심볼: 24시간 통계} (거래소에 없는 심볼은 제외)
+        """
+        tickers = {s: self.get(exchange, s, max_age) for s in symbols}
+
+        if any(t is None for t in tickers.values()):
+            await self.refresh(exchange)
+            entries = self._entries.get(exchange, {})
+            tickers = {s: entries[s].ticker if s in entries else None for s in symbols}
+
+        return {s: t for s, t in tickers.items() if t is not None}
+
+    async def get_ticker(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """단일 심볼 티커 조회 (REST 폴백)"""
+        tickers = await self.get_tickers(exchange, [symbol], max_age)
+        if symbol not in tickers:
+            raise Exception(f"Failed to get ticker for {symbol} on {exchange}")
+        return tickers[symbol]
+
+    async def get_price_async(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> float:
+        """단일 심볼 최신가 조회 (REST 폴백)"""
+        ticker = await self.get_ticker(exchange, symbol, max_age)
+        return ticker["last_price"]
+
+    async def refresh(self, exchange: str):
+        """
+        REST 전체 티커로 장부 갱신
+
+        동시에 여러 요청이 폴백해도 거래소 호출은 1회만 수행합니다.
+        """
+        task = self._refreshing.get(exchange)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(exchange))
+            self._refreshing[exchange] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(exchange, None))
+
+        await asyncio.shield(task)
+
+    async def _refresh(self, exchange: str):
+        client = self._public_client(exchange)
+        tickers = await client.get_all_24h_tickers_async()
+
+        for symbol, ticker in tickers.items():
+            self.update(exchange, symbol, ticker, source="rest")
+
+        self.stats["rest_refreshes"] += 1
+        logger.debug(f"Price book refreshed from REST: {exchange} ({len(tickers)} symbols)")
+
+    def _public_client(self, exchange: str):
+        if exchange not in self._public_clients:
+            if exchange == "binance":
+                self._public_clients[exchange] = BinanceClient(api_key="", api_secret="", testnet=False)
+            elif exchange == "okx":
+                self._public_clients[exchange] = OKXClient(api_key="", api_secret="", passphrase="", testnet=False)
+            else:
+                raise ValueError(f"Unsupported exchange: {exchange}")
+        return self._public_clients[exchange]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """장부 통계"""
+        return {
+            **self.stats,
+            "symbols": {exchange: len(entries) for exchange, entries in self._entries.items()},
+            "mark_symbols": {venue: len(marks) for venue, marks in self._marks.items()},
+            "streaming": price_feed.is_running
+        }
+
+
+class PriceFeed:
+    """
+    가격 장부 WebSocket 공급자
+
+    거래소별 공개 티커 스트림을 구독해 PriceBook을 지속적으로 갱신합니다.
+    """
+
+    def __init__(self, book: PriceBook, max_backoff: float = 60.0):
+        self.book = book
+        self.max_backoff = max_backoff
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self):
+        """스트림 시작"""
+        if self.is_running:
+            return
+
+        self._tasks = [
+            asyncio.create_task(self._run("binance", self._stream_binance)),
+            asyncio.create_task(self._run("binance mark", lambda: self._stream_binance_marks(
+                BINANCE_MARK_STREAM_URL, mark_venue("binance", False)
+            ))),
+            asyncio.create_task(self._run("okx", lambda: self._stream_okx(
+                OKX_PUBLIC_WS_URL, mark_venue("okx", False), tickers=True
+            )))
+        ]
+        if settings.PRICE_BOOK_TESTNET_MARKS:
+            self._tasks += [
+                asyncio.create_task(self._run("binance testnet mark", lambda: self._stream_binance_marks(
+                    BINANCE_TESTNET_MARK_STREAM_URL, mark_venue("binance", True)
+                ))),
+                asyncio.create_task(self._run("okx demo mark", lambda: self._stream_okx(
+                    OKX_DEMO_PUBLIC_WS_URL, mark_venue("okx", True), tickers=False
+                )))
+            ]
+        logger.info(f"Price feed started (binance, okx, testnet marks: {settings.PRICE_BOOK_TESTNET_MARKS})")
+
+    async def stop(self):
+        """스트림 중지"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Price feed stopped")
+
+    async def _run(self, exchange: str, stream):
+        """재연결 루프 (Exponential Backoff)"""
+        backoff = 1.0
+
+        while True:
+            try:
+                await stream()
+                backoff = 1.0
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception as e:
+                logger.warning(f"Price feed {exchange} disconnected: {e}. Reconnecting in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _stream_binance(self):
+        """Binance Futures 전체 심볼 24시간 티커 스트림 (1초 주기)"""
+        async with websockets.connect(BINANCE_TICKER_STREAM_URL) as ws:
+            logger.info("Price feed connected: binance")
+
+            async for raw in ws:
+                for msg in json.loads(raw):
+                    self.book.update("binance", msg["s"], parse_binance_ws_ticker(msg))
+
+    async def _stream_binance_marks(self, url: str, venue: str):
+        """Binance Futures 전체 심볼 마크 가격 스트림 (1초 주기)"""
+        async with websockets.connect(url) as ws:
+            logger.info(f"Price feed connected: {venue} mark price")
+
+            async for raw in ws:
+                for msg in json.loads(raw):
+                    self.book.update_mark(venue, msg["s"], float(msg["p"]))
+
+    async def _stream_okx(self, url: str, venue: str, tickers: bool):
+        """OKX tickers / mark-price 채널 (지원 심볼)"""
+        channels = ["tickers", "mark-price"] if tickers else ["mark-price"]
+        async with websockets.connect(url) as ws:
+            await ws.send(json.dumps({
+                "op": "subscribe",
+                "args": [
+                    {"channel": channel, "instId": inst_id}
+                    for channel in channels
+                    for inst_id in symbol_config.OKX_FORMAT.values()
+                ]
+            }))
+            logger.info(f"Price feed connected: {venue} ({', '.join(channels)})")
+
+            async for raw in ws:
+                data = json.loads(raw)
+                channel = data.get("arg", {}).get("channel")
+                for item in data.get("data", []):
+                    if channel == "mark-price":
+                        self.book.update_mark(venue, item["instId"], float(item["markPx"]))
+                    else:
+                        self.book.update("okx", item["instId"], OKXClient._parse_24h_ticker(item))
+
+
+# 전역 가격 장부 및 공급자
+price_book = PriceBook(max_age=settings.PRICE_BOOK_MAX_AGE)
+price_feed = PriceFeed(price_book)
@@ -0,0 +1,236 @@
+"""
+가격 트리거 인덱스
+
+포지션의 청산 경고 가격, 손절가, 익절가 같은 "가격이 X를 넘으면" 조건을
+(거래소, 심볼)별 정렬 배열에 보관합니다. 가격 틱이 들어오면 직전 가격과의
+구간을 이분 탐색해 이번 틱에 넘어간 트리거만 돌려줍니다.
+틱당 비용은 O(log n + 넘어간 트리거 수) 이며, 전체 포지션 수와 무관합니다.
+
+Usage:
+    index = PriceTriggerIndex()
+    index.replace_owner(account, [
+        PriceTrigger("pos-1:sl", "binance", "BTCUSDT", 58000.0, BELOW, "stop_loss", account),
+        PriceTrigger("pos-1:tp", "binance", "BTCUSDT", 72000.0, ABOVE, "take_profit", account),
+    ])
+
+    # 가격 틱마다
+    hit, cleared = index.cross("binance", "BTCUSDT", price)
+
+Features:
+- BELOW 트리거: 가격 <= 트리거 가격이면 발동 (롱 손절 / 롱 청산 경고 / 숏 익절)
+- ABOVE 트리거: 가격 >= 트리거 가격이면 발동 (숏 손절 / 숏 청산 경고 / 롱 익절)
+- cross(): 직전 틱 대비 새로 발동(hit) / 해제(cleared)된 트리거만 반환 (엣지)
+- crossed(): 주어진 가격에서 발동 상태인 트리거 전체 (상태 없는 범위 조회)
+- owner(계정, 포지션 등) 단위 일괄 교체 / 제거
+
+이벤트 루프 안에서만 사용합니다 (잠금 없음).
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BELOW = "below"
+ABOVE = "above"
+
+
+@dataclass(frozen=True)
+class PriceTrigger:
+    """가격 조건 하나"""
+    trigger_id: str
+    exchange: str
+    symbol: str
+    price: float
+    direction: str  # BELOW / ABOVE
+    kind: str  # liquidation / stop_loss / take_profit / alert
+    owner: Hashable
+    payload: Any = None
+
+    def is_active(self, price: float) -> bool:
+        """주어진 가격에서 발동 상태인지"""
+        return price <= self.price if self.direction == BELOW else price >= self.price
+
+
+class _Levels:
+    """트리거 가격 정렬 배열 (가격 / ID 병렬 리스트)"""
+
+    __slots__ = ("prices", "ids")
+
+    def __init__(self):
+        self.prices: List[float] = []
+        self.ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def insert(self, price: float, trigger_id: str):
+        position = bisect_right(self.prices, price)
+        self.prices.insert(position, price)
+        self.ids.insert(position, trigger_id)
+
+    def remove(self, price: float, trigger_id: str):
+        lo = bisect_left(self.prices, price)
+        hi = bisect_right(self.prices, price, lo)
+        for position in range(lo, hi):
+            if self.ids[position] == trigger_id:
+                del self.prices[position]
+                del self.ids[position]
+                return
+
+
+@dataclass
+class _SymbolTriggers:
+    below: _Levels
+    above: _Levels
+    last_price: Optional[float] = None
+
+
+class PriceTriggerIndex:
+    """(거래소, 심볼)별 가격 트리거 인덱스"""
+
+    def __init__(self):
+        self._symbols: Dict[Tuple[str, str], _SymbolTriggers] = {}
+        self._triggers: Dict[str, PriceTrigger] = {}
+        self._owners: Dict[Hashable, Set[str]] = {}
+        self.stats = {
+            "ticks": 0,
+            "hits": 0,
+            "cleared": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    # ===== 등록 / 제거 =====
+
+    def add(self, trigger: PriceTrigger):
+        """트리거 등록 (같은 ID가 있으면 교체)"""
+        if trigger.direction not in (BELOW, ABOVE):
+            raise ValueError(f"Invalid trigger direction: {trigger.direction}")
+
+        self.remove(trigger.trigger_id)
+
+        key = (trigger.exchange, trigger.symbol)
+        bucket = self._symbols.get(key)
+        if bucket is None:
+            bucket = self._symbols[key] = _SymbolTriggers(below=_Levels(), above=_Levels())
+
+        levels = bucket.below if trigger.direction == BELOW else bucket.above
+        levels.insert(trigger.price, trigger.trigger_id)
+        self._triggers[trigger.trigger_id] = trigger
+        self._owners.setdefault(trigger.owner, set()).add(trigger.trigger_id)
+
+    def remove(self, trigger_id: str) -> Optional[PriceTrigger]:
+        """트리거 제거"""
+        trigger = self._triggers.pop(trigger_id, None)
+        if trigger is None:
+            return None
+
+        key = (trigger.exchange, trigger.symbol)
+        bucket = self._symbols[key]
+        levels = bucket.below if trigger.direction == BELOW else bucket.above
+        levels.remove(trigger.price, trigger_id)
+        if not bucket.below and not bucket.above:
+            del self._symbols[key]
+
+        owned = self._owners.get(trigger.owner)
+        if owned is not None:
+            owned.discard(trigger_id)
+            if not owned:
+                del self._owners[trigger.owner]
+        return trigger
+
+    def replace_owner(self, owner: Hashable, triggers: List[PriceTrigger]):
+        """owner의 트리거 일괄 교체 (가격이 그대로인 트리거는 재삽입하지 않음)"""
+        new_ids = {trigger.trigger_id for trigger in triggers}
+        for trigger_id in list(self._owners.get(owner, ())):
+            if trigger_id not in new_ids:
+                self.remove(trigger_id)
+
+        for trigger in triggers:
+            if self._triggers.get(trigger.trigger_id) != trigger:
+                self.add(trigger)
+
+    def remove_owner(self, owner: Hashable):
+        """owner의 트리거 전체 제거"""
+        for trigger_id in list(self._owners.get(owner, ())):
+            self.remove(trigger_id)
+
+    def owned(self, owner: Hashable) -> List[PriceTrigger]:
+        """owner의 트리거 목록"""
+        return [self._triggers[trigger_id] for trigger_id in self._owners.get(owner, ())]
+
+    # ===== 조회 =====
+
+    def cross(self, exchange: str, symbol: str, price: float) -> Tuple[List[PriceTrigger], List[PriceTrigger]]:
+        """
+        가격 틱 반영 → 직전 틱 이후 새로 발동 / 해제된 트리거
+
+        심볼의 첫 틱이면 현재 발동 상태인 트리거 전체를 발동으로 봅니다.
+
+        Returns:
+            (발동, 해제)
+        """
+        bucket = self._symbols.get((exchange, symbol))
+        if bucket is None:
+            return [], []
+
+        self.stats["ticks"] += 1
+        last_price = bucket.last_price
+        bucket.last_price = price
+
+        if last_price is None:
+            hit = self._active(bucket, price)
+            self.stats["hits"] += len(hit)
+            return hit, []
+        if price == last_price:
+            return [], []
+
+        low, high = (price, last_price) if price < last_price else (last_price, price)
+
+        # BELOW: low <= 트리거 가격 < high 구간이 넘어감
+        below = bucket.below
+        below_ids = below.ids[bisect_left(below.prices, low):bisect_left(below.prices, high)]
+        # ABOVE: low < 트리거 가격 <= high 구간이 넘어감
+        above = bucket.above
+        above_ids = above.ids[bisect_right(above.prices, low):bisect_right(above.prices, high)]
+
+        if not below_ids and not above_ids:
+            return [], []
+
+        below_triggers = [self._triggers[trigger_id] for trigger_id in below_ids]
+        above_triggers = [self._triggers[trigger_id] for trigger_id in above_ids]
+
+        if price < last_price:
+            hit, cleared = below_triggers, above_triggers
+        else:
+            hit, cleared = above_triggers, below_triggers
+
+        self.stats["hits"] += len(hit)
+        self.stats["cleared"] += len(cleared)
+        return hit, cleared
+
+    def crossed(self, exchange: str, symbol: str, price: float) -> List[PriceTrigger]:
+        """주어진 가격에서 발동 상태인 트리거 전체 (직전 가격 상태를 바꾸지 않음)"""
+        bucket = self._symbols.get((exchange, symbol))
+        if bucket is None:
+            return []
+        return self._active(bucket, price)
+
+    def _active(self, bucket: _SymbolTriggers, price: float) -> List[PriceTrigger]:
+        below = bucket.below
+        above = bucket.above
+        ids = below.ids[bisect_left(below.prices, price):] + above.ids[:bisect_right(above.prices, price)]
+        return [self._triggers[trigger_id] for trigger_id in ids]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 통계"""
+        return {
+            **self.stats,
+            "triggers": len(self._triggers),
+            "symbols": len(self._symbols),
+            "owners": len(self._owners)
+        }
@@ -10,7 +10,7 @@ Features:
 
 import requests
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from app.core.config import settings
@@ -415,11 +415,14 @@ class TelegramService:
         current_var: float,
         threshold_var: float,
         confidence_level: float,
-        portfolio_value: float
+        portfolio_value: float,
+        uncovered_symbols: Optional[List[str]] = None
     ):
         """
         VaR 임계값 초과 경고
 
+        uncovered_symbols: 수익률 이력이 없어 VaR에 반영되지 않은 심볼
+
         예시:
         🚨 VaR 경고!
         현재 VaR: $850 (8.5%)
@@ -437,6 +440,7 @@ class TelegramService:
             f"📊 설정 임계값: ${threshold_var:,.2f} ({threshold_percent:.2f}%)\n"
             f"📈 신뢰 수준: {confidence_level * 100:.0f}%\n"
             f"💰 포트폴리오 가치: ${portfolio_value:,.2f}\n"
+            f"{self._uncovered_line(uncovered_symbols)}"
             f"\n"
             f"💡 <b>권장 조치:</b>\n"
             f"  • 포지션 규모 축소 고려\n"
@@ -568,7 +572,8 @@ class TelegramService:
         winning_positions: int,
         losing_positions: int,
         daily_pnl: float,
-        daily_pnl_pct: float
+        daily_pnl_pct: float,
+        uncovered_symbols: Optional[List[str]] = None
     ):
         """
         일일 리스크 리포트
@@ -612,6 +617,7 @@ class TelegramService:
             f"\n"
             f"<b>리스크 지표:</b>\n"
             f"📉 VaR (95%): ${var_amount:,.2f} ({var_percentage:.2f}%)\n"
+            f"{self._uncovered_line(uncovered_symbols)}"
             f"📊 최대 낙폭: {max_drawdown_pct:.2f}%\n"
             f"📋 포지션 수: {total_positions}개\n"
             f"  ├─ 수익: {winning_positions}개 💚\n"
@@ -625,6 +631,13 @@ class TelegramService:
         # Use quiet notification for routine daily reports
         self.send_message(chat_id, message, disable_notification=True)
 
+    @staticmethod
+    def _uncovered_line(uncovered_symbols: Optional[List[str]]) -> str:
+        """VaR 미반영 심볼 안내 줄 (없으면 빈 문자열)"""
+        if not uncovered_symbols:
+            return ""
+        return f"⚠️ VaR 미반영 (수익률 이력 부족): {', '.join(uncovered_symbols)}\n"
+
 
 # 싱글톤 인스턴스
 telegram_service = TelegramService()
@@ -0,0 +1,420 @@
+"""
+VaR 엔진
+
+심볼별 수익률 시계열을 특징 행렬 저장소(캔들 + 지표)에서 만들어 두고,
+포지션 노출 벡터와의 행렬 곱으로 VaR / CVaR를 계산합니다.
+
+Usage:
+    # 단일 계정
+    result = var_engine.portfolio_var(positions, confidence_level=0.95)
+
+    # 여러 계정 (노출 행렬 × 수익률 행렬 한 번)
+    results = var_engine.batch_var({account_id: positions, ...})
+
+Features:
+- Historical Simulation: 과거 수익률 시나리오 T개 × 계정 A개 손익 행렬
+- Parametric: 공분산 행렬 기반 (상관관계 반영)
+- Monte Carlo: 공분산 Cholesky 분해로 상관된 시나리오 생성 (모든 계정이 같은 시나리오 공유)
+- 수익률 시계열 TTL 캐시 (심볼별 증분 갱신은 MarketDataCollector가 담당)
+- 상장 직후처럼 이력이 짧은 심볼은 정렬에서 빼고 미반영(uncovered) 노출로 보고
+
+동기 함수입니다. 캔들 수집이 필요할 수 있으므로 이벤트 루프에서는 스레드로 실행하세요.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("historical", "parametric", "monte_carlo")
+
+# 지표 계산 워밍업으로 잘리는 캔들을 보충하기 위해 추가로 수집하는 일수
+WARMUP_DAYS = 60
+
+
+def candle_symbol(symbol: str) -> str:
+    """거래소 심볼 → 캔들 저장소 심볼 (BTC-USDT-SWAP → BTCUSDT)"""
+    return symbol.upper().replace("-SWAP", "").replace("-", "")
+
+
+def signed_exposure(position: Dict[str, Any]) -> float:
+    """포지션 노출 금액 (롱 +, 숏 -) - notional이 있으면 그대로 사용 (position_metrics 결과)"""
+    quantity = position.get("size", position.get("position_amt", 0)) or 0
+
+    side = str(position.get("side", "")).upper()
+    if side in ("LONG", "SHORT"):
+        sign = 1 if side == "LONG" else -1
+    else:
+        sign = 1 if quantity >= 0 else -1
+
+    if position.get("notional") is not None:
+        return sign * abs(position["notional"])
+
+    price = position.get("current_price") or position.get("mark_price") or position.get("entry_price") or 0
+    contract_value = position.get("contract_value") or 1.0
+    return sign * abs(quantity) * contract_value * price
+
+
+def _tail_loss(pnl: np.ndarray, confidence_level: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    시나리오 손익 행렬(시나리오 × 계정)의 열별 VaR / CVaR (손실을 양수로)
+    """
+    threshold = np.quantile(pnl, 1 - confidence_level, axis=0)
+    tail = pnl <= threshold
+    tail_count = np.maximum(tail.sum(axis=0), 1)
+    expected_shortfall = np.where(tail, pnl, 0.0).sum(axis=0) / tail_count
+    return np.maximum(-threshold, 0.0), np.maximum(-expected_shortfall, 0.0)
+
+
+class ReturnsStore:
+    """
+    심볼별 롤링 수익률 저장소
+
+    종가 로그 수익률을 심볼마다 보관하고, 요청된 심볼 묶음에 대해
+    타임스탬프를 맞춘 수익률 행렬과 평균 / 공분산 / Cholesky 인자를 캐시합니다.
+    """
+
+    def __init__(
+        self,
+        interval: str = "1d",
+        lookback_days: int = 365,
+        ttl: float = 3600.0,
+        max_universes: int = 64,
+        min_overlap: float = 0.8
+    ):
+        """
+        Args:
+            interval: 캔들 간격 (VaR 시간 범위 1 단위)
+            lookback_days: 수익률 창 길이 (일)
+            ttl: 수익률 재갱신 간격 (초)
+            max_universes: 캐시할 심볼 묶음 수
+            min_overlap: 가장 긴 시계열 대비 최소 이력 비율 (미만이면 정렬에서 제외)
+        """
+        self.interval = interval
+        self.lookback_days = lookback_days
+        self.ttl = ttl
+        self.min_overlap = min_overlap
+        self.max_universes = max_universes
+        self._series: Dict[str, Tuple[pd.Series, float]] = {}
+        self._universes: "OrderedDict[Tuple[str, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._collector = None
+
+    def _get_collector(self):
+        # AI 파이프라인 의존성(python-binance, ta)은 처음 사용할 때 로드
+        if self._collector is None:
+            from app.ai.data_collector import MarketDataCollector
+            self._collector = MarketDataCollector()
+        return self._collector
+
+    def get_returns(self, symbol: str) -> Optional[pd.Series]:
+        """심볼의 로그 수익률 (timestamp 인덱스, 최신 lookback 구간)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._series.get(symbol)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        try:
+            candles = self._get_collector().update_feature_matrix(
+                symbol, self.interval, self.lookback_days + WARMUP_DAYS
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load candles for {symbol}: {e}")
+            return cached[0] if cached is not None else None
+
+        close = candles.set_index("timestamp")["close"].astype(float)
+        returns = np.log(close).diff().dropna()
+        if returns.empty:
+            return None
+        returns = returns[returns.index >= returns.index[-1] - pd.Timedelta(days=self.lookback_days)]
+
+        with self._lock:
+            self._series[symbol] = (returns, now + self.ttl)
+        return returns
+
+    def universe(self, symbols: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        심볼 묶음의 정렬된 수익률 행렬과 통계
+
+        타임스탬프 교집합으로 정렬하므로, 이력이 가장 긴 시계열의 min_overlap
+        비율보다 짧은 심볼은 다른 심볼의 이력을 잘라내지 않도록 제외합니다 (short).
+
+        Returns:
+            {symbols, missing, short, returns(T×N 단순 수익률), mean, cov, cholesky} 또는 None
+        """
+        key = tuple(sorted(set(symbols)))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._universes.get(key)
+            if cached is not None and cached["expires_at"] > now:
+                self._universes.move_to_end(key)
+                return cached
+
+        series = {}
+        for symbol in key:
+            returns = self.get_returns(symbol)
+            if returns is not None and len(returns) > 1:
+                series[symbol] = returns
+
+        if not series:
+            return None
+
+        longest = max(len(returns) for returns in series.values())
+        short = sorted(
+            symbol for symbol, returns in series.items()
+            if len(returns) < longest * self.min_overlap
+        )
+        if short:
+            logger.warning(
+                f"Excluding {short} from VaR alignment: history shorter than "
+                f"{self.min_overlap:.0%} of {longest} observations"
+            )
+            for symbol in short:
+                del series[symbol]
+
+        frame = pd.concat(series, axis=1, join="inner").dropna()
+        if len(frame) < 2:
+            return None
+
+        # 로그 수익률 → 단순 수익률 (노출 금액에 곱해 손익 시나리오로 사용)
+        returns = np.expm1(frame.to_numpy(dtype=float))
+        cov = np.atleast_2d(np.cov(returns, rowvar=False))
+
+        entry = {
+            "symbols": list(frame.columns),
+            "missing": [symbol for symbol in key if symbol not in series and symbol not in short],
+            "short": short,
+            "returns": returns,
+            "mean": returns.mean(axis=0),
+            "cov": cov,
+            "cholesky": self._cholesky(cov),
+            "expires_at": now + self.ttl
+        }
+
+        with self._lock:
+            self._universes[key] = entry
+            self._universes.move_to_end(key)
+            while len(self._universes) > self.max_universes:
+                self._universes.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _cholesky(cov: np.ndarray) -> np.ndarray:
+        """공분산 Cholesky 인자 (준정부호 행렬은 대각 보정 후 분해)"""
+        jitter = 0.0
+        scale = float(np.mean(np.diag(cov))) or 1e-12
+        for _ in range(6):
+            try:
+                return np.linalg.cholesky(cov + np.eye(len(cov)) * jitter)
+            except np.linalg.LinAlgError:
+                jitter = scale * 1e-10 if jitter == 0 else jitter * 100
+        # 최후 수단: 고유값 분해 (음수 고유값은 0으로)
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+    def clear(self):
+        """캐시 전체 제거"""
+        with self._lock:
+            self._series.clear()
+            self._universes.clear()
+
+
+class VaREngine:
+    """노출 행렬 × 수익률 행렬 기반 VaR / CVaR 계산기"""
+
+    def __init__(
+        self,
+        store: ReturnsStore,
+        simulations: int = 10000,
+        default_method: str = "historical",
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            store: 수익률 저장소
+            simulations: Monte Carlo 시나리오 수
+            default_method: var_amount로 보고할 방법 (historical / parametric / monte_carlo)
+            seed: Monte Carlo 난수 시드 (None이면 매번 다름)
+        """
+        if default_method not in METHODS:
+            raise ValueError(f"Unknown VaR method: {default_method}")
+        self.store = store
+        self.simulations = simulations
+        self.default_method = default_method
+        self.seed = seed
+
+    def compute(
+        self,
+        exposures: np.ndarray,
+        universe: Dict[str, Any],
+        confidence_level: float = 0.95,
+        time_horizon_days: int = 1,
+        methods: Sequence[str] = METHODS
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        계정별 VaR / CVaR (벡터화)
+
+        Args:
+            exposures: 노출 행렬 (계정 A × 심볼 N, 심볼 순서는 universe["symbols"])
+            universe: ReturnsStore.universe() 결과
+            confidence_level: 신뢰 수준
+            time_horizon_days: 시간 범위 (캔들 간격 단위)
+            methods: 계산할 방법
+
+        Returns:
+            {method: (VaR[A], CVaR[A])} - 손실 금액 (양수)
+        """
+        returns = universe["returns"]
+        horizon = np.sqrt(time_horizon_days)
+        results = {}
+
+        if "historical" in methods:
+            # 시나리오 T × 계정 A 손익 - 모든 계정을 한 번의 행렬 곱으로
+            pnl = returns @ exposures.T
+            var, cvar = _tail_loss(pnl, confidence_level)
+            results["historical"] = (var * horizon, cvar * horizon)
+
+        if "parametric" in methods:
+            mean = exposures @ universe["mean"] * time_horizon_days
+            sigma = np.sqrt(np.maximum(np.einsum("an,nm,am->a", exposures, universe["cov"], exposures), 0.0))
+            sigma = sigma * horizon
+            z = stats.norm.ppf(1 - confidence_level)
+            var = -(mean + z * sigma)
+            cvar = -(mean - sigma * stats.norm.pdf(z) / (1 - confidence_level))
+            results["parametric"] = (np.maximum(var, 0.0), np.maximum(cvar, 0.0))
+
+        if "monte_carlo" in methods:
+            rng = np.random.default_rng(self.seed)
+            shocks = rng.standard_normal((self.simulations, len(universe["symbols"])))
+            scenarios = universe["mean"] + shocks @ universe["cholesky"].T
+            pnl = scenarios @ exposures.T
+            var, cvar = _tail_loss(pnl, confidence_level)
+            results["monte_carlo"] = (var * horizon, cvar * horizon)
+
+        return results
+
+    def batch_var(
+        self,
+        accounts: Dict[Any, List[Dict[str, Any]]],
+        confidence_level: float = 0.95,
+        time_horizon_days: int = 1,
+        methods: Sequence[str] = METHODS
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        여러 계정의 포트폴리오 VaR
+
+        Args:
+            accounts: {계정 ID: 포지션 리스트}
+            confidence_level: 신뢰 수준
+            time_horizon_days: 시간 범위 (일)
+            methods: 계산할 방법
+
+        Returns:
+            {계정 ID: VaR 결과}
+        """
+        account_ids = list(accounts)
+        symbols = sorted({
+            candle_symbol(position["symbol"])
+            for positions in accounts.values() for position in positions
+        })
+
+        universe = self.store.universe(symbols) if symbols else None
+        universe_symbols = universe["symbols"] if universe else []
+        column = {symbol: index for index, symbol in enumerate(universe_symbols)}
+
+        exposures = np.zeros((len(account_ids), len(universe_symbols)))
+        portfolio_values = np.zeros(len(account_ids))
+        uncovered_values = np.zeros(len(account_ids))
+        uncovered: Dict[Any, set] = {account_id: set() for account_id in account_ids}
+
+        for row, account_id in enumerate(account_ids):
+            for position in accounts[account_id]:
+                exposure = signed_exposure(position)
+                portfolio_values[row] += abs(exposure)
+                symbol = candle_symbol(position["symbol"])
+                if symbol in column:
+                    exposures[row, column[symbol]] += exposure
+                elif exposure:
+                    uncovered[account_id].add(position["symbol"])
+                    uncovered_values[row] += abs(exposure)
+
+        computed = (
+            self.compute(exposures, universe, confidence_level, time_horizon_days, methods)
+            if universe is not None and len(account_ids) else {}
+        )
+
+        results = {}
+        for row, account_id in enumerate(account_ids):
+            portfolio_value = float(portfolio_values[row])
+            uncovered_value = float(uncovered_values[row])
+            if uncovered[account_id]:
+                # 수익률이 없는 심볼은 VaR에 0으로 들어가므로 결과와 로그에 드러냄
+                logger.warning(
+                    f"VaR for {account_id} excludes {sorted(uncovered[account_id])} "
+                    f"(${uncovered_value:,.2f} of ${portfolio_value:,.2f} exposure): no aligned returns"
+                )
+            by_method = {
+                method: {
+                    "var_amount": round(float(var[row]), 2),
+                    "cvar_amount": round(float(cvar[row]), 2)
+                }
+                for method, (var, cvar) in computed.items()
+            }
+            primary = by_method.get(self.default_method) or next(iter(by_method.values()), None)
+            var_amount = primary["var_amount"] if primary else 0.0
+            cvar_amount = primary["cvar_amount"] if primary else 0.0
+
+            results[account_id] = {
+                "var_amount": var_amount,
+                "var_percentage": round(var_amount / portfolio_value * 100, 2) if portfolio_value else 0.0,
+                "cvar_amount": cvar_amount,
+                "confidence_level": confidence_level,
+                "time_horizon_days": time_horizon_days,
+                "portfolio_value": round(portfolio_value, 2),
+                "method": self.default_method if self.default_method in by_method else next(iter(by_method), None),
+                "methods": by_method,
+                "observations": len(universe["returns"]) if universe else 0,
+                "uncovered_symbols": sorted(uncovered[account_id]),
+                "uncovered_value": round(uncovered_value, 2),
+                "coverage": round(1 - uncovered_value / portfolio_value, 4) if portfolio_value else 1.0
+            }
+
+        return results
+
+    def portfolio_var(
+        self,
+        positions: List[Dict[str, Any]],
+        confidence_level: float = 0.95,
+        time_horizon_days: int = 1,
+        methods: Sequence[str] = METHODS
+    ) -> Dict[str, Any]:
+        """단일 포트폴리오 VaR (batch_var의 계정 1개 경우)"""
+        return self.batch_var(
+            {"portfolio": positions},
+            confidence_level=confidence_level,
+            time_horizon_days=time_horizon_days,
+            methods=methods
+        )["portfolio"]
+
+
+# 전역 VaR 엔진
+var_engine = VaREngine(
+    ReturnsStore(
+        interval=settings.VAR_RETURNS_INTERVAL,
+        lookback_days=settings.VAR_LOOKBACK_DAYS,
+        ttl=settings.VAR_RETURNS_TTL,
+        min_overlap=settings.VAR_MIN_OVERLAP
+    ),
+    simulations=settings.VAR_MONTE_CARLO_SIMULATIONS,
+    default_method=settings.VAR_DEFAULT_METHOD
+)
@@ -0,0 +1,403 @@
+"""
+웹훅 시그널 수집 큐
+
+TradingView 웹훅을 요청 처리와 분리해 내구성 있는 큐에 넣고 워커가 실행합니다.
+
+Usage:
+    signal_id, accepted = await webhook_queue.submit(account_id, "binance", signal)
+
+Features:
+- 중복 제거: 시크릿을 뺀 페이로드 해시 + 타임스탬프 윈도우 (재전송/중복 알림 무시)
+- 순서 보장: (계정, 심볼) 해시로 파티션을 정하고 파티션 안에서는 순차 실행
+- 병렬 실행: 파티션별 실행 태스크 (서로 다른 계정/심볼은 동시에 실행)
+- 내구성: 파티션별 Redis Stream + 컨슈머 그룹 (ACK 전 종료 시 다음 소유자가 회수)
+- 이중 체결 방지: 실행 직전 시그널별 실행 마커 (회수된 메시지가 재실행되지 않음)
+- Redis 장애 시 프로세스 내 큐로 대체 (테스트용 인메모리 모드와 동일)
+
+Redis state:
+- webhook:signals:{p}         파티션 p의 Stream (컨슈머 그룹 "executors")
+- webhook:signals:{p}:owner   파티션 소유 리스 (한 파티션은 한 프로세스만 소비)
+- webhook:dedup:{hash}        수집 중복 제거 키 (윈도우 TTL)
+- webhook:exec:{hash}         실행 마커 (1일 TTL)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+STREAM_PREFIX = "webhook:signals:"
+DEDUP_PREFIX = "webhook:dedup:"
+EXEC_PREFIX = "webhook:exec:"
+CONSUMER_GROUP = "executors"
+EXEC_MARKER_TTL = 86400
+STREAM_MAXLEN = 10000
+
+SignalHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def signal_fingerprint(
+    account_id: str,
+    exchange: str,
+    signal: Dict[str, Any],
+    alert_timestamp: Optional[int],
+    window: int
+) -> str:
+    """
+    시그널 지문 (중복 판별 키)
+
+    알림 타임스탬프가 있으면 그 값을, 없으면 수신 시각을 윈도우 단위로 묶어 포함합니다.
+    TradingView 재전송은 같은 본문/타임스탬프로 오므로 같은 지문이 됩니다.
+    """
+    bucket = (alert_timestamp or int(time.time())) // window
+    canonical = json.dumps(
+        {"account_id": account_id, "exchange": exchange, "signal": signal, "bucket": bucket},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+class WebhookIngestionQueue:
+    """파티션 단위 순서 보장 + 파티션 간 병렬 실행 웹훅 큐"""
+
+    def __init__(
+        self,
+        partitions: int = 32,
+        dedup_window: int = 60,
+        lease_seconds: int = 30,
+        use_redis: bool = True
+    ):
+        """
+        Args:
+            partitions: 파티션 수 (동시에 실행 가능한 최대 시그널 수)
+            dedup_window: 중복 제거 윈도우 (초)
+            lease_seconds: 파티션 소유 리스 TTL (초)
+            use_redis: False면 프로세스 내 큐만 사용 (테스트/단일 프로세스)
+        """
+        self.partitions = partitions
+        self.dedup_window = dedup_window
+        self.lease_seconds = lease_seconds
+        self.use_redis = use_redis
+        self.consumer = f"webhook-{uuid.uuid4().hex[:8]}"
+
+        self.handler: Optional[SignalHandler] = None
+        self._client = None
+        self._redis_failed_at = 0.0
+        self._owned: Set[int] = set()
+
+        # 파티션별 실행 대기열: (stream id 또는 None, 메시지)
+        self._local: List[asyncio.Queue] = []
+        self._executors: List[asyncio.Task] = []
+        self._reader_task: Optional[asyncio.Task] = None
+        self._lease_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # 인메모리 모드 중복 제거/실행 마커: {키: 만료 시각}
+        self._local_keys: Dict[str, float] = {}
+
+        self.stats = {
+            "submitted": 0,
+            "duplicates": 0,
+            "executed": 0,
+            "failed": 0,
+            "skipped_executed": 0,
+            "reclaimed": 0,
+            "redis_fallbacks": 0
+        }
+
+    # ===== 생명주기 =====
+
+    async def start(self, handler: SignalHandler):
+        """실행 태스크 시작 (handler: 메시지 하나를 실행하는 코루틴 함수)"""
+        if self._running:
+            return
+
+        self.handler = handler
+        self._running = True
+        self._local = [asyncio.Queue() for _ in range(self.partitions)]
+        self._executors = [
+            asyncio.create_task(self._execute_loop(p), name=f"webhook-partition-{p}")
+            for p in range(self.partitions)
+        ]
+
+        if self.use_redis:
+            try:
+                self._client = await RedisClient.get_client()
+                for p in range(self.partitions):
+                    await self._ensure_group(p)
+                self._lease_task = asyncio.create_task(self._lease_loop())
+                self._reader_task = asyncio.create_task(self._read_loop())
+            except Exception as e:
+                logger.warning(f"Webhook queue running in-process only (Redis unavailable): {e}")
+                self._client = None
+
+        mode = "redis" if self._client is not None else "memory"
+        logger.info(f"Webhook ingestion queue started ({self.partitions} partitions, {mode})")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        종료
+
+        Redis 모드에서 ACK되지 않은 메시지는 다음 소유자가 회수합니다.
+        인메모리 대기열은 제한 시간 내에서 비웁니다.
+        """
+        if not self._running:
+            return
+        self._running = False
+
+        for task in (self._lease_task, self._reader_task):
+            if task:
+                task.cancel()
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._local)),
+                timeout=drain_timeout
+            )
+        except asyncio.TimeoutError:
+            pending = sum(queue.qsize() for queue in self._local)
+            logger.warning(f"Webhook queue stopped with {pending} signals not executed")
+
+        for task in self._executors:
+            task.cancel()
+        await asyncio.gather(*self._executors, return_exceptions=True)
+        self._executors = []
+
+        if self._client is not None:
+            for p in list(self._owned):
+                await self._release(p)
+        self._owned.clear()
+
+    # ===== 수집 =====
+
+    def partition_for(self, account_id: str, symbol: str) -> int:
+        """(계정, 심볼) → 파티션 (프로세스 간 동일해야 하므로 hash() 대신 sha1)"""
+        digest = hashlib.sha1(f"{account_id}:{symbol}".encode()).digest()
+        return int.from_bytes(digest[:4], "big") % self.partitions
+
+    async def submit(
+        self,
+        account_id: str,
+        exchange: str,
+        signal: Dict[str, Any],
+        alert_timestamp: Optional[int] = None,
+        local: bool = False
+    ) -> Tuple[str, bool]:
+        """
+        시그널 등록
+
+        Args:
+            local: True면 Redis Stream을 거치지 않고 이 프로세스의 파티션 대기열에서 실행
+                (이 프로세스 메모리에만 등록된 계정 - 다른 워커는 실행할 수 없음)
+
+        Returns:
+            (시그널 ID, 등록 여부). 윈도우 내 중복이면 등록하지 않고 False
+        """
+        signal_id = signal_fingerprint(account_id, exchange, signal, alert_timestamp, self.dedup_window)
+        partition = self.partition_for(account_id, signal["symbol"])
+        message = {
+            "signal_id": signal_id,
+            "account_id": account_id,
+            "exchange": exchange,
+            "signal": signal,
+            "alert_timestamp": alert_timestamp,
+            "received_at": time.time()
+        }
+
+        if not await self._claim(f"{DEDUP_PREFIX}{signal_id}", self.dedup_window):
+            self.stats["duplicates"] += 1
+            logger.info(f"Duplicate webhook ignored: {signal_id} (account={account_id})")
+            return signal_id, False
+
+        if not local and self._redis_available():
+            try:
+                await self._client.xadd(
+                    f"{STREAM_PREFIX}{partition}",
+                    {"data": json.dumps(message)},
+                    maxlen=STREAM_MAXLEN,
+                    approximate=True
+                )
+                self.stats["submitted"] += 1
+                return signal_id, True
+            except Exception as e:
+                self._on_redis_error(e)
+
+        self._local[partition].put_nowait((None, message))
+        self.stats["submitted"] += 1
+        return signal_id, True
+
+    # ===== Redis / 인메모리 키 =====
+
+    def _redis_available(self) -> bool:
+        # 장애 후 30초 동안은 프로세스 내 큐 사용
+        return self._client is not None and time.monotonic() - self._redis_failed_at > 30
+
+    def _on_redis_error(self, e: Exception):
+        if self._redis_available():
+            logger.warning(f"Webhook queue falling back to in-process queue: {e}")
+        self._redis_failed_at = time.monotonic()
+        self.stats["redis_fallbacks"] += 1
+
+    async def _claim(self, key: str, ttl: int) -> bool:
+        """키 최초 점유 여부 (SET NX)"""
+        if self._redis_available():
+            try:
+                return bool(await self._client.set(key, self.consumer, nx=True, ex=ttl))
+            except Exception as e:
+                self._on_redis_error(e)
+
+        now = time.monotonic()
+        if len(self._local_keys) > 10000:
+            self._local_keys = {k: exp for k, exp in self._local_keys.items() if exp > now}
+        if self._local_keys.get(key, 0) > now:
+            return False
+        self._local_keys[key] = now + ttl
+        return True
+
+    async def _ensure_group(self, partition: int):
+        try:
+            await self._client.xgroup_create(
+                f"{STREAM_PREFIX}{partition}", CONSUMER_GROUP, id="0", mkstream=True
+            )
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    # ===== 파티션 리스 =====
+
+    async def _lease_loop(self):
+        """소유 파티션 리스 갱신 + 비어 있는 파티션 획득"""
+        while self._running:
+            try:
+                for p in range(self.partitions):
+                    owner_key = f"{STREAM_PREFIX}{p}:owner"
+                    if p in self._owned:
+                        if _decode(await self._client.get(owner_key)) == self.consumer:
+                            await self._client.expire(owner_key, self.lease_seconds)
+                        else:
+                            self._owned.discard(p)
+                            logger.warning(f"Webhook partition {p} lease lost")
+                    elif await self._client.set(owner_key, self.consumer, nx=True, ex=self.lease_seconds):
+                        await self._reclaim(p)
+                        self._owned.add(p)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Webhook queue lease refresh failed: {e}")
+
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    async def _reclaim(self, partition: int):
+        """이전 소유자가 ACK하지 못한 메시지를 순서대로 회수"""
+        stream = f"{STREAM_PREFIX}{partition}"
+        start = "0-0"
+        while True:
+            result = await self._client.xautoclaim(
+                stream, CONSUMER_GROUP, self.consumer, min_idle_time=0, start_id=start, count=100
+            )
+            start, entries = result[0], result[1]
+            for entry_id, fields in entries:
+                if fields:
+                    self._local[partition].put_nowait((entry_id, json.loads(_decode(fields[b"data"]))))
+                    self.stats["reclaimed"] += 1
+            if _decode(start) == "0-0":
+                break
+
+    async def _release(self, partition: int):
+        owner_key = f"{STREAM_PREFIX}{partition}:owner"
+        try:
+            if _decode(await self._client.get(owner_key)) == self.consumer:
+                await self._client.delete(owner_key)
+        except Exception as e:
+            logger.warning(f"Failed to release webhook partition {partition}: {e}")
+
+    # ===== 소비 / 실행 =====
+
+    async def _read_loop(self):
+        """소유 파티션 Stream을 한 연결로 블로킹 읽기 → 파티션 대기열로 분배"""
+        while self._running:
+            owned = sorted(self._owned)
+            if not owned or not self._redis_available():
+                await asyncio.sleep(1)
+                continue
+
+            try:
+                response = await self._client.xreadgroup(
+                    CONSUMER_GROUP,
+                    self.consumer,
+                    {f"{STREAM_PREFIX}{p}": ">" for p in owned},
+                    count=100,
+                    block=1000
+                )
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self._on_redis_error(e)
+                continue
+
+            for stream, entries in response or []:
+                partition = int(_decode(stream).rsplit(":", 1)[1])
+                for entry_id, fields in entries:
+                    self._local[partition].put_nowait((entry_id, json.loads(_decode(fields[b"data"]))))
+
+    async def _execute_loop(self, partition: int):
+        """파티션 메시지를 도착 순서대로 하나씩 실행"""
+        queue = self._local[partition]
+        while True:
+            entry_id, message = await queue.get()
+            try:
+                await self._execute(message)
+            finally:
+                if entry_id is not None:
+                    await self._ack(partition, entry_id)
+                queue.task_done()
+
+    async def _execute(self, message: Dict[str, Any]):
+        # 실행 마커를 먼저 잡아 회수/재전달된 메시지가 주문을 다시 내지 않도록 함
+        if not await self._claim(f"{EXEC_PREFIX}{message['signal_id']}", EXEC_MARKER_TTL):
+            self.stats["skipped_executed"] += 1
+            logger.warning(f"Webhook signal already executed, skipping: {message['signal_id']}")
+            return
+
+        try:
+            await self.handler(message)
+            self.stats["executed"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Webhook signal {message['signal_id']} failed: {e}")
+
+    async def _ack(self, partition: int, entry_id):
+        try:
+            await self._client.xack(f"{STREAM_PREFIX}{partition}", CONSUMER_GROUP, entry_id)
+        except Exception as e:
+            logger.warning(f"Failed to ack webhook signal {_decode(entry_id)}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐 통계"""
+        return {
+            **self.stats,
+            "mode": "redis" if self._redis_available() else "memory",
+            "owned_partitions": len(self._owned),
+            "pending_local": sum(queue.qsize() for queue in self._local)
+        }
+
+
+# 전역 웹훅 수집 큐
+webhook_queue = WebhookIngestionQueue(
+    partitions=settings.WEBHOOK_QUEUE_PARTITIONS,
+    dedup_window=settings.WEBHOOK_DEDUP_WINDOW,
+    use_redis=settings.WEBHOOK_QUEUE_BACKEND == "redis"
+)
@@ -0,0 +1,399 @@
+"""
+Frontend WebSocket Fan-out
+
+프론트엔드 클라이언트별 전송 세션입니다.
+각 클라이언트는 구독 토픽, 제한된 크기의 전송 버퍼, 전용 writer 태스크를 가지므로
+느린 클라이언트가 다른 클라이언트나 거래소 스트림 수신 루프를 지연시키지 않습니다.
+
+Features:
+- 클라이언트별 토픽 구독 (ticker_BTCUSDT, kline_BTCUSDT_1m, ...)
+- 클라이언트별 bounded 전송 버퍼 + 전용 writer 태스크
+- 느린 소비자 정책 (drop / conflate / disconnect)
+- 클라이언트별 전송/폐기 통계
+- 1회 직렬화 프레임 (토픽 업데이트당 인코딩 1회, 모든 구독자에 동일 프레임 전송)
+- 연결별 인코딩 협상 (json / msgpack)
+- 구독별 전달 모드 (every / conflate N Hz / batch 주기별 배열)
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def encode_json(message: Any) -> str:
+    """JSON 텍스트 인코딩 (orjson이 설치된 경우 사용)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message).decode("utf-8")
+    return json.dumps(message, separators=(",", ":"))
+
+
+class FrameEncoding(str, Enum):
+    """클라이언트 전송 인코딩"""
+    JSON = "json"        # 텍스트 프레임
+    MSGPACK = "msgpack"  # 바이너리 프레임
+
+
+class Frame:
+    """
+    1회 직렬화 브로드캐스트 프레임
+
+    인코딩별 결과를 최초 요청 시 한 번만 만들어 캐시하므로,
+    구독자 수와 관계없이 토픽 업데이트당 인코딩 비용은 인코딩 종류 수만큼만 듭니다.
+    """
+
+    __slots__ = ("message", "_text", "_binary")
+
+    def __init__(self, message: Any):
+        self.message = message
+        self._text: Optional[str] = None
+        self._binary: Optional[bytes] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = encode_json(self.message)
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        if self._binary is None:
+            self._binary = msgpack.packb(self.message, use_bin_type=True)
+        return self._binary
+
+
+class SlowConsumerPolicy(str, Enum):
+    """전송 버퍼가 가득 찼을 때의 처리 방식"""
+    DROP = "drop"              # 가장 오래된 대기 메시지 폐기
+    CONFLATE = "conflate"      # 토픽별 최신 메시지만 유지
+    DISCONNECT = "disconnect"  # 클라이언트 연결 종료
+
+
+class ClientSession:
+    """
+    프론트엔드 WebSocket 클라이언트 전송 세션
+
+    offer()는 대기 없이 버퍼에 메시지를 넣기만 하고,
+    실제 전송은 세션 전용 writer 태스크가 순서대로 수행합니다.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.CONFLATE,
+        max_pending: int = 256,
+        send_timeout: float = 5.0,
+        encoding: FrameEncoding = FrameEncoding.JSON
+    ):
+        """
+        Args:
+            websocket: 수락된 FastAPI WebSocket
+            policy: 느린 소비자 정책
+            max_pending: 최대 대기 메시지 수
+            send_timeout: 단일 전송 타임아웃 (초)
+            encoding: 전송 인코딩 (json 텍스트 / msgpack 바이너리)
+        """
+        self.websocket = websocket
+        self.client_id = f"client-{uuid.uuid4().hex[:8]}"
+        self.policy = policy
+        self.encoding = encoding
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+
+        # 토픽 → 전달 모드
+        self.topics: Dict[str, "DeliverySpec"] = {}
+
+        # 전송 대기 버퍼 (conflate: 토픽 키, 그 외: 순번 키)
+        self._pending: "OrderedDict[Hashable, Frame]" = OrderedDict()
+        self._seq = 0
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+        self._close_code = 1000
+
+        self.stats = {
+            "sent": 0,
+            "dropped": 0,
+            "conflated": 0
+        }
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def start(self):
+        """writer 태스크 시작"""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def offer(self, topic: Optional[str], frame: Frame) -> bool:
+        """
+        프레임을 전송 버퍼에 추가 (대기하지 않음)
+
+        Returns:
+            버퍼에 들어갔으면 True, 폐기/연결 종료면 False
+        """
+        if self._closed:
+            return False
+
+        if self.policy == SlowConsumerPolicy.CONFLATE and topic is not None:
+            if topic in self._pending:
+                # 같은 토픽의 미전송 메시지를 최신 값으로 교체 (순서 유지)
+                self._pending[topic] = frame
+                self.stats["conflated"] += 1
+                return True
+            key: Hashable = topic
+        else:
+            self._seq += 1
+            key = self._seq
+
+        if len(self._pending) >= self.max_pending:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                # 소유자(WebSocketManager)가 is_closed를 보고 close()로 정리
+                logger.warning(f"Slow consumer {self.client_id} disconnected ({len(self._pending)} pending)")
+                self._closed = True
+                self._close_code = 1013
+                return False
+
+            self._pending.popitem(last=False)
+            self.stats["dropped"] += 1
+
+        self._pending[key] = frame
+        self._ready.set()
+        return True
+
+    async def _write_loop(self):
+        """버퍼의 메시지를 순서대로 전송"""
+        try:
+            while not self._closed:
+                if not self._pending:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                _, frame = self._pending.popitem(last=False)
+                await asyncio.wait_for(self._send(frame), timeout=self.send_timeout)
+                self.stats["sent"] += 1
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception as e:
+            logger.info(f"Client {self.client_id} send failed: {e}")
+            self._closed = True
+
+    async def _send(self, frame: Frame):
+        if self.encoding == FrameEncoding.MSGPACK:
+            await self.websocket.send_bytes(frame.binary)
+        else:
+            await self.websocket.send_text(frame.text)
+
+    async def close(self, code: Optional[int] = None, reason: str = ""):
+        """
+        세션 종료 (writer 중지 및 소켓 종료)
+
+        Args:
+            code: WebSocket 종료 코드 (None이면 정책에 따른 코드, 정상 종료면 소켓은 그대로 둠)
+            reason: 종료 사유
+        """
+        if self._closed and self._writer is None:
+            return
+
+        code = code or self._close_code
+        if code == 1013 and not reason:
+            reason = "Slow consumer"
+
+        self._closed = True
+        self._pending.clear()
+
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+
+        if code != 1000:
+            try:
+                await self.websocket.close(code=code, reason=reason)
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """세션 통계"""
+        return {
+            **self.stats,
+            "client_id": self.client_id,
+            "policy": self.policy.value,
+            "encoding": self.encoding.value,
+            "pending": len(self._pending),
+            "topics": {topic: spec.describe() for topic, spec in self.topics.items()}
+        }
+
+
+class DeliveryMode(str, Enum):
+    """구독별 전달 모드"""
+    EVERY = "every"        # 모든 업데이트 전달
+    CONFLATE = "conflate"  # 주기(N Hz)마다 최신 값 1개만 전달
+    BATCH = "batch"        # 주기마다 누적 메시지를 배열로 전달
+
+
+@dataclass(frozen=True)
+class DeliverySpec:
+    """전달 모드 + 주기 (초)"""
+    mode: DeliveryMode = DeliveryMode.EVERY
+    interval: float = 0.0
+
+    @classmethod
+    def from_request(cls, message: Dict[str, Any]) -> "DeliverySpec":
+        """
+        클라이언트 구독 요청에서 전달 모드 파싱
+
+        - {"mode": "every"}
+        - {"mode": "conflate", "rate": 4}          # 초당 최대 4회
+        - {"mode": "batch", "interval_ms": 250}    # 250ms마다 배열로
+        """
+        try:
+            mode = DeliveryMode(message.get("mode") or DeliveryMode.EVERY.value)
+        except ValueError:
+            raise ValueError(f"Invalid delivery mode: {message.get('mode')}")
+
+        if mode == DeliveryMode.CONFLATE:
+            rate = float(message.get("rate") or settings.WS_DEFAULT_CONFLATE_HZ)
+            if rate <= 0:
+                raise ValueError("rate must be positive")
+            return cls(mode, max(1.0 / rate, settings.WS_MIN_DELIVERY_INTERVAL))
+
+        if mode == DeliveryMode.BATCH:
+            interval_ms = float(message.get("interval_ms") or settings.WS_DEFAULT_BATCH_MS)
+            if interval_ms <= 0:
+                raise ValueError("interval_ms must be positive")
+            return cls(mode, max(interval_ms / 1000, settings.WS_MIN_DELIVERY_INTERVAL))
+
+        return cls()
+
+    def describe(self) -> Dict[str, Any]:
+        if self.mode == DeliveryMode.EVERY:
+            return {"mode": self.mode.value}
+        return {"mode": self.mode.value, "interval_ms": round(self.interval * 1000)}
+
+
+class TopicChannel:
+    """
+    토픽 + 전달 모드 단위 전송 채널
+
+    같은 토픽을 같은 모드로 구독한 세션들은 하나의 채널을 공유하므로
+    conflate/batch 프레임도 주기당 한 번만 만들어 모든 세션에 전달됩니다.
+    타이머는 메시지가 들어올 때만 예약됩니다 (유휴 토픽은 비용 없음).
+    """
+
+    def __init__(self, topic: str, spec: DeliverySpec, on_closed: Callable[[ClientSession], None]):
+        self.topic = topic
+        self.spec = spec
+        self.sessions: Set[ClientSession] = set()
+        self._on_closed = on_closed
+
+        self._latest: Any = None
+        self._has_latest = False
+        self._batch: List[Any] = []
+        self._last_flush = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def publish(self, message: Any):
+        """토픽 업데이트 수신"""
+        if self.spec.mode == DeliveryMode.EVERY:
+            self._fan_out(Frame(message))
+            return
+
+        if self.spec.mode == DeliveryMode.CONFLATE:
+            self._latest = message
+            self._has_latest = True
+        else:
+            self._batch.append(message)
+
+        if self._timer is not None:
+            return
+
+        delay = self._last_flush + self.spec.interval - time.monotonic()
+        if delay <= 0 and self.spec.mode == DeliveryMode.CONFLATE:
+            self._flush()
+        else:
+            self._timer = asyncio.get_running_loop().call_later(max(delay, 0), self._flush)
+
+    def _flush(self):
+        self._timer = None
+        self._last_flush = time.monotonic()
+
+        if self.spec.mode == DeliveryMode.CONFLATE:
+            if not self._has_latest:
+                return
+            frame = Frame(self._latest)
+            self._latest, self._has_latest = None, False
+        else:
+            if not self._batch:
+                return
+            frame = Frame({"type": "batch", "stream": self.topic, "data": self._batch})
+            self._batch = []
+
+        self._fan_out(frame)
+
+    def _fan_out(self, frame: Frame):
+        for session in list(self.sessions):
+            session.offer(self.topic, frame)
+            if session.is_closed:
+                self._on_closed(session)
+
+    def close(self):
+        """예약된 전송 취소"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+def create_session(
+    websocket: WebSocket,
+    policy: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> ClientSession:
+    """
+    설정 기본값으로 세션 생성 (policy, encoding은 클라이언트가 지정 가능)
+
+    msgpack을 요청했지만 패키지가 없으면 json으로 전송합니다.
+    """
+    try:
+        slow_policy = SlowConsumerPolicy(policy or settings.WS_SLOW_CONSUMER_POLICY)
+    except ValueError:
+        slow_policy = SlowConsumerPolicy(settings.WS_SLOW_CONSUMER_POLICY)
+
+    frame_encoding = FrameEncoding.JSON
+    if encoding == FrameEncoding.MSGPACK.value and MSGPACK_AVAILABLE:
+        frame_encoding = FrameEncoding.MSGPACK
+
+    return ClientSession(
+        websocket,
+        policy=slow_policy,
+        max_pending=settings.WS_CLIENT_QUEUE_SIZE,
+        send_timeout=settings.WS_SEND_TIMEOUT,
+        encoding=frame_encoding
+    )
@@ -1,15 +1,20 @@
 import asyncio
-import json
-import websockets
-from typing import Dict, Set, Callable, List, Optional
+from typing import Any, Dict, Set, List, Optional, Tuple
 from fastapi import WebSocket
-from binance import AsyncClient, BinanceSocketManager
 import logging
 import uuid
 
-from app.services.websocket_pool import websocket_pool, WebSocketConnection
-from app.services.websocket_reconnect import websocket_reconnector
+from app.services.websocket_pool import websocket_pool, okx_stream
+from app.services.websocket_fanout import (
+    ClientSession,
+    DeliverySpec,
+    Frame,
+    TopicChannel,
+    create_session
+)
 from app.core.redis_pubsub import WebSocketCoordinator
+from app.services.okx_client import OKXClient
+from app.services.price_book import price_book
 
 logger = logging.getLogger(__name__)
 
@@ -20,20 +25,25 @@ class WebSocketManager:
 
     Features (Enhanced):
     - 연결 풀 관리 (최대 5개/거래소)
-    - 연결 재사용 및 멀티플렉싱
-    - 자동 재연결 (Exponential Backoff)
+    - Combined stream 멀티플렉싱 (연결당 수백 개 스트림, 실시간 구독/해제)
+    - 자동 재연결 (Exponential Backoff, 연결 단위 구독 복원)
     - 워커 간 통신 (Redis Pub/Sub)
     - Health Check 및 모니터링
+    - 토픽 기반 라우팅 (구독한 클라이언트에게만 전송)
+    - 클라이언트별 전송 버퍼/writer 태스크 + 느린 소비자 정책
+    - 1회 직렬화 브로드캐스트 (json / msgpack 연결별 협상)
+    - 구독별 전달 모드 (every / conflate / batch)
     """
 
     def __init__(self):
         self.active_connections: Set[WebSocket] = set()
 
-        # Legacy fields (호환성 유지)
-        self.binance_client: AsyncClient = None
-        self.binance_socket_manager: BinanceSocketManager = None
-        self.okx_connections: Dict[str, websockets.WebSocketClientProtocol] = {}
-        self.active_streams: Dict[str, asyncio.Task] = {}
+        # 프론트엔드 클라이언트 세션 및 토픽 → 전달 모드별 채널
+        self.sessions: Dict[WebSocket, ClientSession] = {}
+        self.topic_channels: Dict[str, Dict[DeliverySpec, TopicChannel]] = {}
+
+        # 스트림 키 → (거래소, 거래소 스트림 이름)
+        self.active_streams: Dict[str, Tuple[str, str]] = {}
         self.subscribed_symbols: Set[str] = set()
 
         # 워커 ID 생성
@@ -42,219 +52,240 @@ class WebSocketManager:
         # 코디네이터 (워커 간 통신)
         self.coordinator: Optional[WebSocketCoordinator] = None
 
-        # 구독 → 연결 매핑: {subscription_key: connection_id}
-        self.subscription_mapping: Dict[str, str] = {}
-
         # 초기화 완료 플래그
         self._initialized = False
 
-    async def connect(self, websocket: WebSocket):
-        """Accept and register a new WebSocket connection"""
+    async def connect(
+        self,
+        websocket: WebSocket,
+        policy: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> ClientSession:
+        """
+        Accept and register a new WebSocket connection
+
+        Args:
+            websocket: Frontend WebSocket
+            policy: Slow-consumer policy (drop, conflate, disconnect; defaults to settings)
+            encoding: Frame encoding (json, msgpack; defaults to json)
+        """
         await websocket.accept()
+
+        session = create_session(websocket, policy, encoding)
+        session.start()
+
+        self.sessions[websocket] = session
         self.active_connections.add(websocket)
-        logger.info(f"New WebSocket connection. Total: {len(self.active_connections)}")
+        logger.info(
+            f"New WebSocket connection {session.client_id} (policy={session.policy.value}). "
+            f"Total: {len(self.active_connections)}"
+        )
+        return session
 
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection"""
         self.active_connections.discard(websocket)
+
+        session = self.sessions.pop(websocket, None)
+        if session is not None:
+            for topic in list(session.topics):
+                self._remove_subscriber(session, topic)
+            asyncio.ensure_future(session.close())
+
         logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
 
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients"""
-        if not self.active_connections:
+    async def subscribe_client(
+        self,
+        websocket: WebSocket,
+        topic: str,
+        spec: Optional[DeliverySpec] = None
+    ):
+        """
+        Route a topic (e.g. ticker_BTCUSDT) to this client
+
+        Args:
+            websocket: Frontend WebSocket
+            topic: Stream topic
+            spec: Delivery mode (every update, conflated N Hz, batched); re-subscribing switches modes
+        """
+        session = self.sessions.get(websocket)
+        if session is None:
             return
 
-        dead_connections = set()
+        spec = spec or DeliverySpec()
+        if topic in session.topics:
+            self._remove_subscriber(session, topic, release=False)
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to client: {e}")
-                dead_connections.add(connection)
+        channels = self.topic_channels.setdefault(topic, {})
+        channel = channels.get(spec)
+        if channel is None:
+            channel = channels[spec] = TopicChannel(topic, spec, self._on_session_closed)
 
-        # Clean up dead connections
-        for connection in dead_connections:
-            self.disconnect(connection)
+        channel.sessions.add(session)
+        session.topics[topic] = spec
 
-    async def initialize_binance_client(self, api_key: str, api_secret: str):
-        """Initialize Binance async client for WebSocket streaming"""
-        try:
-            self.binance_client = await AsyncClient.create(
-                api_key=api_key,
-                api_secret=api_secret
-            )
-            self.binance_socket_manager = BinanceSocketManager(self.binance_client)
-            logger.info("Binance WebSocket client initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Binance client: {e}")
-            raise
+    async def unsubscribe_client(self, websocket: WebSocket, topic: str):
+        """Stop routing a topic to this client (upstream stream stops with its last subscriber)"""
+        session = self.sessions.get(websocket)
+        if session is None:
+            return
 
-    async def subscribe_ticker(self, symbol: str, api_key: str = "", api_secret: str = ""):
-        """
-        Subscribe to ticker updates for a symbol (연결 풀 기반)
+        self._remove_subscriber(session, topic)
 
-        Streams: price, 24h volume, 24h high/low, price change %
+    def _remove_subscriber(self, session: ClientSession, topic: str, release: bool = True):
+        spec = session.topics.pop(topic, None)
+
+        channels = self.topic_channels.get(topic)
+        if spec is None or channels is None or spec not in channels:
+            return
+
+        channel = channels[spec]
+        channel.sessions.discard(session)
+        if not channel.sessions:
+            channel.close()
+            del channels[spec]
+
+        if not channels:
+            del self.topic_channels[topic]
+            if release and topic in self.active_streams:
+                asyncio.ensure_future(self.unsubscribe(topic))
+
+    def _on_session_closed(self, session: ClientSession):
+        # Clean up dead connections
+        if session.websocket in self.sessions:
+            self.disconnect(session.websocket)
+
+    async def broadcast(self, message: dict, topic: Optional[str] = None):
         """
-        subscription_key = f"ticker_{symbol}"
+        Broadcast message to subscribed clients
+
+        Each topic channel (topic + delivery mode) wraps the message in one Frame,
+        encoded at most once per encoding, and queues the same frame for all of its
+        sessions. Each client's writer task sends it, so a slow client never delays
+        the stream or other clients.
 
-        if subscription_key in self.subscription_mapping:
-            logger.info(f"Already subscribed to {symbol}")
+        Args:
+            message: Message payload
+            topic: Routing topic (None sends to every connected client)
+        """
+        if topic is not None:
+            for channel in list(self.topic_channels.get(topic, {}).values()):
+                channel.publish(message)
             return
 
-        try:
-            # 연결 풀에서 연결 가져오기 (재사용 또는 새로 생성)
-            connection = await websocket_pool.get_connection(
-                exchange="binance",
-                api_key=api_key,
-                api_secret=api_secret
-            )
+        if not self.sessions:
+            return
 
-            if not connection:
-                raise Exception("Failed to get connection from pool")
-
-            # 구독 등록
-            connection.add_subscription(subscription_key)
-            self.subscription_mapping[subscription_key] = connection.connection_id
-
-            # Create ticker stream
-            ticker_socket = connection.ws_client.symbol_ticker_socket(symbol)
-
-            # Start streaming task with reconnection support
-            task = asyncio.create_task(
-                self._stream_ticker_with_reconnect(
-                    ticker_socket,
-                    symbol,
-                    connection.connection_id,
-                    api_key,
-                    api_secret
-                )
-            )
+        frame = Frame(message)
+        for session in list(self.sessions.values()):
+            session.offer(None, frame)
+            if session.is_closed:
+                self._on_session_closed(session)
 
-            self.active_streams[subscription_key] = task
-            self.subscribed_symbols.add(symbol)
+    async def send(self, websocket: WebSocket, message: Any):
+        """
+        Send a reply (ack, snapshot, error, pong) to one client
 
-            # 워커 간 동기화 (Redis Pub/Sub)
-            if self.coordinator:
-                await self.coordinator.publish_subscription(
-                    action="subscribe",
-                    exchange="binance",
-                    symbol=symbol,
-                    stream_type="ticker"
-                )
-
-            logger.info(
-                f"✅ Subscribed to ticker {symbol} on connection {connection.connection_id}"
-            )
+        Goes through the client's writer like topic updates, so it uses the
+        negotiated encoding and keeps its order relative to queued deltas.
+        """
+        session = self.sessions.get(websocket)
+        if session is None:
+            return
 
-        except Exception as e:
-            logger.error(f"Error subscribing to ticker {symbol}: {e}")
-            raise
+        session.offer(None, Frame(message))
+        if session.is_closed:
+            self._on_session_closed(session)
+
+    def get_fanout_stats(self) -> Dict[str, Any]:
+        """Frontend fan-out statistics"""
+        return {
+            "clients": len(self.sessions),
+            "topics": {
+                topic: {
+                    spec.mode.value: len(channel.sessions)
+                    for spec, channel in channels.items()
+                }
+                for topic, channels in self.topic_channels.items()
+            },
+            "sessions": [session.get_stats() for session in self.sessions.values()]
+        }
 
-    async def _stream_ticker(self, ticker_socket, symbol: str):
-        """Internal method to stream ticker data (레거시 - 호환성 유지)"""
-        async with ticker_socket as stream:
-            while True:
-                try:
-                    msg = await stream.recv()
-
-                    # Parse Binance ticker data
-                    ticker_data = {
-                        "type": "ticker",
-                        "symbol": msg['s'],
-                        "price": float(msg['c']),
-                        "priceChange": float(msg['p']),
-                        "priceChangePercent": float(msg['P']),
-                        "volume": float(msg['v']),
-                        "high": float(msg['h']),
-                        "low": float(msg['l']),
-                        "timestamp": msg['E']
-                    }
-
-                    # Broadcast to all connected clients
-                    await self.broadcast(ticker_data)
-
-                except Exception as e:
-                    logger.error(f"Error in ticker stream {symbol}: {e}")
-                    break
-
-    async def _stream_ticker_with_reconnect(
-        self,
-        ticker_socket,
-        symbol: str,
-        connection_id: str,
-        api_key: str,
-        api_secret: str
-    ):
-        """재연결 지원 티커 스트리밍"""
-        subscription_key = f"ticker_{symbol}"
-
-        async with ticker_socket as stream:
-            while True:
-                try:
-                    msg = await stream.recv()
-
-                    # Parse Binance ticker data
-                    ticker_data = {
-                        "type": "ticker",
-                        "symbol": msg['s'],
-                        "price": float(msg['c']),
-                        "priceChange": float(msg['p']),
-                        "priceChangePercent": float(msg['P']),
-                        "volume": float(msg['v']),
-                        "high": float(msg['h']),
-                        "low": float(msg['l']),
-                        "timestamp": msg['E']
-                    }
-
-                    # Broadcast to all connected clients
-                    await self.broadcast(ticker_data)
-
-                except Exception as e:
-                    logger.error(f"Ticker stream error for {symbol}: {e}")
-
-                    # 자동 재연결 시작
-                    await websocket_reconnector.handle_disconnect(
-                        connection_id=connection_id,
-                        exchange="binance",
-                        subscription_key=subscription_key,
-                        error=e,
-                        reconnect_callback=self._reconnect_ticker,
-                        subscriptions_to_restore={
-                            "symbol": symbol,
-                            "api_key": api_key,
-                            "api_secret": api_secret
-                        }
-                    )
-
-                    break
-
-    async def _reconnect_ticker(
+    async def _subscribe_stream(
         self,
-        connection_id: str,
+        stream_key: str,
         exchange: str,
-        subscription_key: str,
-        subscriptions_to_restore: dict
-    ) -> bool:
-        """티커 재연결 콜백"""
-        try:
-            symbol = subscriptions_to_restore["symbol"]
-            api_key = subscriptions_to_restore["api_key"]
-            api_secret = subscriptions_to_restore["api_secret"]
+        stream: str,
+        handler,
+        symbol: Optional[str] = None,
+        stream_type: str = "ticker"
+    ):
+        """
+        Place an exchange stream on a pooled multiplexed connection
+
+        Args:
+            stream_key: Topic key (e.g. ticker_BTCUSDT)
+            exchange: binance or okx
+            stream: Exchange stream name (e.g. btcusdt@ticker)
+            handler: Coroutine called with each raw exchange event
+            symbol: Symbol tracked in subscribed_symbols
+            stream_type: Stream type for worker coordination
+        """
+        if stream_key in self.active_streams:
+            logger.info(f"Already subscribed to {stream_key}")
+            return
+
+        connection = await websocket_pool.subscribe(exchange, stream, handler)
+        if not connection:
+            raise Exception("No stream capacity left in connection pool")
+
+        self.active_streams[stream_key] = (exchange, stream)
+        if symbol:
+            self.subscribed_symbols.add(symbol)
 
-            logger.info(f"Reconnecting ticker stream for {symbol}...")
+        # 워커 간 동기화 (Redis Pub/Sub)
+        if self.coordinator:
+            await self.coordinator.publish_subscription(
+                action="subscribe",
+                exchange=exchange,
+                symbol=symbol or stream,
+                stream_type=stream_type
+            )
 
-            # 기존 구독 해제
-            await self.unsubscribe(subscription_key)
+        logger.info(f"✅ Subscribed to {stream_key} on connection {connection.connection_id}")
 
-            # 재구독
-            await self.subscribe_ticker(symbol, api_key, api_secret)
+    async def subscribe_ticker(self, symbol: str):
+        """
+        Subscribe to ticker updates for a symbol
 
-            return True
+        Streams: price, 24h volume, 24h high/low, price change %
+        """
+        stream_key = f"ticker_{symbol}"
+
+        async def on_ticker(msg: dict):
+            # Parse Binance ticker data
+            ticker_data = {
+                "type": "ticker",
+                "symbol": msg['s'],
+                "price": float(msg['c']),
+                "priceChange": float(msg['p']),
+                "priceChangePercent": float(msg['P']),
+                "volume": float(msg['v']),
+                "high": float(msg['h']),
+                "low": float(msg['l']),
+                "timestamp": msg['E']
+            }
+
+            # Broadcast to subscribed clients
+            await self.broadcast(ticker_data, topic=stream_key)
 
+        try:
+            await self._subscribe_stream(
+                stream_key, "binance", f"{symbol.lower()}@ticker", on_ticker, symbol=symbol
+            )
         except Exception as e:
-            logger.error(f"Reconnection failed for {subscription_key}: {e}")
-            return False
+            logger.error(f"Error subscribing to ticker {symbol}: {e}")
+            raise
 
     async def subscribe_kline(self, symbol: str, interval: str = "1m"):
         """
@@ -266,61 +297,35 @@ class WebSocketManager:
         """
         stream_key = f"kline_{symbol}_{interval}"
 
-        if stream_key in self.active_streams:
-            logger.info(f"Already subscribed to {stream_key}")
-            return
+        async def on_kline(msg: dict):
+            kline = msg['k']
+
+            # Parse kline data
+            kline_data = {
+                "type": "kline",
+                "symbol": kline['s'],
+                "interval": kline['i'],
+                "openTime": kline['t'],
+                "closeTime": kline['T'],
+                "open": float(kline['o']),
+                "high": float(kline['h']),
+                "low": float(kline['l']),
+                "close": float(kline['c']),
+                "volume": float(kline['v']),
+                "isClosed": kline['x']
+            }
+
+            # Broadcast to subscribed clients
+            await self.broadcast(kline_data, topic=stream_key)
 
         try:
-            # Create kline stream
-            kline_socket = self.binance_socket_manager.kline_socket(
-                symbol=symbol,
-                interval=interval
-            )
-
-            # Start streaming task
-            task = asyncio.create_task(
-                self._stream_kline(kline_socket, symbol, interval)
+            await self._subscribe_stream(
+                stream_key, "binance", f"{symbol.lower()}@kline_{interval}", on_kline, stream_type="kline"
             )
-
-            self.active_streams[stream_key] = task
-
-            logger.info(f"Subscribed to kline stream {stream_key}")
-
         except Exception as e:
             logger.error(f"Error subscribing to kline {stream_key}: {e}")
             raise
 
-    async def _stream_kline(self, kline_socket, symbol: str, interval: str):
-        """Internal method to stream kline data"""
-        async with kline_socket as stream:
-            while True:
-                try:
-                    msg = await stream.recv()
-
-                    kline = msg['k']
-
-                    # Parse kline data
-                    kline_data = {
-                        "type": "kline",
-                        "symbol": kline['s'],
-                        "interval": kline['i'],
-                        "openTime": kline['t'],
-                        "closeTime": kline['T'],
-                        "open": float(kline['o']),
-                        "high": float(kline['h']),
-                        "low": float(kline['l']),
-                        "close": float(kline['c']),
-                        "volume": float(kline['v']),
-                        "isClosed": kline['x']
-                    }
-
-                    # Broadcast to all connected clients
-                    await self.broadcast(kline_data)
-
-                except Exception as e:
-                    logger.error(f"Error in kline stream {symbol}_{interval}: {e}")
-                    break
-
     async def subscribe_trades(self, symbol: str):
         """
         Subscribe to trade updates (order book executions)
@@ -329,70 +334,43 @@ class WebSocketManager:
         """
         stream_key = f"trades_{symbol}"
 
-        if stream_key in self.active_streams:
-            logger.info(f"Already subscribed to {stream_key}")
-            return
+        async def on_trade(msg: dict):
+            # Parse trade data
+            trade_data = {
+                "type": "trade",
+                "symbol": msg['s'],
+                "price": float(msg['p']),
+                "quantity": float(msg['q']),
+                "time": msg['T'],
+                "isBuyerMaker": msg['m']
+            }
 
-        try:
-            # Create trade stream
-            trade_socket = self.binance_socket_manager.trade_socket(symbol)
+            # Broadcast to subscribed clients
+            await self.broadcast(trade_data, topic=stream_key)
 
-            # Start streaming task
-            task = asyncio.create_task(
-                self._stream_trades(trade_socket, symbol)
+        try:
+            await self._subscribe_stream(
+                stream_key, "binance", f"{symbol.lower()}@trade", on_trade, stream_type="trades"
             )
-
-            self.active_streams[stream_key] = task
-
-            logger.info(f"Subscribed to trade stream {stream_key}")
-
         except Exception as e:
             logger.error(f"Error subscribing to trades {stream_key}: {e}")
             raise
 
-    async def _stream_trades(self, trade_socket, symbol: str):
-        """Internal method to stream trade data"""
-        async with trade_socket as stream:
-            while True:
-                try:
-                    msg = await stream.recv()
-
-                    # Parse trade data
-                    trade_data = {
-                        "type": "trade",
-                        "symbol": msg['s'],
-                        "price": float(msg['p']),
-                        "quantity": float(msg['q']),
-                        "time": msg['T'],
-                        "isBuyerMaker": msg['m']
-                    }
-
-                    # Broadcast to all connected clients
-                    await self.broadcast(trade_data)
-
-                except Exception as e:
-                    logger.error(f"Error in trade stream {symbol}: {e}")
-                    break
-
     async def unsubscribe(self, stream_key: str):
-        """Unsubscribe from a specific stream"""
-        if stream_key in self.active_streams:
-            task = self.active_streams[stream_key]
-            task.cancel()
-
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        """Unsubscribe from a specific stream (live UNSUBSCRIBE on the pooled connection)"""
+        entry = self.active_streams.pop(stream_key, None)
+        if entry is None:
+            return
 
-            del self.active_streams[stream_key]
+        exchange, stream = entry
+        await websocket_pool.unsubscribe(exchange, stream)
 
-            # Remove from subscribed symbols if ticker stream
-            if stream_key.startswith("ticker_"):
-                symbol = stream_key.replace("ticker_", "")
-                self.subscribed_symbols.discard(symbol)
+        # Remove from subscribed symbols if ticker stream
+        for prefix in ("ticker_", "okx_ticker_"):
+            if stream_key.startswith(prefix):
+                self.subscribed_symbols.discard(stream_key[len(prefix):])
 
-            logger.info(f"Unsubscribed from {stream_key}")
+        logger.info(f"Unsubscribed from {stream_key}")
 
     async def subscribe_okx_ticker(self, symbol: str):
         """
@@ -403,77 +381,35 @@ class WebSocketManager:
         """
         stream_key = f"okx_ticker_{symbol}"
 
-        if stream_key in self.active_streams:
-            logger.info(f"Already subscribed to {stream_key}")
-            return
+        async def on_ticker(ticker: dict):
+            price_book.update("okx", ticker["instId"], OKXClient._parse_24h_ticker(ticker))
+
+            last = float(ticker["last"])
+            open_24h = float(ticker["open24h"])
+            ticker_data = {
+                "type": "ticker",
+                "exchange": "okx",
+                "symbol": ticker["instId"],
+                "price": last,
+                "priceChange": last - open_24h,
+                "priceChangePercent": ((last - open_24h) / open_24h * 100) if open_24h > 0 else 0,
+                "volume": float(ticker["vol24h"]),
+                "high": float(ticker["high24h"]),
+                "low": float(ticker["low24h"]),
+                "timestamp": int(ticker["ts"])
+            }
+
+            # Broadcast to subscribed clients
+            await self.broadcast(ticker_data, topic=stream_key)
 
         try:
-            # OKX WebSocket URL
-            ws_url = "wss://ws.okx.com:8443/ws/v5/public"
-
-            # Start streaming task
-            task = asyncio.create_task(
-                self._stream_okx_ticker(ws_url, symbol)
+            await self._subscribe_stream(
+                stream_key, "okx", okx_stream("tickers", symbol), on_ticker, symbol=symbol
             )
-
-            self.active_streams[stream_key] = task
-            self.subscribed_symbols.add(symbol)
-
-            logger.info(f"Subscribed to OKX ticker stream for {symbol}")
-
         except Exception as e:
             logger.error(f"Error subscribing to OKX ticker {symbol}: {e}")
             raise
 
-    async def _stream_okx_ticker(self, ws_url: str, symbol: str):
-        """Internal method to stream OKX ticker data"""
-        try:
-            async with websockets.connect(ws_url) as ws:
-                # Subscribe to ticker channel
-                subscribe_msg = {
-                    "op": "subscribe",
-                    "args": [
-                        {
-                            "channel": "tickers",
-                            "instId": symbol
-                        }
-                    ]
-                }
-
-                await ws.send(json.dumps(subscribe_msg))
-                logger.info(f"Sent OKX subscription for {symbol}")
-
-                while True:
-                    try:
-                        msg = await ws.recv()
-                        data = json.loads(msg)
-
-                        # Check if it's ticker data
-                        if "data" in data:
-                            for ticker in data["data"]:
-                                ticker_data = {
-                                    "type": "ticker",
-                                    "exchange": "okx",
-                                    "symbol": ticker["instId"],
-                                    "price": float(ticker["last"]),
-                                    "priceChange": float(ticker["last"]) - float(ticker["open24h"]),
-                                    "priceChangePercent": ((float(ticker["last"]) - float(ticker["open24h"])) / float(ticker["open24h"]) * 100) if float(ticker["open24h"]) > 0 else 0,
-                                    "volume": float(ticker["vol24h"]),
-                                    "high": float(ticker["high24h"]),
-                                    "low": float(ticker["low24h"]),
-                                    "timestamp": int(ticker["ts"])
-                                }
-
-                                # Broadcast to all connected clients
-                                await self.broadcast(ticker_data)
-
-                    except Exception as e:
-                        logger.error(f"Error in OKX ticker stream {symbol}: {e}")
-                        break
-
-        except Exception as e:
-            logger.error(f"OKX WebSocket connection error for {symbol}: {e}")
-
     async def subscribe_multi_symbols(self, exchange: str, symbols: List[str]):
         """
         Subscribe to multiple symbols at once
@@ -491,9 +427,6 @@ class WebSocketManager:
                 else:
                     logger.warning(f"Unsupported exchange: {exchange}")
 
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.1)
-
             except Exception as e:
                 logger.error(f"Error subscribing to {symbol} on {exchange}: {e}")
 
@@ -510,6 +443,10 @@ class WebSocketManager:
         """Close all connections and cleanup (연결 풀, 재연결, 코디네이터 통합)"""
         logger.info("Closing WebSocket manager...")
 
+        # 프론트엔드 세션 종료
+        for websocket in list(self.sessions):
+            self.disconnect(websocket)
+
         # 모든 구독 해제
         await self.unsubscribe_all()
 
@@ -520,10 +457,6 @@ class WebSocketManager:
         # 연결 풀 중지
         await websocket_pool.stop()
 
-        # 레거시 Binance 클라이언트 정리
-        if self.binance_client:
-            await self.binance_client.close_connection()
-
         logger.info("✅ WebSocket manager closed successfully")
 
 
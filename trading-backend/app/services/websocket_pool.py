@@ -2,56 +2,342 @@
 WebSocket Connection Pool Manager
 
 Features:
-- 거래소별 연결 풀 관리 (Binance, OKX)
-- 연결 재사용 및 멀티플렉싱
+- 거래소별 연결 풀 관리 (Binance, Binance Futures, OKX)
+- Combined stream 멀티플렉싱 (연결당 최대 스트림 수까지 한 소켓에 묶음)
+- 기존 연결에서 실시간 SUBSCRIBE / UNSUBSCRIBE (제어 메시지 배치 전송)
+- 연결별 자동 재연결 + 구독 복원 (Exponential Backoff)
+- 오래된 연결 재활용 시 스트림 재분배 (make-before-break)
 - 자동 Health Check 및 정리
 - 최대 연결 수 제한
 """
 
 import asyncio
+import json
 import logging
-from typing import Dict, Optional, Set, List
-from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
 from datetime import datetime, timedelta
-from binance import AsyncClient, BinanceSocketManager
 import websockets
-from websockets.exceptions import WebSocketException
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# 스트림 메시지 핸들러 (거래소 원본 이벤트 1건)
+StreamHandler = Callable[[dict], Awaitable[None]]
+
+BINANCE_COMBINED_STREAM_URL = "wss://stream.binance.com:9443/stream"
+BINANCE_FUTURES_COMBINED_STREAM_URL = "wss://fstream.binance.com/stream"
+OKX_PUBLIC_WS_URL = "wss://ws.okx.com:8443/ws/v5/public"
+
+# Binance 제어 메시지 / combined stream 형식을 쓰는 풀 (현물, USDS-M 선물)
+BINANCE_EXCHANGES = ("binance", "binance_futures")
+
+# 제어 메시지 간격 (Binance: 연결당 초당 5개 제한)
+CONTROL_INTERVAL = 0.25
+# 제어 메시지 1건당 최대 스트림 수
+CONTROL_BATCH_SIZE = 100
+# OKX는 30초 무응답 시 연결 종료 → 주기적 ping
+OKX_PING_INTERVAL = 20.0
+# 재활용 시 새 연결의 구독 확인 대기 (초)
+RECYCLE_CONFIRM_TIMEOUT = 10.0
+
+
+def okx_stream(channel: str, inst_id: str) -> str:
+    """OKX 구독 인자를 스트림 이름으로 변환 (예: tickers:BTC-USDT-SWAP)"""
+    return f"{channel}:{inst_id}"
+
 
-@dataclass
 class WebSocketConnection:
-    """WebSocket 연결 정보"""
-    connection_id: str
-    exchange: str
-    ws_client: any  # BinanceSocketManager or websockets.WebSocketClientProtocol
-    created_at: datetime
-    last_used: datetime
-    subscriptions: Set[str] = field(default_factory=set)
-    is_healthy: bool = True
-    reconnect_count: int = 0
-
-    def add_subscription(self, subscription: str):
-        """구독 추가"""
-        self.subscriptions.add(subscription)
-        self.last_used = datetime.utcnow()
+    """
+    멀티플렉싱 WebSocket 연결
+
+    하나의 거래소 소켓에 여러 스트림을 구독하고, 수신 메시지를 스트림별 핸들러로 전달합니다.
+    끊기면 스스로 재연결하고 현재 스트림을 다시 구독합니다.
+    """
 
-    def remove_subscription(self, subscription: str):
-        """구독 제거"""
-        self.subscriptions.discard(subscription)
+    def __init__(
+        self,
+        connection_id: str,
+        exchange: str,
+        url: str,
+        max_streams: int,
+        max_backoff: float = 30.0
+    ):
+        """
+        Args:
+            connection_id: 연결 ID
+            exchange: 거래소 (binance, binance_futures, okx)
+            url: WebSocket URL
+            max_streams: 연결당 최대 스트림 수
+            max_backoff: 재연결 최대 대기 (초)
+        """
+        self.connection_id = connection_id
+        self.exchange = exchange
+        self.url = url
+        self.max_streams = max_streams
+        self.max_backoff = max_backoff
+
+        self.streams: Dict[str, StreamHandler] = {}
+        self.created_at = datetime.utcnow()
         self.last_used = datetime.utcnow()
+        self.last_message_at: Optional[datetime] = None
+        self.is_healthy = True
+        self.reconnect_count = 0
+        self.recycling = False
+
+        self._ws = None
+        self._connected = asyncio.Event()
+        self._ops_ready = asyncio.Event()
+        self._pending_subscribe: Set[str] = set()
+        self._pending_unsubscribe: Set[str] = set()
+        # 거래소가 구독을 확인했거나 (ack) 첫 메시지가 도착한 스트림
+        self._live: Set[str] = set()
+        self._live_changed = asyncio.Event()
+        # Binance SUBSCRIBE 요청 ID → 스트림 (ack 매칭)
+        self._inflight: Dict[int, List[str]] = {}
+        self._request_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+    # ===== 상태 =====
+
+    @property
+    def subscriptions(self) -> Set[str]:
+        """구독 중인 스트림"""
+        return set(self.streams)
+
+    @property
+    def capacity(self) -> int:
+        """추가 가능한 스트림 수"""
+        return self.max_streams - len(self.streams)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
 
     @property
     def is_idle(self) -> bool:
         """유휴 상태 확인 (5분 이상 미사용)"""
-        return len(self.subscriptions) == 0 and \
+        return len(self.streams) == 0 and \
                (datetime.utcnow() - self.last_used) > timedelta(minutes=5)
 
     @property
     def is_stale(self) -> bool:
-        """오래된 연결 확인 (30분 이상)"""
-        return (datetime.utcnow() - self.created_at) > timedelta(minutes=30)
+        """재활용 대상 확인 (거래소 강제 종료 전 교체)"""
+        return (datetime.utcnow() - self.created_at) > timedelta(seconds=settings.WS_POOL_RECYCLE_AFTER)
+
+    # ===== 구독 =====
+
+    def add_stream(self, stream: str, handler: StreamHandler):
+        """스트림 추가 (연결 중이면 즉시 SUBSCRIBE 예약)"""
+        is_new = stream not in self.streams
+        self.streams[stream] = handler
+        self.last_used = datetime.utcnow()
+
+        if is_new:
+            self._pending_unsubscribe.discard(stream)
+            self._pending_subscribe.add(stream)
+            self._ops_ready.set()
+
+    def remove_stream(self, stream: str):
+        """스트림 제거 (연결 중이면 UNSUBSCRIBE 예약)"""
+        if self.streams.pop(stream, None) is None:
+            return
+        self.last_used = datetime.utcnow()
+        self._live.discard(stream)
+
+        if stream in self._pending_subscribe:
+            self._pending_subscribe.discard(stream)
+        else:
+            self._pending_unsubscribe.add(stream)
+            self._ops_ready.set()
+
+    async def wait_live(self, streams: Set[str], timeout: float) -> Set[str]:
+        """
+        스트림 구독 확인 대기 (ack 또는 첫 메시지)
+
+        Returns:
+            timeout 안에 확인된 스트림
+        """
+        deadline = asyncio.get_running_loop().time() + timeout
+
+        while True:
+            self._live_changed.clear()
+            pending = {stream for stream in streams if stream in self.streams and stream not in self._live}
+            remaining = deadline - asyncio.get_running_loop().time()
+            if not pending or remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._live_changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+
+        return streams & self._live
+
+    def _mark_live(self, streams):
+        for stream in streams:
+            if stream in self.streams and stream not in self._live:
+                self._live.add(stream)
+                self._live_changed.set()
+
+    # ===== 수명 주기 =====
+
+    def start(self):
+        """연결 루프 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """연결 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            # 제어 루프의 wait_for가 취소와 동시에 깨어나면 취소가 묻힐 수 있어 종료될 때까지 반복
+            while not self._task.done():
+                await asyncio.wait({self._task}, timeout=1.0)
+                self._task.cancel()
+            self._task = None
+        self._connected.clear()
+
+    async def _run(self):
+        """재연결 루프 (Exponential Backoff)"""
+        backoff = 1.0
+
+        while True:
+            try:
+                await self._session()
+                backoff = 1.0
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception as e:
+                self.is_healthy = False
+                self.reconnect_count += 1
+                logger.warning(
+                    f"Pool connection {self.connection_id} disconnected: {e}. "
+                    f"Reconnecting in {backoff:.0f}s ({len(self.streams)} streams)"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+    async def _session(self):
+        """단일 연결 세션: 현재 스트림 전체 재구독 후 수신/제어 루프 실행"""
+        async with websockets.connect(self.url) as ws:
+            self._ws = ws
+            self._pending_unsubscribe.clear()
+            self._pending_subscribe = set(self.streams)
+            self._live.clear()
+            self._inflight.clear()
+            self._ops_ready.set()
+            self._connected.set()
+            self.is_healthy = True
+            logger.info(f"Pool connection {self.connection_id} connected ({len(self.streams)} streams)")
+
+            reader = asyncio.create_task(self._read_loop(ws))
+            writer = asyncio.create_task(self._control_loop(ws))
+            try:
+                done, _ = await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+                raise ConnectionError("connection closed")
+            finally:
+                reader.cancel()
+                writer.cancel()
+                await asyncio.gather(reader, writer, return_exceptions=True)
+
+    async def _read_loop(self, ws):
+        """수신 메시지를 스트림 핸들러로 전달"""
+        async for raw in ws:
+            self.last_message_at = datetime.utcnow()
+
+            if raw == "pong":
+                continue
+
+            for stream, event in self._route(json.loads(raw)):
+                self._mark_live((stream,))
+                handler = self.streams.get(stream)
+                if handler is None:
+                    continue
+                try:
+                    await handler(event)
+                except Exception as e:
+                    logger.error(f"Stream handler error for {stream}: {e}")
+
+    def _route(self, msg: dict) -> List[tuple]:
+        """거래소 메시지 → [(스트림, 이벤트)]"""
+        if self.exchange in BINANCE_EXCHANGES:
+            if "stream" in msg:
+                return [(msg["stream"], msg["data"])]
+            streams = self._inflight.pop(msg.get("id"), [])
+            if msg.get("error"):
+                logger.error(f"Binance stream control error on {self.connection_id}: {msg['error']}")
+            elif "result" in msg:
+                self._mark_live(streams)
+            return []
+
+        # OKX
+        if msg.get("event") == "error":
+            logger.error(f"OKX stream control error on {self.connection_id}: {msg.get('msg')}")
+            return []
+        if msg.get("event") == "subscribe" and "arg" in msg:
+            self._mark_live((okx_stream(msg["arg"]["channel"], msg["arg"]["instId"]),))
+            return []
+        arg = msg.get("arg")
+        if not arg or "data" not in msg:
+            return []
+        stream = okx_stream(arg["channel"], arg["instId"])
+        return [(stream, item) for item in msg["data"]]
+
+    async def _control_loop(self, ws):
+        """대기 중인 SUBSCRIBE/UNSUBSCRIBE를 배치로 전송 (연결당 제어 메시지 속도 제한 준수)"""
+        while True:
+            try:
+                await asyncio.wait_for(self._ops_ready.wait(), timeout=OKX_PING_INTERVAL)
+            except asyncio.TimeoutError:
+                if self.exchange == "okx":
+                    await ws.send("ping")
+                continue
+
+            self._ops_ready.clear()
+
+            # 짧은 구간의 구독 요청을 모아서 전송
+            await asyncio.sleep(CONTROL_INTERVAL)
+
+            for action, pending in (("unsubscribe", self._pending_unsubscribe), ("subscribe", self._pending_subscribe)):
+                streams = sorted(pending)
+                pending.clear()
+
+                for i in range(0, len(streams), CONTROL_BATCH_SIZE):
+                    await ws.send(json.dumps(self._control_message(action, streams[i:i + CONTROL_BATCH_SIZE])))
+                    await asyncio.sleep(CONTROL_INTERVAL)
+
+    def _control_message(self, action: str, streams: List[str]) -> dict:
+        if self.exchange in BINANCE_EXCHANGES:
+            self._request_id += 1
+            if action == "subscribe":
+                self._inflight[self._request_id] = streams
+            return {"method": action.upper(), "params": streams, "id": self._request_id}
+
+        args = []
+        for stream in streams:
+            channel, inst_id = stream.split(":", 1)
+            args.append({"channel": channel, "instId": inst_id})
+        return {"op": action, "args": args}
+
+    def get_stats(self) -> Dict[str, any]:
+        return {
+            "connection_id": self.connection_id,
+            "streams": len(self.streams),
+            "max_streams": self.max_streams,
+            "connected": self.is_connected,
+            "healthy": self.is_healthy,
+            "reconnect_count": self.reconnect_count,
+            "recycling": self.recycling,
+            "age_seconds": int((datetime.utcnow() - self.created_at).total_seconds())
+        }
 
 
 class WebSocketConnectionPool:
@@ -60,11 +346,17 @@ class WebSocketConnectionPool:
 
     Features:
     - 거래소별 연결 풀 관리
-    - 연결 재사용 (멀티플렉싱)
+    - 스트림을 여유 있는 연결에 배치 (combined stream 멀티플렉싱)
     - 자동 Health Check
-    - 유휴/오래된 연결 자동 정리
+    - 유휴 연결 정리, 오래된 연결 재활용 + 스트림 재분배
     """
 
+    EXCHANGE_URLS = {
+        "binance": BINANCE_COMBINED_STREAM_URL,
+        "binance_futures": BINANCE_FUTURES_COMBINED_STREAM_URL,
+        "okx": OKX_PUBLIC_WS_URL
+    }
+
     def __init__(
         self,
         max_connections_per_exchange: int = 5,
@@ -83,12 +375,15 @@ class WebSocketConnectionPool:
 
         # 연결 풀: {exchange: {connection_id: WebSocketConnection}}
         self.pools: Dict[str, Dict[str, WebSocketConnection]] = {
-            "binance": {},
-            "okx": {}
+            exchange: {} for exchange in self.EXCHANGE_URLS
+        }
+
+        # 스트림 → 연결 ID
+        self.stream_index: Dict[str, Dict[str, str]] = {
+            exchange: {} for exchange in self.EXCHANGE_URLS
         }
 
-        # Binance 클라이언트 캐시
-        self.binance_clients: Dict[str, AsyncClient] = {}
+        self._connection_seq = 0
 
         # 백그라운드 작업
         self.health_check_task: Optional[asyncio.Task] = None
@@ -96,6 +391,11 @@ class WebSocketConnectionPool:
 
         self._running = False
 
+    def _max_streams(self, exchange: str) -> int:
+        if exchange in BINANCE_EXCHANGES:
+            return settings.WS_POOL_BINANCE_MAX_STREAMS
+        return settings.WS_POOL_OKX_MAX_STREAMS
+
     async def start(self):
         """연결 풀 시작 (백그라운드 작업 실행)"""
         if self._running:
@@ -135,30 +435,26 @@ class WebSocketConnectionPool:
         for exchange in self.pools:
             await self._close_all_connections(exchange)
 
-        # Binance 클라이언트 정리
-        for client in self.binance_clients.values():
-            await client.close_connection()
-
-        self.binance_clients.clear()
-
         logger.info("WebSocket connection pool stopped")
 
-    async def get_connection(
+    # ===== 구독 =====
+
+    async def subscribe(
         self,
         exchange: str,
-        api_key: str = "",
-        api_secret: str = ""
+        stream: str,
+        handler: StreamHandler
     ) -> Optional[WebSocketConnection]:
         """
-        연결 가져오기 (재사용 또는 새로 생성)
+        스트림 구독 (여유 있는 연결에 추가, 없으면 새 연결 생성)
 
         Args:
-            exchange: 거래소 (binance, okx)
-            api_key: API 키 (Binance만)
-            api_secret: API Secret (Binance만)
+            exchange: 거래소 (binance, binance_futures, okx)
+            stream: 거래소 스트림 이름 (예: "btcusdt@ticker", okx_stream("tickers", "BTC-USDT-SWAP"))
+            handler: 이벤트 핸들러
 
         Returns:
-            WebSocketConnection 또는 None
+            스트림이 배치된 연결 (연결 한도 초과 시 None)
         """
         exchange = exchange.lower()
 
@@ -166,132 +462,170 @@ class WebSocketConnectionPool:
             logger.error(f"Unsupported exchange: {exchange}")
             return None
 
-        pool = self.pools[exchange]
-
-        # 1. 재사용 가능한 연결 찾기 (건강하고 구독 < 10개)
-        for conn in pool.values():
-            if conn.is_healthy and len(conn.subscriptions) < 10:
-                logger.debug(f"Reusing existing connection: {conn.connection_id}")
-                return conn
+        # 이미 구독 중이면 핸들러만 교체
+        connection_id = self.stream_index[exchange].get(stream)
+        if connection_id in self.pools[exchange]:
+            connection = self.pools[exchange][connection_id]
+            connection.add_stream(stream, handler)
+            return connection
 
-        # 2. 최대 연결 수 확인
-        if len(pool) >= self.max_connections_per_exchange:
-            logger.warning(f"Max connections reached for {exchange}: {len(pool)}")
-            # 가장 구독이 적은 연결 반환
-            return min(pool.values(), key=lambda c: len(c.subscriptions))
+        connection = self._connection_with_capacity(exchange)
+        if connection is None:
+            logger.error(
+                f"No stream capacity left for {exchange} "
+                f"({self.max_connections_per_exchange} connections x {self._max_streams(exchange)} streams)"
+            )
+            return None
 
-        # 3. 새 연결 생성
-        return await self._create_connection(exchange, api_key, api_secret)
+        connection.add_stream(stream, handler)
+        self.stream_index[exchange][stream] = connection.connection_id
 
-    async def _create_connection(
-        self,
-        exchange: str,
-        api_key: str,
-        api_secret: str
-    ) -> Optional[WebSocketConnection]:
-        """새 WebSocket 연결 생성"""
-        connection_id = f"{exchange}_{len(self.pools[exchange])}"
+        logger.debug(f"Stream {stream} placed on {connection.connection_id} ({len(connection.streams)} streams)")
+        return connection
 
-        try:
-            if exchange == "binance":
-                # Binance 클라이언트 생성 또는 재사용
-                client_key = f"{api_key}_{api_secret}"
-
-                if client_key not in self.binance_clients:
-                    client = await AsyncClient.create(
-                        api_key=api_key,
-                        api_secret=api_secret
-                    )
-                    self.binance_clients[client_key] = client
-                else:
-                    client = self.binance_clients[client_key]
+    async def unsubscribe(self, exchange: str, stream: str):
+        """스트림 구독 해제 (연결은 유지, 유휴 시 정리 작업이 종료)"""
+        exchange = exchange.lower()
 
-                ws_client = BinanceSocketManager(client)
+        connection_id = self.stream_index.get(exchange, {}).pop(stream, None)
+        connection = self.pools.get(exchange, {}).get(connection_id)
+        if connection is None:
+            return
 
-            elif exchange == "okx":
-                # OKX는 구독 시점에 연결 생성 (여기서는 플레이스홀더)
-                ws_client = None
+        connection.remove_stream(stream)
+        logger.debug(
+            f"Released stream {stream} from {connection_id}. "
+            f"Remaining: {len(connection.streams)}"
+        )
 
-            else:
-                logger.error(f"Unsupported exchange: {exchange}")
-                return None
+    def _connection_with_capacity(
+        self,
+        exchange: str,
+        exclude: Optional[WebSocketConnection] = None
+    ) -> Optional[WebSocketConnection]:
+        """가장 많이 찬 (여유가 남은) 연결 선택, 없으면 새 연결 생성"""
+        candidates = [
+            conn for conn in self.pools[exchange].values()
+            if conn is not exclude and not conn.recycling and conn.capacity > 0
+        ]
+        if candidates:
+            # 소켓 수를 최소화하도록 채워진 연결부터 사용
+            return min(candidates, key=lambda c: c.capacity)
+
+        active = [conn for conn in self.pools[exchange].values() if not conn.recycling]
+        if len(active) >= self.max_connections_per_exchange:
+            return None
 
-            # 연결 객체 생성
-            connection = WebSocketConnection(
-                connection_id=connection_id,
-                exchange=exchange,
-                ws_client=ws_client,
-                created_at=datetime.utcnow(),
-                last_used=datetime.utcnow()
-            )
+        return self._create_connection(exchange)
 
-            # 풀에 추가
-            self.pools[exchange][connection_id] = connection
+    def _create_connection(self, exchange: str) -> WebSocketConnection:
+        """새 WebSocket 연결 생성"""
+        self._connection_seq += 1
+        connection_id = f"{exchange}_{self._connection_seq}"
+
+        connection = WebSocketConnection(
+            connection_id=connection_id,
+            exchange=exchange,
+            url=self.EXCHANGE_URLS[exchange],
+            max_streams=self._max_streams(exchange)
+        )
+        connection.start()
 
-            logger.info(f"Created new connection: {connection_id}")
+        # 풀에 추가
+        self.pools[exchange][connection_id] = connection
 
-            return connection
+        logger.info(f"Created new connection: {connection_id}")
 
-        except Exception as e:
-            logger.error(f"Failed to create connection for {exchange}: {e}")
-            return None
+        return connection
 
-    async def release_connection(
-        self,
-        exchange: str,
-        connection_id: str,
-        subscription: str
-    ):
+    async def _recycle_connection(self, exchange: str, connection: WebSocketConnection):
         """
-        구독 해제 및 연결 반환
+        오래된 연결 교체 (make-before-break)
 
-        Args:
-            exchange: 거래소
-            connection_id: 연결 ID
-            subscription: 구독 키 (예: "ticker_BTCUSDT")
+        스트림을 다른 연결에 먼저 구독하고, 새 연결이 구독을 확인한 (ack 또는 첫 메시지)
+        스트림만 기존 연결에서 제거합니다. 확인되지 않은 스트림은 기존 연결에 남기고
+        다음 정리 주기에 다시 시도합니다. 겹치는 동안 이벤트가 중복 전달될 수 있습니다.
         """
-        exchange = exchange.lower()
-
-        if exchange not in self.pools:
+        connection.recycling = True
+        placed: Dict[WebSocketConnection, Set[str]] = {}
+
+        for stream, handler in list(connection.streams.items()):
+            target = self._connection_with_capacity(exchange, exclude=connection)
+            if target is None:
+                logger.warning(f"Recycle of {connection.connection_id} deferred: no capacity")
+                self._restore_streams(exchange, connection, placed)
+                connection.recycling = False
+                return
+
+            target.add_stream(stream, handler)
+            self.stream_index[exchange][stream] = target.connection_id
+            placed.setdefault(target, set()).add(stream)
+
+        live_by_target = await asyncio.gather(*(
+            target.wait_live(streams, timeout=RECYCLE_CONFIRM_TIMEOUT)
+            for target, streams in placed.items()
+        ))
+
+        moved: Set[str] = set()
+        unconfirmed: Dict[WebSocketConnection, Set[str]] = {}
+        for (target, streams), live in zip(placed.items(), live_by_target):
+            for stream in streams:
+                if stream in live or self.stream_index[exchange].get(stream) != target.connection_id:
+                    # 새 연결에서 확인됐거나 대기 중 구독 해제된 스트림
+                    moved.add(stream)
+                else:
+                    unconfirmed.setdefault(target, set()).add(stream)
+
+        if unconfirmed:
+            for stream in moved:
+                connection.remove_stream(stream)
+            self._restore_streams(exchange, connection, unconfirmed)
+            connection.recycling = False
+            logger.warning(
+                f"Recycle of {connection.connection_id} incomplete: "
+                f"{sum(len(streams) for streams in unconfirmed.values())} stream(s) not confirmed, kept on old connection"
+            )
             return
 
-        pool = self.pools[exchange]
+        await self._close_connection(exchange, connection.connection_id)
+        logger.info(f"Recycled {connection.connection_id} onto {len(placed)} connection(s)")
 
-        if connection_id not in pool:
-            return
-
-        connection = pool[connection_id]
-        connection.remove_subscription(subscription)
+    def _restore_streams(
+        self,
+        exchange: str,
+        connection: WebSocketConnection,
+        placed: Dict[WebSocketConnection, Set[str]]
+    ):
+        """재활용 중 대상 연결에 옮긴 스트림을 기존 연결로 되돌림"""
+        for target, streams in placed.items():
+            for stream in streams:
+                # 대기 중 교체된 핸들러 유지
+                connection.add_stream(stream, target.streams[stream])
+                target.remove_stream(stream)
+                self.stream_index[exchange][stream] = connection.connection_id
 
-        logger.debug(
-            f"Released subscription {subscription} from {connection_id}. "
-            f"Remaining: {len(connection.subscriptions)}"
-        )
+    # ===== 백그라운드 작업 =====
 
     async def _health_check_loop(self):
-        """주기적 Health Check"""
+        """주기적 Health Check (연결 상태 + 최근 수신 여부)"""
         while self._running:
             try:
                 await asyncio.sleep(self.health_check_interval)
 
+                silence_limit = timedelta(seconds=self.health_check_interval * 2)
+                now = datetime.utcnow()
+
                 for exchange, pool in self.pools.items():
                     for conn_id, conn in pool.items():
-                        # Binance 연결 상태 확인
-                        if exchange == "binance":
-                            try:
-                                # Binance 클라이언트 ping
-                                client_key = list(self.binance_clients.keys())[0]
-                                client = self.binance_clients.get(client_key)
-
-                                if client:
-                                    await client.ping()
-                                    conn.is_healthy = True
-                                else:
-                                    conn.is_healthy = False
-
-                            except Exception as e:
-                                logger.error(f"Health check failed for {conn_id}: {e}")
-                                conn.is_healthy = False
+                        silent = (
+                            conn.streams
+                            and conn.last_message_at is not None
+                            and now - conn.last_message_at > silence_limit
+                        )
+                        conn.is_healthy = conn.is_connected and not silent
+
+                        if not conn.is_healthy:
+                            logger.warning(f"Health check failed for {conn_id}")
 
                 logger.debug("Health check completed")
 
@@ -301,25 +635,26 @@ class WebSocketConnectionPool:
                 logger.error(f"Health check error: {e}")
 
     async def _cleanup_loop(self):
-        """주기적 정리 작업 (유휴/오래된 연결 제거)"""
+        """주기적 정리 작업 (유휴 연결 제거, 오래된 연결 재활용)"""
         while self._running:
             try:
                 await asyncio.sleep(self.cleanup_interval)
 
                 for exchange, pool in self.pools.items():
-                    # 정리 대상 연결 찾기
-                    to_remove = []
-
-                    for conn_id, conn in pool.items():
-                        if conn.is_idle or conn.is_stale or not conn.is_healthy:
-                            to_remove.append(conn_id)
+                    idle = [conn_id for conn_id, conn in pool.items() if conn.is_idle]
+                    stale = [conn for conn in pool.values() if conn.is_stale and not conn.is_idle]
 
                     # 연결 종료 및 제거
-                    for conn_id in to_remove:
+                    for conn_id in idle:
                         await self._close_connection(exchange, conn_id)
 
-                    if to_remove:
-                        logger.info(f"Cleaned up {len(to_remove)} connections from {exchange}")
+                    for conn in stale:
+                        await self._recycle_connection(exchange, conn)
+
+                    if idle or stale:
+                        logger.info(
+                            f"Cleaned up {len(idle)} idle and recycled {len(stale)} connections from {exchange}"
+                        )
 
             except asyncio.CancelledError:
                 break
@@ -333,25 +668,17 @@ class WebSocketConnectionPool:
         if not pool or connection_id not in pool:
             return
 
-        connection = pool[connection_id]
+        connection = pool.pop(connection_id)
 
         try:
-            if exchange == "binance":
-                # Binance 소켓 정리 (구독 취소)
-                # BinanceSocketManager는 자동으로 정리됨
-                pass
-
-            elif exchange == "okx":
-                # OKX WebSocket 연결 종료
-                if connection.ws_client:
-                    await connection.ws_client.close()
-
+            await connection.close()
         except Exception as e:
             logger.error(f"Error closing connection {connection_id}: {e}")
 
-        finally:
-            del pool[connection_id]
-            logger.info(f"Closed connection: {connection_id}")
+        for stream in [s for s, cid in self.stream_index[exchange].items() if cid == connection_id]:
+            del self.stream_index[exchange][stream]
+
+        logger.info(f"Closed connection: {connection_id}")
 
     async def _close_all_connections(self, exchange: str):
         """거래소의 모든 연결 종료"""
@@ -372,7 +699,7 @@ class WebSocketConnectionPool:
         stats = {}
 
         for exchange, pool in self.pools.items():
-            total_subscriptions = sum(len(conn.subscriptions) for conn in pool.values())
+            total_subscriptions = sum(len(conn.streams) for conn in pool.values())
             healthy_count = sum(1 for conn in pool.values() if conn.is_healthy)
 
             stats[exchange] = {
@@ -380,7 +707,9 @@ class WebSocketConnectionPool:
                 "healthy_connections": healthy_count,
                 "total_subscriptions": total_subscriptions,
                 "max_connections": self.max_connections_per_exchange,
-                "utilization_pct": round(len(pool) / self.max_connections_per_exchange * 100, 2)
+                "max_streams_per_connection": self._max_streams(exchange),
+                "utilization_pct": round(len(pool) / self.max_connections_per_exchange * 100, 2),
+                "connections": [conn.get_stats() for conn in pool.values()]
             }
 
         return stats
@@ -388,7 +717,7 @@ class WebSocketConnectionPool:
 
 # 전역 싱글톤 인스턴스
 websocket_pool = WebSocketConnectionPool(
-    max_connections_per_exchange=5,
+    max_connections_per_exchange=settings.WS_POOL_MAX_CONNECTIONS,
     health_check_interval=30,
     cleanup_interval=60
 )
@@ -0,0 +1,227 @@
+"""
+Shared Analysis Scheduler
+
+Runs market data collection and AI ensemble analysis once per
+(symbol, interval) on each candle close and publishes the result to every
+subscribed auto-trader. Traders only apply per-user sizing and risk, so
+exchange calls and CPU scale with symbols instead of users x symbols.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+import pandas as pd
+
+from app.core.config import settings
+from app.services.binance_client import BinanceClient
+from app.ai.ensemble import TripleAIEnsemble, EnsembleDecision
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "3m": 180,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "2h": 7200,
+    "4h": 14400,
+    "6h": 21600,
+    "12h": 43200,
+    "1d": 86400,
+}
+
+
+@dataclass
+class AnalysisResult:
+    """Shared analysis for one (symbol, interval) candle close"""
+    symbol: str
+    interval: str
+    market_data: pd.DataFrame
+    current_price: float
+    decision: EnsembleDecision
+    candle_close: float  # epoch seconds of the candle close that triggered it
+
+
+AnalysisCallback = Callable[[AnalysisResult], Awaitable[None]]
+
+
+def klines_to_frame(klines: List[List[Any]]) -> pd.DataFrame:
+    """Binance kline rows -> DataFrame with timestamp, open, high, low, close, volume"""
+    df = pd.DataFrame([row[:6] for row in klines], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        df[col] = df[col].astype(float)
+    return df
+
+
+class AnalysisScheduler:
+    """
+    Candle-close-aligned shared analysis scheduler
+
+    Responsibilities:
+    - Keep one analysis loop per subscribed (symbol, interval)
+    - Wake shortly after each candle close
+    - Fetch market data and run the ensemble once
+    - Fan the result out to all subscribers concurrently
+    """
+
+    def __init__(self, close_delay: float = 2.0, history_limit: int = 500):
+        """
+        Args:
+            close_delay: Seconds to wait after candle close so the exchange has
+                finalized the candle
+            history_limit: Number of candles fetched for analysis
+        """
+        self.close_delay = close_delay
+        self.history_limit = history_limit
+        # Public market data only: no credentials, shared HTTP pool and request budget
+        self.binance: Optional[BinanceClient] = None
+        self.ensemble: Optional[TripleAIEnsemble] = None
+
+        self.subscribers: Dict[Tuple[str, str], Set[AnalysisCallback]] = {}
+        self.tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.latest: Dict[Tuple[str, str], AnalysisResult] = {}
+
+    def subscribe(self, symbol: str, interval: str, callback: AnalysisCallback):
+        """
+        Subscribe a callback to analysis results for (symbol, interval)
+
+        Starts the shared loop for the stream if this is the first subscriber.
+        """
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unsupported interval: {interval}")
+
+        key = (symbol, interval)
+        self.subscribers.setdefault(key, set()).add(callback)
+
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.create_task(self._run_stream(symbol, interval))
+            logger.info(f"Analysis stream started for {symbol} {interval}")
+
+    def unsubscribe(self, symbol: str, interval: str, callback: AnalysisCallback):
+        """
+        Remove a subscriber; stops the stream when nobody is left
+        """
+        key = (symbol, interval)
+        callbacks = self.subscribers.get(key)
+        if not callbacks:
+            return
+
+        callbacks.discard(callback)
+
+        if not callbacks:
+            del self.subscribers[key]
+            self.latest.pop(key, None)
+            task = self.tasks.pop(key, None)
+            if task:
+                task.cancel()
+            logger.info(f"Analysis stream stopped for {symbol} {interval}")
+
+    async def stop(self):
+        """Stop all analysis streams"""
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.tasks.clear()
+        self.subscribers.clear()
+        self.latest.clear()
+
+    def get_status(self) -> Dict:
+        """Summarize active streams"""
+        return {
+            f"{symbol}:{interval}": {
+                "subscribers": len(callbacks),
+                "lastCandleClose": self.latest[(symbol, interval)].candle_close
+                if (symbol, interval) in self.latest else None
+            }
+            for (symbol, interval), callbacks in self.subscribers.items()
+        }
+
+    @staticmethod
+    def next_candle_close(interval: str, now: Optional[float] = None) -> float:
+        """Epoch seconds of the next candle close for an interval"""
+        period = INTERVAL_SECONDS[interval]
+        now = time.time() if now is None else now
+        return (int(now // period) + 1) * period
+
+    async def _run_stream(self, symbol: str, interval: str):
+        """Analysis loop for one (symbol, interval)"""
+        key = (symbol, interval)
+
+        while key in self.subscribers:
+            try:
+                candle_close = self.next_candle_close(interval)
+                await asyncio.sleep(max(0.0, candle_close + self.close_delay - time.time()))
+
+                result = await self._analyze(symbol, interval, candle_close)
+                self.latest[key] = result
+
+                await self._publish(key, result)
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception as e:
+                logger.error(f"Error in analysis stream {symbol} {interval}: {e}", exc_info=True)
+                await asyncio.sleep(60)  # Wait 1 minute on error
+
+    async def _analyze(self, symbol: str, interval: str, candle_close: float) -> AnalysisResult:
+        """Fetch market data and run the ensemble once for all subscribers"""
+        if self.binance is None:
+            self.binance = BinanceClient(api_key="", api_secret="", testnet=settings.BINANCE_TESTNET)
+        if self.ensemble is None:
+            self.ensemble = TripleAIEnsemble()
+
+        klines, current_price = await asyncio.gather(
+            self.binance.get_klines_async(symbol, interval, self.history_limit),
+            self.binance.get_current_price_async(symbol)
+        )
+        market_data = klines_to_frame(klines)
+
+        decision = await self.ensemble.analyze(
+            symbol=symbol,
+            market_data=market_data,
+            current_price=current_price
+        )
+
+        logger.info(
+            f"{symbol} {interval} shared analysis: {decision.direction} | "
+            f"P={decision.probability_up:.2%} | "
+            f"C={decision.confidence:.2%} | "
+            f"A={decision.agreement:.2%} | "
+            f"Enter={decision.should_enter} | "
+            f"Subscribers={len(self.subscribers.get((symbol, interval), ()))}"
+        )
+
+        return AnalysisResult(
+            symbol=symbol,
+            interval=interval,
+            market_data=market_data,
+            current_price=current_price,
+            decision=decision,
+            candle_close=candle_close
+        )
+
+    async def _publish(self, key: Tuple[str, str], result: AnalysisResult):
+        """Deliver a result to all subscribers; one failure doesn't affect others"""
+        callbacks = list(self.subscribers.get(key, ()))
+        outcomes = await asyncio.gather(
+            *(callback(result) for callback in callbacks),
+            return_exceptions=True
+        )
+
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Subscriber failed for {key[0]} {key[1]}: {outcome}")
+
+
+# Global shared analysis scheduler
+analysis_scheduler = AnalysisScheduler()
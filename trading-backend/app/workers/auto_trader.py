@@ -3,6 +3,9 @@ Auto-Trading Engine
 
 Executes trades automatically based on user's selected strategy and AI ensemble signals.
 Monitors positions and manages risk in real-time.
+
+Market data and ensemble analysis are shared across users through the
+AnalysisScheduler; each trader only applies its own sizing and risk checks.
 """
 
 import asyncio
@@ -12,7 +15,11 @@ import logging
 from sqlalchemy.orm import Session
 
 from app.services.binance import BinanceFuturesClient
-from app.ai.ensemble import TripleAIEnsemble
+from app.workers.analysis_scheduler import (
+    AnalysisScheduler,
+    AnalysisResult,
+    analysis_scheduler
+)
 from app.database.session import get_db
 from app.models.user import User
 from app.core.config import settings
@@ -26,25 +33,39 @@ class AutoTrader:
 
     Responsibilities:
     - Load active strategy configurations for users
-    - Run AI ensemble analysis on configured symbols
+    - Subscribe to shared AI ensemble analysis for configured symbols
     - Execute orders when signals meet strategy thresholds
     - Set stop-loss and take-profit automatically
     - Monitor positions and update database
     """
 
-    def __init__(self, user_id: str, db: Session):
+    # Candle interval the shared analysis runs on
+    ANALYSIS_INTERVAL = '1h'
+
+    def __init__(
+        self,
+        user_id: str,
+        db: Session,
+        scheduler: Optional[AnalysisScheduler] = None
+    ):
         """
         Initialize auto-trader for specific user
 
         Args:
             user_id: User ID
             db: Database session
+            scheduler: Shared analysis scheduler (defaults to the global one)
         """
         self.user_id = user_id
         self.db = db
         self.is_running = False
         self.binance_client: Optional[BinanceFuturesClient] = None
-        self.ai_ensemble = TripleAIEnsemble()
+        self.scheduler = scheduler or analysis_scheduler
+        self._stopped = asyncio.Event()
+        # Set once the exchange client is ready and symbols are subscribed
+        self._ready = asyncio.Event()
+        # Serializes this user's signal handling so position limits hold
+        self._cycle_lock = asyncio.Lock()
 
         # Load user
         self.user = db.query(User).filter(User.id == user_id).first()
@@ -122,39 +143,58 @@ class AutoTrader:
         logger.info(f"Binance client initialized for user {self.user_id}")
 
     async def start(self):
-        """Start auto-trading loop"""
+        """Start auto-trading: subscribe to shared analysis and wait until stopped"""
         if self.is_running:
             logger.warning(f"AutoTrader already running for user {self.user_id}")
             return
 
-        self.is_running = True
-        logger.info(f"Starting AutoTrader for user {self.user_id}...")
-
-        # Initialize Binance client
-        await self.initialize_binance()
+        self._stopped.clear()
+        symbols = []
 
         try:
-            while self.is_running:
-                await self._trading_cycle()
+            self.is_running = True
+            logger.info(f"Starting AutoTrader for user {self.user_id}...")
 
-                # Wait before next cycle (e.g., 5 minutes)
-                await asyncio.sleep(300)  # 5 minutes
+            # Initialize Binance client
+            await self.initialize_binance()
 
-        except Exception as e:
-            logger.error(f"Error in auto-trading loop: {e}", exc_info=True)
+            symbols = list(self.active_config.selectedSymbols)
+            for symbol in symbols:
+                self.scheduler.subscribe(symbol, self.ANALYSIS_INTERVAL, self._on_analysis)
+
+            self._ready.set()
+            await self._stopped.wait()
+        finally:
+            for symbol in symbols:
+                self.scheduler.unsubscribe(symbol, self.ANALYSIS_INTERVAL, self._on_analysis)
             self.is_running = False
-            raise
 
     async def stop(self):
-        """Stop auto-trading loop"""
+        """Stop auto-trading"""
         logger.info(f"Stopping AutoTrader for user {self.user_id}...")
         self.is_running = False
+        self._stopped.set()
+
+    async def _on_analysis(self, result: AnalysisResult):
+        """Handle a shared analysis result for one of this user's symbols"""
+        if not self.is_running:
+            return
 
-    async def _trading_cycle(self):
-        """Execute one trading cycle"""
-        logger.info(f"--- Trading Cycle Start for {self.user_id} ---")
+        async with self._cycle_lock:
+            await self._trading_cycle(result)
+
+    async def _trading_cycle(self, result: AnalysisResult):
+        """Apply per-user risk and sizing to one shared analysis result"""
+        symbol = result.symbol
+        decision = result.decision
+
+        logger.info(f"--- Trading Cycle Start for {self.user_id} ({symbol}) ---")
 
         try:
+            if not decision.should_enter:
+                logger.info(f"{symbol}: no entry signal for this candle")
+                return
+
             # 1. Get account balance
             balance = await self.binance_client.get_account_balance()
             available_balance = balance['availableBalance']
@@ -171,46 +211,19 @@ class AutoTrader:
                 logger.info("Max open positions reached, skipping new signals")
                 return
 
-            # 4. Analyze each configured symbol
-            for symbol in self.active_config.selectedSymbols:
-                # Skip if already have position in this symbol
-                if any(pos['symbol'] == symbol for pos in open_positions):
-                    logger.info(f"Already have position in {symbol}, skipping")
-                    continue
-
-                # Get market data
-                market_data = await self.binance_client.get_market_data(
-                    symbol=symbol,
-                    interval='1h',
-                    limit=500
-                )
-
-                # Get current price
-                current_price = await self.binance_client.get_current_price(symbol)
-
-                # Run AI ensemble analysis
-                decision = await self.ai_ensemble.analyze(
-                    symbol=symbol,
-                    market_data=market_data,
-                    current_price=current_price
-                )
-
-                # Log decision
-                logger.info(f"{symbol}: {decision.direction} | "
-                          f"Prob={decision.probability_up:.2%} | "
-                          f"Conf={decision.confidence:.2%} | "
-                          f"Agree={decision.agreement:.2%} | "
-                          f"Enter={decision.should_enter}")
-
-                # 5. Execute trade if signal meets criteria
-                if decision.should_enter:
-                    await self._execute_trade(
-                        symbol=symbol,
-                        decision=decision,
-                        available_balance=available_balance
-                    )
-
-            logger.info(f"--- Trading Cycle End for {self.user_id} ---")
+            # 4. Skip if already have position in this symbol
+            if any(pos['symbol'] == symbol for pos in open_positions):
+                logger.info(f"Already have position in {symbol}, skipping")
+                return
+
+            # 5. Execute trade
+            await self._execute_trade(
+                symbol=symbol,
+                decision=decision,
+                available_balance=available_balance
+            )
+
+            logger.info(f"--- Trading Cycle End for {self.user_id} ({symbol}) ---")
 
         except Exception as e:
             logger.error(f"Error in trading cycle: {e}", exc_info=True)
@@ -340,7 +353,12 @@ class AutoTraderManager:
         self.tasks: Dict[str, asyncio.Task] = {}
 
     async def start_trader(self, user_id: str, db: Session):
-        """Start auto-trading for a user"""
+        """
+        Start auto-trading for a user
+
+        Returns once the trader is initialized; initialization errors
+        (missing keys, exchange down) are raised to the caller.
+        """
         if user_id in self.traders:
             logger.warning(f"Trader already running for user {user_id}")
             return
@@ -353,6 +371,16 @@ class AutoTraderManager:
             # Start trading loop in background task
             task = asyncio.create_task(trader.start())
             self.tasks[user_id] = task
+            task.add_done_callback(lambda done: self._forget(user_id, done))
+
+            # Wait until initialized or failed
+            ready = asyncio.create_task(trader._ready.wait())
+            await asyncio.wait({task, ready}, return_when=asyncio.FIRST_COMPLETED)
+            ready.cancel()
+            if task.done():
+                self._forget(user_id, task)
+                task.result()
+                raise RuntimeError(f"Trader for user {user_id} exited during startup")
 
             logger.info(f"Auto-trader started for user {user_id}")
 
@@ -360,6 +388,14 @@ class AutoTraderManager:
             logger.error(f"Error starting trader for user {user_id}: {e}", exc_info=True)
             raise
 
+    def _forget(self, user_id: str, task: asyncio.Task):
+        """Drop a trader whose task has ended (unless it was already replaced)"""
+        if self.tasks.get(user_id) is task:
+            del self.tasks[user_id]
+            self.traders.pop(user_id, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Auto-trader for user {user_id} stopped: {task.exception()}")
+
     async def stop_trader(self, user_id: str):
         """Stop auto-trading for a user"""
         if user_id not in self.traders:
@@ -399,6 +435,7 @@ class AutoTraderManager:
             'userId': trader.user_id,
             'strategyName': trader.strategy.name,
             'symbols': trader.active_config.selectedSymbols,
+            'interval': trader.ANALYSIS_INTERVAL,
             'message': 'Trader running'
         }
 
@@ -1,7 +1,9 @@
 import asyncio
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Set
 from app.services.binance import BinanceFuturesClient
+from app.services.price_book import price_book
+from app.services.price_triggers import ABOVE, BELOW, PriceTrigger, PriceTriggerIndex
 from app.ai.ensemble import TripleAIEnsemble
 import logging
 
@@ -154,20 +156,29 @@ class PositionManager:
     - Check for SL/TP hits
     - Detect reversal signals
     - Auto-close positions when needed
+
+    Price checks are tick driven: each sync registers every position's
+    stop-loss, take-profit and liquidation warning prices in a price trigger
+    index, and a tick only checks the positions whose trigger it crossed.
     """
 
-    def __init__(self, check_interval: int = 30):
+    def __init__(self, check_interval: int = 30, liquidation_warning_pct: float = 10.0):
         """
         Initialize position manager
 
         Args:
-            check_interval: Position check interval in seconds (default: 30s)
+            check_interval: Position / protective order sync interval in seconds (default: 30s)
+            liquidation_warning_pct: Distance to liquidation that triggers a check (default: 10%)
         """
         self.check_interval = check_interval
+        self.liquidation_warning_pct = liquidation_warning_pct
         self.binance = BinanceFuturesClient()
         self.ensemble = TripleAIEnsemble()
         self.running = False
         self.task: asyncio.Task = None
+        self.triggers = PriceTriggerIndex()
+        self.positions: Dict[str, Dict] = {}
+        self._checks: Set[asyncio.Task] = set()
 
     async def start(self):
         """Start position management"""
@@ -176,6 +187,7 @@ class PositionManager:
             return
 
         self.running = True
+        price_book.add_listener(self._on_price)
         self.task = asyncio.create_task(self._manage_positions())
         logger.info("Position manager started")
 
@@ -185,6 +197,7 @@ class PositionManager:
             return
 
         self.running = False
+        price_book.remove_listener(self._on_price)
 
         if self.task:
             self.task.cancel()
@@ -196,13 +209,17 @@ class PositionManager:
         logger.info("Position manager stopped")
 
     async def _manage_positions(self):
-        """Continuously manage open positions"""
+        """Keep the trigger index in sync with open positions and protective orders"""
         logger.info("Started position management")
 
         while self.running:
             try:
-                # Get all open positions
-                positions = await self.binance.get_open_positions()
+                # Get all open positions and their SL/TP orders
+                positions, orders = await asyncio.gather(
+                    self.binance.get_open_positions(),
+                    self.binance.get_protective_orders()
+                )
+                self._sync_triggers(positions, orders)
 
                 if not positions:
                     await asyncio.sleep(self.check_interval)
@@ -210,11 +227,12 @@ class PositionManager:
 
                 logger.info(f"Managing {len(positions)} open positions")
 
-                # Check each position
-                for position in positions:
-                    await self._check_position(position)
+                # Positions already past a trigger (e.g. opened inside the warning zone)
+                for symbol in {position['symbol'] for position in positions}:
+                    mark_price = next(p['markPrice'] for p in positions if p['symbol'] == symbol)
+                    self._dispatch(self.triggers.crossed("binance", symbol, mark_price), mark_price)
 
-                # Wait for next check
+                # Wait for next sync
                 await asyncio.sleep(self.check_interval)
 
             except asyncio.CancelledError:
@@ -224,12 +242,98 @@ class PositionManager:
                 logger.error(f"Error in position management: {e}")
                 await asyncio.sleep(60)
 
-    async def _check_position(self, position: Dict):
+    def _sync_triggers(self, positions: List[Dict], orders: List[Dict]):
+        """
+        Rebuild the trigger index from a position / order snapshot
+
+        Args:
+            positions: Open positions from Binance
+            orders: Open STOP_MARKET / TAKE_PROFIT_MARKET orders
+        """
+        previous = set(self.positions)
+        self.positions = {f"{p['symbol']}:{p['side']}": p for p in positions}
+
+        for position_id, position in self.positions.items():
+            self.triggers.replace_owner(position_id, self._build_triggers(position_id, position, orders))
+
+        for position_id in previous - set(self.positions):
+            self.triggers.remove_owner(position_id)
+
+    def _build_triggers(self, position_id: str, position: Dict, orders: List[Dict]) -> List[PriceTrigger]:
+        """Liquidation warning, stop-loss and take-profit prices of one position"""
+        symbol = position['symbol']
+        is_long = position['side'] == 'LONG'
+        closing_side = 'SELL' if is_long else 'BUY'
+        triggers = []
+
+        liquidation_price = position['liquidationPrice']
+        if liquidation_price > 0:
+            ratio = self.liquidation_warning_pct / 100
+            triggers.append(PriceTrigger(
+                trigger_id=f"{position_id}:liquidation",
+                exchange="binance",
+                symbol=symbol,
+                price=liquidation_price / (1 - ratio) if is_long else liquidation_price / (1 + ratio),
+                direction=BELOW if is_long else ABOVE,
+                kind="liquidation",
+                owner=position_id
+            ))
+
+        for order in orders:
+            if order['symbol'] != symbol or order['side'] != closing_side:
+                continue
+            if order['positionSide'] not in ('BOTH', position['side']):
+                continue
+
+            is_stop = order['type'] == 'STOP_MARKET'
+            triggers.append(PriceTrigger(
+                trigger_id=f"{position_id}:{order['orderId']}",
+                exchange="binance",
+                symbol=symbol,
+                price=order['stopPrice'],
+                direction=(BELOW if is_long else ABOVE) if is_stop else (ABOVE if is_long else BELOW),
+                kind="stop_loss" if is_stop else "take_profit",
+                owner=position_id
+            ))
+
+        return triggers
+
+    def _on_price(self, exchange: str, symbol: str):
+        """Price tick: check only the positions whose triggers were crossed"""
+        if exchange != "binance":
+            return
+
+        price = price_book.get_price(exchange, symbol)
+        if not price:
+            return
+
+        hit, _ = self.triggers.cross(exchange, symbol, price)
+        if hit:
+            self._dispatch(hit, price)
+
+    def _dispatch(self, triggers: List[PriceTrigger], price: float):
+        """Schedule one check per position with the triggers it crossed"""
+        crossed: Dict[str, List[PriceTrigger]] = {}
+        for trigger in triggers:
+            crossed.setdefault(trigger.owner, []).append(trigger)
+
+        for position_id, position_triggers in crossed.items():
+            position = self.positions.get(position_id)
+            if position is None:
+                continue
+            task = asyncio.create_task(
+                self._check_position({**position, 'markPrice': price}, position_triggers)
+            )
+            self._checks.add(task)
+            task.add_done_callback(self._checks.discard)
+
+    async def _check_position(self, position: Dict, triggers: List[PriceTrigger] = ()):
         """
         Check a single position for management actions
 
         Args:
             position: Position data from Binance
+            triggers: Price triggers the position just crossed
         """
         symbol = position['symbol']
         side = position['side']
@@ -244,6 +348,12 @@ class PositionManager:
             f"PnL=${unrealized_pnl:.2f}"
         )
 
+        for trigger in triggers:
+            logger.warning(
+                f"{symbol} {side} crossed {trigger.kind} trigger "
+                f"@ {trigger.price:.2f} (mark {current_price:.2f})"
+            )
+
         # TODO: Implement position management logic
         # 1. Check if SL/TP should be adjusted
         # 2. Detect reversal signals from AI
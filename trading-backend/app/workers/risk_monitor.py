@@ -2,26 +2,42 @@
 리스크 모니터링 백그라운드 워커
 
 주기적으로 포트폴리오 리스크를 모니터링하고 임계값 초과 시 알림을 전송합니다.
+
+Features:
+- 계정 동시 스캔 (전체 / 거래소별 동시성 제한, 거래소 가중치는 request_budget이 관리)
+- 이벤트 기반 청산가 감시: 스캔 시 포지션별 경고 가격을 가격 트리거 인덱스에 등록하고
+  마크 가격 틱마다 이번 틱에 넘어간 경고 가격만 조회 (알림 지연 = 틱 간격)
+- 테스트넷 계정은 테스트넷 마크 가격으로 평가
+- 계정 Private 스트림 이벤트(체결, 청산가 변경) 시 해당 계정 경고 가격 재계산
+- 텔레그램 전송은 백그라운드 큐에서 처리 (틱 처리 경로를 막지 않음)
 """
 
 import asyncio
 import logging
+import time as monotonic_time
+from dataclasses import dataclass, field
 from datetime import datetime, time
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
+from app.core.background_queue import background_queue
 from app.core.config import settings
 from app.services.telegram_service import TelegramService
-from app.services.binance_client import BinanceClient
-from app.services.okx_client import OKXClient
+from app.services.price_book import mark_venue, price_book
+from app.services.account_state import account_key, account_state
+from app.services.client_cache import client_cache
+from app.services.position_stream import position_metrics
+from app.services.price_triggers import ABOVE, BELOW, PriceTrigger, PriceTriggerIndex
+from app.services.var_engine import var_engine
 from app.models.api_key import ApiKey
 from app.database.base import AsyncSessionLocal, is_sqlite, SessionLocal
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+AccountKey = Tuple[str, str, bool]
+
 
 class RiskMonitorConfig:
     """리스크 모니터링 설정"""
@@ -54,6 +70,79 @@ class RiskMonitorConfig:
     # 중복 알림 방지 (같은 이슈는 N분마다만 알림)
     ALERT_COOLDOWN_MINUTES = 30
 
+    # 청산 임박(critical) 알림 반복 간격 (초) - 틱마다 보내지 않도록 제한
+    CRITICAL_REPEAT_SECONDS = 60
+
+    # 청산 근접 단계 해제 여유 (%p) - 임계값 + 여유보다 멀어져야 한 단계 내려감
+    LIQUIDATION_HYSTERESIS = 1.0
+
+
+# 청산가 근접 단계 (값이 클수록 위험)
+LIQUIDATION_WARNING = 1
+LIQUIDATION_DANGER = 2
+LIQUIDATION_CRITICAL = 3
+
+
+@dataclass
+class MonitoredAccount:
+    """스캔 대상 계정 (DB 세션과 분리된 스냅샷)"""
+    api_key: ApiKey
+    chat_id: Optional[str]
+
+    @property
+    def id(self) -> str:
+        return self.api_key.id
+
+    @property
+    def exchange(self) -> str:
+        return self.api_key.exchange.lower()
+
+    @property
+    def mark_venue(self) -> str:
+        """마크 가격 장부 키 (테스트넷 계정은 테스트넷 시세)"""
+        return mark_venue(self.exchange, bool(self.api_key.testnet))
+
+
+@dataclass
+class LiquidationAlertState:
+    """포지션별 청산 근접 알림 상태 (단계가 내려가도 전송 시각은 유지)"""
+    level: int = 0
+    last_sent: float = float("-inf")
+    last_critical_sent: float = float("-inf")
+
+
+@dataclass
+class LiquidationTrigger:
+    """
+    포지션 하나의 청산 근접 경고 가격
+
+    거리(%) = 롱 (가격 - 청산가) / 가격, 숏 (청산가 - 가격) / 가격 이므로
+    임계값 d%에 해당하는 가격은 롱 청산가 / (1 - d), 숏 청산가 / (1 + d) 입니다.
+    롱은 가격이 그 아래로, 숏은 위로 넘어가면 해당 단계에 진입합니다.
+    """
+    position_id: str
+    account: MonitoredAccount = field(compare=False)
+    symbol: str
+    side: str  # long / short
+    entry_price: float
+    liquidation_price: float
+    leverage: int
+    # (단계, 경고 가격) - 위험한 단계부터
+    levels: List[Tuple[int, float]] = field(default_factory=list)
+    # 단계 → 임계 거리 (%)
+    thresholds: Dict[int, float] = field(default_factory=dict)
+
+    def distance(self, price: float) -> float:
+        if self.side == "long":
+            return (price - self.liquidation_price) / price * 100
+        return (self.liquidation_price - price) / price * 100
+
+    def level_at(self, price: float) -> int:
+        for level, trigger_price in self.levels:
+            if (price <= trigger_price) if self.side == "long" else (price >= trigger_price):
+                return level
+        return 0
+
 
 class RiskMonitor:
     """리스크 모니터링 서비스"""
@@ -71,10 +160,32 @@ class RiskMonitor:
         # 활성 상태
         self.is_running = False
 
+        # 이벤트 기반 청산가 감시
+        self.event_driven = settings.RISK_MONITOR_EVENT_DRIVEN
+        self._accounts: Dict[AccountKey, MonitoredAccount] = {}
+        # 단계별 경고 가격 (owner = 계정 키, payload = LiquidationTrigger)
+        self._triggers = PriceTriggerIndex()
+        # 포지션 ID → 알림 상태
+        self._liquidation_alerts: Dict[str, LiquidationAlertState] = {}
+
+        # 스캔 중 수집한 계정별 (잔고, 포지션) → 스캔 후 VaR 일괄 계산
+        self._var_inputs: Dict[str, Tuple[MonitoredAccount, float, List[Dict]]] = {}
+        self._var_results: Dict[str, Dict] = {}
+
+        self.stats = {
+            "scans": 0,
+            "last_scan_seconds": 0.0,
+            "ticks_checked": 0,
+            "liquidation_alerts": 0
+        }
+
     async def start(self):
         """모니터링 시작"""
         self.is_running = True
-        logger.info("Risk monitoring service started")
+        if self.event_driven:
+            price_book.add_mark_listener(self._on_mark)
+            account_state.add_listener(self._on_account)
+        logger.info(f"Risk monitoring service started (event-driven: {self.event_driven})")
 
         while self.is_running:
             try:
@@ -93,262 +204,355 @@ class RiskMonitor:
     async def stop(self):
         """모니터링 중지"""
         self.is_running = False
+        price_book.remove_mark_listener(self._on_mark)
+        account_state.remove_listener(self._on_account)
         logger.info("Risk monitoring service stopped")
 
-    async def monitor_all_accounts(self):
-        """모든 활성 계정 모니터링"""
-        if is_sqlite:
-            # SQLite: 동기 방식
-            db = SessionLocal()
-            try:
-                # 모든 활성 API 키 조회
-                stmt = select(ApiKey).where(ApiKey.is_active == True)
-                result = db.execute(stmt)
-                active_keys = result.scalars().all()
+    # ===== 계정 스캔 =====
 
-                for api_key in active_keys:
-                    try:
-                        await self.monitor_account(api_key, db)
-                    except Exception as e:
-                        logger.error(f"Error monitoring account {api_key.id}: {e}")
+    async def load_active_accounts(self) -> List[MonitoredAccount]:
+        """
+        활성 계정 조회 (사용자 포함 단일 쿼리)
 
-            except Exception as e:
-                logger.error(f"Error in monitor_all_accounts: {e}")
-                db.rollback()
-                raise
-            finally:
-                db.close()
+        SQLite 동기 세션은 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+        """
+        stmt = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.is_active == True)
+
+        if is_sqlite:
+            def query() -> List[ApiKey]:
+                db = SessionLocal()
+                try:
+                    return db.execute(stmt).scalars().all()
+                finally:
+                    db.close()
+
+            active_keys = await asyncio.to_thread(query)
         else:
-            # PostgreSQL: 비동기 방식
             async with AsyncSessionLocal() as db:
-                try:
-                    # 모든 활성 API 키 조회
-                    stmt = select(ApiKey).where(ApiKey.is_active == True)
-                    result = await db.execute(stmt)
-                    active_keys = result.scalars().all()
+                result = await db.execute(stmt)
+                active_keys = result.scalars().all()
 
-                    for api_key in active_keys:
-                        try:
-                            await self.monitor_account(api_key, db)
-                        except Exception as e:
-                            logger.error(f"Error monitoring account {api_key.id}: {e}")
+        return [
+            MonitoredAccount(api_key=api_key, chat_id=getattr(api_key.user, 'telegram_chat_id', None))
+            for api_key in active_keys
+        ]
 
+    async def _scan(self, accounts: List[MonitoredAccount], job):
+        """계정별 작업 동시 실행 (전체 / 거래소별 동시성 제한)"""
+        limit = asyncio.Semaphore(settings.RISK_MONITOR_CONCURRENCY)
+        exchange_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async def run(account: MonitoredAccount):
+            exchange_limit = exchange_limits.setdefault(
+                account.exchange,
+                asyncio.Semaphore(settings.RISK_MONITOR_EXCHANGE_CONCURRENCY)
+            )
+            async with limit, exchange_limit:
+                try:
+                    await job(account)
                 except Exception as e:
-                    logger.error(f"Error in monitor_all_accounts: {e}")
-                    await db.rollback()
-                    raise
+                    logger.error(f"Error monitoring account {account.id}: {e}")
+
+        await asyncio.gather(*(run(account) for account in accounts))
 
-    async def monitor_account(self, api_key: ApiKey, db: Union[Session, AsyncSession]):
+    async def monitor_all_accounts(self):
+        """모든 활성 계정 모니터링"""
+        started = monotonic_time.monotonic()
+        accounts = await self.load_active_accounts()
+
+        self._var_inputs = {}
+        await self._scan(accounts, self.monitor_account)
+
+        # 전체 계정 VaR (계정 × 심볼 노출 행렬 한 번의 행렬 곱)
+        await self.check_var(self._var_inputs)
+
+        # 비활성화 / 삭제된 계정 정리
+        active_ids = {account.id for account in accounts}
+        for key, account in list(self._accounts.items()):
+            if account.id not in active_ids:
+                self._forget_account(key)
+
+        self.stats["scans"] += 1
+        self.stats["last_scan_seconds"] = round(monotonic_time.monotonic() - started, 3)
+
+    async def monitor_account(self, account: MonitoredAccount):
         """개별 계정 모니터링"""
+        # 텔레그램 미설정 시 스킵
+        if not account.chat_id:
+            return
 
-        # 거래소 클라이언트 생성
-        if api_key.exchange == "binance":
-            client = BinanceClient(
-                api_key=api_key.api_key,
-                api_secret=api_key.api_secret,
-                testnet=api_key.testnet
-            )
-        elif api_key.exchange == "okx":
-            client = OKXClient(
-                api_key=api_key.api_key,
-                api_secret=api_key.api_secret,
-                passphrase=api_key.passphrase,
-                testnet=api_key.testnet
-            )
-        else:
-            logger.warning(f"Unsupported exchange: {api_key.exchange}")
+        # 거래소 클라이언트 (복호화된 자격증명 캐시)
+        try:
+            client = client_cache.get(account.api_key)
+        except ValueError:
+            logger.warning(f"Unsupported exchange: {account.api_key.exchange}")
             return
 
         # 계정 정보 조회
         try:
-            balance_info = await client.get_account_balance()
-            positions = await client.get_positions()
-
-            # 텔레그램 채팅 ID (User와 연결되어야 함, 여기서는 간단히 구현)
-            # 실제로는 User 모델에 telegram_chat_id 필드 추가 필요
-            chat_id = getattr(api_key.user, 'telegram_chat_id', None)
-
-            if not chat_id:
-                # 텔레그램 미설정 시 스킵
-                return
+            balance_info, positions = await asyncio.gather(
+                account_state.get_balance(client),
+                account_state.get_positions(client)
+            )
 
             # 포트폴리오 가치
-            total_balance = float(balance_info.get('totalWalletBalance', 0))
+            total_balance = float(balance_info.get('total_balance', 0))
 
-            # 활성 포지션 필터링
-            active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
+            # 포지션별 실시간 지표 (노출, 청산가)
+            active_positions = [
+                position_metrics(account.exchange, p, price_book.get_mark_price(account.mark_venue, p['symbol']))
+                for p in positions if p.get('position_amt')
+            ]
+
+            # 청산가 감시 인덱스 갱신 (포지션이 없으면 제거)
+            key = account_key(client)
+            self._accounts[key] = account
+            self._index_account(key, account, positions)
 
             if not active_positions:
                 # 포지션 없으면 스킵
                 return
 
-            # 1. VaR 체크
-            await self.check_var(
-                api_key=api_key,
-                chat_id=chat_id,
-                total_balance=total_balance,
-                positions=active_positions
-            )
+            # 1. VaR 체크 (스캔 후 전체 계정 일괄 계산)
+            self._var_inputs[account.id] = (account, total_balance, active_positions)
 
             # 2. 청산가 근접 체크
-            await self.check_liquidation_proximity(
-                api_key=api_key,
-                chat_id=chat_id,
-                positions=active_positions
-            )
+            await self.check_liquidation_proximity(key)
 
             # 3. 포지션 집중도 체크
             await self.check_position_concentration(
-                api_key=api_key,
-                chat_id=chat_id,
+                account=account,
                 total_balance=total_balance,
                 positions=active_positions
             )
 
         except Exception as e:
-            logger.error(f"Error monitoring account {api_key.id}: {e}")
+            logger.error(f"Error monitoring account {account.id}: {e}")
 
-    async def check_var(
+    async def batch_var(
         self,
-        api_key: ApiKey,
-        chat_id: str,
-        total_balance: float,
-        positions: List[Dict]
-    ):
-        """VaR (Value at Risk) 체크"""
+        inputs: Dict[str, Tuple[MonitoredAccount, float, List[Dict]]]
+    ) -> Dict[str, Dict]:
+        """계정별 VaR 일괄 계산 (캔들 수집이 필요할 수 있으므로 스레드에서 실행)"""
+        if not inputs:
+            return {}
 
-        # 간단한 VaR 추정: 총 노출의 5% (95% 신뢰수준)
-        total_exposure = sum(
-            abs(float(p.get('notional', 0)))
-            for p in positions
-        )
+        try:
+            return await asyncio.to_thread(
+                var_engine.batch_var,
+                {account_id: positions for account_id, (_, _, positions) in inputs.items()},
+                confidence_level=0.95,
+                methods=(var_engine.default_method,)
+            )
+        except Exception as e:
+            logger.error(f"Batch VaR calculation failed: {e}")
+            return {}
 
-        # VaR = 총 노출 * 5% (가정: 95% 신뢰수준에서 일일 변동성 5%)
-        var_amount = total_exposure * 0.05
-        var_percentage = (var_amount / total_balance * 100) if total_balance > 0 else 0
+    async def check_var(self, inputs: Dict[str, Tuple[MonitoredAccount, float, List[Dict]]]):
+        """VaR (Value at Risk) 체크 - 과거 수익률 기반 95% 1일 VaR"""
+        results = await self.batch_var(inputs)
+        self._var_results = results
 
-        # 임계값 체크
-        alert_key = f"{api_key.id}_var"
+        for account_id, (account, total_balance, _) in inputs.items():
+            result = results.get(account_id)
+            if result is None:
+                continue
 
-        if var_percentage > self.config.VAR_DANGER_THRESHOLD:
-            if self._should_send_alert(alert_key):
-                self.telegram.send_var_alert(
-                    chat_id=chat_id,
-                    current_var_amount=var_amount,
-                    current_var_percentage=var_percentage,
-                    threshold_percentage=self.config.VAR_DANGER_THRESHOLD,
-                    confidence_level=95
-                )
-                self._mark_alert_sent(alert_key)
-                logger.warning(
-                    f"VaR alert sent for account {api_key.id}: "
-                    f"{var_percentage:.2f}% (threshold: {self.config.VAR_DANGER_THRESHOLD}%)"
-                )
+            var_amount = result['var_amount']
+            var_percentage = (var_amount / total_balance * 100) if total_balance > 0 else 0
+
+            # 임계값 체크
+            alert_key = f"{account.id}_var"
+
+            if var_percentage > self.config.VAR_DANGER_THRESHOLD:
+                threshold = self.config.VAR_DANGER_THRESHOLD
+                log_level = logger.warning
+            elif var_percentage > self.config.VAR_WARNING_THRESHOLD:
+                threshold = self.config.VAR_WARNING_THRESHOLD
+                log_level = logger.info
+            else:
+                continue
 
-        elif var_percentage > self.config.VAR_WARNING_THRESHOLD:
             if self._should_send_alert(alert_key):
-                self.telegram.send_var_alert(
-                    chat_id=chat_id,
-                    current_var_amount=var_amount,
-                    current_var_percentage=var_percentage,
-                    threshold_percentage=self.config.VAR_WARNING_THRESHOLD,
-                    confidence_level=95
+                background_queue.submit(
+                    self.telegram.send_var_alert,
+                    chat_id=account.chat_id,
+                    current_var=var_amount,
+                    threshold_var=total_balance * threshold / 100,
+                    confidence_level=result['confidence_level'],
+                    portfolio_value=total_balance,
+                    uncovered_symbols=result.get('uncovered_symbols')
                 )
                 self._mark_alert_sent(alert_key)
-                logger.info(
-                    f"VaR warning sent for account {api_key.id}: "
-                    f"{var_percentage:.2f}% (threshold: {self.config.VAR_WARNING_THRESHOLD}%)"
+                log_level(
+                    f"VaR alert sent for account {account.id}: "
+                    f"{var_percentage:.2f}% (threshold: {threshold}%)"
                 )
 
-    async def check_liquidation_proximity(
-        self,
-        api_key: ApiKey,
-        chat_id: str,
-        positions: List[Dict]
-    ):
-        """청산가 근접 체크"""
+    # ===== 청산가 근접 (이벤트 기반) =====
+
+    def _build_trigger(self, account: MonitoredAccount, position: Dict) -> Optional[LiquidationTrigger]:
+        liquidation_price = position.get('liquidation_price')
+        if not liquidation_price:
+            return None
+
+        side = str(position.get('side', '')).lower()
+        if side not in ('long', 'short'):
+            side = 'long' if position['position_amt'] > 0 else 'short'
+
+        trigger = LiquidationTrigger(
+            position_id=f"{account.id}:{position['symbol']}:{position.get('position_side', position['side'])}",
+            account=account,
+            symbol=position['symbol'],
+            side=side,
+            entry_price=position['entry_price'],
+            liquidation_price=liquidation_price,
+            leverage=int(position.get('leverage') or 1)
+        )
+        for level, threshold in (
+            (LIQUIDATION_CRITICAL, self.config.LIQUIDATION_CRITICAL_THRESHOLD),
+            (LIQUIDATION_DANGER, self.config.LIQUIDATION_DANGER_THRESHOLD),
+            (LIQUIDATION_WARNING, self.config.LIQUIDATION_WARNING_THRESHOLD)
+        ):
+            ratio = threshold / 100
+            trigger.thresholds[level] = threshold
+            trigger_price = liquidation_price / (1 - ratio) if side == 'long' else liquidation_price / (1 + ratio)
+            trigger.levels.append((level, trigger_price))
+        return trigger
+
+    def _index_account(self, key: AccountKey, account: MonitoredAccount, positions: List[Dict]):
+        """계정 포지션의 경고 가격을 트리거 인덱스에 반영"""
+        old_ids = {t.payload.position_id for t in self._triggers.owned(key)}
+        entries: List[PriceTrigger] = []
 
         for position in positions:
-            try:
-                symbol = position.get('symbol')
-                side = 'long' if float(position.get('positionAmt', 0)) > 0 else 'short'
-                entry_price = float(position.get('entryPrice', 0))
-                mark_price = float(position.get('markPrice', 0))
-                liquidation_price = float(position.get('liquidationPrice', 0))
-                leverage = int(position.get('leverage', 1))
-
-                if liquidation_price == 0:
-                    continue
-
-                # 청산가까지 거리 계산
-                if side == 'long':
-                    distance = ((mark_price - liquidation_price) / mark_price * 100)
-                else:
-                    distance = ((liquidation_price - mark_price) / mark_price * 100)
-
-                # 임계값 체크
-                alert_key = f"{api_key.id}_liquidation_{symbol}"
-
-                if distance <= self.config.LIQUIDATION_CRITICAL_THRESHOLD:
-                    # 항상 알림 (매우 위험)
-                    self.telegram.send_liquidation_warning(
-                        chat_id=chat_id,
-                        symbol=symbol,
-                        side=side,
-                        entry_price=entry_price,
-                        current_price=mark_price,
-                        liquidation_price=liquidation_price,
-                        distance_percent=distance,
-                        leverage=leverage
-                    )
-                    logger.critical(
-                        f"CRITICAL liquidation warning for {symbol}: "
-                        f"{distance:.2f}% from liquidation"
-                    )
-
-                elif distance <= self.config.LIQUIDATION_DANGER_THRESHOLD:
-                    if self._should_send_alert(alert_key):
-                        self.telegram.send_liquidation_warning(
-                            chat_id=chat_id,
-                            symbol=symbol,
-                            side=side,
-                            entry_price=entry_price,
-                            current_price=mark_price,
-                            liquidation_price=liquidation_price,
-                            distance_percent=distance,
-                            leverage=leverage
-                        )
-                        self._mark_alert_sent(alert_key)
-                        logger.error(
-                            f"Liquidation danger for {symbol}: "
-                            f"{distance:.2f}% from liquidation"
-                        )
-
-                elif distance <= self.config.LIQUIDATION_WARNING_THRESHOLD:
-                    if self._should_send_alert(alert_key):
-                        self.telegram.send_liquidation_warning(
-                            chat_id=chat_id,
-                            symbol=symbol,
-                            side=side,
-                            entry_price=entry_price,
-                            current_price=mark_price,
-                            liquidation_price=liquidation_price,
-                            distance_percent=distance,
-                            leverage=leverage
-                        )
-                        self._mark_alert_sent(alert_key)
-                        logger.warning(
-                            f"Liquidation warning for {symbol}: "
-                            f"{distance:.2f}% from liquidation"
-                        )
+            trigger = self._build_trigger(account, position)
+            if trigger is None:
+                continue
+            direction = BELOW if trigger.side == 'long' else ABOVE
+            for level, trigger_price in trigger.levels:
+                entries.append(PriceTrigger(
+                    trigger_id=f"{trigger.position_id}:{level}",
+                    exchange=account.mark_venue,
+                    symbol=trigger.symbol,
+                    price=trigger_price,
+                    direction=direction,
+                    kind="liquidation",
+                    owner=key,
+                    payload=trigger
+                ))
+
+        self._triggers.replace_owner(key, entries)
+
+        for position_id in old_ids - {entry.payload.position_id for entry in entries}:
+            self._liquidation_alerts.pop(position_id, None)
+
+    def _forget_account(self, key: AccountKey):
+        self._accounts.pop(key, None)
+        self._index_account(key, None, [])
+
+    def _on_mark(self, venue: str, symbol: str):
+        """마크 가격 틱 → 이번 틱에 넘어간 경고 가격의 포지션만 평가 (동기, 가볍게 유지)"""
+        price = price_book.get_mark_price(venue, symbol)
+        if not price:
+            return
 
+        hit, cleared = self._triggers.cross(venue, symbol, price)
+        if not hit and not cleared:
+            return
+
+        self.stats["ticks_checked"] += 1
+        # 한 틱에 여러 단계를 넘어도 포지션당 한 번만 평가
+        for trigger in {entry.payload.position_id: entry.payload for entry in hit + cleared}.values():
+            self._evaluate_liquidation(trigger, price)
+
+    def _on_account(self, key: AccountKey):
+        """계정 상태 변경 → 해당 계정 경고 가격 재계산"""
+        account = self._accounts.get(key)
+        if account is None:
+            return
+
+        state = account_state.peek(key)
+        if state is None:
+            self._forget_account(key)
+            return
+        self._index_account(key, account, list(state.positions.values()))
+        # 이미 경고 구간 안에 있는 새 포지션은 다음 틱의 교차를 기다리지 않음
+        self._check_account(key)
+
+    def _liquidation_level(self, trigger: LiquidationTrigger, price: float, current: int) -> int:
+        """
+        히스테리시스를 적용한 청산 근접 단계
+
+        올라갈 때는 임계값에서 바로, 내려갈 때는 현재 단계 임계값 + 여유보다 멀어져야 합니다.
+        임계값 근처에서 가격이 흔들려도 단계가 매 틱 바뀌지 않습니다.
+        """
+        level = trigger.level_at(price)
+        if level >= current:
+            return level
+        if trigger.distance(price) <= trigger.thresholds[current] + self.config.LIQUIDATION_HYSTERESIS:
+            return current
+        return level
+
+    def _evaluate_liquidation(self, trigger: LiquidationTrigger, price: float):
+        state = self._liquidation_alerts.setdefault(trigger.position_id, LiquidationAlertState())
+        level = self._liquidation_level(trigger, price, state.level)
+        state.level = level
+        if not level:
+            return
+
+        now = monotonic_time.monotonic()
+        if level == LIQUIDATION_CRITICAL:
+            # 청산 임박은 처음 진입 시 즉시, 이후 CRITICAL_REPEAT_SECONDS마다
+            if now - state.last_critical_sent < self.config.CRITICAL_REPEAT_SECONDS:
+                return
+            state.last_critical_sent = now
+        elif now - state.last_sent < self.config.ALERT_COOLDOWN_MINUTES * 60:
+            # 경고 / 위험은 단계가 올라가도 쿨다운 적용
+            return
+
+        distance = trigger.distance(price)
+        background_queue.submit(
+            self.telegram.send_liquidation_warning,
+            chat_id=trigger.account.chat_id,
+            symbol=trigger.symbol,
+            side=trigger.side,
+            entry_price=trigger.entry_price,
+            current_price=price,
+            liquidation_price=trigger.liquidation_price,
+            distance_percent=distance,
+            leverage=trigger.leverage
+        )
+        state.last_sent = now
+        self._mark_alert_sent(f"{trigger.account.id}_liquidation_{trigger.symbol}")
+        self.stats["liquidation_alerts"] += 1
+
+        log_level = {
+            LIQUIDATION_CRITICAL: logger.critical,
+            LIQUIDATION_DANGER: logger.error,
+            LIQUIDATION_WARNING: logger.warning
+        }[level]
+        log_level(f"Liquidation alert for {trigger.symbol}: {distance:.2f}% from liquidation")
+
+    async def check_liquidation_proximity(self, key: AccountKey):
+        """청산가 근접 체크 (계정 포지션 전체, 마크 가격 기준)"""
+        self._check_account(key)
+
+    def _check_account(self, key: AccountKey):
+        positions = {entry.payload.position_id: entry for entry in self._triggers.owned(key)}
+        for entry in positions.values():
+            trigger = entry.payload
+            price = price_book.get_mark_price(entry.exchange, entry.symbol)
+            if not price:
+                continue
+            try:
+                self._evaluate_liquidation(trigger, price)
             except Exception as e:
-                logger.error(f"Error checking liquidation for {position.get('symbol')}: {e}")
+                logger.error(f"Error checking liquidation for {trigger.symbol}: {e}")
 
     async def check_position_concentration(
         self,
-        api_key: ApiKey,
-        chat_id: str,
+        account: MonitoredAccount,
         total_balance: float,
         positions: List[Dict]
     ):
@@ -359,7 +563,7 @@ class RiskMonitor:
         for position in positions:
             try:
                 symbol = position.get('symbol')
-                notional = abs(float(position.get('notional', 0)))
+                notional = abs(position['notional'])
                 percentage = (notional / total_balance * 100) if total_balance > 0 else 0
                 position_sizes.append((symbol, percentage))
             except Exception as e:
@@ -381,7 +585,7 @@ class RiskMonitor:
         hhi = sum(pct ** 2 for _, pct in position_sizes)
 
         # 임계값 체크
-        alert_key = f"{api_key.id}_concentration"
+        alert_key = f"{account.id}_concentration"
 
         danger_triggered = False
         warning_triggered = False
@@ -393,20 +597,20 @@ class RiskMonitor:
 
         if danger_triggered or warning_triggered:
             if self._should_send_alert(alert_key):
-                self.telegram.send_concentration_warning(
-                    chat_id=chat_id,
-                    largest_position_symbol=largest_symbol,
+                background_queue.submit(
+                    self.telegram.send_concentration_warning,
+                    chat_id=account.chat_id,
                     largest_position_pct=largest_pct,
-                    top3_concentration_pct=top3_pct,
-                    hhi=hhi,
-                    total_positions=len(positions)
+                    top_3_concentration=top3_pct,
+                    total_positions=len(positions),
+                    herfindahl_index=hhi
                 )
                 self._mark_alert_sent(alert_key)
 
                 log_level = logger.error if danger_triggered else logger.warning
                 log_level(
-                    f"Position concentration alert for account {api_key.id}: "
-                    f"Largest={largest_pct:.2f}%, Top3={top3_pct:.2f}%, HHI={hhi:.2f}"
+                    f"Position concentration alert for account {account.id}: "
+                    f"Largest={largest_symbol} {largest_pct:.2f}%, Top3={top3_pct:.2f}%, HHI={hhi:.2f}"
                 )
 
     async def check_daily_report(self):
@@ -433,108 +637,61 @@ class RiskMonitor:
 
     async def send_daily_reports(self):
         """모든 계정에 일일 리포트 전송"""
-        if is_sqlite:
-            # SQLite: 동기 방식
-            db = SessionLocal()
-            try:
-                stmt = select(ApiKey).where(ApiKey.is_active == True)
-                result = db.execute(stmt)
-                active_keys = result.scalars().all()
-
-                for api_key in active_keys:
-                    try:
-                        await self.send_account_daily_report(api_key, db)
-                    except Exception as e:
-                        logger.error(f"Error sending daily report for {api_key.id}: {e}")
-
-            except Exception as e:
-                logger.error(f"Error in send_daily_reports: {e}")
-                db.rollback()
-                raise
-            finally:
-                db.close()
-        else:
-            # PostgreSQL: 비동기 방식
-            async with AsyncSessionLocal() as db:
-                try:
-                    stmt = select(ApiKey).where(ApiKey.is_active == True)
-                    result = await db.execute(stmt)
-                    active_keys = result.scalars().all()
-
-                    for api_key in active_keys:
-                        try:
-                            await self.send_account_daily_report(api_key, db)
-                        except Exception as e:
-                            logger.error(f"Error sending daily report for {api_key.id}: {e}")
-
-                except Exception as e:
-                    logger.error(f"Error in send_daily_reports: {e}")
-                    await db.rollback()
-                    raise
+        accounts = await self.load_active_accounts()
+        await self._scan(accounts, self.send_account_daily_report)
 
-    async def send_account_daily_report(self, api_key: ApiKey, db: Union[Session, AsyncSession]):
+    async def send_account_daily_report(self, account: MonitoredAccount):
         """개별 계정 일일 리포트"""
 
-        # 거래소 클라이언트 생성
-        if api_key.exchange == "binance":
-            client = BinanceClient(
-                api_key=api_key.api_key,
-                api_secret=api_key.api_secret,
-                testnet=api_key.testnet
-            )
-        elif api_key.exchange == "okx":
-            client = OKXClient(
-                api_key=api_key.api_key,
-                api_secret=api_key.api_secret,
-                passphrase=api_key.passphrase,
-                testnet=api_key.testnet
-            )
-        else:
+        # 텔레그램 채팅 ID
+        if not account.chat_id:
             return
 
-        # 텔레그램 채팅 ID
-        chat_id = getattr(api_key.user, 'telegram_chat_id', None)
-        if not chat_id:
+        # 거래소 클라이언트 (복호화된 자격증명 캐시)
+        try:
+            client = client_cache.get(account.api_key)
+        except ValueError:
             return
 
         try:
             # 계정 정보 조회
-            balance_info = await client.get_account_balance()
-            positions = await client.get_positions()
+            balance_info, positions = await asyncio.gather(
+                account_state.get_balance(client),
+                account_state.get_positions(client)
+            )
 
-            total_balance = float(balance_info.get('totalWalletBalance', 0))
-            unrealized_profit = float(balance_info.get('totalUnrealizedProfit', 0))
+            total_balance = float(balance_info.get('total_balance', 0))
 
             # 활성 포지션
-            active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
+            active_positions = [
+                position_metrics(account.exchange, p, price_book.get_mark_price(account.mark_venue, p['symbol']))
+                for p in positions if p.get('position_amt')
+            ]
+            unrealized_profit = sum(p['unrealized_pnl'] for p in active_positions)
 
             # 수익/손실 포지션 카운트
-            winning_positions = sum(
-                1 for p in active_positions
-                if float(p.get('unRealizedProfit', 0)) > 0
-            )
+            winning_positions = sum(1 for p in active_positions if p['unrealized_pnl'] > 0)
             losing_positions = len(active_positions) - winning_positions
 
             # 총 노출
-            total_exposure = sum(
-                abs(float(p.get('notional', 0)))
-                for p in active_positions
-            )
+            total_exposure = sum(abs(p['notional']) for p in active_positions)
 
-            # VaR 추정
-            var_amount = total_exposure * 0.05
+            # VaR (최근 스캔의 일괄 계산 결과, 없으면 총 노출의 5%로 추정)
+            var_result = self._var_results.get(account.id)
+            var_amount = var_result['var_amount'] if var_result else total_exposure * 0.05
             var_percentage = (var_amount / total_balance * 100) if total_balance > 0 else 0
 
             # 최대 낙폭 (간단히 현재 손실로 추정)
-            max_drawdown_pct = abs(unrealized_profit / total_balance * 100) if unrealized_profit < 0 else 0
+            max_drawdown_pct = abs(unrealized_profit / total_balance * 100) if unrealized_profit < 0 and total_balance > 0 else 0
 
             # 일일 손익 (간단히 미실현 손익으로 추정)
             daily_pnl = unrealized_profit
             daily_pnl_pct = (daily_pnl / total_balance * 100) if total_balance > 0 else 0
 
             # 리포트 전송
-            self.telegram.send_daily_risk_report(
-                chat_id=chat_id,
+            background_queue.submit(
+                self.telegram.send_daily_risk_report,
+                chat_id=account.chat_id,
                 portfolio_value=total_balance,
                 total_exposure=total_exposure,
                 var_amount=var_amount,
@@ -544,13 +701,14 @@ class RiskMonitor:
                 winning_positions=winning_positions,
                 losing_positions=losing_positions,
                 daily_pnl=daily_pnl,
-                daily_pnl_pct=daily_pnl_pct
+                daily_pnl_pct=daily_pnl_pct,
+                uncovered_symbols=var_result.get('uncovered_symbols') if var_result else None
             )
 
-            logger.info(f"Daily report sent for account {api_key.id}")
+            logger.info(f"Daily report sent for account {account.id}")
 
         except Exception as e:
-            logger.error(f"Error generating daily report for {api_key.id}: {e}")
+            logger.error(f"Error generating daily report for {account.id}: {e}")
 
     def _should_send_alert(self, alert_key: str) -> bool:
         """알림 전송 여부 체크 (중복 방지)"""
@@ -567,6 +725,15 @@ class RiskMonitor:
         """알림 전송 기록"""
         self.last_alerts[alert_key] = datetime.utcnow()
 
+    def get_stats(self) -> Dict:
+        """모니터링 통계"""
+        return {
+            **self.stats,
+            "event_driven": self.event_driven,
+            "accounts": len(self._accounts),
+            "triggers": self._triggers.get_stats()
+        }
+
 
 # 전역 인스턴스
 _risk_monitor_instance: Optional[RiskMonitor] = None
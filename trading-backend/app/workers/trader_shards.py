@@ -0,0 +1,586 @@
+"""
+Sharded Auto-Trader Hosting
+
+Hosts AutoTraders in a pool of worker processes instead of the API event
+loop. Users are consistently hashed onto live workers; start/stop/status
+commands travel over Redis Pub/Sub (RedisPublisher / RedisSubscriber), and
+shards rebalance automatically when a worker joins, shuts down or stops
+sending heartbeats.
+
+Redis state:
+- autotrader:desired         SET of user IDs that should be auto-trading
+- autotrader:owner:{user_id} lease held by the worker running that user
+
+Run a worker (any host sharing the same Redis/DB):
+    python -m app.workers.trader_shards --worker-id trader-1
+"""
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis_client import RedisClient
+from app.core.redis_pubsub import RedisPublisher, RedisSubscriber, WorkerMessage
+from app.workers.auto_trader import AutoTrader, AutoTraderManager, auto_trader_manager
+
+logger = logging.getLogger(__name__)
+
+COMMAND_CHANNEL = "autotrader:commands"
+HEARTBEAT_CHANNEL = "autotrader:heartbeat"
+DESIRED_KEY = "autotrader:desired"
+OWNER_KEY_PREFIX = "autotrader:owner:"
+
+# Upper bound between attempts to start a trader that keeps failing
+MAX_START_BACKOFF = 300.0
+
+# KEYS[1]=lease key / ARGV: worker_id, ttl - extend only while this worker holds it
+_EXTEND_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# KEYS[1]=lease key / ARGV: worker_id - delete only while this worker holds it
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def _close_session(db):
+    """Close a sync (SQLite) or async (PostgreSQL) session"""
+    result = db.close()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class ConsistentHashRing:
+    """
+    Consistent hash ring with virtual nodes
+
+    Adding or removing a worker only moves the users that hashed to it.
+    """
+
+    def __init__(self, replicas: int = 100):
+        """
+        Args:
+            replicas: Virtual nodes per worker (higher = more even spread)
+        """
+        self.replicas = replicas
+        self._hashes: List[int] = []
+        self._ring: Dict[int, str] = {}
+        self._nodes = set()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int(hashlib.md5(key.encode()).hexdigest(), 16)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def add(self, node: str) -> bool:
+        """Add a worker; returns False if already present"""
+        if node in self._nodes:
+            return False
+
+        self._nodes.add(node)
+        for i in range(self.replicas):
+            h = self._hash(f"{node}#{i}")
+            self._ring[h] = node
+            bisect.insort(self._hashes, h)
+        return True
+
+    def remove(self, node: str) -> bool:
+        """Remove a worker; returns False if not present"""
+        if node not in self._nodes:
+            return False
+
+        self._nodes.discard(node)
+        for i in range(self.replicas):
+            h = self._hash(f"{node}#{i}")
+            self._ring.pop(h, None)
+            index = bisect.bisect_left(self._hashes, h)
+            if index < len(self._hashes) and self._hashes[index] == h:
+                self._hashes.pop(index)
+        return True
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Worker responsible for a key (None if the ring is empty)"""
+        if not self._hashes:
+            return None
+
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._ring[self._hashes[index]]
+
+
+class TraderShardWorker:
+    """
+    Worker process hosting the AutoTraders of its shard
+
+    Responsibilities:
+    - Track live workers from heartbeats and keep the hash ring in sync
+    - Start traders for desired users it owns, stop the ones it lost
+    - Hold a Redis lease per running user so two workers never trade the
+      same account during a rebalance (extended / released only by its holder)
+    - Retry traders that fail to start with exponential backoff, keeping
+      them in the desired set
+    - Report its traders in every heartbeat (used for status queries)
+    """
+
+    def __init__(
+        self,
+        worker_id: str,
+        heartbeat_interval: float = 5.0,
+        dead_after: float = 15.0
+    ):
+        """
+        Args:
+            worker_id: Unique worker ID
+            heartbeat_interval: Seconds between heartbeats / rebalance passes
+            dead_after: Seconds without heartbeat before a worker is considered dead
+        """
+        self.worker_id = worker_id
+        self.heartbeat_interval = heartbeat_interval
+        self.dead_after = dead_after
+        self.lease_seconds = int(dead_after * 2)
+
+        self.ring = ConsistentHashRing()
+        self.ring.add(worker_id)
+        self.last_seen: Dict[str, float] = {}
+
+        self.manager = AutoTraderManager()
+        self.publisher = RedisPublisher(worker_id)
+        self.subscriber: Optional[RedisSubscriber] = None
+        self.client = None
+        self._extend_lease = None
+        self._release_lease = None
+
+        # {user_id: (consecutive failures, next attempt time)}
+        self.start_failures: Dict[str, Tuple[int, float]] = {}
+
+        self._rebalance_lock = asyncio.Lock()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    async def start(self):
+        """Join the pool and start hosting traders"""
+        self.client = await RedisClient.get_client()
+        self._extend_lease = self.client.register_script(_EXTEND_LEASE_SCRIPT)
+        self._release_lease = self.client.register_script(_RELEASE_LEASE_SCRIPT)
+
+        self.subscriber = RedisSubscriber(
+            worker_id=self.worker_id,
+            channels=[COMMAND_CHANNEL, HEARTBEAT_CHANNEL],
+            message_handler=self._handle_message
+        )
+        await self.subscriber.start()
+
+        self._running = True
+        await self._send_heartbeat()
+        self._loop_task = asyncio.create_task(self._heartbeat_loop())
+
+        logger.info(f"Trader shard worker {self.worker_id} started")
+
+    async def stop(self):
+        """Leave the pool; other workers take over this shard"""
+        self._running = False
+
+        if self._loop_task:
+            self._loop_task.cancel()
+
+        for user_id in list(self.manager.traders.keys()):
+            await self._stop_local(user_id)
+
+        await self.publisher.publish(
+            channel=HEARTBEAT_CHANNEL,
+            message_type="shutdown",
+            payload={"worker_id": self.worker_id}
+        )
+
+        if self.subscriber:
+            await self.subscriber.stop()
+
+        logger.info(f"Trader shard worker {self.worker_id} stopped")
+
+    def owns(self, user_id: str) -> bool:
+        return self.ring.get_node(user_id) == self.worker_id
+
+    async def _handle_message(self, message: WorkerMessage):
+        """Handle pool membership and trader commands"""
+        if message.message_type == "heartbeat":
+            self.last_seen[message.worker_id] = time.time()
+            if self.ring.add(message.worker_id):
+                logger.info(f"Worker {message.worker_id} joined; rebalancing")
+                await self._rebalance()
+
+        elif message.message_type == "shutdown":
+            self.last_seen.pop(message.worker_id, None)
+            if self.ring.remove(message.worker_id):
+                logger.info(f"Worker {message.worker_id} left; rebalancing")
+                await self._rebalance()
+
+        elif message.message_type == "start":
+            user_id = message.payload["user_id"]
+            # An explicit start request retries immediately
+            self.start_failures.pop(user_id, None)
+            if self.owns(user_id):
+                await self._start_local(user_id)
+
+        elif message.message_type == "stop":
+            user_id = message.payload["user_id"]
+            if user_id in self.manager.traders:
+                await self._stop_local(user_id)
+
+        elif message.message_type == "status":
+            # Status requests are answered with an immediate heartbeat
+            await self._send_heartbeat()
+
+    async def _start_local(self, user_id: str):
+        """Start a trader here if this worker can take the user's lease"""
+        if user_id in self.manager.traders:
+            return
+
+        failures, retry_at = self.start_failures.get(user_id, (0, 0.0))
+        if time.time() < retry_at:
+            return
+
+        acquired = await self.client.set(
+            f"{OWNER_KEY_PREFIX}{user_id}", self.worker_id,
+            nx=True, ex=self.lease_seconds
+        )
+        if not acquired:
+            owner = _decode(await self.client.get(f"{OWNER_KEY_PREFIX}{user_id}"))
+            if owner != self.worker_id:
+                # Previous owner still holds the lease; retried on next pass
+                return
+
+        from app.database.base import AsyncSessionLocal
+
+        db = AsyncSessionLocal()
+        try:
+            await self.manager.start_trader(user_id=user_id, db=db)
+        except Exception as e:
+            # Keep the user desired (failures are usually transient: DB, exchange, Redis)
+            # and retry on a later rebalance pass
+            failures += 1
+            delay = min(self.heartbeat_interval * 2 ** (failures - 1), MAX_START_BACKOFF)
+            self.start_failures[user_id] = (failures, time.time() + delay)
+            logger.error(
+                f"Worker {self.worker_id} could not start trader {user_id} "
+                f"(attempt {failures}): {e}. Retrying in {delay:.0f}s"
+            )
+            await self._release_lease(keys=[f"{OWNER_KEY_PREFIX}{user_id}"], args=[self.worker_id])
+            await _close_session(db)
+            return
+
+        self.start_failures.pop(user_id, None)
+
+    async def _stop_local(self, user_id: str):
+        """Stop a local trader and release its lease"""
+        trader = self.manager.traders.get(user_id)
+        try:
+            await self.manager.stop_trader(user_id)
+        finally:
+            if trader is not None:
+                await _close_session(trader.db)
+            await self._release_lease(keys=[f"{OWNER_KEY_PREFIX}{user_id}"], args=[self.worker_id])
+
+    async def _rebalance(self):
+        """Converge local traders to (desired users) ∩ (users this worker owns)"""
+        async with self._rebalance_lock:
+            desired = {_decode(uid) for uid in await self.client.smembers(DESIRED_KEY)}
+
+            for user_id in list(self.start_failures):
+                if user_id not in desired or not self.owns(user_id):
+                    del self.start_failures[user_id]
+
+            for user_id in list(self.manager.traders.keys()):
+                if user_id not in desired or not self.owns(user_id):
+                    await self._stop_local(user_id)
+
+            for user_id in desired:
+                if self.owns(user_id) and user_id not in self.manager.traders:
+                    await self._start_local(user_id)
+
+    async def _send_heartbeat(self):
+        await self.publisher.publish(
+            channel=HEARTBEAT_CHANNEL,
+            message_type="heartbeat",
+            payload={
+                "worker_id": self.worker_id,
+                "traders": self.manager.list_active_traders()
+            }
+        )
+
+    async def _refresh_leases(self):
+        if not self.manager.traders:
+            return
+
+        user_ids = list(self.manager.traders)
+        pipe = self.client.pipeline()
+        for user_id in user_ids:
+            await self._extend_lease(
+                keys=[f"{OWNER_KEY_PREFIX}{user_id}"],
+                args=[self.worker_id, self.lease_seconds],
+                client=pipe
+            )
+        extended = await pipe.execute()
+
+        for user_id, ok in zip(user_ids, extended):
+            if not ok:
+                # Lease expired and another worker may have taken the user over
+                logger.warning(f"Worker {self.worker_id} lost the lease for {user_id}; stopping its trader")
+                await self._stop_local(user_id)
+
+    async def _heartbeat_loop(self):
+        """Heartbeat, lease refresh, dead-worker detection and periodic rebalance"""
+        while self._running:
+            try:
+                await self._send_heartbeat()
+                await self._refresh_leases()
+
+                now = time.time()
+                dead = [
+                    worker_id for worker_id, seen in self.last_seen.items()
+                    if now - seen > self.dead_after
+                ]
+                for worker_id in dead:
+                    del self.last_seen[worker_id]
+                    self.ring.remove(worker_id)
+                    logger.warning(f"Worker {worker_id} appears to be dead; taking over its shard")
+
+                # Also picks up missed commands and expired leases
+                await self._rebalance()
+
+                await asyncio.sleep(self.heartbeat_interval)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Trader shard loop error: {e}")
+                await asyncio.sleep(1)
+
+
+def _run_worker_process(worker_id: str):
+    """Process entry point for locally spawned workers"""
+    asyncio.run(run_worker(worker_id))
+
+
+async def run_worker(worker_id: str):
+    """Run a shard worker until SIGINT/SIGTERM"""
+    worker = TraderShardWorker(worker_id)
+    stop_event = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows
+
+    await worker.start()
+    try:
+        await stop_event.wait()
+    finally:
+        await worker.stop()
+        await RedisClient.close()
+
+
+class ShardedAutoTraderManager:
+    """
+    API-side facade with the same interface as AutoTraderManager
+
+    start/stop update the desired set and publish a command; the owning
+    worker acts on it. Status is served from the trader lists carried in
+    worker heartbeats, so no request waits on a worker round-trip.
+    """
+
+    def __init__(self, local_workers: int = 0, dead_after: float = 15.0):
+        """
+        Args:
+            local_workers: Worker processes to spawn on this host (0 = external workers only)
+            dead_after: Seconds without heartbeat before a worker's traders are dropped from status
+        """
+        self.local_workers = local_workers
+        self.dead_after = dead_after
+        self.worker_id = f"api-{socket.gethostname()}-{os.getpid()}"
+
+        self.publisher = RedisPublisher(self.worker_id)
+        self.subscriber: Optional[RedisSubscriber] = None
+        self.client = None
+
+        # {worker_id: (last_seen, [trader dicts])}
+        self.worker_traders: Dict[str, tuple] = {}
+        self.processes: Dict[str, multiprocessing.Process] = {}
+        self._supervisor_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start status mirroring and spawn local worker processes"""
+        self.client = await RedisClient.get_client()
+
+        self.subscriber = RedisSubscriber(
+            worker_id=self.worker_id,
+            channels=[HEARTBEAT_CHANNEL],
+            message_handler=self._handle_message
+        )
+        await self.subscriber.start()
+
+        for i in range(self.local_workers):
+            self._spawn(f"trader-{socket.gethostname()}-{i}")
+
+        self._supervisor_task = asyncio.create_task(self._supervise())
+
+        await self.publisher.publish(COMMAND_CHANNEL, "status", {})
+
+        logger.info(f"Sharded auto-trader manager started ({self.local_workers} local workers)")
+
+    async def stop(self):
+        """Stop local workers (their shards move to remaining workers)"""
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=10)
+        self.processes.clear()
+
+        if self.subscriber:
+            await self.subscriber.stop()
+
+    def _spawn(self, worker_id: str):
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(
+            target=_run_worker_process,
+            args=(worker_id,),
+            name=worker_id,
+            daemon=True
+        )
+        process.start()
+        self.processes[worker_id] = process
+
+    async def _supervise(self):
+        """Respawn dead local workers and expire silent ones from status"""
+        while True:
+            try:
+                await asyncio.sleep(5)
+
+                for worker_id, process in list(self.processes.items()):
+                    if not process.is_alive():
+                        logger.warning(f"Local trader worker {worker_id} died (exit {process.exitcode}); respawning")
+                        self._spawn(worker_id)
+
+                now = time.time()
+                for worker_id, (seen, _) in list(self.worker_traders.items()):
+                    if now - seen > self.dead_after:
+                        del self.worker_traders[worker_id]
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Trader worker supervisor error: {e}")
+
+    async def _handle_message(self, message: WorkerMessage):
+        if message.message_type == "heartbeat":
+            self.worker_traders[message.worker_id] = (
+                time.time(), message.payload.get("traders", [])
+            )
+        elif message.message_type == "shutdown":
+            self.worker_traders.pop(message.worker_id, None)
+
+    async def start_trader(self, user_id: str, db):
+        """Validate the user's config, mark desired and notify the pool"""
+        # Raises ValueError for missing user / strategy (same as in-process mode)
+        AutoTrader(user_id=user_id, db=db)
+
+        await self.client.sadd(DESIRED_KEY, user_id)
+        await self.publisher.publish(COMMAND_CHANNEL, "start", {"user_id": user_id})
+
+        logger.info(f"Auto-trader start requested for user {user_id}")
+
+    async def stop_trader(self, user_id: str):
+        """Clear desired state and notify the pool"""
+        await self.client.srem(DESIRED_KEY, user_id)
+        await self.publisher.publish(COMMAND_CHANNEL, "stop", {"user_id": user_id})
+
+        logger.info(f"Auto-trader stop requested for user {user_id}")
+
+    def get_trader_status(self, user_id: str) -> Dict:
+        """Get status of a trader from the latest worker heartbeats"""
+        for worker_id, (_, traders) in self.worker_traders.items():
+            for trader in traders:
+                if trader['userId'] == user_id:
+                    return {
+                        'isRunning': True,
+                        'userId': user_id,
+                        'strategyName': trader['strategyName'],
+                        'symbols': trader['symbols'],
+                        'worker': worker_id,
+                        'message': 'Trader running'
+                    }
+
+        return {
+            'isRunning': False,
+            'message': 'Trader not running'
+        }
+
+    def list_active_traders(self) -> List[Dict]:
+        """List all active traders across workers"""
+        return [
+            {**trader, 'worker': worker_id}
+            for worker_id, (_, traders) in self.worker_traders.items()
+            for trader in traders
+        ]
+
+
+_sharded_manager: Optional[ShardedAutoTraderManager] = None
+
+
+def get_auto_trader_manager():
+    """
+    Auto-trader manager for API handlers
+
+    Returns the sharded facade when AUTO_TRADER_SHARDING is enabled,
+    otherwise the in-process AutoTraderManager.
+    """
+    global _sharded_manager
+
+    if not settings.AUTO_TRADER_SHARDING:
+        return auto_trader_manager
+
+    if _sharded_manager is None:
+        _sharded_manager = ShardedAutoTraderManager(local_workers=settings.AUTO_TRADER_WORKERS)
+    return _sharded_manager
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Auto-trader shard worker")
+    parser.add_argument(
+        "--worker-id",
+        default=f"trader-{socket.gethostname()}-{os.getpid()}",
+        help="Unique worker ID"
+    )
+    args = parser.parse_args()
+
+    from app.core.logging_config import setup_logging
+    setup_logging(log_level=settings.LOG_LEVEL)
+
+    asyncio.run(run_worker(args.worker_id))
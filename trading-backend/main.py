@@ -155,6 +155,15 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"WARNING: Redis initialization failed: {e}. Caching will be disabled.")
 
+    # Start background queue (notifications / audit off the order path)
+    from app.core.background_queue import background_queue
+    await background_queue.start()
+
+    # Start webhook ingestion queue (dedup + per-account ordering)
+    from app.services.webhook_queue import webhook_queue
+    from app.api.v1.webhook import execute_webhook_signal
+    await webhook_queue.start(execute_webhook_signal)
+
     # Start risk monitoring service
     logger.info("Starting risk monitoring service...")
     from app.workers.risk_monitor import start_risk_monitor
@@ -166,6 +175,28 @@ async def startup_event():
     await websocket_pool.start()
     logger.info("WebSocket connection pool started")
 
+    # Start account state cache (private-stream fed balances / positions)
+    from app.services.account_state import account_state
+    await account_state.start()
+
+    # Start websocket-fed price book
+    if settings.PRICE_BOOK_ENABLED:
+        logger.info("Starting price book feed...")
+        from app.services.price_book import price_feed
+        await price_feed.start()
+
+    # Start position PnL stream (/ws/positions deltas)
+    from app.services.position_stream import position_stream
+    await position_stream.start()
+
+    # Start L2 order book mirrors for supported symbols
+    if settings.ORDER_BOOK_ENABLED:
+        logger.info("Starting order book mirrors...")
+        from app.services.order_book import order_book_manager
+        from app.core.symbols import symbol_config
+        for symbol in symbol_config.BINANCE_FORMAT.values():
+            order_book_manager.subscribe(symbol)
+
     # Initialize WebSocket coordinator (worker communication)
     logger.info("Initializing WebSocket coordinator...")
     from app.services.websocket_manager import websocket_manager
@@ -177,6 +208,15 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"WARNING: WebSocket coordinator initialization failed: {e}. Worker coordination will be disabled.")
 
+    # Start sharded auto-trader hosting (worker processes)
+    if settings.AUTO_TRADER_SHARDING:
+        logger.info("Starting sharded auto-trader manager...")
+        from app.workers.trader_shards import get_auto_trader_manager
+        try:
+            await get_auto_trader_manager().start()
+        except Exception as e:
+            logger.warning(f"WARNING: Sharded auto-trader manager failed to start: {e}")
+
     # TODO: Initialize market monitor for selected symbols
     # from app.workers.market_monitor import MarketMonitor
     # market_monitor = MarketMonitor(symbols=["BTCUSDT", "ETHUSDT"])
@@ -201,6 +241,27 @@ async def shutdown_event():
     from app.workers.risk_monitor import stop_risk_monitor
     await stop_risk_monitor()
 
+    # Stop local auto-trader worker processes
+    if settings.AUTO_TRADER_SHARDING:
+        from app.workers.trader_shards import get_auto_trader_manager
+        await get_auto_trader_manager().stop()
+
+    # Stop position PnL stream
+    from app.services.position_stream import position_stream
+    await position_stream.stop()
+
+    # Close account private streams
+    from app.services.account_state import account_state
+    await account_state.stop()
+
+    # Stop price book feed
+    from app.services.price_book import price_feed
+    await price_feed.stop()
+
+    # Stop order book mirrors
+    from app.services.order_book import order_book_manager
+    await order_book_manager.stop()
+
     # Stop WebSocket coordinator and connection pool
     from app.services.websocket_manager import websocket_manager
     from app.services.websocket_pool import websocket_pool
@@ -215,11 +276,23 @@ async def shutdown_event():
     logger.info("Closing WebSocket connections...")
     await websocket_manager.close()
 
+    # Stop webhook ingestion (unacked signals are reclaimed by the next owner)
+    from app.services.webhook_queue import webhook_queue
+    await webhook_queue.stop()
+
+    # Drain pending notifications / audit writes
+    from app.core.background_queue import background_queue
+    await background_queue.stop()
+
     # Close Redis connection
     from app.core.redis_client import RedisClient
     await RedisClient.close()
     logger.info("Redis client closed")
 
+    # Close exchange HTTP connection pools
+    from app.services.http_transport import close_all as close_exchange_http
+    await close_exchange_http()
+
     # TODO: Stop market monitor
     # await market_monitor.stop()
 
@@ -0,0 +1,40 @@
+"""
+테스트 공통 설정
+
+앱 설정은 import 시점에 로드되므로, 앱 모듈을 불러오기 전에 임시 SQLite DB와
+인메모리 큐 백엔드를 환경변수로 지정합니다 (개발 DB / Redis를 건드리지 않음).
+"""
+
+import os
+import sys
+import tempfile
+
+from cryptography.fernet import Fernet
+
+_TEST_DIR = tempfile.mkdtemp(prefix="tradingbot-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}"
+os.environ["DEBUG"] = "false"
+os.environ["WEBHOOK_QUEUE_BACKEND"] = "memory"
+os.environ.setdefault("BINANCE_API_KEY", "test")
+os.environ.setdefault("BINANCE_API_SECRET", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("WEBHOOK_SECRET", "test-webhook-secret-0123456789abcdef")
+os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app.database.base import Base, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """테스트 세션용 스키마 생성"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
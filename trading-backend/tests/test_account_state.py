@@ -0,0 +1,68 @@
+"""
+계정 상태 캐시 테스트
+
+Binance ACCOUNT_UPDATE로 수량이 바뀐 포지션의 청산가를
+디바운스된 positionRisk 조회로 다시 채우는지,
+미실현 손익을 계정 환경(테스트넷)의 마크 가격으로 계산하는지 확인합니다.
+"""
+
+import asyncio
+
+from app.services.account_state import AccountState, AccountStateManager
+from app.services.price_book import price_book
+
+
+class FakeBinanceClient:
+    api_key = "fake-key"
+    testnet = True
+
+    def __init__(self):
+        self.position_calls = []
+
+    async def get_positions_async(self, symbol=None):
+        self.position_calls.append(symbol)
+        return [{
+            "symbol": symbol,
+            "position_amt": 0.3,
+            "entry_price": 100.0,
+            "unrealized_pnl": 0.0,
+            "leverage": 10,
+            "side": "LONG",
+            "position_side": "BOTH",
+            "liquidation_price": 91.5
+        }]
+
+
+def account_update(amount):
+    return {"e": "ACCOUNT_UPDATE", "a": {"P": [{"s": "BTCUSDT", "ps": "BOTH", "pa": str(amount), "ep": "100", "up": "0"}]}}
+
+
+def test_amount_change_refreshes_liquidation_price_once():
+    manager = AccountStateManager()
+    client = FakeBinanceClient()
+    state = AccountState(exchange="binance", client=client)
+
+    async def run():
+        manager.apply_binance_event(state, account_update(0.1))
+        manager.apply_binance_event(state, account_update(0.3))
+        assert state.positions[("BTCUSDT", "BOTH")]["liquidation_price"] is None
+        await asyncio.gather(*state.position_refresh.values())
+
+    asyncio.run(run())
+
+    assert client.position_calls == ["BTCUSDT"]
+    assert state.positions[("BTCUSDT", "BOTH")]["liquidation_price"] == 91.5
+    assert not state.position_refresh
+
+
+def test_live_pnl_uses_the_accounts_mark_price():
+    manager = AccountStateManager()
+    state = AccountState(exchange="binance", client=FakeBinanceClient())
+    position = {"symbol": "SOLUSDT", "position_amt": 2.0, "entry_price": 100.0, "unrealized_pnl": 4.0}
+
+    # 메인넷 마크 가격은 테스트넷 계정에 쓰지 않고 거래소 값을 유지
+    price_book.update_mark("binance", "SOLUSDT", 150.0)
+    assert manager._with_live_pnl(state, position)["unrealized_pnl"] == 4.0
+
+    price_book.update_mark("binance-testnet", "SOLUSDT", 103.0)
+    assert manager._with_live_pnl(state, position)["unrealized_pnl"] == 6.0
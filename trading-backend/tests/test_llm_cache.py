@@ -0,0 +1,116 @@
+"""
+LLM 응답 캐시 테스트
+
+로컬 스텁 LLM 서버(OpenAI 호환)로 앙상블을 호출해
+캔들당 한 번만 LLM을 호출하는지 확인합니다.
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from app.ai.ensemble import TripleAIEnsemble
+from app.ai.llm_cache import llm_cache
+from app.core.config import settings
+
+ANALYSIS = {"direction": "LONG", "probability": 0.8, "confidence": 0.75, "reasoning": "stub"}
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        StubLLMHandler.requests.append(self.path)
+
+        body = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4-turbo-preview",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(ANALYSIS)}
+            }]
+        }
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", f"{base}/v1")
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    StubLLMHandler.requests = []
+    llm_cache.clear()
+
+    yield StubLLMHandler.requests
+
+    server.shutdown()
+    llm_cache.clear()
+
+
+def candles(bars: int) -> pd.DataFrame:
+    """마지막 행이 진행 중인 1시간 캔들"""
+    timestamps = pd.date_range(end=pd.Timestamp.now("UTC").floor("h").tz_localize(None), periods=bars, freq="h")
+    closes = [100.0 + i * 0.1 for i in range(bars)]
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": closes,
+        "high": [c + 1 for c in closes],
+        "low": [c - 1 for c in closes],
+        "close": closes,
+        "volume": [1000.0] * bars
+    })
+
+
+def test_one_llm_call_per_bar_regardless_of_price(stub_llm):
+    ensemble = TripleAIEnsemble()
+    data = candles(60)
+
+    async def run():
+        first = await ensemble._gpt4_analysis("BTCUSDT", data, 105.0)
+        # 같은 캔들 안에서 가격이 1% 움직여도 같은 분석을 공유
+        second = await ensemble._gpt4_analysis("BTCUSDT", data, 106.05)
+        # 동시 요청은 하나의 호출을 공유
+        concurrent = await asyncio.gather(*(
+            ensemble._gpt4_analysis("ETHUSDT", data, price) for price in (105.0, 104.0, 106.0)
+        ))
+        return first, second, concurrent
+
+    first, second, concurrent = asyncio.run(run())
+
+    assert first.reasoning == "GPT-4: stub" and second is first
+    assert all(result.reasoning == "GPT-4: stub" for result in concurrent)
+    assert stub_llm == ["/v1/chat/completions"] * 2
+
+
+def test_new_bar_calls_llm_again(stub_llm):
+    ensemble = TripleAIEnsemble()
+    data = candles(61)
+
+    async def run():
+        await ensemble._gpt4_analysis("BTCUSDT", data.iloc[:-1], 105.0)
+        await ensemble._gpt4_analysis("BTCUSDT", data, 105.0)
+        await ensemble._gpt4_analysis("ETHUSDT", data, 105.0)
+
+    asyncio.run(run())
+
+    assert stub_llm == ["/v1/chat/completions"] * 3
@@ -0,0 +1,59 @@
+"""
+시장 데이터 응답 캐시 테스트
+
+캐시가 만료된 뒤 동시에 들어온 요청에는 이전 값을 바로 돌려주고,
+갱신은 백그라운드에서 한 번만 수행하는지 확인합니다 (stale-while-revalidate).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.api.v1 import market
+from app.core.cache import cache_manager
+
+
+@pytest.fixture
+def price_calls(monkeypatch):
+    calls = []
+    gate = asyncio.Event()
+
+    async def get_price_async(exchange, symbol):
+        calls.append(symbol)
+        await gate.wait()
+        return 100.0 + len(calls)
+
+    monkeypatch.setattr(market.price_book, "get_price_async", get_price_async)
+    cache_manager.market_data_cache.clear()
+    yield calls, gate
+    cache_manager.market_data_cache.clear()
+
+
+def test_expired_price_is_served_while_one_refresh_runs(price_calls):
+    calls, gate = price_calls
+
+    async def run():
+        gate.set()
+        first = await market._fetch_single_price("BTC", "binance")
+
+        for entry in cache_manager.market_data_cache.cache.values():
+            entry.expires_at = time.time() - 1
+
+        gate.clear()
+        stale = await asyncio.gather(*(market._fetch_single_price("BTC", "binance") for _ in range(5)))
+        in_flight = len(calls)
+
+        gate.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        refreshed = await market._fetch_single_price("BTC", "binance")
+        return first, stale, in_flight, refreshed
+
+    first, stale, in_flight, refreshed = asyncio.run(run())
+
+    assert first["price"] == 101.0
+    assert all(result["price"] == 101.0 for result in stale)
+    assert in_flight == 2
+    assert refreshed["price"] == 102.0
+    assert calls == ["BTCUSDT", "BTCUSDT"]
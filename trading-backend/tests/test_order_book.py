@@ -0,0 +1,84 @@
+"""
+로컬 호가창 미러 테스트
+
+녹화된 스냅샷 + diff 이벤트를 리플레이 피드로 재생해 시퀀스 갭에서
+재동기화하고, 상위 N호가와 VWAP가 기대값과 일치하는지 확인합니다.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services import order_book as order_book_module
+from app.services.order_book import LocalOrderBook, OrderBookSync, binance_depth_source, replay_source
+
+SNAPSHOTS = [
+    {"lastUpdateId": 100, "bids": [["99", "1"], ["98", "2"]], "asks": [["101", "1"], ["102", "2"]]},
+    {"lastUpdateId": 115, "bids": [["99", "2"], ["97", "1"]], "asks": [["102", "1"], ["103", "4"]]},
+]
+
+EVENTS = [
+    # 스냅샷 이전 이벤트 (폐기)
+    {"U": 90, "u": 95, "pu": 89, "b": [["99", "9"]], "a": []},
+    {"U": 98, "u": 102, "pu": 95, "b": [["99", "1.5"]], "a": []},
+    {"U": 103, "u": 105, "pu": 102, "b": [], "a": [["101", "0"], ["103", "3"]]},
+    # 106~109 누락 → 재동기화
+    {"U": 110, "u": 112, "pu": 109, "b": [["50", "1"]], "a": []},
+    {"U": 113, "u": 116, "pu": 112, "b": [["98", "0.5"]], "a": [["102", "0.5"]]},
+    {"U": 117, "u": 118, "pu": 116, "b": [], "a": [["104", "5"]]},
+]
+
+
+def test_replay_resyncs_on_gap(tmp_path):
+    feed = tmp_path / "depth.jsonl"
+    feed.write_text("\n".join(json.dumps(event) for event in EVENTS) + "\n")
+
+    snapshots = iter(SNAPSHOTS)
+
+    async def fetch_snapshot():
+        return next(snapshots)
+
+    book = LocalOrderBook("BTCUSDT")
+    sync = OrderBookSync(book, fetch_snapshot, replay_source(str(feed)))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(sync.run())
+
+    assert sync.resyncs == 1
+    assert book.last_update_id == 118
+    assert book.top(2) == {"bids": [(99.0, 2.0), (98.0, 0.5)], "asks": [(102.0, 0.5), (103.0, 4.0)]}
+    assert book.vwap("BUY", 2.5) == pytest.approx(102.8)
+    assert book.vwap("SELL", 2.5) == pytest.approx(98.8)
+    assert book.vwap("BUY", 100) is None
+
+
+class FakePool:
+    def __init__(self):
+        self.handlers = {}
+
+    async def subscribe(self, exchange, stream, handler):
+        self.handlers[(exchange, stream)] = handler
+        return object()
+
+    async def unsubscribe(self, exchange, stream):
+        del self.handlers[(exchange, stream)]
+
+
+def test_depth_source_uses_shared_pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(order_book_module, "websocket_pool", pool)
+
+    async def run():
+        events = binance_depth_source("BTCUSDT")()
+        first = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+
+        handler = pool.handlers[("binance_futures", "btcusdt@depth@100ms")]
+        await handler(EVENTS[1])
+        received = await first
+        await events.aclose()
+        return received
+
+    assert asyncio.run(run()) == EVENTS[1]
+    assert pool.handlers == {}
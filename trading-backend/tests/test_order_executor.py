@@ -0,0 +1,75 @@
+"""
+주문 실행기 테스트
+
+호가가 얇을 때 자동 산정 수량을 LOT_SIZE 단위로 내림하고,
+최소 수량에 못 미치면 주문 없이 시그널을 건너뛰는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import order_executor as order_executor_module
+from app.services.order_executor import Exchange, order_executor
+
+
+class ThinBook:
+    def __init__(self, liquidity):
+        self.liquidity = liquidity
+
+    def max_quantity_within_slippage(self, side, max_slippage_bps):
+        return self.liquidity
+
+
+class FakeBinanceClient:
+    def __init__(self):
+        self.orders = []
+
+    async def get_lot_size_async(self, symbol):
+        return 0.001, 0.002
+
+    async def get_current_price_async(self, symbol):
+        return 50000.0
+
+    async def create_market_order_async(self, symbol, side, quantity):
+        self.orders.append((symbol, side, quantity))
+        return {"symbol": symbol, "quantity": quantity}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeBinanceClient()
+
+    async def get_client(account_id, exchange):
+        return fake
+
+    async def get_balance(client):
+        return {"available_balance": 10000.0, "total_balance": 10000.0}
+
+    monkeypatch.setattr(order_executor, "get_client", get_client)
+    monkeypatch.setattr(order_executor_module.account_state, "get_balance", get_balance)
+    monkeypatch.setattr(order_executor_module.price_book, "get_price", lambda exchange, symbol: 50000.0)
+    monkeypatch.setattr(order_executor_module.order_book_manager, "estimate_slippage", lambda *args: None)
+    return fake
+
+
+def execute(liquidity, monkeypatch):
+    monkeypatch.setattr(order_executor_module.order_book_manager, "get", lambda symbol: ThinBook(liquidity))
+    return asyncio.run(order_executor.execute_signal_async(
+        "acct", Exchange.BINANCE, {"action": "long", "symbol": "BTCUSDT"}
+    ))
+
+
+def test_thin_book_rounds_down_to_step(client, monkeypatch):
+    result = execute(0.00789, monkeypatch)
+
+    assert result["success"]
+    assert client.orders == [("BTCUSDT", "BUY", 0.007)]
+
+
+def test_liquidity_below_min_qty_skips_signal(client, monkeypatch):
+    result = execute(0.0019, monkeypatch)
+
+    assert not result["success"]
+    assert result["skipped"] == "insufficient_liquidity"
+    assert client.orders == []
@@ -0,0 +1,90 @@
+"""
+포지션 스트림 테스트
+
+테스트넷 계정 포지션이 테스트넷 마크 가격으로만 재계산되는지,
+연결 종료 시 감시 상태가 바로 정리되는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import position_stream as position_stream_module
+from app.services.account_state import AccountState, account_key
+from app.services.binance_client import BinanceClient
+from app.services.position_stream import PositionStream
+from app.services.price_book import price_book
+
+POSITION = {
+    "symbol": "BTCUSDT",
+    "side": "LONG",
+    "position_side": "BOTH",
+    "position_amt": 0.5,
+    "entry_price": 100.0,
+    "unrealized_pnl": 0.0,
+    "leverage": 10,
+    "liquidation_price": 80.0
+}
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    client = BinanceClient(api_key="stream-key", api_secret="secret", testnet=True)
+    state = AccountState(
+        exchange="binance",
+        client=client,
+        balance={"total_balance": 1000.0},
+        positions={("BTCUSDT", "BOTH"): POSITION}
+    )
+    sent = []
+
+    async def get_positions(client):
+        return list(state.positions.values())
+
+    async def broadcast(message, topic):
+        sent.append(message)
+
+    monkeypatch.setattr(position_stream_module.account_state, "get_positions", get_positions)
+    monkeypatch.setattr(
+        position_stream_module.account_state,
+        "peek",
+        lambda key: state if key == account_key(client) else None
+    )
+    monkeypatch.setattr(position_stream_module.websocket_manager, "broadcast", broadcast)
+    monkeypatch.setitem(position_stream_module.websocket_manager.topic_channels, "positions_u1", {"spec": object()})
+
+    price_book.update_mark("binance-testnet", "BTCUSDT", 100.0)
+    stream = PositionStream()
+    asyncio.run(stream.watch("u1", [("acct", client)]))
+    sent.clear()
+    return stream, sent
+
+
+def test_testnet_positions_follow_testnet_marks(stream):
+    stream, sent = stream
+
+    price_book.update_mark("binance", "BTCUSDT", 120.0)
+    stream._on_mark("binance", "BTCUSDT")
+    asyncio.run(stream._flush())
+    assert sent == []
+
+    price_book.update_mark("binance-testnet", "BTCUSDT", 104.0)
+    stream._on_mark("binance-testnet", "BTCUSDT")
+    asyncio.run(stream._flush())
+
+    [update] = sent[0]["updates"]
+    assert update["mark_price"] == 104.0
+    assert update["unrealized_pnl"] == 2.0
+
+
+def test_unwatch_releases_indexes_once_no_subscriber_remains(stream, monkeypatch):
+    stream, _ = stream
+    assert stream._symbol_users == {("binance-testnet", "BTCUSDT"): {"u1"}}
+
+    # 같은 사용자의 다른 연결이 남아 있으면 유지
+    stream.unwatch("u1")
+    assert stream.get_stats()["users"] == 1
+
+    monkeypatch.delitem(position_stream_module.websocket_manager.topic_channels, "positions_u1")
+    stream.unwatch("u1")
+    assert stream.get_stats() == {**stream.stats, "users": 0, "accounts": 0, "symbols": 0}
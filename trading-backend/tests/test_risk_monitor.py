@@ -0,0 +1,98 @@
+"""
+리스크 모니터 청산 근접 알림 테스트
+
+가격이 경고 임계값 주변에서 흔들려도 텔레그램 알림이 반복되지 않는지,
+테스트넷 계정이 테스트넷 마크 가격으로 평가되는지 확인합니다.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.api_key import ApiKey
+from app.services.price_book import price_book
+from app.workers import risk_monitor as risk_monitor_module
+from app.workers.risk_monitor import MonitoredAccount, RiskMonitor
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(risk_monitor_module, "monotonic_time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        risk_monitor_module.background_queue,
+        "submit",
+        lambda func, **kwargs: calls.append(kwargs) or True
+    )
+    return calls
+
+
+# 롱, 청산가 85 → 경고(15%) 100, 청산 임박(5%) 약 89.47
+POSITION = {
+    "symbol": "BTCUSDT",
+    "side": "LONG",
+    "position_side": "BOTH",
+    "position_amt": 1.0,
+    "entry_price": 100.0,
+    "liquidation_price": 85.0,
+    "leverage": 10
+}
+
+
+@pytest.fixture
+def trigger():
+    account = MonitoredAccount(api_key=ApiKey(id="key-1", exchange="binance"), chat_id="1")
+    return RiskMonitor()._build_trigger(account, POSITION)
+
+
+def test_oscillation_across_warning_threshold_alerts_once(clock, sent, trigger):
+    monitor = RiskMonitor()
+
+    for _ in range(20):
+        for price in (99.9, 100.1, 102.0):
+            monitor._evaluate_liquidation(trigger, price)
+            clock[0] += 1
+
+    assert len(sent) == 1
+    assert sent[0]["current_price"] == 99.9
+
+
+def test_first_critical_bypasses_cooldown_then_repeats_on_interval(clock, sent, trigger):
+    monitor = RiskMonitor()
+
+    monitor._evaluate_liquidation(trigger, 99.0)
+    clock[0] += 1
+    monitor._evaluate_liquidation(trigger, 89.0)
+    assert len(sent) == 2
+
+    # 청산 임박 ↔ 위험 사이를 오가도 반복 간격 전에는 다시 보내지 않음
+    for price in (90.5, 89.0) * 10:
+        clock[0] += 1
+        monitor._evaluate_liquidation(trigger, price)
+    assert len(sent) == 2
+
+    clock[0] += monitor.config.CRITICAL_REPEAT_SECONDS
+    monitor._evaluate_liquidation(trigger, 89.0)
+    assert len(sent) == 3
+
+
+def test_testnet_account_follows_testnet_mark_price(clock, sent):
+    monitor = RiskMonitor()
+    account = MonitoredAccount(api_key=ApiKey(id="key-2", exchange="binance", testnet=True), chat_id="1")
+    key = ("binance", "testnet-key", True)
+    monitor._index_account(key, account, [POSITION])
+
+    # 메인넷 마크 가격이 경고 구간이어도 테스트넷 계정에는 영향 없음
+    price_book.update_mark("binance", "BTCUSDT", 99.0)
+    monitor._on_mark("binance", "BTCUSDT")
+    assert sent == []
+
+    price_book.update_mark("binance-testnet", "BTCUSDT", 99.0)
+    monitor._on_mark("binance-testnet", "BTCUSDT")
+    assert len(sent) == 1 and sent[0]["current_price"] == 99.0
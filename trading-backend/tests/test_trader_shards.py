@@ -0,0 +1,76 @@
+"""
+트레이더 샤드 워커 테스트
+
+거래소 클라이언트 초기화에 실패한 트레이더가 실행 중으로 남지 않고,
+리스를 반납한 뒤 백오프로 재시도되는지 확인합니다.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.workers import auto_trader as auto_trader_module
+from app.workers.auto_trader import AutoTrader
+from app.workers.trader_shards import OWNER_KEY_PREFIX, TraderShardWorker
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+
+class FailingTrader(AutoTrader):
+    """DB 조회 없이 만들고, API 키가 없어 초기화에 실패하는 트레이더"""
+
+    def __init__(self, user_id, db):
+        self.user_id = user_id
+        self.db = db
+        self.is_running = False
+        self.binance_client = None
+        self.scheduler = None
+        self._stopped = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._cycle_lock = asyncio.Lock()
+        self.active_config = SimpleNamespace(selectedSymbols=["BTCUSDT"])
+
+    async def initialize_binance(self):
+        raise ValueError(f"No active Binance API key found for user {self.user_id}")
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(auto_trader_module, "AutoTrader", FailingTrader)
+
+    worker = TraderShardWorker("trader-test")
+    worker.client = FakeRedis()
+
+    async def release_lease(keys, args):
+        if worker.client.values.get(keys[0]) == args[0]:
+            del worker.client.values[keys[0]]
+
+    worker._release_lease = release_lease
+    return worker
+
+
+def test_failed_initialization_releases_lease_and_backs_off(worker):
+    asyncio.run(worker._start_local("u1"))
+
+    assert "u1" not in worker.manager.traders
+    assert "u1" not in worker.manager.tasks
+    assert f"{OWNER_KEY_PREFIX}u1" not in worker.client.values
+    failures, retry_at = worker.start_failures["u1"]
+    assert failures == 1
+
+    # 백오프 동안은 다시 시작하지 않음
+    asyncio.run(worker._start_local("u1"))
+    assert worker.start_failures["u1"] == (1, retry_at)
@@ -0,0 +1,60 @@
+"""
+VaR 엔진 테스트
+
+최근 상장된 심볼이 다른 심볼의 수익률 이력을 잘라내지 않고,
+수익률이 없는 노출은 결과에 미반영으로 보고되는지 확인합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.services.var_engine import ReturnsStore, VaREngine
+
+
+class FakeReturnsStore(ReturnsStore):
+    def __init__(self, series, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = series
+
+    def get_returns(self, symbol):
+        return self.fixtures.get(symbol)
+
+
+def returns(days: int, seed: int) -> pd.Series:
+    index = pd.date_range(end="2026-01-01", periods=days, freq="D")
+    return pd.Series(np.random.default_rng(seed).normal(0, 0.02, days), index=index)
+
+
+def position(symbol: str, notional: float) -> dict:
+    return {"symbol": symbol, "side": "LONG", "notional": notional}
+
+
+def test_short_history_symbol_does_not_truncate_universe():
+    store = FakeReturnsStore({
+        "BTCUSDT": returns(365, 1),
+        "ETHUSDT": returns(365, 2),
+        "NEWUSDT": returns(10, 3)
+    })
+
+    universe = store.universe(["BTCUSDT", "ETHUSDT", "NEWUSDT", "GONEUSDT"])
+
+    assert universe["symbols"] == ["BTCUSDT", "ETHUSDT"]
+    assert len(universe["returns"]) == 365
+    assert universe["short"] == ["NEWUSDT"]
+    assert universe["missing"] == ["GONEUSDT"]
+
+
+def test_uncovered_exposure_is_reported():
+    engine = VaREngine(FakeReturnsStore({"BTCUSDT": returns(365, 1), "NEWUSDT": returns(10, 3)}))
+
+    results = engine.batch_var({
+        "a": [position("BTCUSDT", 1000.0), position("NEWUSDT", 3000.0)],
+        "b": [position("BTCUSDT", 1000.0)]
+    }, methods=("historical",))
+
+    assert results["a"]["observations"] == 365
+    assert results["a"]["uncovered_symbols"] == ["NEWUSDT"]
+    assert results["a"]["uncovered_value"] == 3000.0
+    assert results["a"]["coverage"] == 0.25
+    assert results["b"]["uncovered_symbols"] == [] and results["b"]["coverage"] == 1.0
+    assert results["a"]["var_amount"] == results["b"]["var_amount"] > 0
@@ -0,0 +1,88 @@
+"""
+웹훅 수집 큐 테스트
+
+파티션을 소유한 워커가 계정을 메모리에 등록하지 않은 경우에도
+DB 자격증명으로 시그널을 실행하는지 확인합니다.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.api.v1 import webhook
+from app.core.crypto import crypto_service
+from app.database.base import SessionLocal
+from app.models.api_key import ApiKey
+from app.models.user import User
+from app.services.binance_client import BinanceClient
+from app.services.order_executor import Exchange, order_executor
+from app.services.webhook_queue import WebhookIngestionQueue
+
+
+@pytest.fixture
+def stored_account():
+    """DB에만 저장된 Binance 계정 (이 프로세스의 order_executor에는 미등록)"""
+    user_id = str(uuid.uuid4())
+    key_id = str(uuid.uuid4())
+    encrypted = crypto_service.encrypt_api_credentials(api_key="stored-key", api_secret="stored-secret")
+
+    db = SessionLocal()
+    db.add(User(id=user_id, email=f"{user_id}@example.com"))
+    db.add(ApiKey(
+        id=key_id,
+        user_id=user_id,
+        exchange="binance",
+        api_key=encrypted["api_key"],
+        api_secret=encrypted["api_secret"],
+        testnet=True,
+        is_active=True
+    ))
+    db.commit()
+    db.close()
+
+    yield f"{user_id}_{key_id}"
+
+    db = SessionLocal()
+    db.query(ApiKey).filter(ApiKey.id == key_id).delete()
+    db.query(User).filter(User.id == user_id).delete()
+    db.commit()
+    db.close()
+
+
+def test_consumer_without_registration_executes_from_db(stored_account, monkeypatch):
+    closed = []
+
+    async def fake_close_position(self, symbol, **kwargs):
+        closed.append((self.api_key, symbol))
+        return {"symbol": symbol, "status": "FILLED"}
+
+    monkeypatch.setattr(BinanceClient, "close_position_async", fake_close_position)
+    monkeypatch.setattr(webhook.background_queue, "submit", lambda *args, **kwargs: True)
+    assert stored_account not in order_executor.binance_clients
+
+    async def run():
+        queue = WebhookIngestionQueue(partitions=4, use_redis=False)
+        await queue.start(webhook.execute_webhook_signal)
+        _, accepted = await queue.submit(
+            account_id=stored_account,
+            exchange="binance",
+            signal={"action": "close_all", "symbol": "BTCUSDT"}
+        )
+        await queue.stop()
+        return accepted, queue.stats
+
+    accepted, stats = asyncio.run(run())
+
+    assert accepted
+    assert stats["executed"] == 1 and stats["failed"] == 0
+    assert closed == [("stored-key", "BTCUSDT")]
+
+
+def test_unknown_account_is_rejected():
+    async def run():
+        return await order_executor.load_account(f"nobody_{uuid.uuid4()}", Exchange.BINANCE)
+
+    assert asyncio.run(run()) is None
+    with pytest.raises(ValueError, match="account not found"):
+        asyncio.run(order_executor.get_client(f"nobody_{uuid.uuid4()}", Exchange.BINANCE))
@@ -0,0 +1,85 @@
+"""
+WebSocket 연결 풀 재활용 테스트
+
+로컬 스텁 Binance 스트림 서버로 오래된 연결을 교체할 때
+새 연결의 구독 확인 후에만 기존 연결에서 스트림을 빼는지 확인합니다.
+"""
+
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from app.services import websocket_pool as websocket_pool_module
+from app.services.websocket_pool import WebSocketConnectionPool
+
+STREAMS = ("btcusdt@markPrice", "ethusdt@markPrice")
+
+
+class StubBinance:
+    """연결 순번별로 제어 메시지를 기록하고, ack 여부를 연결마다 정함"""
+
+    def __init__(self, ack_connections):
+        self.ack_connections = ack_connections
+        self.log = []
+        self.connections = 0
+
+    async def handler(self, ws, path=None):
+        self.connections += 1
+        number = self.connections
+        async for raw in ws:
+            msg = json.loads(raw)
+            self.log.append((number, msg["method"], tuple(msg["params"])))
+            if msg["method"] == "SUBSCRIBE" and number in self.ack_connections:
+                await ws.send(json.dumps({"result": None, "id": msg["id"]}))
+
+
+@pytest.fixture(autouse=True)
+def fast_control(monkeypatch):
+    monkeypatch.setattr(websocket_pool_module, "CONTROL_INTERVAL", 0.01)
+    monkeypatch.setattr(websocket_pool_module, "RECYCLE_CONFIRM_TIMEOUT", 0.5)
+
+
+def recycle(stub):
+    async def handler(event):
+        pass
+
+    async def run():
+        async with websockets.serve(stub.handler, "127.0.0.1", 0) as server:
+            pool = WebSocketConnectionPool()
+            pool.EXCHANGE_URLS = {"binance": f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"}
+
+            for stream in STREAMS:
+                old = await pool.subscribe("binance", stream, handler)
+            assert await old.wait_live(set(STREAMS), timeout=2.0) == set(STREAMS)
+
+            await pool._recycle_connection("binance", old)
+            await asyncio.sleep(0.1)
+            state = (old, dict(pool.stream_index["binance"]), set(pool.pools["binance"]))
+            await pool.stop()
+            return state
+
+    return asyncio.run(run())
+
+
+def test_recycle_subscribes_new_connection_before_leaving_old():
+    stub = StubBinance(ack_connections={1, 2})
+
+    old, index, connections = recycle(stub)
+
+    assert stub.log[:2] == [(1, "SUBSCRIBE", STREAMS), (2, "SUBSCRIBE", STREAMS)]
+    assert old.connection_id not in connections
+    assert set(index.values()) == {"binance_2"}
+
+
+def test_unconfirmed_streams_stay_on_old_connection():
+    stub = StubBinance(ack_connections={1})
+
+    old, index, connections = recycle(stub)
+
+    assert (1, "UNSUBSCRIBE", STREAMS) not in stub.log
+    assert (2, "UNSUBSCRIBE", STREAMS) in stub.log
+    assert old.connection_id in connections and not old.recycling
+    assert set(old.streams) == set(STREAMS)
+    assert set(index.values()) == {old.connection_id}